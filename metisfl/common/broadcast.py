@@ -0,0 +1,387 @@
+"""Concurrent broadcast of a model to many Learners, either directly or through a tree of relaying Learners."""
+
+import itertools
+import queue
+import threading
+import time
+from concurrent import futures
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import grpc
+
+from ..proto import learner_pb2, model_pb2, service_common_pb2
+from .chunking import model_to_chunks
+from .client import get_channel_pool
+from .common import get_endpoint
+from .logger import MetisLogger
+from .types import ClientParams
+
+# The maximum number of models sent concurrently by a single sender.
+DEFAULT_BROADCAST_CONCURRENCY: int = 16
+
+# The maximum number of chunks a relaying Learner holds for each of its peers.
+RELAY_BUFFER_SIZE: int = 8
+
+# Mark the end of the chunks of a ChunkRelay, and a model that was not received in full.
+_END = object()
+_ABORT = object()
+
+
+def _identity(serialized: bytes) -> bytes:
+    return serialized
+
+
+class _SerializedLearnerStub(object):
+
+    """A stub of the initial model endpoints of the Learner that sends already serialized chunks."""
+
+    def __init__(self, channel: grpc.Channel):
+        self.SetInitialWeights = channel.unary_unary(
+            '/metisfl.LearnerService/SetInitialWeights',
+            request_serializer=_identity,
+            response_deserializer=service_common_pb2.Ack.FromString,
+        )
+        self.SetInitialWeightsStream = channel.stream_unary(
+            '/metisfl.LearnerService/SetInitialWeightsStream',
+            request_serializer=_identity,
+            response_deserializer=service_common_pb2.Ack.FromString,
+        )
+        self.SetInitialWeightsRelayStream = channel.stream_unary(
+            '/metisfl.LearnerService/SetInitialWeightsRelayStream',
+            request_serializer=_identity,
+            response_deserializer=learner_pb2.BroadcastResponse.FromString,
+        )
+
+
+def to_relay_peer(client_params: ClientParams) -> learner_pb2.RelayPeer:
+    """Converts the client parameters of a Learner to a RelayPeer, reading its root certificate.
+
+    Parameters
+    ----------
+    client_params : ClientParams
+        The client parameters of the Learner.
+
+    Returns
+    -------
+    learner_pb2.RelayPeer
+        The RelayPeer of the Learner.
+    """
+    peer = learner_pb2.RelayPeer(
+        hostname=client_params.hostname,
+        port=client_params.port,
+    )
+    if client_params.root_certificate is not None:
+        peer.root_certificate = Path(client_params.root_certificate).read_bytes()
+    return peer
+
+
+def broadcast_model(
+    model: model_pb2.Model,
+    peers: List[learner_pb2.RelayPeer],
+    fanout: Optional[int] = 0,
+    max_concurrency: Optional[int] = DEFAULT_BROADCAST_CONCURRENCY,
+    request_retries: Optional[int] = 1,
+    request_timeout: Optional[int] = None,
+    send_references: Optional[bool] = True
+) -> List[learner_pb2.BroadcastReport]:
+    """Sends the model as the initial model of the Learners. Blocks until all Learners have replied.
+
+    Parameters
+    ----------
+    model : model_pb2.Model
+        The model to send. It is split into chunks and serialized only once.
+    peers : List[learner_pb2.RelayPeer]
+        The Learners to send the model to.
+    fanout : Optional[int], (default=0)
+        If 0, the model is sent directly to every Learner. Otherwise, the model is sent directly to
+        at most fanout Learners, each of which forwards it to at most fanout of the remaining Learners,
+        and so on, so that the uplink of the sender is not the bottleneck of the broadcast.
+    max_concurrency : Optional[int], (default=DEFAULT_BROADCAST_CONCURRENCY)
+        The maximum number of models sent concurrently.
+    request_retries : Optional[int], (default=1)
+        The number of attempts per Learner.
+    request_timeout : Optional[int], (default=None)
+        The timeout in seconds of each attempt.
+    send_references : Optional[bool], (default=True)
+        If the model is versioned, whether to first send only its version to every Learner.
+        The Learners that already hold the model, e.g., the Learner it was obtained from or the
+        Learners that outlived a restart of the Driver, set it without receiving it again.
+
+    Returns
+    -------
+    List[learner_pb2.BroadcastReport]
+        The report of every Learner, in the order of the peers.
+    """
+    reports = [None] * len(peers)
+    if send_references and model.version:
+        reference = model_pb2.Model(
+            version=model.version, reference=True).SerializeToString()
+        with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            reports = list(executor.map(
+                lambda peer: _refer(peer, reference, request_timeout), peers))
+
+    missing = [index for index, report in enumerate(reports) if report is None]
+    missing_reports = broadcast_chunks(
+        chunks=model_to_chunks(model),
+        peers=[peers[index] for index in missing],
+        fanout=fanout,
+        max_concurrency=max_concurrency,
+        request_retries=request_retries,
+        request_timeout=request_timeout,
+    )
+    for index, report in zip(missing, missing_reports):
+        reports[index] = report
+    return reports
+
+
+def broadcast_chunks(
+    chunks: Iterable[model_pb2.ModelChunk],
+    peers: List[learner_pb2.RelayPeer],
+    fanout: Optional[int] = 0,
+    max_concurrency: Optional[int] = DEFAULT_BROADCAST_CONCURRENCY,
+    request_retries: Optional[int] = 1,
+    request_timeout: Optional[int] = None
+) -> List[learner_pb2.BroadcastReport]:
+    """Same as broadcast_model, for a model that is already split into chunks."""
+
+    if not peers:
+        return []
+
+    if fanout > 0:
+        targets = _split_tree(peers, fanout)
+        body = [
+            learner_pb2.SetInitialWeightsRelayChunk(
+                model_chunk=chunk).SerializeToString()
+            for chunk in chunks
+        ]
+    else:
+        targets = [(peer, []) for peer in peers]
+        body = [chunk.SerializeToString() for chunk in chunks]
+
+    with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = list(executor.map(
+            lambda target: _send(target[0], target[1], fanout, body,
+                                 request_retries, request_timeout),
+            targets
+        ))
+
+    return _peer_reports(peers, results)
+
+
+class ChunkRelay(object):
+
+    """Forwards the chunks of a model to the peers as they arrive, e.g., while a relaying Learner
+        receives the model. Every peer is sent its chunks from a bounded queue, hence at most
+        RELAY_BUFFER_SIZE chunks are held for each peer and a slow peer slows down the stream the
+        chunks arrive from. The chunks are not kept, hence every peer is sent the model only once."""
+
+    def __init__(
+        self,
+        peers: List[learner_pb2.RelayPeer],
+        fanout: Optional[int] = 0,
+        request_timeout: Optional[int] = None,
+        buffer_size: Optional[int] = RELAY_BUFFER_SIZE
+    ):
+        """Starts sending the model to the peers, as in broadcast_chunks. Every direct peer is
+            sent the model concurrently, since each of them must consume every chunk.
+
+        Parameters
+        ----------
+        peers : List[learner_pb2.RelayPeer]
+            The Learners to send the model to.
+        fanout : Optional[int], (default=0)
+            The fanout of the relay tree, as in broadcast_model.
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds of each request.
+        buffer_size : Optional[int], (default=RELAY_BUFFER_SIZE)
+            The maximum number of chunks held for each direct peer.
+        """
+        self._peers = peers
+        self._fanout = fanout
+        targets = _split_tree(peers, fanout) if fanout > 0 else [(peer, []) for peer in peers]
+        self._queues = [queue.Queue(maxsize=buffer_size) for _ in targets]
+        self._sent = [threading.Event() for _ in targets]
+        self._executor = futures.ThreadPoolExecutor(max_workers=max(len(targets), 1))
+        self._results = [
+            self._executor.submit(self._send, index, peer, subtree, request_timeout)
+            for index, (peer, subtree) in enumerate(targets)
+        ]
+
+    def put(self, chunk: model_pb2.ModelChunk) -> None:
+        """Forwards the chunk to the peers. Blocks while the queue of a peer is full."""
+
+        if self._fanout > 0:
+            chunk = learner_pb2.SetInitialWeightsRelayChunk(model_chunk=chunk)
+        self._put_all(chunk.SerializeToString())
+
+    def close(self) -> None:
+        """Ends the model; the peers set it once they have received its last chunk."""
+
+        self._put_all(_END)
+
+    def abort(self) -> None:
+        """Cancels the requests to the peers, e.g., if the model was not received in full."""
+
+        self._put_all(_ABORT)
+
+    def result(self) -> List[learner_pb2.BroadcastReport]:
+        """Waits for the peers to reply, once the relay is closed or aborted.
+
+        Returns
+        -------
+        List[learner_pb2.BroadcastReport]
+            The report of every Learner, in the order of the peers.
+        """
+        results = [result.result() for result in self._results]
+        self._executor.shutdown()
+        return _peer_reports(self._peers, results)
+
+    def _put_all(self, item) -> None:
+        for chunks, sent in zip(self._queues, self._sent):
+            # The requests that have ended, e.g., failed, no longer consume their chunks.
+            while not sent.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def _send(
+        self,
+        index: int,
+        peer: learner_pb2.RelayPeer,
+        subtree: List[learner_pb2.RelayPeer],
+        request_timeout: Optional[int]
+    ) -> List[learner_pb2.BroadcastReport]:
+        try:
+            return _send(peer, subtree, self._fanout, self._chunks(index), 1, request_timeout)
+        finally:
+            self._sent[index].set()
+
+    def _chunks(self, index: int) -> Iterator[bytes]:
+        chunks = self._queues[index]
+        while True:
+            chunk = chunks.get()
+            if chunk is _END:
+                return
+            if chunk is _ABORT:
+                # Cancels the request, so that the peer does not set a partial model.
+                raise RuntimeError("The relayed model was not received in full")
+            yield chunk
+
+
+def _peer_reports(
+    peers: List[learner_pb2.RelayPeer],
+    results: List[List[learner_pb2.BroadcastReport]]
+) -> List[learner_pb2.BroadcastReport]:
+    """Orders the reports of the requests, each of a peer and its subtree, by the peers."""
+
+    reports = {}
+    for report in (report for result in results for report in result):
+        reports[report.endpoint] = report
+
+    return [reports[_get_peer_endpoint(peer)] for peer in peers]
+
+
+def _split_tree(
+    peers: List[learner_pb2.RelayPeer],
+    fanout: int
+) -> List[Tuple[learner_pb2.RelayPeer, List[learner_pb2.RelayPeer]]]:
+    """Splits the peers into at most fanout subtrees of similar size, each with its root."""
+
+    roots, rest = peers[:fanout], peers[fanout:]
+    return [(root, rest[index::fanout]) for index, root in enumerate(roots)]
+
+
+def _send(
+    peer: learner_pb2.RelayPeer,
+    subtree: List[learner_pb2.RelayPeer],
+    fanout: int,
+    body: Iterable[bytes],
+    request_retries: int,
+    request_timeout: Optional[int]
+) -> List[learner_pb2.BroadcastReport]:
+    """Sends the serialized chunks to the peer and returns the reports of the peer and of its subtree.
+        The chunks are sent again on every attempt, hence are iterated once if request_retries is 1."""
+
+    endpoint = _get_peer_endpoint(peer)
+    channel = get_channel_pool().acquire(endpoint, peer.root_certificate or None)
+    stub = channel.get_stub(_SerializedLearnerStub)
+
+    start = time.perf_counter()
+    ok, error, subtree_reports = False, "", []
+    for _ in range(request_retries):
+        try:
+            if fanout > 0:
+                header = learner_pb2.SetInitialWeightsRelayChunk(
+                    peers=subtree, fanout=fanout).SerializeToString()
+                response = stub.SetInitialWeightsRelayStream(
+                    itertools.chain([header], body), timeout=request_timeout)
+                ok, subtree_reports = response.ack.status, list(response.reports)
+            else:
+                ok, subtree_reports = stub.SetInitialWeightsStream(
+                    iter(body), timeout=request_timeout).status, []
+            error = "" if ok else "Learner did not set the model"
+            break
+        except grpc.RpcError as rpc_error:
+            if rpc_error.code() == grpc.StatusCode.UNAVAILABLE:
+                channel.mark_unavailable()
+            error = "{}".format(rpc_error.details())
+    latency_secs = time.perf_counter() - start
+
+    if not ok:
+        MetisLogger.error(
+            "Broadcast to learner {} failed: {}".format(endpoint, error))
+
+    reports = [learner_pb2.BroadcastReport(
+        endpoint=endpoint,
+        ok=ok,
+        latency_secs=latency_secs,
+        error=error,
+    )]
+    reports.extend(subtree_reports)
+    reported = {report.endpoint for report in subtree_reports}
+    for subtree_peer in subtree:
+        # E.g., the relay failed before forwarding the model.
+        subtree_endpoint = _get_peer_endpoint(subtree_peer)
+        if subtree_endpoint not in reported:
+            reports.append(learner_pb2.BroadcastReport(
+                endpoint=subtree_endpoint,
+                ok=False,
+                error="Relay through learner {} failed".format(endpoint),
+            ))
+
+    return reports
+
+
+def _refer(
+    peer: learner_pb2.RelayPeer,
+    reference: bytes,
+    request_timeout: Optional[int]
+) -> Optional[learner_pb2.BroadcastReport]:
+    """Sends the serialized reference to the peer. Returns the report of the peer if it holds
+        the model it refers to, or None if the model must be sent in full."""
+
+    endpoint = _get_peer_endpoint(peer)
+    channel = get_channel_pool().acquire(endpoint, peer.root_certificate or None)
+    stub = channel.get_stub(_SerializedLearnerStub)
+
+    start = time.perf_counter()
+    try:
+        if not stub.SetInitialWeights(reference, timeout=request_timeout).status:
+            return None
+    except grpc.RpcError as rpc_error:
+        if rpc_error.code() == grpc.StatusCode.UNAVAILABLE:
+            channel.mark_unavailable()
+        return None
+
+    return learner_pb2.BroadcastReport(
+        endpoint=endpoint,
+        ok=True,
+        latency_secs=time.perf_counter() - start,
+    )
+
+
+def _get_peer_endpoint(peer: learner_pb2.RelayPeer) -> str:
+    return get_endpoint(peer.hostname, peer.port)
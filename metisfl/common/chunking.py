@@ -0,0 +1,244 @@
+"""Helpers to transfer models over the streaming RPCs in bounded-size chunks."""
+
+from typing import Iterable, Iterator, List, Optional, Union
+
+from ..proto import model_pb2
+
+# Kept well below the 4 MB default gRPC message limit, so that
+# chunks go through even if the peer does not raise its limit.
+DEFAULT_CHUNK_SIZE: int = 1024 * 1024
+
+
+def tensor_to_chunks(
+    tensor_index: int,
+    tensor_spec: model_pb2.Tensor,
+    value: Union[bytes, memoryview],
+    encrypted: Optional[bool] = False,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    version: Optional[str] = "",
+    base_version: Optional[str] = "",
+    packed: Optional[bool] = False,
+    masking: Optional[model_pb2.Masking] = None
+) -> Iterator[model_pb2.ModelChunk]:
+    """Splits the value of a tensor into consecutive chunks.
+
+    Parameters
+    ----------
+    tensor_index : int
+        The index of the tensor in the model.
+    tensor_spec : model_pb2.Tensor
+        The tensor spec (length, dimensions, type, codec, quantization, sparsity, encrypted).
+        Its value is ignored.
+    value : Union[bytes, memoryview]
+        The value of the tensor. Only one chunk of it is copied at a time.
+    encrypted : Optional[bool], (default=False)
+        Whether all the tensors of the model are encrypted. Tensors that are
+        encrypted selectively are flagged in their spec instead.
+    chunk_size : Optional[int], (default=DEFAULT_CHUNK_SIZE)
+        The maximum number of value bytes per chunk.
+    version : Optional[str], (default="")
+        The version of the model.
+    base_version : Optional[str], (default="")
+        The version of the model the tensor is a delta from, if any.
+    packed : Optional[bool], (default=False)
+        Whether the tensors of the model are packed.
+    masking : Optional[model_pb2.Masking], (default=None)
+        The masking of the model, if any; set only for the first tensor of the model.
+
+    Yields
+    ------
+    model_pb2.ModelChunk
+        The chunks of the tensor. The first chunk carries the tensor spec and the model versions.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+
+    spec = model_pb2.Tensor(
+        length=tensor_spec.length,
+        dimensions=tensor_spec.dimensions,
+        type=tensor_spec.type,
+        codec=tensor_spec.codec,
+        encrypted=tensor_spec.encrypted,
+    )
+    if tensor_spec.HasField("quantization"):
+        spec.quantization.CopyFrom(tensor_spec.quantization)
+    if tensor_spec.HasField("sparsity"):
+        spec.sparsity.CopyFrom(tensor_spec.sparsity)
+    value = memoryview(value).cast("B")
+    value_size = len(value)
+
+    offset = 0
+    while True:
+        chunk = model_pb2.ModelChunk(
+            encrypted=encrypted,
+            tensor_index=tensor_index,
+            offset=offset,
+            data=value[offset:offset + chunk_size].tobytes(),
+        )
+        if offset == 0:
+            chunk.tensor_spec.CopyFrom(spec)
+            chunk.value_size = value_size
+            chunk.version = version
+            chunk.base_version = base_version
+            chunk.packed = packed
+            if masking is not None:
+                chunk.masking.CopyFrom(masking)
+        yield chunk
+
+        offset += chunk_size
+        if offset >= value_size:
+            break
+
+
+def model_to_chunks(
+    model: model_pb2.Model,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE
+) -> Iterator[model_pb2.ModelChunk]:
+    """Splits a Model proto into chunks.
+
+    Parameters
+    ----------
+    model : model_pb2.Model
+        The model to split.
+    chunk_size : Optional[int], (default=DEFAULT_CHUNK_SIZE)
+        The maximum number of value bytes per chunk.
+
+    Yields
+    ------
+    model_pb2.ModelChunk
+        The chunks of the model, in order.
+    """
+    for index, tensor in enumerate(model.tensors):
+        yield from tensor_to_chunks(
+            tensor_index=index,
+            tensor_spec=tensor,
+            value=tensor.value,
+            encrypted=model.encrypted,
+            chunk_size=chunk_size,
+            version=model.version,
+            base_version=model.base_version,
+            packed=model.packed,
+            masking=model.masking if index == 0 and model.HasField("masking") else None,
+        )
+
+
+def chunks_to_model(chunks: Iterable[model_pb2.ModelChunk]) -> model_pb2.Model:
+    """Assembles a Model proto from its chunks.
+
+    Parameters
+    ----------
+    chunks : Iterable[model_pb2.ModelChunk]
+        The chunks of the model, in order.
+
+    Returns
+    -------
+    model_pb2.Model
+        The assembled model.
+    """
+    assembler = ModelAssembler()
+    for chunk in chunks:
+        assembler.add_chunk(chunk)
+    return assembler.get_model()
+
+
+class ModelAssembler(object):
+    """Incrementally assembles a Model proto from its chunks, as they arrive. The data of the chunks
+        of a tensor is joined once the tensor is complete, hence it is copied only once."""
+
+    def __init__(self):
+        """Initializes an empty ModelAssembler."""
+        self._model = model_pb2.Model()
+        self._value: Optional[List[bytes]] = None
+        self._value_size = 0
+        self._received = 0
+
+    def add_chunk(self, chunk: model_pb2.ModelChunk) -> None:
+        """Appends the data of the chunk to the model.
+
+        Parameters
+        ----------
+        chunk : model_pb2.ModelChunk
+            The next chunk of the model.
+
+        Raises
+        ------
+        ValueError
+            If the chunk is out of order.
+        """
+        if chunk.HasField("tensor_spec"):
+            self._flush_tensor()
+            if chunk.tensor_index != len(self._model.tensors):
+                raise ValueError("Expected tensor {} but received tensor {}".format(
+                    len(self._model.tensors), chunk.tensor_index))
+            self._model.encrypted = chunk.encrypted
+            self._model.version = chunk.version
+            self._model.base_version = chunk.base_version
+            self._model.packed = chunk.packed
+            if chunk.HasField("masking"):
+                self._model.masking.CopyFrom(chunk.masking)
+            self._model.tensors.add().CopyFrom(chunk.tensor_spec)
+            self._value = []
+            self._value_size = chunk.value_size
+            self._received = 0
+
+        validate_chunk(chunk, len(self._model.tensors) - 1,
+                       self._received, self._value_size)
+        # The chunks are in order, as validated.
+        self._value.append(chunk.data)
+        self._received += len(chunk.data)
+
+    def get_model(self) -> model_pb2.Model:
+        """Returns the assembled model.
+
+        Raises
+        ------
+        ValueError
+            If the last tensor of the model is incomplete.
+        """
+        self._flush_tensor()
+        return self._model
+
+    def _flush_tensor(self) -> None:
+        if self._value is None:
+            return
+        if self._received != self._value_size:
+            raise ValueError("Tensor {} is incomplete: received {} of {} bytes".format(
+                len(self._model.tensors) - 1, self._received, self._value_size))
+        # The data of a tensor sent in a single chunk is assigned as is.
+        self._model.tensors[-1].value = b"".join(self._value)
+        self._value = None
+
+
+def validate_chunk(
+    chunk: model_pb2.ModelChunk,
+    tensor_index: int,
+    received: int,
+    value_size: int
+) -> None:
+    """Checks that the chunk continues the tensor that is currently assembled.
+
+    Parameters
+    ----------
+    chunk : model_pb2.ModelChunk
+        The chunk to validate.
+    tensor_index : int
+        The index of the tensor that is currently assembled, -1 if none.
+    received : int
+        The number of bytes of the tensor received so far.
+    value_size : int
+        The total size in bytes of the tensor value.
+
+    Raises
+    ------
+    ValueError
+        If the chunk is out of order or exceeds the size of the tensor.
+    """
+    if tensor_index < 0 or chunk.tensor_index != tensor_index:
+        raise ValueError(
+            "Received a chunk of tensor {} without its spec".format(chunk.tensor_index))
+    if chunk.offset != received:
+        raise ValueError("Expected offset {} but received offset {} for tensor {}".format(
+            received, chunk.offset, tensor_index))
+    if received + len(chunk.data) > value_size:
+        raise ValueError("Tensor {} exceeds its size of {} bytes".format(
+            tensor_index, value_size))
@@ -1,12 +1,15 @@
 """gRPC client for the Metis Controller."""
 
-import queue
+import asyncio
+import atexit
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import grpc
+import grpc.aio
 from pebble import ThreadPool
 
 from ..common.types import ClientParams
@@ -15,6 +18,10 @@ from .common import get_endpoint
 
 GRPC_MAX_MESSAGE_LENGTH: int = 512 * 1024 * 1024
 
+# Keepalive pings detect dead connections of idle pooled channels.
+GRPC_KEEPALIVE_TIME_MS: int = 30 * 1000
+GRPC_KEEPALIVE_TIMEOUT_MS: int = 10 * 1000
+
 
 def create_channel(
     server_address: str,
@@ -42,10 +49,7 @@ def create_channel(
     if isinstance(root_certificate, str):
         root_certificate = Path(root_certificate).read_bytes()
 
-    options = [
-        ("grpc.max_send_message_length", max_message_length),
-        ("grpc.max_receive_message_length", max_message_length),
-    ]
+    options = _channel_options(max_message_length)
 
     if root_certificate is not None:
         ssl_channel_credentials = grpc.ssl_channel_credentials(
@@ -60,6 +64,262 @@ def create_channel(
     return channel
 
 
+def create_aio_channel(
+    server_address: str,
+    root_certificate: Optional[Union[str, bytes]] = None,
+    max_message_length: Optional[int] = GRPC_MAX_MESSAGE_LENGTH
+) -> grpc.aio.Channel:
+    """Creates an asyncio gRPC channel to the given server address using the given root certificate.
+        The channel is bound to the running event loop.
+
+    Parameters
+    ----------
+    server_address : str
+        The server address in the form of "hostname:port".
+    root_certificate : Optional[Union[str, bytes]], optional
+        The root certificate, either as a string or bytes, by default None.
+        If None, the connection is insecure.
+    max_message_length : Optional[int], optional
+        The maximum message length, by default GRPC_MAX_MESSAGE_LENGTH
+
+    Returns
+    -------
+    grpc.aio.Channel
+        The gRPC channel.
+    """
+
+    if isinstance(root_certificate, str):
+        root_certificate = Path(root_certificate).read_bytes()
+
+    options = _channel_options(max_message_length)
+
+    if root_certificate is not None:
+        ssl_channel_credentials = grpc.ssl_channel_credentials(
+            root_certificates=root_certificate,
+        )
+        return grpc.aio.secure_channel(
+            server_address, ssl_channel_credentials, options=options
+        )
+    return grpc.aio.insecure_channel(server_address, options=options)
+
+
+def _channel_options(max_message_length: int) -> List[Tuple[str, int]]:
+    return [
+        ("grpc.max_send_message_length", max_message_length),
+        ("grpc.max_receive_message_length", max_message_length),
+        ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", GRPC_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+
+class ChannelPool(object):
+
+    """A process-wide pool of gRPC channels, keyed by endpoint and credentials.
+
+    Each pooled channel is created lazily (it connects on its first request), is kept
+    alive with HTTP/2 keepalive pings and is reused by every client of the same server.
+    The holders of a channel, i.e., the clients that acquired it and the requests they
+    scheduled, are counted, along with the calls in flight on it. A channel is retired,
+    i.e., removed from the pool such that later calls get a new channel, when a client
+    shuts down or when its last call failed with UNAVAILABLE; the new channel reconnects
+    without waiting for the reconnection backoff of the retired one. A retired channel is
+    closed once its last holder releases it and its calls in flight complete, hence no
+    client has its requests cancelled or refused by another.
+    """
+
+    def __init__(self):
+        """Initializes an empty ChannelPool."""
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, _PooledChannel] = {}
+        self._stats = {"channels_created": 0, "channels_reused": 0}
+
+    def acquire(
+        self,
+        endpoint: str,
+        root_certificate: Optional[Union[str, bytes]] = None,
+        max_message_length: Optional[int] = GRPC_MAX_MESSAGE_LENGTH
+    ) -> "_PooledChannel":
+        """Returns the pooled channel of the endpoint, creating it if needed. The caller
+            holds the channel until it releases it.
+
+        Parameters
+        ----------
+        endpoint : str
+            The server address in the form of "hostname:port".
+        root_certificate : Optional[Union[str, bytes]], optional
+            The root certificate, either as a string or bytes, by default None.
+        max_message_length : Optional[int], optional
+            The maximum message length, by default GRPC_MAX_MESSAGE_LENGTH
+
+        Returns
+        -------
+        _PooledChannel
+            The pooled channel.
+        """
+        key = (endpoint, root_certificate, max_message_length)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.is_healthy():
+                self._stats["channels_reused"] += 1
+                entry.hold()
+                return entry
+
+            if entry is not None:
+                MetisLogger.info(
+                    "Channel to {} is unhealthy, reconnecting.".format(endpoint))
+                entry.retire()
+            entry = _PooledChannel(endpoint, root_certificate, max_message_length)
+            self._entries[key] = entry
+            self._stats["channels_created"] += 1
+            entry.hold()
+            return entry
+
+    def release(self, entry: "_PooledChannel") -> None:
+        """Releases the channel acquired by the caller. A retired channel is closed once its
+            last holder releases it and its calls in flight complete.
+
+        Parameters
+        ----------
+        entry : _PooledChannel
+            The pooled channel to release.
+        """
+        entry.unhold()
+
+    def retire(self, entry: "_PooledChannel") -> None:
+        """Retires the channel: it is removed from the pool, such that later calls get a new
+            channel, and closed once its last holder releases it and its calls in flight complete.
+
+        Parameters
+        ----------
+        entry : _PooledChannel
+            The pooled channel to retire.
+        """
+        with self._lock:
+            for key, pooled_entry in list(self._entries.items()):
+                if pooled_entry is entry:
+                    del self._entries[key]
+        entry.retire()
+
+    def close(self) -> None:
+        """Closes all the channels of the pool, along with their calls in flight."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of channels created and reused by the pool."""
+        with self._lock:
+            return dict(self._stats)
+
+
+class _PooledChannel(grpc.UnaryUnaryClientInterceptor,
+                     grpc.UnaryStreamClientInterceptor,
+                     grpc.StreamUnaryClientInterceptor,
+                     grpc.StreamStreamClientInterceptor):
+
+    """A channel of the ChannelPool, along with its stubs. Counts its holders and intercepts
+        the calls on the channel to count the ones in flight."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        root_certificate: Optional[Union[str, bytes]],
+        max_message_length: int
+    ):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._holders = 0
+        self._retired = False
+        self._closed = False
+        self._healthy = True
+        self._stubs: Dict[Callable, Any] = {}
+        # The channel connects on its first request.
+        self._channel = create_channel(endpoint, root_certificate, max_message_length)
+        self.channel = grpc.intercept_channel(self._channel, self)
+
+    def mark_unavailable(self) -> None:
+        self._healthy = False
+
+    def is_healthy(self) -> bool:
+        return self._healthy
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def get_stub(self, stub_class: Callable) -> Any:
+        with self._lock:
+            if stub_class not in self._stubs:
+                self._stubs[stub_class] = stub_class(self.channel)
+            return self._stubs[stub_class]
+
+    def hold(self) -> None:
+        with self._lock:
+            self._holders += 1
+
+    def unhold(self) -> None:
+        with self._lock:
+            self._holders -= 1
+            idle = self._retired and self._is_idle()
+        if idle:
+            self.close()
+
+    def retire(self) -> None:
+        with self._lock:
+            self._retired = True
+            idle = self._is_idle()
+        if idle:
+            self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._channel.close()
+
+    def _is_idle(self) -> bool:
+        return self._holders == 0 and self._in_flight == 0
+
+    def _intercept(self, continuation: Callable, client_call_details: Any, request: Any) -> Any:
+        with self._lock:
+            self._in_flight += 1
+        try:
+            call = continuation(client_call_details, request)
+        except BaseException:
+            self._call_done()
+            raise
+        call.add_done_callback(lambda _: self._call_done())
+        return call
+
+    def _call_done(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            idle = self._retired and self._is_idle()
+        if idle:
+            # May be called from the thread that completes the call, hence closed apart from it.
+            threading.Thread(target=self.close, daemon=True).start()
+
+    intercept_unary_unary = _intercept
+    intercept_unary_stream = _intercept
+    intercept_stream_unary = _intercept
+    intercept_stream_stream = _intercept
+
+
+_CHANNEL_POOL = ChannelPool()
+atexit.register(_CHANNEL_POOL.close)
+
+
+def get_channel_pool() -> ChannelPool:
+    """Returns the process-wide ChannelPool."""
+    return _CHANNEL_POOL
+
+
 @contextmanager
 def get_client(
     client_params: ClientParams,
@@ -68,6 +328,9 @@ def get_client(
     max_workers=1
 ):
     """Gets a gRPC client for the given server hostname/port and stub class.
+        The channel is taken from the process-wide ChannelPool and remains open
+        after the client is used. The requests of the client are run by a ThreadPool
+        of its own, which exits once the scheduled requests complete.
 
     Parameters
     ----------
@@ -84,6 +347,8 @@ def get_client(
     ------
     Iterator[ Tuple[ controller_pb2_grpc.ControllerServiceStub, Callable, Callable ] ]
         A tuple containing the stub, the schedule_request function and the shutdown function.
+        The shutdown function waits for the requests scheduled by the client and retires the pooled
+        channel, which is closed once the requests of the other clients complete as well.
     """
 
     server_hostname = client_params.hostname
@@ -92,21 +357,20 @@ def get_client(
 
     endpoint = get_endpoint(server_hostname, server_port)
 
-    channel = create_channel(
+    entry = _CHANNEL_POOL.acquire(
         endpoint,
         root_certificate,
         max_message_length
     )
-    stub = stub_class(channel)
-
+    stub = entry.get_stub(stub_class)
     executor = ThreadPool(max_workers=max_workers)
-    executor_pool = queue.Queue()
 
     def schedule(
         request,
         request_retries=1,
         request_timeout=None,
-        block=True
+        block=True,
+        raise_errors=False
     ) -> Union[Any, None]:
         """Schedule a request with the given parameters.
 
@@ -120,6 +384,9 @@ def get_client(
             The timeout in seconds, by default None
         block : bool, optional
             Whether to block until the request is completed, by default True
+        raise_errors : bool, optional
+            Whether to raise the error of the last failed attempt of a blocking request,
+            instead of returning None, by default False
 
         Returns
         -------
@@ -127,26 +394,45 @@ def get_client(
             If the request is blocking, the response is returned. 
             If the request is non-blocking, None is returned.
         """
-        future = executor.schedule(function=request_with_timeout,
-                                   args=(request, request_timeout, request_retries))
+        def _request(_timeout=None):
+            try:
+                return request(_timeout)
+            except grpc.RpcError as rpc_error:
+                if rpc_error.code() == grpc.StatusCode.UNAVAILABLE:
+                    entry.mark_unavailable()
+                raise
+
+        # The request holds the channel until it completes, e.g., after the client is left.
+        entry.hold()
+        try:
+            future = executor.schedule(function=request_with_timeout,
+                                       args=(_request, request_timeout, request_retries,
+                                             raise_errors))
+        except BaseException:
+            entry.unhold()
+            raise
+        future.add_done_callback(lambda _: entry.unhold())
 
-        return future.result() if block else executor_pool.put(future)
+        return future.result() if block else None
 
     def shutdown():
         executor.close()
         executor.join()
-        channel.close()
+        _CHANNEL_POOL.retire(entry)
 
     try:
         yield (stub, schedule, shutdown)
     finally:
-        shutdown()
+        # The workers exit once the scheduled requests complete.
+        executor.close()
+        _CHANNEL_POOL.release(entry)
 
 
 def request_with_timeout(
     request_fn: Callable,
     request_timeout: int,
-    request_retries: int
+    request_retries: int,
+    raise_errors: Optional[bool] = False
 ) -> Any:
     """Sends a request to the controller with a timeout and retries.
 
@@ -158,11 +444,18 @@ def request_with_timeout(
         The timeout in seconds.
     request_retries : int
         The number of retries.
+    raise_errors : Optional[bool], (default=False)
+        Whether to raise the error of the last failed attempt instead of returning None.
 
     Returns
     -------
     Any
         The response. If the request fails, None is returned.
+
+    Raises
+    ------
+    grpc.RpcError
+        If all the attempts fail and raise_errors is set.
     """
     # FIXME: check the return logic, must not return None
 
@@ -174,9 +467,121 @@ def request_with_timeout(
         except grpc.RpcError as rpc_error:
             MetisLogger.info(
                 "Exception Raised: {},".format(rpc_error))
+            if raise_errors and count_retries + 1 >= request_retries:
+                raise
             if rpc_error.code() == grpc.StatusCode.UNAVAILABLE:
                 time.sleep(10)
         else:
             break
         count_retries += 1
     return response
+
+
+class AsyncClient(object):
+
+    """An asyncio gRPC client of a server. Its requests are coroutines, which wait on the event loop
+        instead of holding a thread of a ThreadPool, hence many requests, e.g., to all the learners
+        of a federation, can be in flight concurrently from a single thread.
+
+    The channel is created on the first request, bound to the running event loop, and is reused
+    by every request of the client, concurrent ones included, until the client is closed. A request
+    that fails with UNAVAILABLE leaves the channel open, since it reconnects by itself and the other
+    requests in flight on it must not be cancelled.
+    """
+
+    def __init__(
+        self,
+        client_params: ClientParams,
+        stub_class: Callable,
+        max_message_length: Optional[int] = GRPC_MAX_MESSAGE_LENGTH
+    ):
+        """Initializes the AsyncClient object.
+
+        Parameters
+        ----------
+        client_params : ClientParams
+            The client parameters.
+        stub_class : Callable
+            The stub class to be used with the created channel to establish a connection.
+        max_message_length : Optional[int], optional
+            The maximum message length, by default GRPC_MAX_MESSAGE_LENGTH
+        """
+        self._endpoint = get_endpoint(client_params.hostname, client_params.port)
+        self._root_certificate = client_params.root_certificate
+        self._max_message_length = max_message_length
+        self._stub_class = stub_class
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._stub = None
+
+    def get_stub(self) -> Any:
+        """Returns the stub of the channel of the client, connecting it if needed."""
+
+        if self._channel is None:
+            self._channel = create_aio_channel(
+                self._endpoint,
+                self._root_certificate,
+                self._max_message_length
+            )
+            self._stub = self._stub_class(self._channel)
+        return self._stub
+
+    async def request(
+        self,
+        request_fn: Callable[[Any, Optional[float]], Awaitable[Any]],
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[float] = None,
+        raise_errors: Optional[bool] = False
+    ) -> Any:
+        """Sends a request with the given parameters.
+
+        Parameters
+        ----------
+        request_fn : Callable[[Any, Optional[float]], Awaitable[Any]]
+            A coroutine function that sends the request with the given stub and timeout.
+        request_retries : Optional[int], optional
+            The number of retries, by default 1
+        request_timeout : Optional[float], optional
+            The timeout in seconds, by default None
+        raise_errors : Optional[bool], optional
+            Whether to raise the error of the last failed attempt instead of returning None, by default False
+
+        Returns
+        -------
+        Any
+            The response. If the request fails, None is returned.
+
+        Raises
+        ------
+        grpc.RpcError
+            If all the attempts fail and raise_errors is set.
+        """
+        count_retries = 0
+        response = None
+        while count_retries < request_retries:
+            try:
+                response = await request_fn(self.get_stub(), request_timeout)
+            except grpc.RpcError as rpc_error:
+                MetisLogger.info(
+                    "Exception Raised: {},".format(rpc_error))
+                if count_retries + 1 >= request_retries:
+                    if raise_errors:
+                        raise
+                elif rpc_error.code() == grpc.StatusCode.UNAVAILABLE:
+                    await asyncio.sleep(10)
+            else:
+                break
+            count_retries += 1
+        return response
+
+    async def close(self, grace: Optional[float] = None) -> None:
+        """Closes the channel of the client.
+
+        Parameters
+        ----------
+        grace : Optional[float], optional
+            The time in seconds the requests in flight are given to complete before they are cancelled.
+            If None, they are cancelled right away, by default None
+        """
+        channel, self._channel, self._stub = self._channel, None, None
+        if channel is not None:
+            await channel.close(grace)
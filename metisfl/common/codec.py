@@ -0,0 +1,233 @@
+"""Lossless codecs of the tensor values, applied per tensor in a pool of threads."""
+
+import os
+import threading
+from concurrent import futures
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from ..proto import model_pb2
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# The codec names of the GlobalTrainConfig.
+CODEC_NAME_TO_PROTO = {
+    "Zstd": model_pb2.Codec.Type.ZSTD,
+    "LZ4": model_pb2.Codec.Type.LZ4,
+    "ShuffleZstd": model_pb2.Codec.Type.SHUFFLE_ZSTD,
+}
+
+ZSTD_LEVEL: int = 3
+
+# The number of tensors coded in parallel.
+CODEC_MAX_WORKERS: int = min(32, os.cpu_count() or 1)
+
+# Shared by all codec calls of the process. Both zstd and
+# lz4 release the GIL, hence tensors are coded in parallel.
+_EXECUTOR: Optional[futures.ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def codec_from_name(name: Optional[str]) -> int:
+    """Converts the name of a codec to its Codec.Type.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        The name of the codec, one of CODEC_NAME_TO_PROTO. If None, no codec is used.
+
+    Returns
+    -------
+    int
+        The Codec.Type of the codec.
+
+    Raises
+    ------
+    ValueError
+        If the codec is not supported.
+    """
+    if name is None:
+        return model_pb2.Codec.Type.NONE
+    if name not in CODEC_NAME_TO_PROTO:
+        raise ValueError("Codec {} is not supported".format(name))
+    return CODEC_NAME_TO_PROTO[name]
+
+
+def encode_value(
+    value: Union[bytes, memoryview],
+    codec: int,
+    itemsize: Optional[int] = 1
+) -> Union[bytes, memoryview]:
+    """Encodes the value of a tensor.
+
+    Parameters
+    ----------
+    value : Union[bytes, memoryview]
+        The value of the tensor.
+    codec : int
+        The Codec.Type to encode the value with.
+    itemsize : Optional[int], (default=1)
+        The size in bytes of every element of the tensor; used to shuffle the bytes.
+
+    Returns
+    -------
+    Union[bytes, memoryview]
+        The encoded value. If the codec is NONE, the value itself.
+    """
+    if codec == model_pb2.Codec.Type.NONE:
+        return value
+
+    value = memoryview(value).cast("B")
+    if codec == model_pb2.Codec.Type.SHUFFLE_ZSTD:
+        value = _shuffle(value, itemsize)
+
+    if codec in (model_pb2.Codec.Type.ZSTD, model_pb2.Codec.Type.SHUFFLE_ZSTD):
+        return _require(zstandard, codec).ZstdCompressor(level=ZSTD_LEVEL).compress(value)
+    if codec == model_pb2.Codec.Type.LZ4:
+        return _require(lz4_frame, codec).compress(value)
+
+    raise ValueError("Codec {} is not supported".format(codec))
+
+
+def decode_value(
+    value: Union[bytes, memoryview],
+    codec: int,
+    out: memoryview,
+    itemsize: Optional[int] = 1
+) -> None:
+    """Decodes the value of a tensor into a caller-owned buffer.
+
+    Parameters
+    ----------
+    value : Union[bytes, memoryview]
+        The encoded value of the tensor.
+    codec : int
+        The Codec.Type the value was encoded with.
+    out : memoryview
+        The buffer to write the decoded value to. Its size must match the decoded value.
+    itemsize : Optional[int], (default=1)
+        The size in bytes of every element of the tensor; used to unshuffle the bytes.
+
+    Raises
+    ------
+    ValueError
+        If the codec is not supported or the decoded value does not fit the buffer.
+    """
+    out = memoryview(out).cast("B")
+
+    if codec == model_pb2.Codec.Type.NONE:
+        decoded = value
+    elif codec in (model_pb2.Codec.Type.ZSTD, model_pb2.Codec.Type.SHUFFLE_ZSTD):
+        decoded = _require(zstandard, codec).ZstdDecompressor().decompress(
+            value, max_output_size=len(out))
+    elif codec == model_pb2.Codec.Type.LZ4:
+        decompressor = _require(lz4_frame, codec).LZ4FrameDecompressor()
+        decoded = decompressor.decompress(value, max_length=len(out))
+        if not decompressor.eof:
+            raise ValueError("Decoded value exceeds {} bytes".format(len(out)))
+    else:
+        raise ValueError("Codec {} is not supported".format(codec))
+
+    if len(decoded) != len(out):
+        raise ValueError("Decoded value has {} bytes but {} bytes were expected".format(
+            len(decoded), len(out)))
+
+    if codec == model_pb2.Codec.Type.SHUFFLE_ZSTD:
+        _unshuffle(memoryview(decoded), itemsize, out)
+    else:
+        out[:] = decoded
+
+
+def map_in_order(fn, items: Iterable, lookahead: Optional[int] = None) -> Iterator:
+    """Applies the function to the items in the shared pool of threads and yields the results in order.
+        At most lookahead items are processed ahead of the consumer, so that only a few results
+        are held in memory at a time.
+
+    Parameters
+    ----------
+    fn : Callable
+        The function to apply.
+    items : Iterable
+        The items to apply the function to.
+    lookahead : Optional[int], (default=None)
+        The maximum number of pending items. If None, CODEC_MAX_WORKERS.
+
+    Yields
+    ------
+    Any
+        The result of the function for every item, in the order of the items.
+    """
+    executor = _get_executor()
+    lookahead = lookahead or CODEC_MAX_WORKERS
+
+    pending = []
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) > lookahead:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def submit(fn, *args) -> futures.Future:
+    """Runs the function in the shared pool of threads.
+
+    Parameters
+    ----------
+    fn : Callable
+        The function to run.
+    *args
+        The arguments of the function.
+
+    Returns
+    -------
+    futures.Future
+        The future of the result of the function.
+    """
+    return _get_executor().submit(fn, *args)
+
+
+def _get_executor() -> futures.ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = futures.ThreadPoolExecutor(
+                max_workers=CODEC_MAX_WORKERS,
+                thread_name_prefix="metisfl-codec",
+            )
+        return _EXECUTOR
+
+
+def _require(module, codec: int):
+    if module is None:
+        raise ValueError("Codec {} requires the {} package, which is not installed".format(
+            model_pb2.Codec.Type.Name(codec),
+            "lz4" if codec == model_pb2.Codec.Type.LZ4 else "zstandard"))
+    return module
+
+
+def _shuffle(value: memoryview, itemsize: int) -> np.ndarray:
+    """Groups the i-th bytes of all elements together."""
+    values = np.frombuffer(value, dtype=np.uint8)
+    if itemsize <= 1:
+        return values
+    return np.ascontiguousarray(values.reshape(-1, itemsize).T)
+
+
+def _unshuffle(value: memoryview, itemsize: int, out: memoryview) -> None:
+    """Inverse of _shuffle, writing straight into the output buffer."""
+    values = np.frombuffer(value, dtype=np.uint8)
+    out_values = np.frombuffer(out, dtype=np.uint8)
+    if itemsize <= 1:
+        out_values[:] = values
+        return
+    out_values.reshape(-1, itemsize)[:] = values.reshape(itemsize, -1).T
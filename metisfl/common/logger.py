@@ -1,7 +1,8 @@
-import inspect
-import threading
+import atexit
 import logging
-import sys
+import logging.handlers
+import queue
+import threading
 
 import datetime as dt
 
@@ -37,9 +38,9 @@ class MyFormatter(logging.Formatter):
 
 
 class MetisLogger(object):
-    
+
     log_formatter = MyFormatter(
-        '%(asctime)s %(name)s [%(levelname)s] %(message)s', 
+        '%(asctime)s %(name)s [%(levelname)s] %(pathname)s:%(lineno)d: %(message)s',
         datefmt="%Y-%m-%d %H:%M:%S.%f")
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(log_formatter)
@@ -47,23 +48,53 @@ class MetisLogger(object):
     __logger.setLevel('INFO')
     __logger.addHandler(console_handler)
     __logger.propagate = False
-    __logger_lock = threading.Lock()
+    __listener = None
+    __listener_lock = threading.Lock()
 
     @classmethod
     def getlogger(cls):
-        MetisLogger.__logger_lock.acquire()
-        try:
-            return MetisLogger.__logger
-        finally:
-            MetisLogger.__logger_lock.release()
+        return MetisLogger.__logger
+
+    @classmethod
+    def enable_async(cls):
+        """Moves the output handlers of the logger (e.g., console, file) behind a queue, drained by a
+            background thread, so that logging never blocks the calling thread on I/O."""
+        with MetisLogger.__listener_lock:
+            if MetisLogger.__listener is not None:
+                return
+            logger = MetisLogger.__logger
+            handlers = list(logger.handlers)
+            log_queue = queue.SimpleQueue()
+            MetisLogger.__listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True)
+            for handler in handlers:
+                logger.removeHandler(handler)
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            MetisLogger.__listener.start()
+
+    @classmethod
+    def disable_async(cls):
+        """Flushes the queued records and restores the output handlers of the logger."""
+        with MetisLogger.__listener_lock:
+            listener = MetisLogger.__listener
+            if listener is None:
+                return
+            logger = MetisLogger.__logger
+            for handler in list(logger.handlers):
+                if isinstance(handler, logging.handlers.QueueHandler):
+                    logger.removeHandler(handler)
+            listener.stop()
+            for handler in listener.handlers:
+                logger.addHandler(handler)
+            MetisLogger.__listener = None
 
     @classmethod
     def log_with_filename(cls, level, msg):
-        caller_frame = inspect.stack()[2]  # Get the caller's frame
-        filename = caller_frame.filename
-        lineno = caller_frame.lineno
-        log_msg = f"{filename}:{lineno}: {msg}"
-        cls.getlogger().log(level, log_msg)
+        logger = MetisLogger.__logger
+        # Checked first, so that disabled levels cost next to nothing.
+        if logger.isEnabledFor(level):
+            # The caller of debug(), info(), etc. is 3 frames up.
+            logger.log(level, msg, stacklevel=3)
 
     @classmethod
     def debug(cls, msg):
@@ -84,3 +115,6 @@ class MetisLogger(object):
     @classmethod
     def fatal(cls, msg):
         cls.log_with_filename(logging.CRITICAL, msg)
+
+
+atexit.register(MetisLogger.disable_async)
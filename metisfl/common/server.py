@@ -1,8 +1,9 @@
 import concurrent.futures
 from pathlib import Path
-from typing import Callable
+from typing import Callable, List, Tuple, Union
 
 import grpc
+import grpc.aio
 
 from ..proto import learner_pb2_grpc
 from ..common.types import ServerParams
@@ -38,22 +39,69 @@ def get_server(
     grpc.Server
         The gRPC server, not started.
     """
-    server_hostname = server_params.hostname
-    server_port = server_params.port
+    server = grpc.server(
+        concurrent.futures.ThreadPoolExecutor(max_workers=max_workers),
+        options=_server_options(max_workers, max_message_length),
+    )
 
-    endpoint = get_endpoint(server_hostname, server_port)
+    add_servicer_to_server_fn(servicer, server)
+    _add_port(server, server_params)
 
-    options = [
-        ("grpc.max_concurrent_streams", max_workers),
-        ("grpc.max_send_message_length", max_message_length),
-    ]
+    return server
 
-    server = grpc.server(
-        concurrent.futures.ThreadPoolExecutor(max_workers=max_workers),
-        options=options,
+
+def get_aio_server(
+    server_params: ServerParams,
+    servicer: learner_pb2_grpc.LearnerServiceServicer,
+    add_servicer_to_server_fn: Callable,
+    max_concurrent_streams: int = 1000,
+    max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
+) -> grpc.aio.Server:
+    """Creates an asyncio gRPC server using the given server parameters and servicer.
+        The requests are handled by the coroutines of the servicer on the event loop
+        of the server, hence no thread is held by a request while it waits on I/O.
+        Must be called from the event loop the server runs on.
+
+    Parameters
+    ----------
+    server_params : ServerParams
+        The server configuration parameters.
+    servicer: learner_pb2_grpc.LearnerServiceServicer
+        The servicer for the gRPC server. Its endpoints must be coroutines.
+    add_servicer_to_server_fn: Callable
+        The function to add the servicer to the server.
+    max_concurrent_streams : int, optional
+        The maximum number of requests that can be handled concurrently, by default 1000
+    max_message_length : int, optional
+        The maximum message length, by default GRPC_MAX_MESSAGE_LENGTH
+
+    Returns
+    -------
+    grpc.aio.Server
+        The gRPC server, not started.
+    """
+    server = grpc.aio.server(
+        options=_server_options(max_concurrent_streams, max_message_length),
     )
 
     add_servicer_to_server_fn(servicer, server)
+    _add_port(server, server_params)
+
+    return server
+
+
+def _server_options(max_concurrent_streams: int, max_message_length: int) -> List[Tuple[str, int]]:
+    return [
+        ("grpc.max_concurrent_streams", max_concurrent_streams),
+        ("grpc.max_send_message_length", max_message_length),
+        # Accepts the keepalive pings of the pooled (possibly idle) client channels.
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_recv_ping_interval_without_data_ms", 10 * 1000),
+    ]
+
+
+def _add_port(server: Union[grpc.Server, grpc.aio.Server], server_params: ServerParams) -> None:
+    endpoint = get_endpoint(server_params.hostname, server_params.port)
 
     if server_params.root_certificate is not None:
         root_certificate = Path(server_params.root_certificate).read_bytes()
@@ -68,5 +116,3 @@ def get_server(
         server.add_secure_port(endpoint, server_credentials)
     else:
         server.add_insecure_port(endpoint)
-
-    return server
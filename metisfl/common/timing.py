@@ -0,0 +1,71 @@
+"""This module times the phases of a task, e.g., the deserialization, training, serialization
+    and upload of a training task, with perf_counter_ns."""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class PhaseTimer(object):
+
+    """Accumulates the durations of the phases of a task. Phases may be nested; the duration of
+        a nested phase is not included in the phase it is nested in, hence the durations add up
+        to the duration of the outermost phases. Used by one thread at a time."""
+
+    def __init__(self):
+        self._durations_ns: Dict[str, int] = {}
+        # The phases being timed, innermost last, as [name, start, duration of nested phases].
+        self._running: List[list] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the phase for the duration of the context. A phase timed more than once accumulates.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        """
+        timing = [name, time.perf_counter_ns(), 0]
+        self._running.append(timing)
+        try:
+            yield
+        finally:
+            elapsed_ns = time.perf_counter_ns() - timing[1]
+            self._running.pop()
+            self.add(name, elapsed_ns - timing[2])
+            if self._running:
+                self._running[-1][2] += elapsed_ns
+
+    def add(self, name: str, duration_ns: int) -> None:
+        """Adds the duration, e.g., measured in another process, to the phase.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        duration_ns : int
+            The duration in nanoseconds.
+        """
+        self._durations_ns[name] = self._durations_ns.get(name, 0) + max(duration_ns, 0)
+
+    def durations_ns(self) -> Dict[str, int]:
+        """Returns the duration of every phase, in nanoseconds."""
+
+        return dict(self._durations_ns)
+
+    def durations_ms(self) -> Dict[str, float]:
+        """Returns the duration of every phase, in milliseconds."""
+
+        return {name: duration_ns / 1e6 for name, duration_ns in self._durations_ns.items()}
+
+
+@contextmanager
+def optional_phase(timer: Optional[PhaseTimer], name: str) -> Iterator[None]:
+    """Times the phase with the timer, if any."""
+
+    if timer is None:
+        yield
+    else:
+        with timer.phase(name):
+            yield
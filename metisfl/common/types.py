@@ -9,7 +9,9 @@ METRICS = ["accuracy"]
 COMMUNICATION_PROTOCOLS = ["Synchronous", "Asynchronous", "SemiSynchronous"]
 MODEL_STORES = ["InMemory", "Redis"]
 HE_SCHEMES = ["CKKS"]
-AGGREGATION_RULES = ["FedAvg", "FedRec", "FedStride", "SecAgg"]
+AGGREGATION_RULES = ["FedAvg", "FedRec", "FedStride", "SecAgg", "MaskedAgg"]
+AGGREGATION_PRECISIONS = ["Float32", "Float64"]
+TENSOR_CODECS = ["Zstd", "LZ4", "ShuffleZstd"]
 SCALING_FACTORS = ["NumTrainingExamples",
                    "NumCompletedBatches", "NumParticipants"]
 
@@ -102,7 +104,9 @@ class GlobalTrainConfig(object):
     Parameters
     ----------
     aggregation_rule : str
-        The aggregation rule to use. Must be one of the following: ["FedAvg", "FedRec", "FedStride", "SecAgg"].
+        The aggregation rule to use. Must be one of the following: ["FedAvg", "FedRec", "FedStride", "SecAgg", "MaskedAgg"].
+        MaskedAgg sums models that the learners mask pairwise (see metisfl.encryption.masking.PairwiseMasking),
+        hence it requires the Synchronous protocol.
     communication_protocol : str
         The communication protocol to use. Must be one of the following: ["Synchronous", "Asynchronous", "SemiSynchronous"].
     scaling_factor : str
@@ -111,6 +115,19 @@ class GlobalTrainConfig(object):
         The participation ratio to use. Defaults to 1.0.
     stride_length : Optional[int], (default=None)
         The stride length to use. Required if the aggregation rule is FedStride.
+    aggregation_precision : Optional[str], (default="Float64")
+        The floating point precision the controller accumulates the models with. Must be one of the following: ["Float32", "Float64"].
+        The community model is always returned with the data types of the learners' models.
+    incremental_aggregation : Optional[bool], (default=False)
+        Whether the controller folds each model into a running average as soon as it arrives, instead of
+        aggregating all the models when the round closes. Only applies to FedAvg with a synchronous protocol.
+    tensor_codec : Optional[str], (default=None)
+        The lossless codec the tensors of the models are encoded with, by the controller and the learners alike.
+        Must be one of the following: ["Zstd", "LZ4", "ShuffleZstd"]. If None, the tensors are not encoded.
+        ShuffleZstd usually compresses floating point tensors best, LZ4 is the fastest.
+    delta_updates : Optional[bool], (default=False)
+        Whether the models are exchanged as deltas from the community model each learner acknowledged last,
+        instead of in full. Deltas compress far better with a tensor codec. Not supported with SecAgg or MaskedAgg.
     he_batch_size : Optional[int], (default=None)
         The HE batch size to use. Required if the aggregation rule is SecAgg.
     he_scaling_factor_bits : Optional[int], (default=None)
@@ -124,9 +141,12 @@ class GlobalTrainConfig(object):
     ------
     ValueError
         Value error is raised in the following cases:
-        - If the aggregation rule is not one of the following: ["FedAvg", "FedRec", "FedStride", "SecAgg"].
+        - If the aggregation rule is not one of the following: ["FedAvg", "FedRec", "FedStride", "SecAgg", "MaskedAgg"].
+        - If the aggregation rule is MaskedAgg and the communication protocol is not Synchronous.
         - If the communication protocol is not one of the following: ["Synchronous", "Asynchronous", "SemiSynchronous"].
         - If the scaling factor is not one of the following: ["NumTrainingExamples", "NumCompletedBatches", "NumParticipants"].
+        - If the aggregation precision is not one of the following: ["Float32", "Float64"].
+        - If the tensor codec is not one of the following: ["Zstd", "LZ4", "ShuffleZstd"].
         - If the communication protocol is SemiSynchronous and the semi_sync_lambda or semi_sync_recompute_num_updates are not specified.
 
     """
@@ -136,6 +156,10 @@ class GlobalTrainConfig(object):
     scaling_factor: str
     participation_ratio: Optional[float] = 1.0
     stride_length: Optional[int] = None
+    aggregation_precision: Optional[str] = "Float64"
+    incremental_aggregation: Optional[bool] = False
+    tensor_codec: Optional[str] = None
+    delta_updates: Optional[bool] = False
     he_batch_size: Optional[int] = None
     he_scaling_factor_bits: Optional[int] = None
     he_crypto_context_file: Optional[str] = None
@@ -154,8 +178,16 @@ class GlobalTrainConfig(object):
         if self.communication_protocol not in COMMUNICATION_PROTOCOLS:
             raise ValueError(
                 f"Invalid communication protocol: {self.protocol}")
+        if self.aggregation_rule == "MaskedAgg" and self.communication_protocol != "Synchronous":
+            raise ValueError(
+                f"MaskedAgg requires the Synchronous protocol, not {self.communication_protocol}")
         if self.scaling_factor not in SCALING_FACTORS:
             raise ValueError(f"Invalid scaling factor: {self.scaling_factor}")
+        if self.aggregation_precision not in AGGREGATION_PRECISIONS:
+            raise ValueError(
+                f"Invalid aggregation precision: {self.aggregation_precision}")
+        if self.tensor_codec is not None and self.tensor_codec not in TENSOR_CODECS:
+            raise ValueError(f"Invalid tensor codec: {self.tensor_codec}")
         if self.he_crypto_context_file is not None and not os.path.isfile(self.he_crypto_context_file):
             raise ValueError(
                 f"HE crypto context file {self.he_crypto_context_file} does not exist")
@@ -5,6 +5,8 @@
 #include "metisfl/controller/aggregation/federated_average.h"
 #include "metisfl/controller/aggregation/federated_recency.h"
 #include "metisfl/controller/aggregation/federated_stride.h"
+#include "metisfl/controller/aggregation/masked_aggregation.h"
+#include "metisfl/controller/aggregation/running_average.h"
 #include "metisfl/controller/aggregation/secure_aggregation.h"
 
 #endif //METISFL_METISFL_CONTROLLER_AGGREGATION_MODEL_AGGREGATION_H_
@@ -11,6 +11,11 @@
 
 namespace metisfl::controller {
 
+// The numerical precision used by the aggregation rules to accumulate the
+// learners' tensors. The aggregated tensors are always serialized back
+// using the data type of the incoming tensors.
+enum class AggregationPrecision { kFloat32, kFloat64 };
+
 class AggregationFunction {
  public:
   virtual ~AggregationFunction() = default;
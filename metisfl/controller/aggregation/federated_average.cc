@@ -15,16 +15,20 @@ Model FederatedAverage::Aggregate(
 
 #pragma omp parallel for
   for (int var_idx = 0; var_idx < total_tensors; ++var_idx) {
-    auto var_num_values = model.tensors(var_idx).length();
+    const auto &tensor_spec = model.tensors(var_idx);
 
-    auto aggregated_tensor =
-        AggregateTensorAtIndex(pairs, var_idx, var_num_values);
-    auto serialized_tensor = TensorOps::SerializeTensor(aggregated_tensor);
-
-    std::string serialized_tensor_str(serialized_tensor.begin(),
-                                      serialized_tensor.end());
+    std::string serialized_tensor_str;
+    if (precision_ == AggregationPrecision::kFloat32) {
+      serialized_tensor_str =
+          AggregateTensorAtIndex<float>(pairs, var_idx, tensor_spec);
+    } else {
+      serialized_tensor_str =
+          AggregateTensorAtIndex<double>(pairs, var_idx, tensor_spec);
+    }
 
     *model.mutable_tensors(var_idx)->mutable_value() = serialized_tensor_str;
+    model.mutable_tensors(var_idx)->clear_quantization();
+    model.mutable_tensors(var_idx)->clear_sparsity();
   }
 
   return model;
@@ -32,35 +36,34 @@ Model FederatedAverage::Aggregate(
 
 void FederatedAverage::Reset() {}
 
-void FederatedAverage::AddTensors(std::vector<double> &tensor_left,
+template <typename T>
+void FederatedAverage::AddTensors(std::vector<T> &tensor_left,
                                   const Tensor &tensor_spec_right,
                                   double scaling_factor_right) const {
-  auto t2_r = TensorOps::DeserializeTensor(tensor_spec_right);
-
-  transform(t2_r.begin(), t2_r.end(), t2_r.begin(),
-            std::bind(std::multiplies<double>(), std::placeholders::_1,
-                      scaling_factor_right));
-
-  transform(tensor_left.begin(), tensor_left.end(), t2_r.begin(),
-            tensor_left.begin(), std::plus<double>());
+  TensorOps::AccumulateTensor<T>(tensor_spec_right,
+                                 static_cast<T>(scaling_factor_right),
+                                 tensor_left.data());
 }
 
-std::vector<double> FederatedAverage::AggregateTensorAtIndex(
+template <typename T>
+std::string FederatedAverage::AggregateTensorAtIndex(
     std::vector<std::vector<std::pair<const Model *, double>>> &pairs,
-    int var_idx, uint32_t var_num_values) const {
-  auto aggregated_tensor = std::vector<double>(var_num_values);
+    int var_idx, const Tensor &tensor_spec) const {
+  auto aggregated_tensor = std::vector<T>(tensor_spec.length());
   for (const auto &pair : pairs) {
     const auto *local_model = pair.front().first;
-    if (!local_model->encrypted()) {
+    if (!TensorOps::IsEncrypted(*local_model, local_model->tensors(var_idx))) {
       const auto &local_tensor = local_model->tensors(var_idx);
-      AddTensors(aggregated_tensor, local_tensor, pair.front().second);
+      AddTensors<T>(aggregated_tensor, local_tensor, pair.front().second);
     } else {
       throw std::runtime_error(
           "Cannot aggregate encrypted tensors using "
           "Federated Average.");
     }
   }
-  return aggregated_tensor;
+  // Ship the aggregated tensor with the same data type it was received.
+  return TensorOps::SerializeTensor<T>(aggregated_tensor,
+                                       tensor_spec.type().type());
 }
 
 }  // namespace metisfl::controller
@@ -11,6 +11,10 @@ using metisfl::proto::TensorOps;
 namespace metisfl::controller {
 class FederatedAverage : public AggregationFunction {
  public:
+  explicit FederatedAverage(
+      AggregationPrecision precision = AggregationPrecision::kFloat64)
+      : precision_(precision) {}
+
   Model Aggregate(std::vector<std::vector<std::pair<const Model *, double>>>
                       &pairs) override;
 
@@ -21,13 +25,16 @@ class FederatedAverage : public AggregationFunction {
   void Reset() override;
 
  private:
-  void AddTensors(std::vector<double> &tensor_left,
-                  const Tensor &tensor_spec_right,
+  AggregationPrecision precision_;
+
+  template <typename T>
+  void AddTensors(std::vector<T> &tensor_left, const Tensor &tensor_spec_right,
                   double scaling_factor_right) const;
 
-  std::vector<double> AggregateTensorAtIndex(
+  template <typename T>
+  std::string AggregateTensorAtIndex(
       std::vector<std::vector<std::pair<const Model *, double>>> &pairs,
-      int var_idx, uint32_t var_num_values) const;
+      int var_idx, const Tensor &tensor_spec) const;
 };
 }  // namespace metisfl::controller
 
@@ -15,9 +15,8 @@ using metisfl::proto::TensorOps;
 using ::testing::proto::EqualsProto;
 
 const char kModel1_with_tensor_values_1to10_as_FLOAT32[] = R"pb(
-  tensor {
+  tensors {
     length: 10
-    encrypted: false
     dimensions: 10
     type { type: FLOAT32 byte_order: LITTLE_ENDIAN_ORDER fortran_order: False }
     value: "\000\000\200?\000\000\000@\000\000@@\000\000\200@\000\000\240@\000\000\300@\000\000\340@\000\000\000A\000\000\020A\000\000 A"
@@ -25,9 +24,8 @@ const char kModel1_with_tensor_values_1to10_as_FLOAT32[] = R"pb(
 )pb";
 
 const char kModel1_with_tensor_values_1to10_as_FLOAT64[] = R"pb(
-  tensor {
+  tensors {
     length: 10
-    encrypted: false
     dimensions: 10
     type { type: FLOAT64 byte_order: LITTLE_ENDIAN_ORDER fortran_order: False }
     value: "\000\000\000\000\000\000\360?\000\000\000\000\000\000\000@\000\000\000\000\000\000\010@\000\000\000\000\000\000\020@\000\000\000\000\000\000\024@\000\000\000\000\000\000\030@\000\000\000\000\000\000\034@\000\000\000\000\000\000 @\000\000\000\000\000\000\"@\000\000\000\000\000\000$@"
@@ -51,7 +49,8 @@ TEST_F(FederatedAverageTest, CorrectAverageFLOAT32) {
 
   auto aggregated_value_serialized = averaged.tensors().at(0).value();
   auto num_values = averaged.tensors().at(0).length();
-  TensorOps::PrintSerializedTensor(aggregated_value_serialized, num_values);
+  TensorOps::PrintSerializedTensor<float>(aggregated_value_serialized,
+                                          num_values);
   EXPECT_THAT(averaged, EqualsProto(model1));
 }
 
@@ -76,4 +75,39 @@ TEST_F(FederatedAverageTest, CorrectAverageFLOAT64) {
   EXPECT_THAT(averaged, EqualsProto(model1));
 }
 
+TEST_F(FederatedAverageTest, CorrectAverageFLOAT64WithFloat32Precision) {
+  auto model1 = TensorOps::ParseTextOrDie<Model>(
+      kModel1_with_tensor_values_1to10_as_FLOAT64);
+  auto model2 = TensorOps::ParseTextOrDie<Model>(
+      kModel1_with_tensor_values_1to10_as_FLOAT64);
+
+  std::vector seq1({std::make_pair<const Model *, double>(&model1, 0.5)});
+  std::vector seq2({std::make_pair<const Model *, double>(&model2, 0.5)});
+  std::vector to_aggregate({seq1, seq2});
+
+  // The accumulation precision must not change the data type of the model.
+  FederatedAverage avg = FederatedAverage(AggregationPrecision::kFloat32);
+  Model averaged = avg.Aggregate(to_aggregate);
+  EXPECT_THAT(averaged, EqualsProto(model1));
+}
+
+TEST_F(FederatedAverageTest, CorrectAverageFLOAT16) {
+  Model model1;
+  auto tensor = model1.add_tensors();
+  tensor->set_length(4);
+  tensor->add_dimensions(4);
+  tensor->mutable_type()->set_type(DType_Type_FLOAT16);
+  *tensor->mutable_value() = TensorOps::SerializeTensor<float>(
+      {1.0f, -2.5f, 0.125f, 1024.0f}, DType_Type_FLOAT16);
+  Model model2 = model1;
+
+  std::vector seq1({std::make_pair<const Model *, double>(&model1, 0.5)});
+  std::vector seq2({std::make_pair<const Model *, double>(&model2, 0.5)});
+  std::vector to_aggregate({seq1, seq2});
+
+  FederatedAverage avg = FederatedAverage(AggregationPrecision::kFloat32);
+  Model averaged = avg.Aggregate(to_aggregate);
+  EXPECT_THAT(averaged, EqualsProto(model1));
+}
+
 }  // namespace metisfl::controller
\ No newline at end of file
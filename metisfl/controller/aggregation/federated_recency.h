@@ -10,6 +10,10 @@ namespace metisfl::controller {
 class FederatedRecency : public AggregationFunction,
                          FederatedRollingAverageBase {
  public:
+  explicit FederatedRecency(
+      AggregationPrecision precision = AggregationPrecision::kFloat64)
+      : FederatedRollingAverageBase(precision) {}
+
   Model Aggregate(std::vector<std::vector<std::pair<const Model *, double>>>
                       &pairs) override;
 
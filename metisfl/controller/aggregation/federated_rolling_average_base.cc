@@ -8,26 +8,38 @@ void FederatedRollingAverageBase::InitializeModel(const Model *init_model,
   wc_scaled_model = *init_model;
   score_z = init_contrib_value;
 
-  if (!wc_scaled_model.encrypted()) {
+  community_types.clear();
+  for (const auto &init_tensor : init_model->tensors()) {
+    community_types.push_back(init_tensor.type().type());
+  }
+
+  if (!TensorOps::HasEncryptedTensors(wc_scaled_model)) {
     for (auto index = 0; index < init_model->tensors_size(); index++) {
       const auto &init_tensor = init_model->tensors(index);
       auto scaled_tensor = wc_scaled_model.mutable_tensors(index);
-      auto aggregated_result = ScaleTensor(init_tensor, init_contrib_value,
-                                           TensorOperation::MULTIPLY);
+      auto aggregated_result =
+          ScaleTensor(init_tensor, init_contrib_value,
+                      TensorOperation::MULTIPLY, AccumulationType());
 
       *scaled_tensor->mutable_value() = aggregated_result;
+      scaled_tensor->mutable_type()->set_type(AccumulationType());
+      scaled_tensor->clear_quantization();
+      scaled_tensor->clear_sparsity();
     }
 
     // TODO(stripeli): Place logic for encrypted tensors here.
   }
 
-  model = wc_scaled_model;
+  model = *init_model;
+  for (auto &tensor : *model.mutable_tensors()) {
+    TensorOps::DensifyTensor(&tensor);
+  }
 }
 
 void FederatedRollingAverageBase::UpdateScaledModel(
     const Model *existing_model, const Model *new_model,
     double existing_contrib_value, double new_contrib_value) {
-  if (!wc_scaled_model.encrypted()) {
+  if (!TensorOps::HasEncryptedTensors(wc_scaled_model)) {
     for (int index = 0; index < wc_scaled_model.tensors_size(); index++) {
       auto scaled_tensor = wc_scaled_model.mutable_tensors(index);
 
@@ -55,64 +67,83 @@ void FederatedRollingAverageBase::UpdateScaledModel(
 
 void FederatedRollingAverageBase::UpdateCommunityModel() {
   model = Model();
-  if (!wc_scaled_model.encrypted()) {
+  if (!TensorOps::HasEncryptedTensors(wc_scaled_model)) {
     for (const auto &scaled_mdl_variable : wc_scaled_model.tensors()) {
       auto cm_variable = model.add_tensors();
       *cm_variable = scaled_mdl_variable;
+      auto community_type = community_types[model.tensors_size() - 1];
       std::string scaled_result;
-      scaled_result =
-          ScaleTensor(scaled_mdl_variable, score_z, TensorOperation::DIVIDE);
+      scaled_result = ScaleTensor(scaled_mdl_variable, score_z,
+                                  TensorOperation::DIVIDE, community_type);
       *(cm_variable->mutable_value()) = scaled_result;
+      cm_variable->mutable_type()->set_type(community_type);
     }
 
     // TODO(stripeli): Place logic for encrypted tensors here.
   }
 }
 
+DType_Type FederatedRollingAverageBase::AccumulationType() const {
+  return precision == AggregationPrecision::kFloat32 ? DType_Type_FLOAT32
+                                                      : DType_Type_FLOAT64;
+}
+
+std::string FederatedRollingAverageBase::MergeTensors(
+    const Tensor &tensor_spec_left, const Tensor &tensor_spec_right,
+    double scaling_factor_right, TensorOperation op) {
+  if (precision == AggregationPrecision::kFloat32)
+    return MergeTensors<float>(tensor_spec_left, tensor_spec_right,
+                               scaling_factor_right, op);
+  return MergeTensors<double>(tensor_spec_left, tensor_spec_right,
+                              scaling_factor_right, op);
+}
+
+std::string FederatedRollingAverageBase::ScaleTensor(const Tensor &tensor,
+                                                     double scaling_factor,
+                                                     TensorOperation op,
+                                                     DType_Type output_type) {
+  if (precision == AggregationPrecision::kFloat32)
+    return ScaleTensor<float>(tensor, scaling_factor, op, output_type);
+  return ScaleTensor<double>(tensor, scaling_factor, op, output_type);
+}
+
+template <typename T>
 std::string FederatedRollingAverageBase::MergeTensors(
     const Tensor &tensor_spec_left, const Tensor &tensor_spec_right,
     double scaling_factor_right, TensorOperation op) {
-  auto t1_l = TensorOps::DeserializeTensor(tensor_spec_left);
-  auto t2_r = TensorOps::DeserializeTensor(tensor_spec_right);
+  auto t1_l = TensorOps::DeserializeTensor<T>(tensor_spec_left);
 
-  transform(t2_r.begin(), t2_r.end(), t2_r.begin(),
-            std::bind(std::multiplies<double>(), std::placeholders::_1,
-                      scaling_factor_right));
   if (op == TensorOperation::SUBTRACTION) {
-    transform(t1_l.begin(), t1_l.end(), t2_r.begin(), t1_l.begin(),
-              std::minus<double>());
+    TensorOps::AccumulateTensor<T>(
+        tensor_spec_right, -static_cast<T>(scaling_factor_right), t1_l.data());
   } else if (op == TensorOperation::ADDITION) {
-    transform(t1_l.begin(), t1_l.end(), t2_r.begin(), t1_l.begin(),
-              std::plus<double>());
+    TensorOps::AccumulateTensor<T>(
+        tensor_spec_right, static_cast<T>(scaling_factor_right), t1_l.data());
   }
 
-  auto serialized_tensor = TensorOps::SerializeTensor(t1_l);
-
-  std::string serialized_tensor_str(serialized_tensor.begin(),
-                                    serialized_tensor.end());
-  return serialized_tensor_str;
+  // The left tensor is always the scaled model tensor, hence we keep
+  // the merged result in the accumulation precision.
+  return TensorOps::SerializeTensor<T>(t1_l, AccumulationType());
 }
 
+template <typename T>
 std::string FederatedRollingAverageBase::ScaleTensor(const Tensor &tensor,
                                                      double scaling_factor,
-                                                     TensorOperation op) {
-  auto ts = TensorOps::DeserializeTensor(tensor);
+                                                     TensorOperation op,
+                                                     DType_Type output_type) {
+  auto ts = TensorOps::DeserializeTensor<T>(tensor);
 
   if (op == TensorOperation::DIVIDE) {
     transform(ts.begin(), ts.end(), ts.begin(),
-              std::bind(std::divides<double>(), std::placeholders::_1,
-                        scaling_factor));
+              std::bind(std::divides<T>(), std::placeholders::_1,
+                        static_cast<T>(scaling_factor)));
   } else if (op == TensorOperation::MULTIPLY) {
     transform(ts.begin(), ts.end(), ts.begin(),
-              std::bind(std::multiplies<double>(), std::placeholders::_1,
-                        scaling_factor));
+              std::bind(std::multiplies<T>(), std::placeholders::_1,
+                        static_cast<T>(scaling_factor)));
   }
 
-  auto serialized_tensor = TensorOps::SerializeTensor(ts);
-
-  std::string serialized_tensor_str(serialized_tensor.begin(),
-                                    serialized_tensor.end());
-  return serialized_tensor_str;
+  return TensorOps::SerializeTensor<T>(ts, output_type);
 }
 
 }  // namespace metisfl::controller
@@ -2,6 +2,7 @@
 #ifndef METISFL_METISFL_CONTROLLER_AGGREGATION_FED_ROLL_H_
 #define METISFL_METISFL_CONTROLLER_AGGREGATION_FED_ROLL_H_
 
+#include "metisfl/controller/aggregation/aggregation_function.h"
 #include "metisfl/controller/common/proto_tensor_serde.h"
 #include "metisfl/proto/model.pb.h"
 
@@ -12,11 +13,20 @@ namespace metisfl::controller {
 enum TensorOperation { MULTIPLY, DIVIDE, SUBTRACTION, ADDITION };
 
 class FederatedRollingAverageBase {
+ public:
+  explicit FederatedRollingAverageBase(
+      AggregationPrecision precision = AggregationPrecision::kFloat64)
+      : precision(precision) {}
+
  protected:
   int num_contributors = 0;
   double score_z = 0;
   Model model;
+  // The scaled model is kept in the accumulation precision, whereas the
+  // community model is serialized using the data types of the init model.
   Model wc_scaled_model;
+  std::vector<DType_Type> community_types;
+  AggregationPrecision precision;
 
   void InitializeModel(const Model *init_model, double init_contrib_value);
 
@@ -27,12 +37,23 @@ class FederatedRollingAverageBase {
   void UpdateCommunityModel();
 
  private:
+  DType_Type AccumulationType() const;
+
+  std::string MergeTensors(const Tensor &tensor_spec_left,
+                           const Tensor &tensor_spec_right,
+                           double scaling_factor_right, TensorOperation op);
+
+  std::string ScaleTensor(const Tensor &tensor, double scaling_factor,
+                          TensorOperation op, DType_Type output_type);
+
+  template <typename T>
   std::string MergeTensors(const Tensor &tensor_spec_left,
                            const Tensor &tensor_spec_right,
                            double scaling_factor_right, TensorOperation op);
 
+  template <typename T>
   std::string ScaleTensor(const Tensor &tensor, double scaling_factor,
-                          TensorOperation op);
+                          TensorOperation op, DType_Type output_type);
 };
 }  // namespace metisfl::controller
 
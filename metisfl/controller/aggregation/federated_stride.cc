@@ -33,6 +33,7 @@ void FederatedStride::Reset() {
   num_contributors = 0;
   model = Model();
   wc_scaled_model = Model();
+  community_types.clear();
 }
 
 }  // namespace metisfl::controller
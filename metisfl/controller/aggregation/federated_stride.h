@@ -10,6 +10,10 @@ namespace metisfl::controller {
 class FederatedStride : public AggregationFunction,
                         FederatedRollingAverageBase {
  public:
+  explicit FederatedStride(
+      AggregationPrecision precision = AggregationPrecision::kFloat64)
+      : FederatedRollingAverageBase(precision) {}
+
   Model Aggregate(std::vector<std::vector<std::pair<const Model *, double>>>
                       &pairs) override;
 
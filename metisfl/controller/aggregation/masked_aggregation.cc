@@ -0,0 +1,93 @@
+#include "metisfl/controller/aggregation/masked_aggregation.h"
+
+#include <cstring>
+#include <stdexcept>
+
+namespace metisfl::controller {
+
+Model MaskedAgg::Aggregate(
+    std::vector<std::vector<std::pair<const Model *, double>>> &pairs) {
+  // The tensors of the aggregated model are those of any model of the round;
+  // corrections hold a single tensor with all the values.
+  const Model *sample_model = nullptr;
+  for (const auto &pair : pairs) {
+    const auto *model = pair.front().first;
+    if (!model->has_masking()) {
+      throw std::runtime_error(
+          "Cannot aggregate models without masking using MaskedAgg.");
+    }
+    if (!model->masking().correction() && sample_model == nullptr) {
+      sample_model = model;
+    }
+  }
+  if (sample_model == nullptr) {
+    throw std::runtime_error("Cannot aggregate corrections without models.");
+  }
+
+  size_t num_values = 0;
+  for (const auto &tensor : sample_model->tensors()) {
+    num_values += tensor.length();
+  }
+
+  // Unsigned integers wrap around, hence the sum is taken modulo 2^64.
+  std::vector<uint64_t> sum(num_values, 0);
+  uint64_t weight = 0;
+  for (const auto &pair : pairs) {
+    const auto &model = *pair.front().first;
+    if (model.masking().round_id() != sample_model->masking().round_id() ||
+        model.masking().fraction_bits() !=
+            sample_model->masking().fraction_bits()) {
+      throw std::runtime_error(
+          "Cannot aggregate models masked for different rounds.");
+    }
+    AddValues(model, sum);
+    weight += model.masking().weight();
+  }
+
+  // The masks have cancelled out, hence the sums are the signed, fixed point
+  // sums of the weighted values and of the weights. Their scales cancel out.
+  const auto total_weight = static_cast<double>(static_cast<int64_t>(weight));
+  if (total_weight <= 0) {
+    throw std::runtime_error("The sum of the masked weights is not positive.");
+  }
+
+  Model model;
+  model.mutable_tensors()->CopyFrom(sample_model->tensors());
+  size_t offset = 0;
+  for (auto &tensor : *model.mutable_tensors()) {
+    std::vector<double> values(tensor.length());
+    for (size_t i = 0; i < values.size(); ++i) {
+      values[i] =
+          static_cast<double>(static_cast<int64_t>(sum[offset + i])) /
+          total_weight;
+    }
+    offset += values.size();
+    *tensor.mutable_value() =
+        TensorOps::SerializeTensor<double>(values, tensor.type().type());
+  }
+  return model;
+}
+
+void MaskedAgg::Reset() {}
+
+void MaskedAgg::AddValues(const Model &model, std::vector<uint64_t> &sum) {
+  // Models may be packed, i.e., the values run on across the tensors.
+  size_t offset = 0;
+  for (const auto &tensor : model.tensors()) {
+    const auto &value = tensor.value();
+    if (value.size() % sizeof(uint64_t) != 0 ||
+        offset + value.size() / sizeof(uint64_t) > sum.size()) {
+      throw std::runtime_error("Masked model does not match the round.");
+    }
+    uint64_t masked;
+    for (size_t i = 0; i < value.size(); i += sizeof(uint64_t), ++offset) {
+      std::memcpy(&masked, value.data() + i, sizeof(uint64_t));
+      sum[offset] += masked;
+    }
+  }
+  if (offset != sum.size()) {
+    throw std::runtime_error("Masked model does not match the round.");
+  }
+}
+
+}  // namespace metisfl::controller
@@ -0,0 +1,42 @@
+#ifndef METISFL_METISFL_CONTROLLER_AGGREGATION_MASKED_AGGREGATION_H_
+#define METISFL_METISFL_CONTROLLER_AGGREGATION_MASKED_AGGREGATION_H_
+
+#include <cstdint>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "metisfl/controller/aggregation/aggregation_function.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+using metisfl::proto::TensorOps;
+
+namespace metisfl::controller {
+
+// Secure aggregation with pairwise additive masks. Every learner sends its
+// values scaled by its weight, in fixed point, plus the masks it shares with
+// the other learners of the round (see the Masking message). The masks cancel
+// out in the sum of all the models of the round, which is computed modulo
+// 2^64; the sum is then divided by the sum of the weights. The masks shared
+// with learners that dropped out of the round are cancelled by the correction
+// models of the surviving learners, which are summed along with the models.
+class MaskedAgg : public AggregationFunction {
+ public:
+  Model Aggregate(std::vector<std::vector<std::pair<const Model *, double>>>
+                      &pairs) override;
+
+  inline std::string Name() const override { return "MaskedAgg"; }
+
+  inline int RequiredLearnerLineageLength() const override { return 1; }
+
+  void Reset() override;
+
+ private:
+  // Adds the values of all the tensors of the model to the sum, modulo 2^64.
+  static void AddValues(const Model &model, std::vector<uint64_t> &sum);
+};
+
+}  // namespace metisfl::controller
+
+#endif  // METISFL_METISFL_CONTROLLER_AGGREGATION_MASKED_AGGREGATION_H_
@@ -0,0 +1,152 @@
+#include "metisfl/controller/aggregation/masked_aggregation.h"
+
+#include <gtest/gtest.h>
+
+#include <cmath>
+#include <cstring>
+#include <stdexcept>
+#include <vector>
+
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::controller {
+namespace {
+
+using metisfl::proto::TensorOps;
+
+constexpr int kFractionBits = 16;
+
+uint64_t FixedPoint(double value) {
+  return static_cast<uint64_t>(
+      static_cast<int64_t>(std::llround(value * (1 << kFractionBits))));
+}
+
+std::string Serialize(const std::vector<uint64_t> &values) {
+  std::string value(values.size() * sizeof(uint64_t), '\0');
+  std::memcpy(value.data(), values.data(), value.size());
+  return value;
+}
+
+// Masks the values of every tensor of the learner, scaled by its weight, with
+// the given masks, which run on across the tensors.
+Model CreateModel(const std::vector<std::vector<double>> &tensors,
+                  double weight, const std::vector<uint64_t> &masks) {
+  Model model;
+  model.mutable_masking()->set_round_id("round");
+  model.mutable_masking()->set_fraction_bits(kFractionBits);
+  model.mutable_masking()->set_weight(FixedPoint(weight) + masks[0]);
+  size_t offset = 1;
+  for (const auto &values : tensors) {
+    std::vector<uint64_t> masked;
+    for (auto value : values) {
+      masked.push_back(FixedPoint(weight * value) + masks[offset++]);
+    }
+    auto *tensor = model.add_tensors();
+    tensor->set_length(values.size());
+    tensor->add_dimensions(values.size());
+    tensor->mutable_type()->set_type(DType_Type_FLOAT32);
+    *tensor->mutable_value() = Serialize(masked);
+  }
+  return model;
+}
+
+class MaskedAggTest : public ::testing::Test {
+ protected:
+  const std::vector<std::vector<double>> tensors_a_ = {{1, -2, 3}, {0.5}};
+  const std::vector<std::vector<double>> tensors_b_ = {{3, 2, -1}, {-1.5}};
+  // The masks learner A shares with B, with C and learner B with C.
+  const std::vector<uint64_t> mask_ab_ = {7, 1ULL << 63, 12345, ~0ULL, 42};
+  const std::vector<uint64_t> mask_ac_ = {99, 3, 1ULL << 40, 5, 6};
+  const std::vector<uint64_t> mask_bc_ = {1, 2, 3, ~1ULL, 1ULL << 62};
+  const std::vector<uint64_t> zeros_ = std::vector<uint64_t>(5, 0);
+
+  // Returns first + sign * second, modulo 2^64.
+  static std::vector<uint64_t> Add(const std::vector<uint64_t> &first,
+                                   const std::vector<uint64_t> &second,
+                                   int sign = 1) {
+    std::vector<uint64_t> sum;
+    for (size_t i = 0; i < first.size(); ++i) {
+      sum.push_back(sign > 0 ? first[i] + second[i] : first[i] - second[i]);
+    }
+    return sum;
+  }
+
+  // Returns the correction model of the masks shared with a dropped learner.
+  static Model CreateCorrection(const std::vector<uint64_t> &correction) {
+    Model model;
+    model.mutable_masking()->set_round_id("round");
+    model.mutable_masking()->set_fraction_bits(kFractionBits);
+    model.mutable_masking()->set_correction(true);
+    model.mutable_masking()->set_weight(correction[0]);
+    auto *tensor = model.add_tensors();
+    tensor->set_length(correction.size() - 1);
+    tensor->add_dimensions(correction.size() - 1);
+    tensor->mutable_type()->set_type(DType_Type_UINT64);
+    *tensor->mutable_value() = Serialize(
+        std::vector<uint64_t>(correction.begin() + 1, correction.end()));
+    return model;
+  }
+};
+
+TEST_F(MaskedAggTest, MasksCancelOut) /* NOLINT */ {
+  // Learner A adds the masks it shares with greater learners, B subtracts them.
+  auto model_a = CreateModel(tensors_a_, 1, mask_ab_);
+  auto model_b = CreateModel(tensors_b_, 3, Add(zeros_, mask_ab_, -1));
+  std::vector<std::vector<std::pair<const Model *, double>>> pairs = {
+      {{&model_a, 1.0}}, {{&model_b, 1.0}}};
+
+  auto model = MaskedAgg().Aggregate(pairs);
+
+  ASSERT_EQ(model.tensors_size(), 2);
+  EXPECT_FALSE(model.has_masking());
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(model.tensors(0)),
+            std::vector<float>({2.5, 1, 0}));
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(model.tensors(1)),
+            std::vector<float>({-1}));
+}
+
+TEST_F(MaskedAggTest, CorrectionsCancelTheMasksOfDroppedLearners) /* NOLINT */ {
+  // Learner C drops out, hence A and B correct the masks they share with it.
+  auto model_a = CreateModel(tensors_a_, 1, Add(mask_ab_, mask_ac_));
+  auto model_b = CreateModel(tensors_b_, 1, Add(mask_bc_, mask_ab_, -1));
+  auto correction_a = CreateCorrection(Add(zeros_, mask_ac_, -1));
+  auto correction_b = CreateCorrection(Add(zeros_, mask_bc_, -1));
+  std::vector<std::vector<std::pair<const Model *, double>>> pairs = {
+      {{&correction_a, 0.0}}, {{&model_a, 1.0}},
+      {{&model_b, 1.0}}, {{&correction_b, 0.0}}};
+
+  auto model = MaskedAgg().Aggregate(pairs);
+
+  ASSERT_EQ(model.tensors_size(), 2);
+  EXPECT_EQ(model.tensors(0).type().type(), DType_Type_FLOAT32);
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(model.tensors(0)),
+            std::vector<float>({2, 0, 1}));
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(model.tensors(1)),
+            std::vector<float>({-0.5}));
+
+  // Without the corrections, the masks do not cancel out.
+  pairs = {{{&model_a, 1.0}}, {{&model_b, 1.0}}};
+  model = MaskedAgg().Aggregate(pairs);
+  EXPECT_NE(TensorOps::DeserializeTensor<float>(model.tensors(0)),
+            std::vector<float>({2, 0, 1}));
+}
+
+TEST_F(MaskedAggTest, RejectsMismatchedModels) /* NOLINT */ {
+  auto model_a = CreateModel(tensors_a_, 1, zeros_);
+  auto model_b = CreateModel({{1, 2, 3}}, 1, zeros_);
+  std::vector<std::vector<std::pair<const Model *, double>>> pairs = {
+      {{&model_a, 1.0}}, {{&model_b, 1.0}}};
+  EXPECT_THROW(MaskedAgg().Aggregate(pairs), std::runtime_error);
+
+  model_b = CreateModel(tensors_b_, 1, zeros_);
+  model_b.mutable_masking()->set_round_id("other round");
+  EXPECT_THROW(MaskedAgg().Aggregate(pairs), std::runtime_error);
+
+  auto correction = CreateCorrection(zeros_);
+  pairs = {{{&correction, 0.0}}};
+  EXPECT_THROW(MaskedAgg().Aggregate(pairs), std::runtime_error);
+}
+
+}  // namespace
+}  // namespace metisfl::controller
@@ -0,0 +1,114 @@
+
+#include "metisfl/controller/aggregation/running_average.h"
+
+#include "absl/strings/str_cat.h"
+
+namespace metisfl::controller {
+
+absl::Status RunningAverage::Add(const Model &model, double weight) {
+  if (TensorOps::HasEncryptedTensors(model)) {
+    return absl::InvalidArgumentError(
+        "Cannot aggregate encrypted tensors using a running average.");
+  }
+
+  if (num_models_ == 0) {
+    spec_.mutable_tensors()->CopyFrom(model.tensors());
+    for (auto &tensor : *spec_.mutable_tensors()) {
+      tensor.clear_value();
+      tensor.clear_quantization();
+      tensor.clear_sparsity();
+    }
+
+    if (precision_ == AggregationPrecision::kFloat32) {
+      accumulators32_.clear();
+      for (const auto &tensor : model.tensors())
+        accumulators32_.emplace_back(tensor.length());
+    } else {
+      accumulators64_.clear();
+      for (const auto &tensor : model.tensors())
+        accumulators64_.emplace_back(tensor.length());
+    }
+  } else {
+    if (model.tensors_size() != spec_.tensors_size()) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Expected ", spec_.tensors_size(), " tensors but got ",
+                       model.tensors_size()));
+    }
+    for (int var_idx = 0; var_idx < model.tensors_size(); ++var_idx) {
+      if (model.tensors(var_idx).length() != spec_.tensors(var_idx).length()) {
+        return absl::InvalidArgumentError(
+            absl::StrCat("Tensor ", var_idx, " has length ",
+                         model.tensors(var_idx).length(), " instead of ",
+                         spec_.tensors(var_idx).length()));
+      }
+    }
+  }
+
+  if (precision_ == AggregationPrecision::kFloat32) {
+    Fold<float>(model, weight, accumulators32_);
+  } else {
+    Fold<double>(model, weight, accumulators64_);
+  }
+
+  ++num_models_;
+  total_weight_ += weight;
+  return absl::OkStatus();
+}
+
+absl::Status RunningAverage::Release(Model *model) {
+  if (num_models_ == 0)
+    return absl::FailedPreconditionError("No models have been added.");
+  if (total_weight_ == 0)
+    return absl::FailedPreconditionError("The total weight is zero.");
+
+  *model = std::move(spec_);
+  if (precision_ == AggregationPrecision::kFloat32) {
+    Normalize<float>(accumulators32_, model);
+  } else {
+    Normalize<double>(accumulators64_, model);
+  }
+
+  Reset();
+  return absl::OkStatus();
+}
+
+void RunningAverage::Reset() {
+  spec_ = Model();
+  num_models_ = 0;
+  total_weight_ = 0;
+  accumulators32_.clear();
+  accumulators64_.clear();
+}
+
+template <typename T>
+void RunningAverage::Fold(const Model &model, double weight,
+                          std::vector<std::vector<T>> &accumulators) const {
+  const auto scale = static_cast<T>(weight);
+  const int total_tensors = model.tensors_size();
+
+#pragma omp parallel for
+  for (int var_idx = 0; var_idx < total_tensors; ++var_idx) {
+    TensorOps::AccumulateTensor<T>(model.tensors(var_idx), scale,
+                                   accumulators[var_idx].data());
+  }
+}
+
+template <typename T>
+void RunningAverage::Normalize(std::vector<std::vector<T>> &accumulators,
+                               Model *model) const {
+  const auto scale = static_cast<T>(1.0 / total_weight_);
+  const int total_tensors = model->tensors_size();
+
+#pragma omp parallel for
+  for (int var_idx = 0; var_idx < total_tensors; ++var_idx) {
+    auto &accumulator = accumulators[var_idx];
+    for (auto &value : accumulator) value *= scale;
+
+    auto *tensor = model->mutable_tensors(var_idx);
+    // Ship the average with the same data type it was received.
+    *tensor->mutable_value() =
+        TensorOps::SerializeTensor<T>(accumulator, tensor->type().type());
+  }
+}
+
+}  // namespace metisfl::controller
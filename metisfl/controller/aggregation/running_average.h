@@ -0,0 +1,57 @@
+
+#ifndef METISFL_METISFL_CONTROLLER_AGGREGATION_RUNNING_AVERAGE_H_
+#define METISFL_METISFL_CONTROLLER_AGGREGATION_RUNNING_AVERAGE_H_
+
+#include <vector>
+
+#include "absl/status/status.h"
+#include "metisfl/controller/aggregation/aggregation_function.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+using metisfl::proto::TensorOps;
+
+namespace metisfl::controller {
+
+// Incremental weighted average of models, for linear aggregation rules such
+// as FedAvg. Each model is folded into a preallocated accumulator as soon as
+// it arrives, hence the memory is O(model) regardless of the number of
+// models, and releasing the average only normalizes the accumulator.
+class RunningAverage {
+ public:
+  explicit RunningAverage(
+      AggregationPrecision precision = AggregationPrecision::kFloat64)
+      : precision_(precision) {}
+
+  // Folds the model, scaled by the weight, into the accumulator. The weights
+  // need not be normalized; the average is divided by their sum on release.
+  absl::Status Add(const Model &model, double weight);
+
+  // Moves the weighted average of the added models out, with the data types
+  // of the first added model, and resets the accumulator.
+  absl::Status Release(Model *model);
+
+  int NumModels() const { return num_models_; }
+
+  void Reset();
+
+ private:
+  AggregationPrecision precision_;
+  // The tensor specs of the first added model, without their values.
+  Model spec_;
+  int num_models_ = 0;
+  double total_weight_ = 0;
+
+  std::vector<std::vector<float>> accumulators32_;
+  std::vector<std::vector<double>> accumulators64_;
+
+  template <typename T>
+  void Fold(const Model &model, double weight,
+            std::vector<std::vector<T>> &accumulators) const;
+
+  template <typename T>
+  void Normalize(std::vector<std::vector<T>> &accumulators, Model *model) const;
+};
+}  // namespace metisfl::controller
+
+#endif  // METISFL_METISFL_CONTROLLER_AGGREGATION_RUNNING_AVERAGE_H_
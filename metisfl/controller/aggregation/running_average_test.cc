@@ -0,0 +1,179 @@
+
+#include "metisfl/controller/aggregation/running_average.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <vector>
+
+#include "metisfl/controller/aggregation/federated_average.h"
+#include "metisfl/controller/common/proto_matchers.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::controller {
+namespace {
+
+using metisfl::proto::TensorOps;
+using ::testing::proto::EqualsProto;
+
+Model CreateModel(DType_Type type, float offset) {
+  Model model;
+  for (int num_values : {10, 0, 3}) {
+    std::vector<float> values(num_values);
+    for (int i = 0; i < num_values; ++i) values[i] = offset + i;
+
+    auto *tensor = model.add_tensors();
+    tensor->set_length(num_values);
+    tensor->add_dimensions(num_values);
+    tensor->mutable_type()->set_type(type);
+    *tensor->mutable_value() = TensorOps::SerializeTensor<float>(values, type);
+  }
+  return model;
+}
+
+void AddTensor(Model *model, const std::vector<float> &values) {
+  auto *tensor = model->add_tensors();
+  tensor->set_length(values.size());
+  tensor->add_dimensions(values.size());
+  tensor->mutable_type()->set_type(DType_Type_FLOAT32);
+  *tensor->mutable_value() =
+      TensorOps::SerializeTensor<float>(values, DType_Type_FLOAT32);
+}
+
+// Quantizes the (small, integral) values of the model with a unit scale.
+Model QuantizeModel(const Model &model) {
+  Model quantized = model;
+  for (auto &tensor : *quantized.mutable_tensors()) {
+    std::string value;
+    for (auto v : TensorOps::DeserializeTensor<float>(tensor)) {
+      value.push_back(static_cast<char>(static_cast<int8_t>(v)));
+    }
+    tensor.set_value(value);
+    tensor.mutable_quantization()->set_type(Quantization_Type_INT8);
+    if (tensor.length() > 0) tensor.mutable_quantization()->add_scales(1.0f);
+  }
+  return quantized;
+}
+
+class RunningAverageTest : public ::testing::Test {};
+
+TEST_F(RunningAverageTest, MatchesFederatedAverage) /* NOLINT */ {
+  auto model1 = CreateModel(DType_Type_FLOAT32, 1);
+  auto model2 = CreateModel(DType_Type_FLOAT32, 5);
+  auto model3 = CreateModel(DType_Type_FLOAT32, -2);
+
+  // Unnormalized weights, e.g., the number of training examples.
+  RunningAverage running_average;
+  ASSERT_TRUE(running_average.Add(model1, 100).ok());
+  ASSERT_TRUE(running_average.Add(model2, 300).ok());
+  ASSERT_TRUE(running_average.Add(model3, 600).ok());
+  EXPECT_EQ(running_average.NumModels(), 3);
+
+  Model averaged;
+  ASSERT_TRUE(running_average.Release(&averaged).ok());
+  EXPECT_EQ(running_average.NumModels(), 0);
+
+  std::vector seq1({std::make_pair<const Model *, double>(&model1, 0.1)});
+  std::vector seq2({std::make_pair<const Model *, double>(&model2, 0.3)});
+  std::vector seq3({std::make_pair<const Model *, double>(&model3, 0.6)});
+  std::vector to_aggregate({seq1, seq2, seq3});
+  FederatedAverage avg;
+
+  EXPECT_THAT(averaged, EqualsProto(avg.Aggregate(to_aggregate)));
+}
+
+TEST_F(RunningAverageTest, KeepsDataTypes) /* NOLINT */ {
+  RunningAverage running_average(AggregationPrecision::kFloat32);
+  ASSERT_TRUE(
+      running_average.Add(CreateModel(DType_Type_FLOAT16, 1), 1).ok());
+  ASSERT_TRUE(
+      running_average.Add(CreateModel(DType_Type_FLOAT16, 3), 1).ok());
+
+  Model averaged;
+  ASSERT_TRUE(running_average.Release(&averaged).ok());
+  EXPECT_THAT(averaged, EqualsProto(CreateModel(DType_Type_FLOAT16, 2)));
+}
+
+TEST_F(RunningAverageTest, ReusableAfterRelease) /* NOLINT */ {
+  RunningAverage running_average;
+  Model averaged;
+
+  ASSERT_TRUE(running_average.Add(CreateModel(DType_Type_FLOAT64, 1), 1).ok());
+  ASSERT_TRUE(running_average.Release(&averaged).ok());
+
+  ASSERT_TRUE(running_average.Add(CreateModel(DType_Type_FLOAT64, 7), 2).ok());
+  ASSERT_TRUE(running_average.Release(&averaged).ok());
+  EXPECT_THAT(averaged, EqualsProto(CreateModel(DType_Type_FLOAT64, 7)));
+}
+
+TEST_F(RunningAverageTest, DequantizesIntoAccumulator) /* NOLINT */ {
+  auto model1 = CreateModel(DType_Type_FLOAT32, 1);
+  auto model2 = CreateModel(DType_Type_FLOAT32, -5);
+
+  RunningAverage running_average(AggregationPrecision::kFloat32);
+  ASSERT_TRUE(running_average.Add(QuantizeModel(model1), 1).ok());
+  ASSERT_TRUE(running_average.Add(QuantizeModel(model2), 1).ok());
+
+  Model averaged;
+  ASSERT_TRUE(running_average.Release(&averaged).ok());
+  EXPECT_THAT(averaged, EqualsProto(CreateModel(DType_Type_FLOAT32, -2)));
+
+  auto quantized1 = QuantizeModel(model1);
+  auto quantized2 = QuantizeModel(model2);
+  std::vector seq1({std::make_pair<const Model *, double>(&quantized1, 0.5)});
+  std::vector seq2({std::make_pair<const Model *, double>(&quantized2, 0.5)});
+  std::vector to_aggregate({seq1, seq2});
+  FederatedAverage avg;
+  EXPECT_THAT(avg.Aggregate(to_aggregate), EqualsProto(averaged));
+}
+
+TEST_F(RunningAverageTest, ScattersSparseModels) /* NOLINT */ {
+  Model sparse;
+  auto *tensor = sparse.add_tensors();
+  tensor->set_length(4);
+  tensor->add_dimensions(4);
+  tensor->mutable_type()->set_type(DType_Type_FLOAT32);
+  *tensor->mutable_value() =
+      TensorOps::SerializeTensor<float>({4, 8}, DType_Type_FLOAT32);
+  tensor->mutable_sparsity()->set_encoding(Sparsity_Encoding_BITMAP);
+  tensor->mutable_sparsity()->set_num_values(2);
+  tensor->mutable_sparsity()->set_indices(std::string({0x09}));
+
+  Model dense;
+  AddTensor(&dense, {2, 2, 2, 2});
+
+  RunningAverage running_average;
+  ASSERT_TRUE(running_average.Add(sparse, 1).ok());
+  ASSERT_TRUE(running_average.Add(dense, 1).ok());
+
+  Model averaged, expected;
+  ASSERT_TRUE(running_average.Release(&averaged).ok());
+  AddTensor(&expected, {3, 1, 1, 5});
+  EXPECT_THAT(averaged, EqualsProto(expected));
+}
+
+TEST_F(RunningAverageTest, RejectsInvalidModels) /* NOLINT */ {
+  RunningAverage running_average;
+  Model averaged;
+  EXPECT_FALSE(running_average.Release(&averaged).ok());
+
+  ASSERT_TRUE(running_average.Add(CreateModel(DType_Type_FLOAT32, 1), 1).ok());
+
+  auto mismatched = CreateModel(DType_Type_FLOAT32, 1);
+  mismatched.mutable_tensors()->RemoveLast();
+  EXPECT_FALSE(running_average.Add(mismatched, 1).ok());
+
+  auto encrypted = CreateModel(DType_Type_FLOAT32, 1);
+  encrypted.set_encrypted(true);
+  EXPECT_FALSE(running_average.Add(encrypted, 1).ok());
+
+  auto partially_encrypted = CreateModel(DType_Type_FLOAT32, 1);
+  partially_encrypted.mutable_tensors(0)->set_encrypted(true);
+  EXPECT_FALSE(running_average.Add(partially_encrypted, 1).ok());
+
+  EXPECT_EQ(running_average.NumModels(), 1);
+}
+
+}  // namespace
+}  // namespace metisfl::controller
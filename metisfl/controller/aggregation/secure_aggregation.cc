@@ -1,4 +1,3 @@
-
 #include "metisfl/controller/aggregation/secure_aggregation.h"
 
 namespace metisfl::controller {
@@ -22,11 +21,36 @@ Model SecAgg::Aggregate(
   }
   Model global_model;
   const auto &sample_model = pairs.front().front().first;
+  ValidateEncryptedTensors(pairs);
+  global_model.set_encrypted(sample_model->encrypted());
+  global_model.set_packed(sample_model->packed());
   global_model.mutable_tensors()->CopyFrom(sample_model->tensors());
 
-  auto total_tensors = global_model.tensors_size();
+  // Models may encrypt only some of their tensors, hence every tensor is
+  // aggregated either homomorphically or in plaintext. Packed models carry the
+  // ciphertexts of all their encrypted tensors in the first encrypted one.
+  std::vector<int> tensors_to_aggregate;
+  bool has_packed_ciphertexts = false;
+  for (int var_idx = 0; var_idx < global_model.tensors_size(); ++var_idx) {
+    if (TensorOps::IsEncrypted(*sample_model, sample_model->tensors(var_idx))) {
+      if (sample_model->packed() && has_packed_ciphertexts) continue;
+      has_packed_ciphertexts = true;
+    }
+    tensors_to_aggregate.push_back(var_idx);
+  }
+
+  const auto total_tensors = static_cast<int>(tensors_to_aggregate.size());
 #pragma omp parallel for
-  for (int var_idx = 0; var_idx < total_tensors; ++var_idx) {
+  for (int i = 0; i < total_tensors; ++i) {
+    const auto var_idx = tensors_to_aggregate[i];
+    auto *tensor = global_model.mutable_tensors(var_idx);
+    if (!TensorOps::IsEncrypted(*sample_model, *tensor)) {
+      *tensor->mutable_value() = AggregatePlaintextTensor(
+          pairs, var_idx, local_models_contrib_value);
+      tensor->clear_quantization();
+      tensor->clear_sparsity();
+      continue;
+    }
     std::vector<std::string> local_tensor_ciphertexts;
     for (const auto &pair : pairs) {
       const auto *model = pair.front().first;
@@ -34,11 +58,46 @@ Model SecAgg::Aggregate(
     }
     auto pwa_result = encryption_scheme_->Aggregate(local_tensor_ciphertexts,
                                                     local_models_contrib_value);
-    *global_model.mutable_tensors(var_idx)->mutable_value() = pwa_result;
+    *tensor->mutable_value() = pwa_result;
   }
   return global_model;
 }
 
 void SecAgg::Reset() {}
 
+void SecAgg::ValidateEncryptedTensors(
+    const std::vector<std::vector<std::pair<const Model *, double>>> &pairs) {
+  const auto &sample_model = *pairs.front().front().first;
+  for (const auto &pair : pairs) {
+    const auto &model = *pair.front().first;
+    if (model.tensors_size() != sample_model.tensors_size() ||
+        model.packed() != sample_model.packed()) {
+      throw std::runtime_error("Cannot aggregate models of different layouts.");
+    }
+    for (int var_idx = 0; var_idx < model.tensors_size(); ++var_idx) {
+      if (TensorOps::IsEncrypted(model, model.tensors(var_idx)) !=
+          TensorOps::IsEncrypted(sample_model,
+                                 sample_model.tensors(var_idx))) {
+        throw std::runtime_error(
+            "Cannot aggregate models that encrypt different tensors.");
+      }
+    }
+  }
+}
+
+std::string SecAgg::AggregatePlaintextTensor(
+    const std::vector<std::vector<std::pair<const Model *, double>>> &pairs,
+    int var_idx, const std::vector<float> &scales) {
+  const auto &tensor_spec = pairs.front().front().first->tensors(var_idx);
+  std::vector<double> aggregated_tensor(tensor_spec.length());
+  for (size_t i = 0; i < pairs.size(); ++i) {
+    const auto &tensor = pairs[i].front().first->tensors(var_idx);
+    TensorOps::AccumulateTensor<double>(tensor, scales[i],
+                                        aggregated_tensor.data());
+  }
+  // Ship the aggregated tensor with the same data type it was received.
+  return TensorOps::SerializeTensor<double>(aggregated_tensor,
+                                            tensor_spec.type().type());
+}
+
 }  // namespace metisfl::controller
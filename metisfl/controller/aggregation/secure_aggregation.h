@@ -5,12 +5,18 @@
 #include <omp.h>
 
 #include "metisfl/controller/aggregation/aggregation_function.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
 #include "metisfl/encryption/palisade/ckks_scheme.h"
 #include "metisfl/encryption/palisade/encryption_scheme.h"
 #include "metisfl/proto/model.pb.h"
 
+using metisfl::proto::TensorOps;
+
 namespace metisfl::controller {
 
+// Aggregates the encrypted tensors of the models homomorphically and their
+// plaintext tensors, if only some of the tensors are encrypted, as a weighted
+// sum. All the models must encrypt the same tensors.
 class SecAgg : public AggregationFunction {
  public:
   SecAgg(int batch_size, int scaling_factor_bits, std::string crypto_context);
@@ -25,6 +31,15 @@ class SecAgg : public AggregationFunction {
   void Reset() override;
 
  private:
+  // Throws if the models differ in the tensors they encrypt.
+  static void ValidateEncryptedTensors(
+      const std::vector<std::vector<std::pair<const Model *, double>>> &pairs);
+
+  // Returns the weighted sum of the plaintext tensors at the index.
+  static std::string AggregatePlaintextTensor(
+      const std::vector<std::vector<std::pair<const Model *, double>>> &pairs,
+      int var_idx, const std::vector<float> &scales);
+
   std::unique_ptr<EncryptionScheme> encryption_scheme_;
 };
 
@@ -0,0 +1,86 @@
+#ifndef METISFL_METISFL_CONTROLLER_COMMON_LOG_JOURNAL_H_
+#define METISFL_METISFL_CONTROLLER_COMMON_LOG_JOURNAL_H_
+
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <mutex>
+#include <string>
+#include <vector>
+
+#include "absl/container/flat_hash_map.h"
+
+namespace metisfl::controller {
+
+enum class LogKind {
+  kTraining = 0,
+  kEvaluation = 1,
+  kModel = 2,
+  kLearner = 3
+};
+
+// The keys of the log entries that changed after a cursor.
+struct LogChanges {
+  // The cursor of the latest change.
+  uint64_t cursor = 0;
+  std::vector<std::string> training_keys;
+  std::vector<std::string> evaluation_keys;
+  std::vector<std::string> model_keys;
+  std::vector<std::string> learner_keys;
+};
+
+// Assigns an increasing sequence number to every change of a log entry, so
+// that readers can fetch only the entries that changed after a cursor, i.e.,
+// the sequence number of the last change they have seen.
+class LogJournal {
+ public:
+  void Record(LogKind kind, const std::string &key) {
+    {
+      std::lock_guard<std::mutex> guard(mutex_);
+      sequence_[static_cast<int>(kind)][key] = ++cursor_;
+    }
+    changed_.notify_all();
+  }
+
+  uint64_t Cursor() {
+    std::lock_guard<std::mutex> guard(mutex_);
+    return cursor_;
+  }
+
+  LogChanges ChangesSince(uint64_t cursor) {
+    std::lock_guard<std::mutex> guard(mutex_);
+
+    LogChanges changes;
+    changes.cursor = cursor_;
+    std::vector<std::string> *keys[] = {
+        &changes.training_keys, &changes.evaluation_keys, &changes.model_keys,
+        &changes.learner_keys};
+    for (int kind = 0; kind < kNumKinds; ++kind) {
+      for (const auto &[key, sequence] : sequence_[kind]) {
+        if (sequence > cursor) keys[kind]->push_back(key);
+      }
+    }
+    return changes;
+  }
+
+  // Blocks until an entry changes after the cursor or the timeout expires.
+  // Returns true if an entry changed after the cursor.
+  bool WaitForChanges(uint64_t cursor, std::chrono::milliseconds timeout) {
+    std::unique_lock<std::mutex> lock(mutex_);
+    return changed_.wait_for(lock, timeout,
+                             [this, cursor] { return cursor_ > cursor; });
+  }
+
+ private:
+  static constexpr int kNumKinds = 4;
+
+  std::mutex mutex_;
+  std::condition_variable changed_;
+  uint64_t cursor_ = 0;
+  // key -> sequence number of its latest change, per kind
+  absl::flat_hash_map<std::string, uint64_t> sequence_[kNumKinds];
+};
+
+}  // namespace metisfl::controller
+
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_LOG_JOURNAL_H_
@@ -0,0 +1,64 @@
+#include "metisfl/controller/common/log_journal.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <thread>
+
+namespace metisfl::controller {
+namespace {
+
+using ::testing::IsEmpty;
+using ::testing::UnorderedElementsAre;
+
+class LogJournalTest : public ::testing::Test {};
+
+TEST_F(LogJournalTest, ChangesSinceCursor) /* NOLINT */ {
+  LogJournal journal;
+  journal.Record(LogKind::kTraining, "task1");
+  journal.Record(LogKind::kModel, "update1");
+
+  auto changes = journal.ChangesSince(0);
+  EXPECT_EQ(changes.cursor, 2);
+  EXPECT_THAT(changes.training_keys, UnorderedElementsAre("task1"));
+  EXPECT_THAT(changes.evaluation_keys, IsEmpty());
+  EXPECT_THAT(changes.model_keys, UnorderedElementsAre("update1"));
+
+  journal.Record(LogKind::kTraining, "task2");
+  journal.Record(LogKind::kEvaluation, "task1");
+  // A changed entry is returned again.
+  journal.Record(LogKind::kModel, "update1");
+  journal.Record(LogKind::kLearner, "learner1");
+
+  changes = journal.ChangesSince(changes.cursor);
+  EXPECT_EQ(changes.cursor, 6);
+  EXPECT_THAT(changes.training_keys, UnorderedElementsAre("task2"));
+  EXPECT_THAT(changes.evaluation_keys, UnorderedElementsAre("task1"));
+  EXPECT_THAT(changes.model_keys, UnorderedElementsAre("update1"));
+  EXPECT_THAT(changes.learner_keys, UnorderedElementsAre("learner1"));
+
+  changes = journal.ChangesSince(changes.cursor);
+  EXPECT_EQ(changes.cursor, 6);
+  EXPECT_THAT(changes.training_keys, IsEmpty());
+  EXPECT_THAT(changes.evaluation_keys, IsEmpty());
+  EXPECT_THAT(changes.model_keys, IsEmpty());
+  EXPECT_THAT(changes.learner_keys, IsEmpty());
+}
+
+TEST_F(LogJournalTest, WaitForChanges) /* NOLINT */ {
+  LogJournal journal;
+  EXPECT_FALSE(journal.WaitForChanges(0, std::chrono::milliseconds(10)));
+
+  std::thread writer([&journal] {
+    std::this_thread::sleep_for(std::chrono::milliseconds(50));
+    journal.Record(LogKind::kTraining, "task1");
+  });
+  EXPECT_TRUE(journal.WaitForChanges(0, std::chrono::seconds(10)));
+  writer.join();
+
+  EXPECT_EQ(journal.Cursor(), 1);
+  EXPECT_FALSE(journal.WaitForChanges(1, std::chrono::milliseconds(10)));
+}
+
+}  // namespace
+}  // namespace metisfl::controller
@@ -0,0 +1,158 @@
+#ifndef METISFL_METISFL_CONTROLLER_COMMON_MODEL_CHUNKING_H_
+#define METISFL_METISFL_CONTROLLER_COMMON_MODEL_CHUNKING_H_
+
+#include <algorithm>
+#include <cstdint>
+#include <string>
+#include <utility>
+
+#include "absl/status/status.h"
+#include "absl/strings/str_cat.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::proto {
+
+// Kept well below the 4 MB default gRPC message limit, so that
+// chunks go through even if the peer does not raise its limit.
+constexpr size_t kModelChunkSize = 1024 * 1024;
+
+class ModelChunking {
+ public:
+  // Splits the model into chunks of at most chunk_size value bytes and passes
+  // them, in order, to the write function. Only one chunk is materialized at a
+  // time. Stops and returns false as soon as the write function returns false.
+  template <typename WriteFn>
+  static bool WriteModelChunks(const Model &model, WriteFn &&write,
+                               size_t chunk_size = kModelChunkSize) {
+    // A masked model without tensors, e.g., a correction that only carries
+    // shares, is a single chunk with its masking.
+    if (model.tensors_size() == 0 && model.has_masking()) {
+      ModelChunk chunk;
+      chunk.set_encrypted(model.encrypted());
+      *chunk.mutable_masking() = model.masking();
+      return write(chunk);
+    }
+    for (int index = 0; index < model.tensors_size(); ++index) {
+      const auto &tensor = model.tensors(index);
+      const auto &value = tensor.value();
+
+      size_t offset = 0;
+      do {
+        ModelChunk chunk;
+        chunk.set_encrypted(model.encrypted());
+        chunk.set_tensor_index(index);
+        chunk.set_offset(offset);
+        chunk.set_data(value.substr(offset, chunk_size));
+        if (offset == 0) {
+          auto *spec = chunk.mutable_tensor_spec();
+          spec->set_length(tensor.length());
+          *spec->mutable_dimensions() = tensor.dimensions();
+          *spec->mutable_type() = tensor.type();
+          spec->set_codec(tensor.codec());
+          spec->set_encrypted(tensor.encrypted());
+          if (tensor.has_quantization()) {
+            *spec->mutable_quantization() = tensor.quantization();
+          }
+          if (tensor.has_sparsity()) {
+            *spec->mutable_sparsity() = tensor.sparsity();
+          }
+          chunk.set_value_size(value.size());
+          chunk.set_version(model.version());
+          chunk.set_base_version(model.base_version());
+          chunk.set_packed(model.packed());
+          if (index == 0 && model.has_masking()) {
+            *chunk.mutable_masking() = model.masking();
+          }
+        }
+        if (!write(chunk)) return false;
+        offset += chunk_size;
+      } while (offset < value.size());
+    }
+    return true;
+  }
+};
+
+// Incrementally assembles a model from its chunks, as they arrive.
+class ModelAssembler {
+ public:
+  absl::Status AddChunk(const ModelChunk &chunk) {
+    if (chunk.has_tensor_spec()) {
+      auto status = FlushTensor();
+      if (!status.ok()) return status;
+
+      if (chunk.tensor_index() != model_.tensors_size()) {
+        return absl::InvalidArgumentError(
+            absl::StrCat("Expected tensor ", model_.tensors_size(),
+                         " but received tensor ", chunk.tensor_index()));
+      }
+      model_.set_encrypted(chunk.encrypted());
+      model_.set_version(chunk.version());
+      model_.set_base_version(chunk.base_version());
+      model_.set_packed(chunk.packed());
+      if (chunk.has_masking()) *model_.mutable_masking() = chunk.masking();
+      auto *tensor = model_.add_tensors();
+      *tensor = chunk.tensor_spec();
+      value_size_ = chunk.value_size();
+      tensor->mutable_value()->reserve(value_size_);
+    } else if (model_.tensors_size() == 0 && chunk.has_masking() &&
+               chunk.data().empty()) {
+      // The single chunk of a masked model without tensors.
+      model_.set_encrypted(chunk.encrypted());
+      *model_.mutable_masking() = chunk.masking();
+      return absl::OkStatus();
+    }
+
+    if (model_.tensors_size() == 0 ||
+        chunk.tensor_index() != model_.tensors_size() - 1) {
+      return absl::InvalidArgumentError(absl::StrCat(
+          "Received a chunk of tensor ", chunk.tensor_index(),
+          " without its spec"));
+    }
+
+    auto *value = model_.mutable_tensors(model_.tensors_size() - 1)
+                      ->mutable_value();
+    if (chunk.offset() != value->size()) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Expected offset ", value->size(),
+                       " but received offset ", chunk.offset()));
+    }
+    if (value->size() + chunk.data().size() > value_size_) {
+      return absl::InvalidArgumentError(absl::StrCat(
+          "Tensor ", chunk.tensor_index(), " exceeds its size of ",
+          value_size_, " bytes"));
+    }
+    value->append(chunk.data());
+    return absl::OkStatus();
+  }
+
+  // Validates that the last tensor is complete and moves the model out.
+  absl::Status Release(Model *model) {
+    auto status = FlushTensor();
+    if (!status.ok()) return status;
+
+    *model = std::move(model_);
+    model_ = Model();
+    value_size_ = 0;
+    return absl::OkStatus();
+  }
+
+ private:
+  Model model_;
+  uint64_t value_size_ = 0;
+
+  absl::Status FlushTensor() const {
+    if (model_.tensors_size() == 0) return absl::OkStatus();
+
+    const auto &value = model_.tensors(model_.tensors_size() - 1).value();
+    if (value.size() != value_size_) {
+      return absl::InvalidArgumentError(absl::StrCat(
+          "Tensor ", model_.tensors_size() - 1, " is incomplete: received ",
+          value.size(), " of ", value_size_, " bytes"));
+    }
+    return absl::OkStatus();
+  }
+};
+
+}  // namespace metisfl::proto
+
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_MODEL_CHUNKING_H_
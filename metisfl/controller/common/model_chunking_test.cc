@@ -0,0 +1,216 @@
+#include "metisfl/controller/common/model_chunking.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <vector>
+
+#include "metisfl/controller/common/proto_matchers.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::proto {
+namespace {
+
+using ::testing::proto::EqualsProto;
+
+Model CreateModel() {
+  Model model;
+  for (int num_values : {1000, 0, 3}) {
+    std::vector<float> values(num_values);
+    for (int i = 0; i < num_values; ++i) values[i] = i;
+
+    auto *tensor = model.add_tensors();
+    tensor->set_length(num_values);
+    tensor->add_dimensions(num_values);
+    tensor->mutable_type()->set_type(DType_Type_FLOAT32);
+    *tensor->mutable_value() =
+        TensorOps::SerializeTensor<float>(values, DType_Type_FLOAT32);
+  }
+  return model;
+}
+
+class ModelChunkingTest : public ::testing::Test {};
+
+TEST_F(ModelChunkingTest, SplitAndAssemble) /* NOLINT */ {
+  auto model = CreateModel();
+
+  std::vector<ModelChunk> chunks;
+  EXPECT_TRUE(ModelChunking::WriteModelChunks(
+      model,
+      [&chunks](const ModelChunk &chunk) {
+        chunks.push_back(chunk);
+        return true;
+      },
+      256));
+  // 4000 bytes in chunks of 256, one chunk for the empty tensor and one chunk
+  // for the 12 bytes of the last tensor.
+  EXPECT_EQ(chunks.size(), 16 + 1 + 1);
+  for (const auto &chunk : chunks) EXPECT_LE(chunk.data().size(), 256);
+
+  ModelAssembler assembler;
+  for (const auto &chunk : chunks) EXPECT_TRUE(assembler.AddChunk(chunk).ok());
+
+  Model assembled;
+  EXPECT_TRUE(assembler.Release(&assembled).ok());
+  EXPECT_THAT(assembled, EqualsProto(model));
+}
+
+TEST_F(ModelChunkingTest, KeepsTensorSpecs) /* NOLINT */ {
+  auto model = CreateModel();
+  model.mutable_tensors(0)->set_codec(Codec_Type_ZSTD);
+  auto *quantization = model.mutable_tensors(2)->mutable_quantization();
+  quantization->set_type(Quantization_Type_INT8);
+  quantization->add_scales(0.5f);
+  auto *sparsity = model.mutable_tensors(1)->mutable_sparsity();
+  sparsity->set_encoding(Sparsity_Encoding_DELTA);
+  sparsity->set_indices(std::string({0x01, 0x02}));
+
+  ModelAssembler assembler;
+  EXPECT_TRUE(ModelChunking::WriteModelChunks(
+      model,
+      [&assembler](const ModelChunk &chunk) {
+        return assembler.AddChunk(chunk).ok();
+      },
+      256));
+
+  Model assembled;
+  EXPECT_TRUE(assembler.Release(&assembled).ok());
+  EXPECT_THAT(assembled, EqualsProto(model));
+}
+
+TEST_F(ModelChunkingTest, KeepsPackedModels) /* NOLINT */ {
+  // The first tensor carries the value of all the tensors.
+  auto model = CreateModel();
+  model.set_encrypted(true);
+  model.set_packed(true);
+  model.mutable_tensors(2)->clear_value();
+
+  ModelAssembler assembler;
+  EXPECT_TRUE(ModelChunking::WriteModelChunks(
+      model,
+      [&assembler](const ModelChunk &chunk) {
+        return assembler.AddChunk(chunk).ok();
+      },
+      256));
+
+  Model assembled;
+  EXPECT_TRUE(assembler.Release(&assembled).ok());
+  EXPECT_THAT(assembled, EqualsProto(model));
+}
+
+TEST_F(ModelChunkingTest, KeepsSelectivelyEncryptedModels) /* NOLINT */ {
+  // The first encrypted tensor carries the value of all the encrypted ones.
+  auto model = CreateModel();
+  model.set_packed(true);
+  model.mutable_tensors(1)->set_encrypted(true);
+  model.mutable_tensors(2)->set_encrypted(true);
+  model.mutable_tensors(2)->clear_value();
+
+  ModelAssembler assembler;
+  EXPECT_TRUE(ModelChunking::WriteModelChunks(
+      model,
+      [&assembler](const ModelChunk &chunk) {
+        EXPECT_FALSE(chunk.encrypted());
+        return assembler.AddChunk(chunk).ok();
+      },
+      256));
+
+  Model assembled;
+  EXPECT_TRUE(assembler.Release(&assembled).ok());
+  EXPECT_THAT(assembled, EqualsProto(model));
+}
+
+TEST_F(ModelChunkingTest, KeepsMaskedModels) /* NOLINT */ {
+  auto model = CreateModel();
+  model.set_encrypted(true);
+  model.mutable_masking()->set_round_id("round");
+  model.mutable_masking()->set_fraction_bits(24);
+  model.mutable_masking()->set_weight(~0ULL);
+
+  std::vector<ModelChunk> chunks;
+  ModelAssembler assembler;
+  EXPECT_TRUE(ModelChunking::WriteModelChunks(
+      model,
+      [&chunks, &assembler](const ModelChunk &chunk) {
+        chunks.push_back(chunk);
+        return assembler.AddChunk(chunk).ok();
+      },
+      256));
+  // Only the first chunk carries the masking.
+  EXPECT_TRUE(chunks.front().has_masking());
+  EXPECT_FALSE(chunks.back().has_masking());
+
+  Model assembled;
+  EXPECT_TRUE(assembler.Release(&assembled).ok());
+  EXPECT_THAT(assembled, EqualsProto(model));
+}
+
+TEST_F(ModelChunkingTest, KeepsMaskedModelsWithoutTensors) /* NOLINT */ {
+  Model model;
+  model.set_encrypted(true);
+  model.mutable_masking()->set_round_id("round");
+  model.mutable_masking()->set_correction(true);
+  auto *share = model.mutable_masking()->add_shares();
+  share->set_learner_id("learner");
+  share->set_share("share");
+
+  std::vector<ModelChunk> chunks;
+  ModelAssembler assembler;
+  EXPECT_TRUE(ModelChunking::WriteModelChunks(
+      model, [&chunks, &assembler](const ModelChunk &chunk) {
+        chunks.push_back(chunk);
+        return assembler.AddChunk(chunk).ok();
+      }));
+  EXPECT_EQ(chunks.size(), 1);
+
+  Model assembled;
+  EXPECT_TRUE(assembler.Release(&assembled).ok());
+  EXPECT_THAT(assembled, EqualsProto(model));
+}
+
+TEST_F(ModelChunkingTest, StopsWhenWriteFails) /* NOLINT */ {
+  int num_writes = 0;
+  EXPECT_FALSE(ModelChunking::WriteModelChunks(
+      CreateModel(), [&num_writes](const ModelChunk &) {
+        return ++num_writes < 2;
+      }, 256));
+  EXPECT_EQ(num_writes, 2);
+}
+
+TEST_F(ModelChunkingTest, RejectsOutOfOrderChunks) /* NOLINT */ {
+  std::vector<ModelChunk> chunks;
+  ModelChunking::WriteModelChunks(
+      CreateModel(),
+      [&chunks](const ModelChunk &chunk) {
+        chunks.push_back(chunk);
+        return true;
+      },
+      256);
+
+  ModelAssembler assembler;
+  EXPECT_TRUE(assembler.AddChunk(chunks[0]).ok());
+  EXPECT_FALSE(assembler.AddChunk(chunks[2]).ok());
+
+  ModelAssembler orphan_assembler;
+  EXPECT_FALSE(orphan_assembler.AddChunk(chunks[1]).ok());
+}
+
+TEST_F(ModelChunkingTest, RejectsIncompleteModel) /* NOLINT */ {
+  std::vector<ModelChunk> chunks;
+  ModelChunking::WriteModelChunks(
+      CreateModel(),
+      [&chunks](const ModelChunk &chunk) {
+        chunks.push_back(chunk);
+        return true;
+      },
+      256);
+
+  ModelAssembler assembler;
+  EXPECT_TRUE(assembler.AddChunk(chunks[0]).ok());
+  Model assembled;
+  EXPECT_FALSE(assembler.Release(&assembled).ok());
+}
+
+}  // namespace
+}  // namespace metisfl::proto
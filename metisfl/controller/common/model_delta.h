@@ -0,0 +1,242 @@
+#ifndef METISFL_METISFL_CONTROLLER_COMMON_MODEL_DELTA_H_
+#define METISFL_METISFL_CONTROLLER_COMMON_MODEL_DELTA_H_
+
+#include <cstdint>
+#include <cstring>
+#include <deque>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <utility>
+
+#include "absl/hash/hash.h"
+#include "absl/status/status.h"
+#include "absl/strings/str_cat.h"
+#include "absl/strings/string_view.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::proto {
+
+// Delta-encodes models against an earlier community model. Differences are
+// taken in the data type of every tensor, as by the Python learners
+// (metisfl/learner/model_delta.py); integer tensors wrap around, hence their
+// deltas are reversed exactly.
+class ModelDelta {
+ public:
+  // Identifies a model by the hash of its tensors.
+  static std::string Version(const Model &model) {
+    using Entry = std::tuple<size_t, int, uint32_t, absl::string_view>;
+    size_t hash = model.tensors_size();
+    for (const auto &tensor : model.tensors()) {
+      hash = absl::Hash<Entry>{}(Entry(hash, tensor.type().type(),
+                                       tensor.length(), tensor.value()));
+    }
+    return absl::StrCat(absl::Hex(hash, absl::kZeroPad16));
+  }
+
+  // Returns a model without tensors that refers to the model by its version,
+  // for receivers that already hold the model.
+  static Model Reference(const Model &model) {
+    Model reference;
+    reference.set_version(model.version());
+    reference.set_reference(true);
+    return reference;
+  }
+
+  // Returns the version of the model the receiver must hold to restore the
+  // model, i.e., the model itself if it is a reference, or else its base.
+  static const std::string &RequiredVersion(const Model &model) {
+    return model.reference() ? model.version() : model.base_version();
+  }
+
+  // Sets the delta to the difference of the model from the base model.
+  static absl::Status Subtract(const Model &model, const Model &base,
+                               Model *delta) {
+    auto status = Validate(model, base);
+    if (!status.ok()) return status;
+
+    delta->Clear();
+    delta->set_version(model.version());
+    delta->set_base_version(base.version());
+    for (int i = 0; i < model.tensors_size(); ++i) {
+      auto *tensor = delta->add_tensors();
+      *tensor = model.tensors(i);
+      Apply(tensor, base.tensors(i), /*add=*/false);
+    }
+    return absl::OkStatus();
+  }
+
+  // Adds the delta to the base model, in place of the delta. The values of
+  // quantized or sparse delta tensors are scattered into the base tensors.
+  static absl::Status Add(const Model &base, Model *delta) {
+    if (delta->base_version() != base.version()) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Model is a delta from version ", delta->base_version(),
+                       " but the base model has version ", base.version()));
+    }
+    auto status = Validate(*delta, base, /*allow_compressed=*/true);
+    if (!status.ok()) return status;
+
+    for (int i = 0; i < delta->tensors_size(); ++i) {
+      auto *tensor = delta->mutable_tensors(i);
+      if (TensorOps::IsQuantized(*tensor) || TensorOps::IsSparse(*tensor)) {
+        auto values = TensorOps::DeserializeTensor<double>(base.tensors(i));
+        try {
+          TensorOps::AccumulateTensor<double>(*tensor, 1.0, values.data());
+        } catch (const std::runtime_error &error) {
+          return absl::InvalidArgumentError(error.what());
+        }
+        *tensor->mutable_value() =
+            TensorOps::SerializeTensor<double>(values, tensor->type().type());
+        tensor->clear_quantization();
+        tensor->clear_sparsity();
+      } else {
+        Apply(tensor, base.tensors(i), /*add=*/true);
+      }
+    }
+    delta->clear_base_version();
+    return absl::OkStatus();
+  }
+
+ private:
+  static absl::Status Validate(const Model &model, const Model &base,
+                               bool allow_compressed = false) {
+    if (TensorOps::HasEncryptedTensors(model) ||
+        TensorOps::HasEncryptedTensors(base)) {
+      return absl::InvalidArgumentError("Encrypted models have no deltas.");
+    }
+    if (model.tensors_size() != base.tensors_size()) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Model has ", model.tensors_size(),
+                       " tensors but the base model has ", base.tensors_size()));
+    }
+    for (int i = 0; i < model.tensors_size(); ++i) {
+      const auto &tensor = model.tensors(i);
+      const auto &base_tensor = base.tensors(i);
+      if (tensor.codec() != Codec_Type_NONE ||
+          base_tensor.codec() != Codec_Type_NONE) {
+        return absl::InvalidArgumentError("Encoded tensors have no deltas.");
+      }
+      const bool compressed =
+          TensorOps::IsQuantized(tensor) || TensorOps::IsSparse(tensor);
+      if ((compressed && !allow_compressed) ||
+          TensorOps::IsQuantized(base_tensor) ||
+          TensorOps::IsSparse(base_tensor)) {
+        return absl::InvalidArgumentError(
+            "Quantized or sparse tensors have no deltas.");
+      }
+      const auto bytes =
+          TensorOps::DTypeSize(tensor.type().type()) * tensor.length();
+      if (tensor.type().type() != base_tensor.type().type() ||
+          tensor.length() != base_tensor.length() ||
+          (!compressed && tensor.value().size() != bytes) ||
+          base_tensor.value().size() != bytes) {
+        return absl::InvalidArgumentError(absl::StrCat(
+            "Tensor ", i, " does not match the tensor of the base model"));
+      }
+    }
+    return absl::OkStatus();
+  }
+
+  // Sets the tensor to tensor + base or tensor - base, element-wise.
+  static void Apply(Tensor *tensor, const Tensor &base, bool add) {
+    auto *values = tensor->mutable_value()->data();
+    const auto *base_values = base.value().data();
+    const size_t num_values = tensor->length();
+
+    switch (tensor->type().type()) {
+      case DType_Type_FLOAT64:
+        return ApplyValues<double>(values, base_values, num_values, add);
+      case DType_Type_FLOAT32:
+        return ApplyValues<float>(values, base_values, num_values, add);
+      case DType_Type_FLOAT16:
+        return ApplyHalfValues(values, base_values, num_values, add,
+                               TensorOps::HalfToFloat, TensorOps::FloatToHalf);
+      case DType_Type_BFLOAT16:
+        return ApplyHalfValues(values, base_values, num_values, add,
+                               TensorOps::BFloat16ToFloat,
+                               TensorOps::FloatToBFloat16);
+      case DType_Type_INT8:
+      case DType_Type_UINT8:
+        return ApplyValues<uint8_t>(values, base_values, num_values, add);
+      case DType_Type_INT16:
+      case DType_Type_UINT16:
+        return ApplyValues<uint16_t>(values, base_values, num_values, add);
+      case DType_Type_INT32:
+      case DType_Type_UINT32:
+        return ApplyValues<uint32_t>(values, base_values, num_values, add);
+      case DType_Type_INT64:
+      case DType_Type_UINT64:
+        return ApplyValues<uint64_t>(values, base_values, num_values, add);
+      default:
+        throw std::runtime_error("Unsupported tensor data type.");
+    }
+  }
+
+  // Integers are applied as unsigned, i.e., modulo 2^N, like numpy does.
+  template <typename T>
+  static void ApplyValues(char *values, const char *base_values,
+                          size_t num_values, bool add) {
+    T value, base_value;
+    for (size_t i = 0; i < num_values; ++i) {
+      std::memcpy(&value, values + i * sizeof(T), sizeof(T));
+      std::memcpy(&base_value, base_values + i * sizeof(T), sizeof(T));
+      value = add ? static_cast<T>(value + base_value)
+                  : static_cast<T>(value - base_value);
+      std::memcpy(values + i * sizeof(T), &value, sizeof(T));
+    }
+  }
+
+  static void ApplyHalfValues(char *values, const char *base_values,
+                              size_t num_values, bool add,
+                              float (*to_float)(uint16_t),
+                              uint16_t (*from_float)(float)) {
+    uint16_t value, base_value;
+    for (size_t i = 0; i < num_values; ++i) {
+      std::memcpy(&value, values + i * sizeof(uint16_t), sizeof(uint16_t));
+      std::memcpy(&base_value, base_values + i * sizeof(uint16_t),
+                  sizeof(uint16_t));
+      const float result = add ? to_float(value) + to_float(base_value)
+                               : to_float(value) - to_float(base_value);
+      value = from_float(result);
+      std::memcpy(values + i * sizeof(uint16_t), &value, sizeof(uint16_t));
+    }
+  }
+};
+
+// Holds the most recent versions of the community model.
+class ModelVersions {
+ public:
+  explicit ModelVersions(size_t capacity) : capacity_(capacity) {}
+
+  // Inserts the model under its version, evicting the oldest version if full.
+  void Insert(const Model &model) {
+    std::lock_guard<std::mutex> guard(mutex_);
+    for (const auto &entry : versions_) {
+      if (entry->version() == model.version()) return;
+    }
+    versions_.push_back(std::make_shared<const Model>(model));
+    if (versions_.size() > capacity_) versions_.pop_front();
+  }
+
+  // Returns the model with the version, or nullptr if it is not held.
+  std::shared_ptr<const Model> Get(const std::string &version) const {
+    std::lock_guard<std::mutex> guard(mutex_);
+    for (const auto &entry : versions_) {
+      if (entry->version() == version) return entry;
+    }
+    return nullptr;
+  }
+
+ private:
+  const size_t capacity_;
+  mutable std::mutex mutex_;
+  std::deque<std::shared_ptr<const Model>> versions_;
+};
+
+}  // namespace metisfl::proto
+
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_MODEL_DELTA_H_
@@ -0,0 +1,122 @@
+#include "metisfl/controller/common/model_delta.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <vector>
+
+#include "metisfl/controller/common/proto_matchers.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::proto {
+namespace {
+
+using ::testing::proto::EqualsProto;
+
+template <typename T>
+void AddTensor(Model *model, const std::vector<T> &values, DType_Type type) {
+  auto *tensor = model->add_tensors();
+  tensor->set_length(values.size());
+  tensor->add_dimensions(values.size());
+  tensor->mutable_type()->set_type(type);
+  *tensor->mutable_value() = TensorOps::SerializeTensor<T>(values, type);
+}
+
+Model CreateModel(double offset) {
+  Model model;
+  AddTensor<double>(&model, {1.5 + offset, -2, 3}, DType_Type_FLOAT64);
+  AddTensor<double>(&model, {0.25 + offset, 8}, DType_Type_FLOAT32);
+  AddTensor<double>(&model, {0.5 + offset, 1}, DType_Type_FLOAT16);
+  // Wraps around in the delta.
+  AddTensor<double>(&model, {-128 + offset, 127 - offset}, DType_Type_INT8);
+  model.set_version(ModelDelta::Version(model));
+  return model;
+}
+
+TEST(ModelDeltaTest, SubtractAndAdd) /* NOLINT */ {
+  auto base = CreateModel(0);
+  auto model = CreateModel(1);
+
+  Model delta;
+  ASSERT_TRUE(ModelDelta::Subtract(model, base, &delta).ok());
+  EXPECT_EQ(delta.version(), model.version());
+  EXPECT_EQ(delta.base_version(), base.version());
+  EXPECT_EQ(TensorOps::DeserializeTensor(delta.tensors(0)),
+            std::vector<double>({1, 0, 0}));
+
+  ASSERT_TRUE(ModelDelta::Add(base, &delta).ok());
+  EXPECT_THAT(delta, EqualsProto(model));
+}
+
+TEST(ModelDeltaTest, AddsSparseQuantizedDelta) /* NOLINT */ {
+  Model base;
+  AddTensor<double>(&base, {1, 2, 3, 4}, DType_Type_FLOAT32);
+  base.set_version(ModelDelta::Version(base));
+
+  // +1 at index 1 and -3 at index 3, in int8 with a scale of 0.5.
+  Model delta;
+  delta.set_base_version(base.version());
+  auto *tensor = delta.add_tensors();
+  *tensor = base.tensors(0);
+  tensor->set_value(std::string({2, -6}));
+  tensor->mutable_quantization()->set_type(Quantization_Type_INT8);
+  tensor->mutable_quantization()->add_scales(0.5f);
+  tensor->mutable_sparsity()->set_encoding(Sparsity_Encoding_DELTA);
+  tensor->mutable_sparsity()->set_num_values(2);
+  tensor->mutable_sparsity()->set_indices(std::string({1, 2}));
+  const auto sparsity = tensor->sparsity();
+
+  ASSERT_TRUE(ModelDelta::Add(base, &delta).ok());
+  Model expected;
+  AddTensor<double>(&expected, {1, 3, 3, 1}, DType_Type_FLOAT32);
+  EXPECT_THAT(delta, EqualsProto(expected));
+
+  // Sparse deltas are only added, never taken.
+  Model sparse_base = base;
+  *sparse_base.mutable_tensors(0)->mutable_sparsity() = sparsity;
+  EXPECT_FALSE(ModelDelta::Subtract(base, sparse_base, &delta).ok());
+}
+
+TEST(ModelDeltaTest, RejectsWrongBase) /* NOLINT */ {
+  auto base = CreateModel(0);
+  auto model = CreateModel(1);
+
+  Model delta;
+  ASSERT_TRUE(ModelDelta::Subtract(model, base, &delta).ok());
+  EXPECT_FALSE(ModelDelta::Add(model, &delta).ok());
+
+  model.mutable_tensors()->RemoveLast();
+  EXPECT_FALSE(ModelDelta::Subtract(model, base, &delta).ok());
+}
+
+TEST(ModelDeltaTest, VersionIdentifiesContent) /* NOLINT */ {
+  EXPECT_EQ(CreateModel(0).version(), CreateModel(0).version());
+  EXPECT_NE(CreateModel(0).version(), CreateModel(1).version());
+}
+
+TEST(ModelDeltaTest, ReferenceRequiresItsVersion) /* NOLINT */ {
+  auto model = CreateModel(0);
+  auto reference = ModelDelta::Reference(model);
+  EXPECT_TRUE(reference.reference());
+  EXPECT_EQ(reference.tensors_size(), 0);
+  EXPECT_EQ(ModelDelta::RequiredVersion(reference), model.version());
+  EXPECT_EQ(ModelDelta::RequiredVersion(model), "");
+
+  Model delta;
+  ASSERT_TRUE(ModelDelta::Subtract(CreateModel(1), model, &delta).ok());
+  EXPECT_EQ(ModelDelta::RequiredVersion(delta), model.version());
+}
+
+TEST(ModelVersionsTest, EvictsOldestVersion) /* NOLINT */ {
+  ModelVersions versions(2);
+  std::vector<Model> models = {CreateModel(0), CreateModel(1), CreateModel(2)};
+  for (const auto &model : models) versions.Insert(model);
+
+  EXPECT_EQ(versions.Get(models[0].version()), nullptr);
+  ASSERT_NE(versions.Get(models[2].version()), nullptr);
+  EXPECT_THAT(*versions.Get(models[2].version()), EqualsProto(models[2]));
+}
+
+}  // namespace
+}  // namespace metisfl::proto
@@ -0,0 +1,25 @@
+#ifndef METISFL_METISFL_CONTROLLER_COMMON_PHASE_DURATIONS_H_
+#define METISFL_METISFL_CONTROLLER_COMMON_PHASE_DURATIONS_H_
+
+#include <algorithm>
+
+#include "metisfl/proto/controller.pb.h"
+
+namespace metisfl::controller {
+
+// Folds the phase durations of a training task into the summary of the phase
+// durations of its learner.
+inline void AddPhaseDurations(const TrainingMetadata &metadata,
+                              PhaseDurations *durations) {
+  for (const auto &[phase, duration_ms] : metadata.phase_duration_ms()) {
+    auto &summary = (*durations->mutable_phases())[phase];
+    summary.set_count(summary.count() + 1);
+    summary.set_total_ms(summary.total_ms() + duration_ms);
+    summary.set_max_ms(std::max(summary.max_ms(), duration_ms));
+    summary.set_last_ms(duration_ms);
+  }
+}
+
+}  // namespace metisfl::controller
+
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_PHASE_DURATIONS_H_
@@ -0,0 +1,43 @@
+#include "metisfl/controller/common/phase_durations.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+namespace metisfl::controller {
+namespace {
+
+using ::testing::UnorderedElementsAre;
+using ::testing::Key;
+
+TrainingMetadata Metadata(double train_ms, double upload_ms) {
+  TrainingMetadata metadata;
+  (*metadata.mutable_phase_duration_ms())["train"] = train_ms;
+  (*metadata.mutable_phase_duration_ms())["upload"] = upload_ms;
+  return metadata;
+}
+
+class PhaseDurationsTest : public ::testing::Test {};
+
+TEST_F(PhaseDurationsTest, SummarizesThePhasesOfTheTasks) /* NOLINT */ {
+  PhaseDurations durations;
+  AddPhaseDurations(Metadata(100, 20), &durations);
+  AddPhaseDurations(Metadata(300, 10), &durations);
+  // Tasks without phase durations leave the summary as it is.
+  AddPhaseDurations(TrainingMetadata(), &durations);
+
+  EXPECT_THAT(durations.phases(),
+              UnorderedElementsAre(Key("train"), Key("upload")));
+  const auto &train = durations.phases().at("train");
+  EXPECT_EQ(train.count(), 2);
+  EXPECT_DOUBLE_EQ(train.total_ms(), 400);
+  EXPECT_DOUBLE_EQ(train.max_ms(), 300);
+  EXPECT_DOUBLE_EQ(train.last_ms(), 300);
+  const auto &upload = durations.phases().at("upload");
+  EXPECT_EQ(upload.count(), 2);
+  EXPECT_DOUBLE_EQ(upload.total_ms(), 30);
+  EXPECT_DOUBLE_EQ(upload.max_ms(), 20);
+  EXPECT_DOUBLE_EQ(upload.last_ms(), 10);
+}
+
+}  // namespace
+}  // namespace metisfl::controller
@@ -1,10 +1,17 @@
-
 #ifndef METISFL_METISFL_CONTROLLER_COMMON_PROTO_TENSOR_SERDE_H_
 #define METISFL_METISFL_CONTROLLER_COMMON_PROTO_TENSOR_SERDE_H_
 
 #include <google/protobuf/text_format.h>
 
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
 #include <cstring>
+#include <iostream>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
 #include <vector>
 
 #include "metisfl/controller/common/macros.h"
@@ -15,28 +22,251 @@ namespace proto {
 
 class TensorOps {
  public:
-  static std::vector<double> DeserializeTensor(const metisfl::Tensor &tensor) {
-    const auto tensor_bytes = tensor.value().c_str();
-    const auto tensor_elements_num = tensor.length();
-    std::vector<double> deserialized_tensor(tensor_elements_num);
-    std::memcpy(&deserialized_tensor[0], tensor_bytes,
-                tensor_elements_num * sizeof(double));
+  // Returns the size in bytes of a single element of the given data type.
+  static size_t DTypeSize(const DType_Type type) {
+    switch (type) {
+      case DType_Type_FLOAT64:
+      case DType_Type_INT64:
+      case DType_Type_UINT64:
+        return 8;
+      case DType_Type_FLOAT32:
+      case DType_Type_INT32:
+      case DType_Type_UINT32:
+        return 4;
+      case DType_Type_FLOAT16:
+      case DType_Type_BFLOAT16:
+      case DType_Type_INT16:
+      case DType_Type_UINT16:
+        return 2;
+      case DType_Type_INT8:
+      case DType_Type_UINT8:
+        return 1;
+      default:
+        throw std::runtime_error("Unsupported tensor data type.");
+    }
+  }
+
+  // Returns whether the values of the tensor are quantized.
+  static bool IsQuantized(const metisfl::Tensor &tensor) {
+    return tensor.quantization().type() != Quantization_Type_NONE;
+  }
+
+  // Returns whether the tensor stores the values at a subset of its indices.
+  static bool IsSparse(const metisfl::Tensor &tensor) {
+    return tensor.sparsity().encoding() != Sparsity_Encoding_NONE;
+  }
+
+  // Returns whether the value of the tensor of the model holds ciphertexts.
+  static bool IsEncrypted(const metisfl::Model &model,
+                          const metisfl::Tensor &tensor) {
+    return model.encrypted() || tensor.encrypted();
+  }
+
+  // Returns whether any tensor of the model is encrypted.
+  static bool HasEncryptedTensors(const metisfl::Model &model) {
+    if (model.encrypted()) return true;
+    return std::any_of(
+        model.tensors().begin(), model.tensors().end(),
+        [](const metisfl::Tensor &tensor) { return tensor.encrypted(); });
+  }
+
+  // Returns the number of values stored in the tensor.
+  static size_t NumStoredValues(const metisfl::Tensor &tensor) {
+    return IsSparse(tensor) ? tensor.sparsity().num_values() : tensor.length();
+  }
+
+  // Returns the size in bytes of the (decoded) tensor value.
+  static size_t ValueSize(const metisfl::Tensor &tensor) {
+    const size_t num_values = NumStoredValues(tensor);
+    switch (tensor.quantization().type()) {
+      case Quantization_Type_INT8:
+        return num_values;
+      case Quantization_Type_INT4:
+        return (num_values + 1) / 2;
+      default:
+        return DTypeSize(tensor.type().type()) * num_values;
+    }
+  }
+
+  // Returns the size in bytes of every stored value; quantized values are
+  // treated as bytes.
+  static size_t ValueItemSize(const metisfl::Tensor &tensor) {
+    return IsQuantized(tensor) ? 1 : DTypeSize(tensor.type().type());
+  }
+
+  // Deserializes the tensor values, stored using the tensor's data type,
+  // into a vector of type T (e.g., float or double accumulators).
+  // Quantized values are dequantized straight into the vector and sparse
+  // tensors are expanded.
+  template <typename T = double>
+  static std::vector<T> DeserializeTensor(const metisfl::Tensor &tensor) {
+    std::vector<T> deserialized_tensor(tensor.length());
+    DeserializeTensor<T>(tensor, deserialized_tensor.data());
     return deserialized_tensor;
   }
 
-  static std::vector<char> SerializeTensor(const std::vector<double> &v) {
+  // Same as above, but writes the values into a caller-owned buffer
+  // that must hold at least tensor.length() elements.
+  template <typename T>
+  static void DeserializeTensor(const metisfl::Tensor &tensor, T *out) {
+    ValidateTensorSize(tensor);
+    if (!IsSparse(tensor)) return DeserializeValues<T>(tensor, out);
+
+    const auto indices = DecodeIndices(tensor);
+    std::vector<T> values(indices.size());
+    DeserializeValues<T>(tensor, values.data());
+    std::fill(out, out + tensor.length(), T(0));
+    for (size_t i = 0; i < indices.size(); ++i) out[indices[i]] = values[i];
+  }
+
+  // Adds the tensor values, multiplied by the scale, to the accumulator that
+  // holds tensor.length() elements. Only the stored values of sparse tensors
+  // are added, i.e., they are scattered straight into the accumulator.
+  template <typename T>
+  static void AccumulateTensor(const metisfl::Tensor &tensor, T scale,
+                               T *accumulator) {
+    ValidateTensorSize(tensor);
+    // Reused across the tensors accumulated by the same thread.
+    thread_local std::vector<T> values;
+    values.resize(NumStoredValues(tensor));
+    DeserializeValues<T>(tensor, values.data());
+
+    if (!IsSparse(tensor)) {
+      for (size_t i = 0; i < values.size(); ++i)
+        accumulator[i] += scale * values[i];
+      return;
+    }
+    const auto indices = DecodeIndices(tensor);
+    for (size_t i = 0; i < indices.size(); ++i)
+      accumulator[indices[i]] += scale * values[i];
+  }
+
+  // Returns the indices of the values stored in a sparse tensor, in order.
+  static std::vector<uint32_t> DecodeIndices(const metisfl::Tensor &tensor) {
+    const auto &sparsity = tensor.sparsity();
+    const auto *bytes =
+        reinterpret_cast<const uint8_t *>(sparsity.indices().data());
+    const size_t num_bytes = sparsity.indices().size();
+    std::vector<uint32_t> indices;
+    indices.reserve(sparsity.num_values());
+
+    if (sparsity.encoding() == Sparsity_Encoding_BITMAP) {
+      if (num_bytes != (tensor.length() + 7) / 8) {
+        throw std::runtime_error("Bitmap does not match the tensor length.");
+      }
+      for (size_t byte = 0; byte < num_bytes; ++byte) {
+        for (unsigned bits = bytes[byte]; bits != 0; bits &= bits - 1) {
+          indices.push_back(byte * 8 + __builtin_ctz(bits));
+        }
+      }
+    } else if (sparsity.encoding() == Sparsity_Encoding_DELTA) {
+      uint64_t index = 0;
+      for (size_t i = 0; i < num_bytes;) {
+        uint64_t gap = 0;
+        for (int shift = 0;; shift += 7) {
+          if (i == num_bytes || shift > 28) {
+            throw std::runtime_error("Malformed sparse tensor indices.");
+          }
+          gap |= static_cast<uint64_t>(bytes[i] & 0x7F) << shift;
+          if ((bytes[i++] & 0x80) == 0) break;
+        }
+        if (!indices.empty() && gap == 0) {
+          throw std::runtime_error("Sparse tensor indices are not increasing.");
+        }
+        index += gap;
+        if (index >= tensor.length()) break;
+        indices.push_back(index);
+      }
+    } else {
+      throw std::runtime_error("Unsupported sparse tensor encoding.");
+    }
+
+    if (indices.size() != sparsity.num_values() ||
+        (!indices.empty() && indices.back() >= tensor.length())) {
+      throw std::runtime_error(
+          "Sparse tensor indices do not match its stored values.");
+    }
+    return indices;
+  }
+
+  // Serializes the raw bytes of the given vector, i.e., the values are
+  // stored using the data type T of the vector.
+  template <typename T = double>
+  static std::vector<char> SerializeTensor(const std::vector<T> &v) {
     auto num_elements = v.size();
-    std::vector<char> serialized_tensor(num_elements * sizeof(double));
-    std::memcpy(&serialized_tensor[0], &v[0], num_elements * sizeof(double));
+    std::vector<char> serialized_tensor(num_elements * sizeof(T));
+    std::memcpy(serialized_tensor.data(), v.data(), num_elements * sizeof(T));
+    return serialized_tensor;
+  }
+
+  // Serializes the given vector using the given tensor data type, so that
+  // the aggregated tensors are shipped with the same type they were received.
+  template <typename T>
+  static std::string SerializeTensor(const std::vector<T> &v,
+                                     const DType_Type type) {
+    const size_t num_values = v.size();
+    std::string serialized_tensor(num_values * DTypeSize(type), '\0');
+    auto *bytes = serialized_tensor.data();
+
+    switch (type) {
+      case DType_Type_FLOAT64:
+        StoreValues<T, double>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_FLOAT32:
+        StoreValues<T, float>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_FLOAT16:
+        StoreHalfValues<T>(v.data(), num_values, bytes, FloatToHalf);
+        break;
+      case DType_Type_BFLOAT16:
+        StoreHalfValues<T>(v.data(), num_values, bytes, FloatToBFloat16);
+        break;
+      case DType_Type_INT8:
+        StoreValues<T, int8_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_INT16:
+        StoreValues<T, int16_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_INT32:
+        StoreValues<T, int32_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_INT64:
+        StoreValues<T, int64_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_UINT8:
+        StoreValues<T, uint8_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_UINT16:
+        StoreValues<T, uint16_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_UINT32:
+        StoreValues<T, uint32_t>(v.data(), num_values, bytes);
+        break;
+      case DType_Type_UINT64:
+        StoreValues<T, uint64_t>(v.data(), num_values, bytes);
+        break;
+      default:
+        throw std::runtime_error("Unsupported tensor data type.");
+    }
     return serialized_tensor;
   }
 
+  // Restores a quantized and/or sparse tensor to a dense tensor that stores
+  // all its values with its data type, in place.
+  static void DensifyTensor(metisfl::Tensor *tensor) {
+    if (!IsQuantized(*tensor) && !IsSparse(*tensor)) return;
+    const auto values = DeserializeTensor<double>(*tensor);
+    *tensor->mutable_value() = SerializeTensor<double>(values, tensor->type().type());
+    tensor->clear_quantization();
+    tensor->clear_sparsity();
+  }
+
   static metisfl::TensorQuantifier QuantifyTensor(
       const metisfl::Tensor &tensor) {
     auto t = TensorOps::DeserializeTensor(tensor);
     auto t_zeros = std::count(t.begin(), t.end(), 0);
     auto t_non_zeros = t.size() - t_zeros;
-    auto t_bytes = sizeof(double) * t.size();
+    auto t_bytes = DTypeSize(tensor.type().type()) * t.size();
     auto tensor_quantifier = metisfl::TensorQuantifier();
     tensor_quantifier.set_tensor_non_zeros(t_non_zeros);
     tensor_quantifier.set_tensor_zeros(t_zeros);
@@ -44,10 +274,11 @@ class TensorOps {
     return tensor_quantifier;
   }
 
+  template <typename T = double>
   static void PrintSerializedTensor(const std::string &str,
                                     const uint32_t num_values) {
-    std::vector<double> loaded_values(num_values);
-    std::memcpy(&loaded_values[0], str.c_str(), num_values * sizeof(double));
+    std::vector<T> loaded_values(num_values);
+    std::memcpy(&loaded_values[0], str.c_str(), num_values * sizeof(T));
     for (auto val : loaded_values) {
       std::cout << val << ", ";
     }
@@ -60,9 +291,259 @@ class TensorOps {
     VALIDATE(google::protobuf::TextFormat::ParseFromString(input, &result));
     return result;
   }
+
+  // IEEE-754 half precision to single precision conversion.
+  static float HalfToFloat(uint16_t h) {
+    const uint32_t sign = static_cast<uint32_t>(h & 0x8000) << 16;
+    uint32_t exponent = (h >> 10) & 0x1F;
+    uint32_t mantissa = h & 0x3FF;
+    uint32_t bits;
+
+    if (exponent == 0x1F) {
+      // Inf or NaN.
+      bits = sign | 0x7F800000 | (mantissa << 13);
+    } else if (exponent == 0) {
+      if (mantissa == 0) {
+        bits = sign;
+      } else {
+        // Subnormal half, normalize it.
+        exponent = 127 - 15 + 1;
+        while ((mantissa & 0x400) == 0) {
+          mantissa <<= 1;
+          exponent--;
+        }
+        mantissa &= 0x3FF;
+        bits = sign | (exponent << 23) | (mantissa << 13);
+      }
+    } else {
+      bits = sign | ((exponent + 127 - 15) << 23) | (mantissa << 13);
+    }
+
+    float f;
+    std::memcpy(&f, &bits, sizeof(f));
+    return f;
+  }
+
+  // Single precision to IEEE-754 half precision conversion,
+  // using round-to-nearest-even.
+  static uint16_t FloatToHalf(float f) {
+    uint32_t bits;
+    std::memcpy(&bits, &f, sizeof(bits));
+
+    const uint16_t sign = (bits >> 16) & 0x8000;
+    const int32_t exponent = static_cast<int32_t>((bits >> 23) & 0xFF);
+    uint32_t mantissa = bits & 0x7FFFFF;
+
+    if (exponent == 0xFF) {
+      // Inf or NaN, keep a quiet NaN bit set for NaNs.
+      return sign | 0x7C00 | (mantissa ? 0x200 : 0);
+    }
+
+    int32_t half_exponent = exponent - 127 + 15;
+    if (half_exponent >= 0x1F) {
+      // Overflow, round to infinity.
+      return sign | 0x7C00;
+    }
+
+    if (half_exponent <= 0) {
+      // Subnormal half or zero.
+      if (half_exponent < -10) return sign;
+      mantissa |= 0x800000;
+      const uint32_t shift = 14 - half_exponent;
+      uint32_t half_mantissa = mantissa >> shift;
+      const uint32_t remainder = mantissa & ((1u << shift) - 1);
+      const uint32_t halfway = 1u << (shift - 1);
+      if (remainder > halfway ||
+          (remainder == halfway && (half_mantissa & 1))) {
+        half_mantissa++;
+      }
+      return sign | static_cast<uint16_t>(half_mantissa);
+    }
+
+    uint32_t half = (static_cast<uint32_t>(half_exponent) << 10) |
+                    (mantissa >> 13);
+    const uint32_t remainder = mantissa & 0x1FFF;
+    if (remainder > 0x1000 || (remainder == 0x1000 && (half & 1))) {
+      // May carry over to the exponent, which is the correct rounding.
+      half++;
+    }
+    return sign | static_cast<uint16_t>(half);
+  }
+
+  static float BFloat16ToFloat(uint16_t b) {
+    const uint32_t bits = static_cast<uint32_t>(b) << 16;
+    float f;
+    std::memcpy(&f, &bits, sizeof(f));
+    return f;
+  }
+
+  // Single precision to bfloat16 conversion, using round-to-nearest-even.
+  static uint16_t FloatToBFloat16(float f) {
+    uint32_t bits;
+    std::memcpy(&bits, &f, sizeof(bits));
+    if ((bits & 0x7F800000) == 0x7F800000 && (bits & 0x7FFFFF)) {
+      // NaN, keep it a quiet NaN after truncation.
+      return static_cast<uint16_t>((bits >> 16) | 0x40);
+    }
+    const uint32_t rounding_bias = 0x7FFF + ((bits >> 16) & 1);
+    return static_cast<uint16_t>((bits + rounding_bias) >> 16);
+  }
+
+ private:
+  static void ValidateTensorSize(const metisfl::Tensor &tensor) {
+    if (tensor.value().size() < ValueSize(tensor)) {
+      throw std::runtime_error(
+          "Tensor value holds fewer bytes than its length and type imply.");
+    }
+    if (IsQuantized(tensor) &&
+        static_cast<size_t>(tensor.quantization().scales_size()) !=
+            NumQuantizationBlocks(tensor)) {
+      throw std::runtime_error(
+          "Tensor holds fewer or more scales than its quantization blocks.");
+    }
+  }
+
+  // Deserializes the stored values of the tensor into out, which must hold
+  // NumStoredValues(tensor) elements.
+  template <typename T>
+  static void DeserializeValues(const metisfl::Tensor &tensor, T *out) {
+    if (IsQuantized(tensor)) return DequantizeValues<T>(tensor, out);
+
+    const auto *bytes = tensor.value().data();
+    const size_t num_values = NumStoredValues(tensor);
+    switch (tensor.type().type()) {
+      case DType_Type_FLOAT64:
+        return CastValues<double, T>(bytes, num_values, out);
+      case DType_Type_FLOAT32:
+        return CastValues<float, T>(bytes, num_values, out);
+      case DType_Type_FLOAT16:
+        return CastHalfValues<T>(bytes, num_values, out, HalfToFloat);
+      case DType_Type_BFLOAT16:
+        return CastHalfValues<T>(bytes, num_values, out, BFloat16ToFloat);
+      case DType_Type_INT8:
+        return CastValues<int8_t, T>(bytes, num_values, out);
+      case DType_Type_INT16:
+        return CastValues<int16_t, T>(bytes, num_values, out);
+      case DType_Type_INT32:
+        return CastValues<int32_t, T>(bytes, num_values, out);
+      case DType_Type_INT64:
+        return CastValues<int64_t, T>(bytes, num_values, out);
+      case DType_Type_UINT8:
+        return CastValues<uint8_t, T>(bytes, num_values, out);
+      case DType_Type_UINT16:
+        return CastValues<uint16_t, T>(bytes, num_values, out);
+      case DType_Type_UINT32:
+        return CastValues<uint32_t, T>(bytes, num_values, out);
+      case DType_Type_UINT64:
+        return CastValues<uint64_t, T>(bytes, num_values, out);
+      default:
+        throw std::runtime_error("Unsupported tensor data type.");
+    }
+  }
+
+  static size_t NumQuantizationBlocks(const metisfl::Tensor &tensor) {
+    const size_t num_values = NumStoredValues(tensor);
+    const size_t block_size = tensor.quantization().block_size();
+    if (block_size == 0) return num_values > 0 ? 1 : 0;
+    return (num_values + block_size - 1) / block_size;
+  }
+
+  template <typename T>
+  static void DequantizeValues(const metisfl::Tensor &tensor, T *out) {
+    const auto &quantization = tensor.quantization();
+    const auto *bytes =
+        reinterpret_cast<const uint8_t *>(tensor.value().data());
+    const size_t num_values = NumStoredValues(tensor);
+    const size_t block_size =
+        quantization.block_size() > 0 ? quantization.block_size() : num_values;
+    const bool int4 = quantization.type() == Quantization_Type_INT4;
+
+    for (size_t start = 0, block = 0; start < num_values;
+         start += block_size, ++block) {
+      const auto scale = static_cast<T>(quantization.scales(block));
+      const size_t end = std::min(start + block_size, num_values);
+      for (size_t i = start; i < end; ++i) {
+        int value;
+        if (int4) {
+          const int nibble = i % 2 == 0 ? bytes[i / 2] & 0x0F : bytes[i / 2] >> 4;
+          value = nibble >= 8 ? nibble - 16 : nibble;
+        } else {
+          value = static_cast<int8_t>(bytes[i]);
+        }
+        out[i] = static_cast<T>(value) * scale;
+      }
+    }
+  }
+
+  template <typename S, typename T>
+  static void CastValues(const char *bytes, size_t num_values, T *out) {
+    if constexpr (std::is_same_v<S, T>) {
+      std::memcpy(out, bytes, num_values * sizeof(S));
+    } else {
+      S value;
+      for (size_t i = 0; i < num_values; ++i) {
+        std::memcpy(&value, bytes + i * sizeof(S), sizeof(S));
+        out[i] = static_cast<T>(value);
+      }
+    }
+  }
+
+  template <typename T>
+  static void CastHalfValues(const char *bytes, size_t num_values, T *out,
+                             float (*to_float)(uint16_t)) {
+    uint16_t value;
+    for (size_t i = 0; i < num_values; ++i) {
+      std::memcpy(&value, bytes + i * sizeof(uint16_t), sizeof(uint16_t));
+      out[i] = static_cast<T>(to_float(value));
+    }
+  }
+
+  template <typename T, typename S>
+  static void StoreValues(const T *values, size_t num_values, char *bytes) {
+    if constexpr (std::is_same_v<S, T>) {
+      std::memcpy(bytes, values, num_values * sizeof(S));
+    } else {
+      S value;
+      for (size_t i = 0; i < num_values; ++i) {
+        if constexpr (std::is_integral_v<S> && std::is_floating_point_v<T>) {
+          value = ToInteger<S, T>(values[i]);
+        } else {
+          value = static_cast<S>(values[i]);
+        }
+        std::memcpy(bytes + i * sizeof(S), &value, sizeof(S));
+      }
+    }
+  }
+
+  // Rounds the value to the nearest integer and clamps it to the range of the
+  // integer type, since casting a value out of range is undefined behavior.
+  // NaN is stored as zero.
+  template <typename S, typename T>
+  static S ToInteger(T value) {
+    if (std::isnan(value)) return 0;
+    value = std::nearbyint(value);
+    // The limits are rounded up to a power of two in T, if not representable.
+    if (value >= static_cast<T>(std::numeric_limits<S>::max())) {
+      return std::numeric_limits<S>::max();
+    }
+    if (value <= static_cast<T>(std::numeric_limits<S>::lowest())) {
+      return std::numeric_limits<S>::lowest();
+    }
+    return static_cast<S>(value);
+  }
+
+  template <typename T>
+  static void StoreHalfValues(const T *values, size_t num_values, char *bytes,
+                              uint16_t (*from_float)(float)) {
+    uint16_t value;
+    for (size_t i = 0; i < num_values; ++i) {
+      value = from_float(static_cast<float>(values[i]));
+      std::memcpy(bytes + i * sizeof(uint16_t), &value, sizeof(uint16_t));
+    }
+  }
 };
 }  // namespace proto
 
 }  // namespace metisfl
 
-#endif  // METISFL_METISFL_CONTROLLER_COMMON_PROTO_TENSOR_SERDE_H_
\ No newline at end of file
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_PROTO_TENSOR_SERDE_H_
@@ -3,7 +3,10 @@
 
 #include <gtest/gtest.h>
 
+#include <cmath>
+#include <cstring>
 #include <iostream>
+#include <limits>
 
 #include "metisfl/controller/common/macros.h"
 #include "metisfl/proto/model.pb.h"
@@ -47,5 +50,191 @@ TEST_F(ProtoTensorSerDe, DeSerFLOAT64) /* NOLINT */ {
   EXPECT_TRUE(are_vectors_equal);
 }
 
+TEST_F(ProtoTensorSerDe, DeSerFLOAT64AsFloat) /* NOLINT */ {
+  auto tensor_float64 =
+      TensorOps::ParseTextOrDie<metisfl::Tensor>(kTensor_1to10_as_FLOAT64);
+  auto deserialized_tensor = TensorOps::DeserializeTensor<float>(tensor_float64);
+
+  std::vector<float> expected({1, 2, 3, 4, 5, 6, 7, 8, 9, 10});
+  EXPECT_EQ(deserialized_tensor, expected);
+}
+
+TEST_F(ProtoTensorSerDe, DeSerFLOAT16) /* NOLINT */ {
+  std::vector<float> values({1.0f, -2.5f, 0.125f, 65504.0f, 0.0f});
+
+  metisfl::Tensor tensor;
+  tensor.set_length(values.size());
+  tensor.add_dimensions(values.size());
+  tensor.mutable_type()->set_type(metisfl::DType_Type_FLOAT16);
+  *tensor.mutable_value() =
+      TensorOps::SerializeTensor<float>(values, metisfl::DType_Type_FLOAT16);
+
+  EXPECT_EQ(tensor.value().size(), values.size() * 2);
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(tensor), values);
+}
+
+TEST_F(ProtoTensorSerDe, DeSerBFLOAT16) /* NOLINT */ {
+  std::vector<double> values({1.0, -2.5, 0.125, 3.0e38, 0.0});
+
+  metisfl::Tensor tensor;
+  tensor.set_length(values.size());
+  tensor.add_dimensions(values.size());
+  tensor.mutable_type()->set_type(metisfl::DType_Type_BFLOAT16);
+  *tensor.mutable_value() =
+      TensorOps::SerializeTensor<double>(values, metisfl::DType_Type_BFLOAT16);
+
+  EXPECT_EQ(tensor.value().size(), values.size() * 2);
+  auto deserialized_tensor = TensorOps::DeserializeTensor<double>(tensor);
+  for (size_t i = 0; i < values.size(); ++i) {
+    EXPECT_NEAR(deserialized_tensor[i], values[i], std::abs(values[i]) / 128);
+  }
+}
+
+TEST_F(ProtoTensorSerDe, DeSerINT32) /* NOLINT */ {
+  std::vector<double> values({-3, 0, 7, 1 << 20});
+
+  metisfl::Tensor tensor;
+  tensor.set_length(values.size());
+  tensor.add_dimensions(values.size());
+  tensor.mutable_type()->set_type(metisfl::DType_Type_INT32);
+  *tensor.mutable_value() =
+      TensorOps::SerializeTensor<double>(values, metisfl::DType_Type_INT32);
+
+  EXPECT_EQ(TensorOps::DeserializeTensor<double>(tensor), values);
+}
+
+TEST_F(ProtoTensorSerDe, SerINT8RoundsAndClamps) /* NOLINT */ {
+  std::vector<double> values({-2.6, -0.4, 2.5, 3.5, 126.7, 300, -1e9, NAN});
+
+  metisfl::Tensor tensor;
+  tensor.set_length(values.size());
+  tensor.add_dimensions(values.size());
+  tensor.mutable_type()->set_type(metisfl::DType_Type_INT8);
+  *tensor.mutable_value() =
+      TensorOps::SerializeTensor<double>(values, metisfl::DType_Type_INT8);
+
+  // Ties are rounded to even, as in the default rounding mode.
+  EXPECT_EQ(TensorOps::DeserializeTensor<double>(tensor),
+            std::vector<double>({-3, 0, 2, 4, 127, 127, -128, 0}));
+}
+
+TEST_F(ProtoTensorSerDe, SerUINT64Clamps) /* NOLINT */ {
+  std::vector<double> values({-1, 1e30});
+
+  metisfl::Tensor tensor;
+  tensor.set_length(values.size());
+  tensor.add_dimensions(values.size());
+  tensor.mutable_type()->set_type(metisfl::DType_Type_UINT64);
+  *tensor.mutable_value() =
+      TensorOps::SerializeTensor<double>(values, metisfl::DType_Type_UINT64);
+
+  uint64_t stored[2];
+  std::memcpy(stored, tensor.value().data(), sizeof(stored));
+  EXPECT_EQ(stored[0], 0);
+  EXPECT_EQ(stored[1], std::numeric_limits<uint64_t>::max());
+}
+
+TEST_F(ProtoTensorSerDe, DequantizeINT8Blocks) /* NOLINT */ {
+  metisfl::Tensor tensor;
+  tensor.set_length(5);
+  tensor.add_dimensions(5);
+  tensor.mutable_type()->set_type(metisfl::DType_Type_FLOAT32);
+  tensor.mutable_quantization()->set_type(metisfl::Quantization_Type_INT8);
+  tensor.mutable_quantization()->set_block_size(2);
+  for (float scale : {0.5f, 2.0f, 0.25f}) {
+    tensor.mutable_quantization()->add_scales(scale);
+  }
+  const int8_t values[] = {-127, 4, 3, -1, 8};
+  tensor.set_value(reinterpret_cast<const char *>(values), sizeof(values));
+
+  std::vector<float> expected({-63.5f, 2.0f, 6.0f, -2.0f, 2.0f});
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(tensor), expected);
+
+  TensorOps::DensifyTensor(&tensor);
+  EXPECT_FALSE(TensorOps::IsQuantized(tensor));
+  EXPECT_EQ(tensor.value().size(), 5 * sizeof(float));
+  EXPECT_EQ(TensorOps::DeserializeTensor<float>(tensor), expected);
+}
+
+TEST_F(ProtoTensorSerDe, DequantizeINT4) /* NOLINT */ {
+  metisfl::Tensor tensor;
+  tensor.set_length(3);
+  tensor.add_dimensions(3);
+  tensor.mutable_type()->set_type(metisfl::DType_Type_FLOAT64);
+  tensor.mutable_quantization()->set_type(metisfl::Quantization_Type_INT4);
+  tensor.mutable_quantization()->add_scales(0.5f);
+  // -7 (0x9) and 3 in the first byte, 7 in the low nibble of the second.
+  tensor.set_value(std::string({static_cast<char>(0x39), 0x07}));
+
+  std::vector<double> expected({-3.5, 1.5, 3.5});
+  EXPECT_EQ(TensorOps::DeserializeTensor<double>(tensor), expected);
+
+  tensor.mutable_quantization()->add_scales(1.0f);
+  EXPECT_THROW(TensorOps::DeserializeTensor<double>(tensor),
+               std::runtime_error);
+}
+
+TEST_F(ProtoTensorSerDe, SparseDeltaAndBitmap) /* NOLINT */ {
+  metisfl::Tensor tensor;
+  tensor.set_length(300);
+  tensor.add_dimensions(300);
+  tensor.mutable_type()->set_type(metisfl::DType_Type_FLOAT32);
+  *tensor.mutable_value() = TensorOps::SerializeTensor<float>(
+      {1.5f, -2.0f, 4.0f}, metisfl::DType_Type_FLOAT32);
+  tensor.mutable_sparsity()->set_num_values(3);
+
+  // Indices 2, 130 and 299: gaps of 2, 128 (two bytes) and 169 (two bytes).
+  tensor.mutable_sparsity()->set_encoding(metisfl::Sparsity_Encoding_DELTA);
+  tensor.mutable_sparsity()->set_indices(
+      std::string({0x02, static_cast<char>(0x80), 0x01,
+                   static_cast<char>(0xA9), 0x01}));
+  auto dense = TensorOps::DeserializeTensor<double>(tensor);
+  std::vector<double> expected(300);
+  expected[2] = 1.5;
+  expected[130] = -2.0;
+  expected[299] = 4.0;
+  EXPECT_EQ(dense, expected);
+
+  std::string bitmap(38, '\0');
+  bitmap[0] = 0x04;
+  bitmap[16] = 0x04;
+  bitmap[37] = 0x08;
+  tensor.mutable_sparsity()->set_encoding(metisfl::Sparsity_Encoding_BITMAP);
+  tensor.mutable_sparsity()->set_indices(bitmap);
+  EXPECT_EQ(TensorOps::DeserializeTensor<double>(tensor), expected);
+
+  // Scattered into the accumulator, scaled.
+  std::vector<double> accumulator(300, 1.0);
+  TensorOps::AccumulateTensor<double>(tensor, 2.0, accumulator.data());
+  EXPECT_EQ(accumulator[1], 1.0);
+  EXPECT_EQ(accumulator[2], 4.0);
+  EXPECT_EQ(accumulator[299], 9.0);
+
+  TensorOps::DensifyTensor(&tensor);
+  EXPECT_FALSE(TensorOps::IsSparse(tensor));
+  EXPECT_EQ(TensorOps::DeserializeTensor<double>(tensor), expected);
+}
+
+TEST_F(ProtoTensorSerDe, RejectsMalformedSparseIndices) /* NOLINT */ {
+  metisfl::Tensor tensor;
+  tensor.set_length(10);
+  tensor.mutable_type()->set_type(metisfl::DType_Type_FLOAT32);
+  *tensor.mutable_value() =
+      TensorOps::SerializeTensor<float>({1.0f, 2.0f}, metisfl::DType_Type_FLOAT32);
+  tensor.mutable_sparsity()->set_num_values(2);
+  tensor.mutable_sparsity()->set_encoding(metisfl::Sparsity_Encoding_DELTA);
+
+  // Out of range.
+  tensor.mutable_sparsity()->set_indices(std::string({0x01, 0x09}));
+  EXPECT_THROW(TensorOps::DeserializeTensor<float>(tensor), std::runtime_error);
+  // Not increasing.
+  tensor.mutable_sparsity()->set_indices(std::string({0x01, 0x00}));
+  EXPECT_THROW(TensorOps::DeserializeTensor<float>(tensor), std::runtime_error);
+  // Truncated varint.
+  tensor.mutable_sparsity()->set_indices(
+      std::string({0x01, static_cast<char>(0x81)}));
+  EXPECT_THROW(TensorOps::DeserializeTensor<float>(tensor), std::runtime_error);
+}
+
 }  // namespace
 }  // namespace proto
@@ -0,0 +1,189 @@
+#include "metisfl/controller/common/self_masks.h"
+
+#include <cstring>
+
+#include "absl/numeric/int128.h"
+#include "absl/status/status.h"
+#include "absl/strings/str_cat.h"
+
+namespace metisfl::proto {
+
+namespace {
+
+constexpr size_t kSeedWords = SelfMasks::kSeedSize / sizeof(uint32_t);
+
+// The rate of SHAKE-256 in bytes, i.e., the part of the state that is absorbed
+// into and squeezed out of at every permutation.
+constexpr size_t kShake256Rate = 136;
+
+constexpr uint64_t kRoundConstants[24] = {
+    0x0000000000000001ULL, 0x0000000000008082ULL, 0x800000000000808aULL,
+    0x8000000080008000ULL, 0x000000000000808bULL, 0x0000000080000001ULL,
+    0x8000000080008081ULL, 0x8000000000008009ULL, 0x000000000000008aULL,
+    0x0000000000000088ULL, 0x0000000080008009ULL, 0x000000008000000aULL,
+    0x000000008000808bULL, 0x800000000000008bULL, 0x8000000000008089ULL,
+    0x8000000000008003ULL, 0x8000000000008002ULL, 0x8000000000000080ULL,
+    0x000000000000800aULL, 0x800000008000000aULL, 0x8000000080008081ULL,
+    0x8000000000008080ULL, 0x0000000080000001ULL, 0x8000000080008008ULL};
+
+// The rotations of the rho step, along the lanes visited by the pi step.
+constexpr int kRotations[24] = {1,  3,  6,  10, 15, 21, 28, 36,
+                                45, 55, 2,  14, 27, 41, 56, 8,
+                                25, 43, 62, 18, 39, 61, 20, 44};
+constexpr int kLanes[24] = {10, 7,  11, 17, 18, 3, 5,  16, 8,  21, 24, 4,
+                            15, 23, 19, 13, 12, 2, 20, 14, 22, 9,  6,  1};
+
+inline uint64_t RotateLeft(uint64_t value, int shift) {
+  return (value << shift) | (value >> (64 - shift));
+}
+
+// The Keccak-f[1600] permutation of FIPS 202.
+void KeccakF1600(uint64_t state[25]) {
+  for (int round = 0; round < 24; ++round) {
+    // Theta.
+    uint64_t columns[5];
+    for (int x = 0; x < 5; ++x) {
+      columns[x] = state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^
+                   state[x + 20];
+    }
+    for (int x = 0; x < 5; ++x) {
+      auto parity = columns[(x + 4) % 5] ^ RotateLeft(columns[(x + 1) % 5], 1);
+      for (int y = 0; y < 25; y += 5) state[y + x] ^= parity;
+    }
+    // Rho and pi.
+    auto current = state[1];
+    for (int i = 0; i < 24; ++i) {
+      auto next = state[kLanes[i]];
+      state[kLanes[i]] = RotateLeft(current, kRotations[i]);
+      current = next;
+    }
+    // Chi.
+    for (int y = 0; y < 25; y += 5) {
+      uint64_t row[5];
+      for (int x = 0; x < 5; ++x) row[x] = state[y + x];
+      for (int x = 0; x < 5; ++x) {
+        state[y + x] = row[x] ^ (~row[(x + 1) % 5] & row[(x + 2) % 5]);
+      }
+    }
+    // Iota.
+    state[0] ^= kRoundConstants[round];
+  }
+}
+
+// The bytes of the state are those of its lanes, in little-endian order.
+inline void XorByte(uint64_t state[25], size_t offset, uint8_t byte) {
+  state[offset / 8] ^= static_cast<uint64_t>(byte) << (8 * (offset % 8));
+}
+
+inline uint8_t GetByte(const uint64_t state[25], size_t offset) {
+  return static_cast<uint8_t>(state[offset / 8] >> (8 * (offset % 8)));
+}
+
+uint64_t MultiplyMod(uint64_t a, uint64_t b) {
+  return static_cast<uint64_t>(absl::uint128(a) * b % SelfMasks::kPrime);
+}
+
+uint64_t PowerMod(uint64_t base, uint64_t exponent) {
+  uint64_t result = 1;
+  for (; exponent > 0; exponent >>= 1) {
+    if (exponent & 1) result = MultiplyMod(result, base);
+    base = MultiplyMod(base, base);
+  }
+  return result;
+}
+
+}  // namespace
+
+absl::StatusOr<std::string> SelfMasks::ReconstructSeed(
+    const std::vector<std::pair<uint64_t, std::string>> &shares) {
+  if (shares.empty()) {
+    return absl::InvalidArgumentError("No shares are given.");
+  }
+  std::vector<std::vector<uint64_t>> values;
+  for (const auto &[index, share] : shares) {
+    if (share.size() != kShareSize || index == 0 || index >= kPrime) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Invalid share of index ", index, "."));
+    }
+    values.emplace_back(kSeedWords);
+    std::memcpy(values.back().data(), share.data(), kShareSize);
+    for (auto value : values.back()) {
+      if (value >= kPrime) {
+        return absl::InvalidArgumentError(
+            absl::StrCat("Invalid share of index ", index, "."));
+      }
+    }
+  }
+
+  // The Lagrange coefficients of the polynomials at 0.
+  std::vector<uint64_t> coefficients;
+  for (const auto &[index, _] : shares) {
+    uint64_t numerator = 1, denominator = 1;
+    for (const auto &[other, __] : shares) {
+      if (other == index) continue;
+      numerator = MultiplyMod(numerator, other);
+      denominator =
+          MultiplyMod(denominator, (other + kPrime - index) % kPrime);
+    }
+    if (denominator == 0) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Share of index ", index, " is given twice."));
+    }
+    coefficients.push_back(
+        MultiplyMod(numerator, PowerMod(denominator, kPrime - 2)));
+  }
+
+  std::string seed(kSeedSize, '\0');
+  for (size_t word = 0; word < kSeedWords; ++word) {
+    uint64_t value = 0;
+    for (size_t i = 0; i < shares.size(); ++i) {
+      value = (value + MultiplyMod(coefficients[i], values[i][word])) % kPrime;
+    }
+    // Too few shares reconstruct random field elements rather than words.
+    if (value >> 32) {
+      return absl::InvalidArgumentError("Shares do not reconstruct a seed.");
+    }
+    auto seed_word = static_cast<uint32_t>(value);
+    std::memcpy(seed.data() + word * sizeof(uint32_t), &seed_word,
+                sizeof(uint32_t));
+  }
+  return seed;
+}
+
+std::vector<uint64_t> SelfMasks::ExpandMasks(const std::string &seed,
+                                             size_t length) {
+  auto stream = Shake256(seed, length * sizeof(uint64_t));
+  std::vector<uint64_t> masks(length);
+  std::memcpy(masks.data(), stream.data(), stream.size());
+  return masks;
+}
+
+std::string SelfMasks::Shake256(const std::string &input, size_t length) {
+  uint64_t state[25] = {0};
+
+  size_t offset = 0;
+  for (unsigned char byte : input) {
+    XorByte(state, offset++, byte);
+    if (offset == kShake256Rate) {
+      KeccakF1600(state);
+      offset = 0;
+    }
+  }
+  // The domain separation of SHAKE and the padding.
+  XorByte(state, offset, 0x1f);
+  XorByte(state, kShake256Rate - 1, 0x80);
+  KeccakF1600(state);
+
+  std::string output(length, '\0');
+  offset = 0;
+  for (size_t i = 0; i < length; ++i) {
+    if (offset == kShake256Rate) {
+      KeccakF1600(state);
+      offset = 0;
+    }
+    output[i] = static_cast<char>(GetByte(state, offset++));
+  }
+  return output;
+}
+
+}  // namespace metisfl::proto
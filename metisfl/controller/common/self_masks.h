@@ -0,0 +1,42 @@
+#ifndef METISFL_METISFL_CONTROLLER_COMMON_SELF_MASKS_H_
+#define METISFL_METISFL_CONTROLLER_COMMON_SELF_MASKS_H_
+
+#include <cstdint>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "absl/status/statusor.h"
+
+namespace metisfl::proto {
+
+// The self masks of pairwise-masked models, as by the Python learners
+// (metisfl/encryption/masking.py). The seed of every self mask is split into
+// Shamir shares: its 32-bit words are the constant terms of polynomials over
+// the field of the prime 2^61 - 1, which are evaluated at the (1-based) index
+// of every learner of the round. Any threshold number of shares reconstruct
+// the seed, which is expanded into the masks with SHAKE-256.
+class SelfMasks {
+ public:
+  static constexpr uint64_t kPrime = (1ULL << 61) - 1;
+  static constexpr size_t kSeedSize = 32;
+  static constexpr size_t kShareSize = 64;
+
+  // Reconstructs a seed from its shares, given along with the indices of their
+  // holders. Fails if the shares are invalid or do not reconstruct a seed,
+  // e.g., if fewer than the threshold number of shares are given.
+  static absl::StatusOr<std::string> ReconstructSeed(
+      const std::vector<std::pair<uint64_t, std::string>> &shares);
+
+  // Expands the seed into length masks, i.e., the SHAKE-256 stream of the seed
+  // as little-endian uint64 integers.
+  static std::vector<uint64_t> ExpandMasks(const std::string &seed,
+                                           size_t length);
+
+  // Returns length bytes of the SHAKE-256 stream of the input.
+  static std::string Shake256(const std::string &input, size_t length);
+};
+
+}  // namespace metisfl::proto
+
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_SELF_MASKS_H_
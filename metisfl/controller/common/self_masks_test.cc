@@ -0,0 +1,81 @@
+#include "metisfl/controller/common/self_masks.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "absl/strings/escaping.h"
+
+namespace metisfl::proto {
+namespace {
+
+using ::testing::ElementsAre;
+
+std::string Seed() {
+  std::string seed;
+  for (int i = 0; i < 32; ++i) seed.push_back(static_cast<char>(i));
+  return seed;
+}
+
+// The shares of Seed() that the Python learners drew for the indices 1 to 5,
+// with a threshold of 3.
+std::vector<std::pair<uint64_t, std::string>> Shares() {
+  return {
+      {1, absl::HexStringToBytes(
+              "d2c1dcbf51756c1a5b69dabba08b17145307d7c091aeca0f522df799c74f3a17"
+              "31547774e6fdff0e8b897a8ae8bc66090920a0d1ec2bc91607e91d69bbdd3409")},
+      {3, absl::HexStringToBytes(
+              "2744f1be4335b409dc7d24b013cb0f043470258ec95fff0fe812bbbc61a53f10"
+              "48b00acf2c55d1040863574552fc4b1436c1d119a3fec90b567d973af0b90a15")},
+      {5, absl::HexStringToBytes(
+              "0f72841a49bc8f1173f79ab2c8eabe1322140f33c72bb31b347f1646b5ed0502"
+              "ce7e544915d1b90f99d24e703243a614c426e030d51f5e1547625eb32217c602")},
+  };
+}
+
+class SelfMasksTest : public ::testing::Test {};
+
+TEST_F(SelfMasksTest, Shake256) /* NOLINT */ {
+  EXPECT_EQ(absl::BytesToHexString(SelfMasks::Shake256("", 16)),
+            "46b9dd2b0ba88d13233b3feb743eeb24");
+  // Absorbs and squeezes more than a block.
+  auto stream = SelfMasks::Shake256(std::string(200, 'a'), 300);
+  EXPECT_EQ(absl::BytesToHexString(stream.substr(284)),
+            "548f7390dfc905036b5cfe9be26fb170");
+}
+
+TEST_F(SelfMasksTest, ExpandMasks) /* NOLINT */ {
+  EXPECT_THAT(SelfMasks::ExpandMasks(Seed(), 3),
+              ElementsAre(180370761657938025ULL, 6574459994614903629ULL,
+                          1388550023433198780ULL));
+}
+
+TEST_F(SelfMasksTest, ReconstructsSeed) /* NOLINT */ {
+  auto seed = SelfMasks::ReconstructSeed(Shares());
+  ASSERT_TRUE(seed.ok());
+  EXPECT_EQ(*seed, Seed());
+}
+
+TEST_F(SelfMasksTest, RejectsTooFewShares) /* NOLINT */ {
+  auto shares = Shares();
+  shares.pop_back();
+  EXPECT_FALSE(SelfMasks::ReconstructSeed(shares).ok());
+}
+
+TEST_F(SelfMasksTest, RejectsInvalidShares) /* NOLINT */ {
+  EXPECT_FALSE(SelfMasks::ReconstructSeed({}).ok());
+
+  auto duplicated = Shares();
+  duplicated[1].first = 1;
+  EXPECT_FALSE(SelfMasks::ReconstructSeed(duplicated).ok());
+
+  auto truncated = Shares();
+  truncated[0].second.pop_back();
+  EXPECT_FALSE(SelfMasks::ReconstructSeed(truncated).ok());
+}
+
+}  // namespace
+}  // namespace metisfl::proto
@@ -0,0 +1,190 @@
+#include "metisfl/controller/common/tensor_codec.h"
+
+#include <lz4frame.h>
+#include <zstd.h>
+
+#include <future>
+#include <memory>
+#include <vector>
+
+#include "absl/strings/str_cat.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+
+namespace metisfl::proto {
+
+absl::StatusOr<Codec_Type> TensorCodec::ParseCodec(const std::string &name) {
+  if (name.empty()) return Codec_Type_NONE;
+  if (name == "Zstd") return Codec_Type_ZSTD;
+  if (name == "LZ4") return Codec_Type_LZ4;
+  if (name == "ShuffleZstd") return Codec_Type_SHUFFLE_ZSTD;
+  return absl::InvalidArgumentError(
+      absl::StrCat("Unsupported tensor codec: ", name));
+}
+
+absl::Status TensorCodec::Encode(Tensor *tensor, Codec_Type codec) {
+  if (tensor->codec() != Codec_Type_NONE) {
+    return absl::FailedPreconditionError("Tensor is already encoded.");
+  }
+  if (codec == Codec_Type_NONE) return absl::OkStatus();
+
+  std::string shuffled;
+  const std::string *value = &tensor->value();
+  if (codec == Codec_Type_SHUFFLE_ZSTD) {
+    shuffled =
+        Shuffle(tensor->value(), TensorOps::ValueItemSize(*tensor));
+    value = &shuffled;
+  }
+
+  std::string encoded;
+  if (codec == Codec_Type_ZSTD || codec == Codec_Type_SHUFFLE_ZSTD) {
+    encoded.resize(ZSTD_compressBound(value->size()));
+    const size_t size = ZSTD_compress(encoded.data(), encoded.size(),
+                                      value->data(), value->size(), kZstdLevel);
+    if (ZSTD_isError(size)) {
+      return absl::InternalError(
+          absl::StrCat("zstd compression failed: ", ZSTD_getErrorName(size)));
+    }
+    encoded.resize(size);
+  } else if (codec == Codec_Type_LZ4) {
+    LZ4F_preferences_t preferences = LZ4F_INIT_PREFERENCES;
+    preferences.frameInfo.contentSize = value->size();
+    encoded.resize(LZ4F_compressFrameBound(value->size(), &preferences));
+    const size_t size =
+        LZ4F_compressFrame(encoded.data(), encoded.size(), value->data(),
+                           value->size(), &preferences);
+    if (LZ4F_isError(size)) {
+      return absl::InternalError(
+          absl::StrCat("lz4 compression failed: ", LZ4F_getErrorName(size)));
+    }
+    encoded.resize(size);
+  } else {
+    return absl::InvalidArgumentError(
+        absl::StrCat("Unsupported tensor codec: ", codec));
+  }
+
+  *tensor->mutable_value() = std::move(encoded);
+  tensor->set_codec(codec);
+  return absl::OkStatus();
+}
+
+absl::Status TensorCodec::Decode(Tensor *tensor) {
+  const auto codec = tensor->codec();
+  if (codec == Codec_Type_NONE) return absl::OkStatus();
+
+  const size_t itemsize = TensorOps::ValueItemSize(*tensor);
+  const size_t expected_size = TensorOps::ValueSize(*tensor);
+  const auto &value = tensor->value();
+
+  std::string decoded(expected_size, '\0');
+  if (codec == Codec_Type_ZSTD || codec == Codec_Type_SHUFFLE_ZSTD) {
+    const size_t size = ZSTD_decompress(decoded.data(), decoded.size(),
+                                        value.data(), value.size());
+    if (ZSTD_isError(size)) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("zstd decompression failed: ", ZSTD_getErrorName(size)));
+    }
+    if (size != expected_size) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Decoded tensor has ", size, " bytes but ",
+                       expected_size, " bytes were expected."));
+    }
+    if (codec == Codec_Type_SHUFFLE_ZSTD) {
+      std::string unshuffled(expected_size, '\0');
+      Unshuffle(decoded, itemsize, unshuffled.data());
+      decoded.swap(unshuffled);
+    }
+  } else if (codec == Codec_Type_LZ4) {
+    LZ4F_dctx *context;
+    auto error = LZ4F_createDecompressionContext(&context, LZ4F_VERSION);
+    if (LZ4F_isError(error)) {
+      return absl::InternalError(LZ4F_getErrorName(error));
+    }
+    std::unique_ptr<LZ4F_dctx, decltype(&LZ4F_freeDecompressionContext)>
+        context_guard(context, LZ4F_freeDecompressionContext);
+
+    size_t read = 0, written = 0, hint = 1;
+    while (hint != 0 && read < value.size()) {
+      size_t src_size = value.size() - read;
+      size_t dst_size = decoded.size() - written;
+      hint = LZ4F_decompress(context, decoded.data() + written, &dst_size,
+                             value.data() + read, &src_size, nullptr);
+      if (LZ4F_isError(hint)) {
+        return absl::InvalidArgumentError(
+            absl::StrCat("lz4 decompression failed: ", LZ4F_getErrorName(hint)));
+      }
+      read += src_size;
+      written += dst_size;
+      if (src_size == 0 && dst_size == 0) break;
+    }
+    if (hint != 0 || written != expected_size) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Decoded tensor has ", written, " bytes but ",
+                       expected_size, " bytes were expected."));
+    }
+  } else {
+    return absl::InvalidArgumentError(
+        absl::StrCat("Unsupported tensor codec: ", codec));
+  }
+
+  *tensor->mutable_value() = std::move(decoded);
+  tensor->set_codec(Codec_Type_NONE);
+  return absl::OkStatus();
+}
+
+bool TensorCodec::IsEncoded(const Model &model) {
+  for (const auto &tensor : model.tensors()) {
+    if (tensor.codec() != Codec_Type_NONE) return true;
+  }
+  return false;
+}
+
+absl::Status TensorCodec::EncodeModel(Model *model, Codec_Type codec,
+                                      BS::thread_pool &pool) {
+  if (model->encrypted() || codec == Codec_Type_NONE) return absl::OkStatus();
+  // The ciphertexts of selectively encrypted tensors are not encoded.
+  return ForEachTensor(model, pool, [codec](Tensor *tensor) {
+    if (tensor->encrypted()) return absl::OkStatus();
+    return Encode(tensor, codec);
+  });
+}
+
+absl::Status TensorCodec::DecodeModel(Model *model, BS::thread_pool &pool) {
+  if (!IsEncoded(*model)) return absl::OkStatus();
+  return ForEachTensor(model, pool, Decode);
+}
+
+template <typename Fn>
+absl::Status TensorCodec::ForEachTensor(Model *model, BS::thread_pool &pool,
+                                        Fn &&fn) {
+  std::vector<std::future<absl::Status>> futures;
+  futures.reserve(model->tensors_size());
+  for (auto &tensor : *model->mutable_tensors()) {
+    futures.push_back(pool.submit([&fn, &tensor] { return fn(&tensor); }));
+  }
+
+  // Waits for all the tensors, even if one of them fails.
+  absl::Status status;
+  for (auto &future : futures) status.Update(future.get());
+  return status;
+}
+
+std::string TensorCodec::Shuffle(const std::string &value, size_t itemsize) {
+  const size_t num_values = value.size() / itemsize;
+  std::string shuffled(value.size(), '\0');
+  for (size_t byte = 0; byte < itemsize; ++byte) {
+    auto *out = shuffled.data() + byte * num_values;
+    for (size_t i = 0; i < num_values; ++i) out[i] = value[i * itemsize + byte];
+  }
+  return shuffled;
+}
+
+void TensorCodec::Unshuffle(const std::string &value, size_t itemsize,
+                            char *out) {
+  const size_t num_values = value.size() / itemsize;
+  for (size_t byte = 0; byte < itemsize; ++byte) {
+    const auto *in = value.data() + byte * num_values;
+    for (size_t i = 0; i < num_values; ++i) out[i * itemsize + byte] = in[i];
+  }
+}
+
+}  // namespace metisfl::proto
@@ -0,0 +1,50 @@
+#ifndef METISFL_METISFL_CONTROLLER_COMMON_TENSOR_CODEC_H_
+#define METISFL_METISFL_CONTROLLER_COMMON_TENSOR_CODEC_H_
+
+#include <string>
+
+#include "absl/status/status.h"
+#include "absl/status/statusor.h"
+#include "metisfl/controller/common/bs_thread_pool.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::proto {
+
+// Lossless codecs of the tensor values. The wire format of every codec
+// matches the one of the Python learners (metisfl/common/codec.py).
+class TensorCodec {
+ public:
+  static constexpr int kZstdLevel = 3;
+
+  // Parses the codec name of the global train params; empty means no codec.
+  static absl::StatusOr<Codec_Type> ParseCodec(const std::string &name);
+
+  // Encodes the value of a plaintext tensor in place.
+  static absl::Status Encode(Tensor *tensor, Codec_Type codec);
+
+  // Decodes the value of the tensor in place, if it is encoded.
+  static absl::Status Decode(Tensor *tensor);
+
+  static bool IsEncoded(const Model &model);
+
+  // Encodes every tensor of a plaintext model, in parallel on the pool.
+  // Encrypted models are left as is, ciphertexts do not compress.
+  static absl::Status EncodeModel(Model *model, Codec_Type codec,
+                                  BS::thread_pool &pool);
+
+  // Decodes every encoded tensor of the model, in parallel on the pool.
+  static absl::Status DecodeModel(Model *model, BS::thread_pool &pool);
+
+ private:
+  template <typename Fn>
+  static absl::Status ForEachTensor(Model *model, BS::thread_pool &pool,
+                                    Fn &&fn);
+
+  static std::string Shuffle(const std::string &value, size_t itemsize);
+  static void Unshuffle(const std::string &value, size_t itemsize,
+                        char *out);
+};
+
+}  // namespace metisfl::proto
+
+#endif  // METISFL_METISFL_CONTROLLER_COMMON_TENSOR_CODEC_H_
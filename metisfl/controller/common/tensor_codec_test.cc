@@ -0,0 +1,102 @@
+#include "metisfl/controller/common/tensor_codec.h"
+
+#include <gmock/gmock.h>
+#include <gtest/gtest.h>
+
+#include <vector>
+
+#include "metisfl/controller/common/proto_matchers.h"
+#include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/proto/model.pb.h"
+
+namespace metisfl::proto {
+namespace {
+
+using ::testing::proto::EqualsProto;
+
+Model CreateModel() {
+  Model model;
+  for (int num_values : {10000, 0, 3}) {
+    std::vector<float> values(num_values);
+    for (int i = 0; i < num_values; ++i) values[i] = (i % 100) * 0.01f;
+
+    auto *tensor = model.add_tensors();
+    tensor->set_length(num_values);
+    tensor->add_dimensions(num_values);
+    tensor->mutable_type()->set_type(DType_Type_FLOAT32);
+    *tensor->mutable_value() =
+        TensorOps::SerializeTensor<float>(values, DType_Type_FLOAT32);
+  }
+  return model;
+}
+
+class TensorCodecTest : public ::testing::TestWithParam<Codec_Type> {
+ protected:
+  BS::thread_pool pool_{2};
+};
+
+TEST_P(TensorCodecTest, EncodeAndDecode) /* NOLINT */ {
+  const auto model = CreateModel();
+
+  auto encoded = model;
+  ASSERT_TRUE(TensorCodec::EncodeModel(&encoded, GetParam(), pool_).ok());
+  EXPECT_TRUE(TensorCodec::IsEncoded(encoded));
+  for (const auto &tensor : encoded.tensors()) {
+    EXPECT_EQ(tensor.codec(), GetParam());
+  }
+  EXPECT_LT(encoded.tensors(0).value().size(), model.tensors(0).value().size());
+
+  ASSERT_TRUE(TensorCodec::DecodeModel(&encoded, pool_).ok());
+  EXPECT_FALSE(TensorCodec::IsEncoded(encoded));
+  EXPECT_THAT(encoded, EqualsProto(model));
+}
+
+TEST_P(TensorCodecTest, RejectsCorruptValue) /* NOLINT */ {
+  auto tensor = CreateModel().tensors(0);
+  ASSERT_TRUE(TensorCodec::Encode(&tensor, GetParam()).ok());
+
+  tensor.mutable_value()->resize(tensor.value().size() / 2);
+  EXPECT_FALSE(TensorCodec::Decode(&tensor).ok());
+}
+
+TEST_P(TensorCodecTest, RejectsWrongLength) /* NOLINT */ {
+  auto tensor = CreateModel().tensors(0);
+  ASSERT_TRUE(TensorCodec::Encode(&tensor, GetParam()).ok());
+
+  tensor.set_length(tensor.length() - 1);
+  EXPECT_FALSE(TensorCodec::Decode(&tensor).ok());
+}
+
+INSTANTIATE_TEST_SUITE_P(Codecs, TensorCodecTest,
+                         ::testing::Values(Codec_Type_ZSTD, Codec_Type_LZ4,
+                                           Codec_Type_SHUFFLE_ZSTD));
+
+TEST(TensorCodecModelTest, LeavesEncryptedModel) /* NOLINT */ {
+  BS::thread_pool pool(2);
+  auto model = CreateModel();
+  model.set_encrypted(true);
+
+  auto encoded = model;
+  ASSERT_TRUE(TensorCodec::EncodeModel(&encoded, Codec_Type_ZSTD, pool).ok());
+  EXPECT_THAT(encoded, EqualsProto(model));
+}
+
+TEST(TensorCodecModelTest, LeavesEncryptedTensors) /* NOLINT */ {
+  BS::thread_pool pool(2);
+  auto model = CreateModel();
+  model.mutable_tensors(0)->set_encrypted(true);
+
+  auto encoded = model;
+  ASSERT_TRUE(TensorCodec::EncodeModel(&encoded, Codec_Type_ZSTD, pool).ok());
+  EXPECT_THAT(encoded.tensors(0), EqualsProto(model.tensors(0)));
+  EXPECT_EQ(encoded.tensors(2).codec(), Codec_Type_ZSTD);
+}
+
+TEST(TensorCodecModelTest, ParseCodec) /* NOLINT */ {
+  EXPECT_EQ(*TensorCodec::ParseCodec(""), Codec_Type_NONE);
+  EXPECT_EQ(*TensorCodec::ParseCodec("ShuffleZstd"), Codec_Type_SHUFFLE_ZSTD);
+  EXPECT_FALSE(TensorCodec::ParseCodec("Gzip").ok());
+}
+
+}  // namespace
+}  // namespace metisfl::proto
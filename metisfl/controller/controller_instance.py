@@ -48,6 +48,10 @@ class Controller(object):
             private_key=server.private_key or "",
 
             aggregation_rule=global_train.aggregation_rule,
+            aggregation_precision=global_train.aggregation_precision or "Float64",
+            incremental_aggregation=bool(global_train.incremental_aggregation),
+            tensor_codec=global_train.tensor_codec or "",
+            delta_updates=bool(global_train.delta_updates),
             communication_protocol=global_train.communication_protocol,
             scaling_factor=global_train.scaling_factor,
             participation_ratio=global_train.participation_ratio,
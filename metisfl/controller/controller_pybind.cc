@@ -31,6 +31,13 @@ class ControllerWrapper {
     GlobalTrainParams global_train_params = {};
     global_train_params.aggregation_rule =
         params["aggregation_rule"].cast<std::string>();
+    global_train_params.aggregation_precision =
+        params["aggregation_precision"].cast<std::string>();
+    global_train_params.incremental_aggregation =
+        params["incremental_aggregation"].cast<bool>();
+    global_train_params.tensor_codec =
+        params["tensor_codec"].cast<std::string>();
+    global_train_params.delta_updates = params["delta_updates"].cast<bool>();
     global_train_params.communication_protocol =
         params["communication_protocol"].cast<std::string>();
     global_train_params.scaling_factor =
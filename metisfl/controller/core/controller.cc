@@ -8,9 +8,24 @@ Controller::Controller(const GlobalTrainParams &global_train_params,
                        const ModelStoreParams &model_store_params) {
   global_train_params_ = global_train_params;
 
-  model_manager_ =
-      absl::make_unique<ModelManager>(global_train_params_, model_store_params);
-  learner_manager_ = absl::make_unique<LearnerManager>();
+  auto codec = proto::TensorCodec::ParseCodec(global_train_params_.tensor_codec);
+  if (!codec.ok()) PLOG(FATAL) << codec.status().message();
+
+  model_manager_ = absl::make_unique<ModelManager>(
+      global_train_params_, model_store_params, &journal_);
+  // Secure aggregation sums masked models, which have no meaningful deltas.
+  const bool pairwise_masking =
+      global_train_params_.aggregation_rule == "MaskedAgg";
+  const bool delta_updates = global_train_params_.delta_updates &&
+                             global_train_params_.aggregation_rule != "SecAgg" &&
+                             !pairwise_masking;
+  if (global_train_params_.delta_updates && !delta_updates) {
+    PLOG(WARNING) << "Delta updates are not supported with "
+                  << global_train_params_.aggregation_rule << ", disabling.";
+  }
+  learner_manager_ = absl::make_unique<LearnerManager>(
+      &journal_, *codec, delta_updates, &codec_pool_, pairwise_masking,
+      global_train_params_.scaling_factor);
   scheduler_ = CreateScheduler(global_train_params_.communication_protocol);
   selector_ = CreateSelector();
 }
@@ -31,7 +46,11 @@ absl::Status Controller::RemoveLearner(std::string learner_id) {
 }
 
 absl::Status Controller::SetInitialModel(const Model &model) {
-  return model_manager_->SetInitialModel(model);
+  Model decoded;
+  auto initial_model = DecodeModel(model, &decoded);
+  if (!initial_model.ok()) return initial_model.status();
+
+  return model_manager_->SetInitialModel(**initial_model);
 }
 
 absl::Status Controller::StartTraining() {
@@ -47,7 +66,49 @@ absl::Status Controller::TrainDone(const TrainDoneRequest &request) {
   auto learner_id = request.learner_id();
   auto task_id = request.task_id();
 
-  model_manager_->InsertModel(learner_id, request.model());
+  // Learners retry the uploads that may have been delivered, hence a task is
+  // completed only once and its duplicates are acknowledged. The task is
+  // claimed atomically, such that concurrent duplicates are not both processed.
+  if (!learner_manager_->ClaimTask(task_id)) {
+    if (learner_manager_->IsTaskCompleted(task_id)) {
+      PLOG(INFO) << "Task " << task_id << " is already completed.";
+      return absl::OkStatus();
+    }
+    // The duplicate is retried, in case the processing of the task fails.
+    return absl::AbortedError(
+        absl::StrCat("Task ", task_id, " is being processed."));
+  }
+
+  // The round the model was masked for, if the models are masked pairwise.
+  std::shared_ptr<const MaskingRound> masking_round;
+  if (global_train_params_.aggregation_rule == "MaskedAgg") {
+    masking_round = learner_manager_->GetMaskingRound();
+    auto status =
+        ValidateMaskedModel(learner_id, request.model(), masking_round.get());
+    if (!status.ok()) {
+      learner_manager_->ReleaseTask(task_id);
+      return status;
+    }
+    learner_manager_->AddMaskingShares(learner_id, request.model().masking());
+  }
+
+  // The models are stored and aggregated decoded.
+  Model decoded;
+  auto model = DecodeModel(request.model(), &decoded);
+  if (!model.ok()) {
+    learner_manager_->ReleaseTask(task_id);
+    return model.status();
+  }
+
+  if (model_manager_->IsIncremental()) {
+    // The model is folded into the running average of the round right away,
+    // instead of being stored until the round closes.
+    model_manager_->FoldModel(
+        learner_id, **model,
+        ComputeScalingWeight(learner_id, request.metadata()));
+  } else {
+    model_manager_->InsertModel(learner_id, **model);
+  }
   learner_manager_->UpdateMetadata(task_id, learner_id, request.metadata());
 
   auto learner_ids = learner_manager_->GetLearnerIds();
@@ -57,17 +118,72 @@ absl::Status Controller::TrainDone(const TrainDoneRequest &request) {
     // Doing the scheduling first so that we don't wait for the aggregation
     learner_manager_->Schedule(to_schedule, model_manager_->GetModel());
 
-    std::vector<std::string> selected_ids =
-        selector_->Select(to_schedule, learner_ids);
+    if (model_manager_->IsIncremental()) {
+      model_manager_->ReleaseModel();
+    } else {
+      std::vector<std::string> selected_ids =
+          selector_->Select(to_schedule, learner_ids);
+
+      auto scaling_factors = ComputeScalingFactors(selected_ids);
 
-    auto scaling_factors = ComputeScalingFactors(selected_ids);
+      std::vector<Model> corrections;
+      if (masking_round != nullptr) {
+        size_t num_values = 0;
+        for (const auto &tensor : request.model().tensors())
+          num_values += tensor.length();
+        auto recovered = RecoverMasks(*masking_round, to_schedule, num_values);
+        if (!recovered.ok()) {
+          PLOG(ERROR) << "Recovering the masks of round "
+                      << masking_round->round_id()
+                      << " failed, the round is not aggregated: "
+                      << recovered.status().message();
+          return absl::OkStatus();
+        }
+        corrections = *std::move(recovered);
+      }
 
-    model_manager_->UpdateModel(selected_ids, scaling_factors);
+      model_manager_->UpdateModel(selected_ids, scaling_factors, corrections);
+    }
   }
 
   return absl::OkStatus();
 }
 
+absl::Status Controller::EvaluateDone(const EvaluateDoneRequest &request) {
+  if (!learner_manager_->ValidateLearner(request.learner_id()))
+    return absl::NotFoundError("Learner does not exist.");
+
+  return learner_manager_->UpdateEvaluationMetadata(
+      request.task_id(), request.learner_id(), request.metadata());
+}
+
+Logs Controller::GetLogs(uint64_t cursor) {
+  auto changes = journal_.ChangesSince(cursor);
+
+  Logs logs;
+  logs.set_cursor(changes.cursor);
+
+  // The entries are looked up only after the changes are taken, hence
+  // they are at least as recent as the returned cursor.
+  for (auto &[task_id, metadata] :
+       learner_manager_->GetTrainingMetadata(changes.training_keys))
+    (*logs.mutable_training_metadata())[task_id] = std::move(metadata);
+
+  for (auto &[task_id, metadata] :
+       learner_manager_->GetEvaluationMetadata(changes.evaluation_keys))
+    (*logs.mutable_evaluation_metadata())[task_id] = std::move(metadata);
+
+  for (auto &[update_id, metadata] :
+       model_manager_->GetModelMetadata(changes.model_keys))
+    (*logs.mutable_model_metadata())[update_id] = std::move(metadata);
+
+  for (auto &[learner_id, durations] :
+       learner_manager_->GetPhaseDurations(changes.learner_keys))
+    (*logs.mutable_learner_phase_durations())[learner_id] = std::move(durations);
+
+  return logs;
+}
+
 void Controller::Shutdown() {
   learner_manager_->Shutdown();
   model_manager_->Shutdown();
@@ -92,4 +208,83 @@ absl::flat_hash_map<std::string, double> Controller::ComputeScalingFactors(
     PLOG(FATAL) << "Unsupported scaling factor.";
   }
 }
+
+double Controller::ComputeScalingWeight(const std::string &learner_id,
+                                        const TrainingMetadata &metadata) {
+  // The unnormalized counterpart of ComputeScalingFactors; the running
+  // average divides by the sum of the weights when the round closes.
+  auto scaling_factor = global_train_params_.scaling_factor;
+
+  if (scaling_factor == "NumCompletedBatches") {
+    return metadata.completed_batches();
+  } else if (scaling_factor == "NumParticipants") {
+    return 1;
+  } else if (scaling_factor == "NumTrainingExamples") {
+    return learner_manager_->GetNumTrainingExamples({learner_id})[learner_id];
+  } else {
+    PLOG(FATAL) << "Unsupported scaling factor.";
+  }
+}
+
+absl::Status Controller::ValidateMaskedModel(const std::string &learner_id,
+                                             const Model &model,
+                                             const MaskingRound *round) {
+  if (!model.has_masking() || model.masking().correction()) {
+    return absl::InvalidArgumentError("MaskedAgg requires masked models.");
+  }
+  // Late models of an earlier round are rejected, since the round is already
+  // aggregated. Its masks may have been recovered since, yet the models stay
+  // hidden by their self masks.
+  if (round == nullptr || model.masking().round_id() != round->round_id()) {
+    return absl::FailedPreconditionError(
+        absl::StrCat("Model was masked for round ", model.masking().round_id(),
+                     " which is not the current round."));
+  }
+  for (const auto &peer : round->peers()) {
+    if (peer.learner_id() == learner_id) return absl::OkStatus();
+  }
+  return absl::FailedPreconditionError(absl::StrCat(
+      "Learner: ", learner_id, " is not part of round ", round->round_id()));
+}
+
+absl::StatusOr<std::vector<Model>> Controller::RecoverMasks(
+    const MaskingRound &round, const std::vector<std::string> &survivors,
+    size_t num_values) {
+  // The learners of the round that left before sending their models.
+  absl::flat_hash_set<std::string> surviving(survivors.begin(),
+                                             survivors.end());
+  std::vector<std::string> dropped;
+  for (const auto &peer : round.peers()) {
+    if (!surviving.contains(peer.learner_id()))
+      dropped.push_back(peer.learner_id());
+  }
+  if (!dropped.empty()) {
+    PLOG(INFO) << dropped.size() << " learners dropped out of round "
+               << round.round_id() << ", recovering their masks.";
+  }
+  // The self masks of the survivors are always removed.
+  return learner_manager_->RecoverMasks(round, survivors, dropped, num_values);
+}
+
+absl::StatusOr<const Model *> Controller::DecodeModel(const Model &model,
+                                                      Model *decoded) {
+  if (!proto::TensorCodec::IsEncoded(model) && model.base_version().empty()) {
+    return &model;
+  }
+
+  *decoded = model;
+  auto status = proto::TensorCodec::DecodeModel(decoded, codec_pool_);
+  if (!status.ok()) return status;
+
+  if (!decoded->base_version().empty()) {
+    auto base = learner_manager_->GetModelVersion(decoded->base_version());
+    if (base == nullptr) {
+      return absl::NotFoundError(absl::StrCat(
+          "Model version ", decoded->base_version(), " is no longer held."));
+    }
+    status = proto::ModelDelta::Add(*base, decoded);
+    if (!status.ok()) return status;
+  }
+  return decoded;
+}
 }  // namespace metisfl::controller
@@ -4,6 +4,7 @@
 
 #include <glog/logging.h>
 
+#include <chrono>
 #include <mutex>
 #include <string>
 #include <thread>
@@ -11,9 +12,12 @@
 #include <vector>
 
 #include "absl/container/flat_hash_map.h"
+#include "absl/container/flat_hash_set.h"
 #include "absl/memory/memory.h"
 #include "absl/status/statusor.h"
+#include "metisfl/controller/common/bs_thread_pool.h"
 #include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/controller/common/tensor_codec.h"
 #include "metisfl/controller/core/controller_utils.h"
 #include "metisfl/controller/core/learner_manager.h"
 #include "metisfl/controller/core/model_manager.h"
@@ -25,6 +29,9 @@ using google::protobuf::util::TimeUtil;
 namespace metisfl::controller {
 class Controller {
   GlobalTrainParams global_train_params_;
+  LogJournal journal_;
+  // Encodes and decodes the tensors of the models exchanged with the learners.
+  BS::thread_pool codec_pool_;
 
   std::unique_ptr<ModelManager> model_manager_;
   std::unique_ptr<LearnerManager> learner_manager_;
@@ -49,6 +56,14 @@ class Controller {
     return model_manager_->GetModelMetadata();
   }
 
+  // Returns the log entries that changed after the cursor; all of them if 0.
+  Logs GetLogs(uint64_t cursor);
+
+  // Blocks until a log entry changes after the cursor or the timeout expires.
+  bool WaitForLogs(uint64_t cursor, std::chrono::milliseconds timeout) {
+    return journal_.WaitForChanges(cursor, timeout);
+  }
+
   absl::StatusOr<std::string> AddLearner(const Learner &learner);
 
   absl::Status SetInitialModel(const Model &model);
@@ -59,11 +74,34 @@ class Controller {
 
   absl::Status TrainDone(const TrainDoneRequest &task);
 
+  absl::Status EvaluateDone(const EvaluateDoneRequest &request);
+
   void Shutdown();
 
  private:
   absl::flat_hash_map<std::string, double> ComputeScalingFactors(
       const std::vector<std::string> &selected_learners);
+
+  double ComputeScalingWeight(const std::string &learner_id,
+                              const TrainingMetadata &metadata);
+
+  // Validates that the model is masked for the round and that the learner is
+  // part of the round.
+  absl::Status ValidateMaskedModel(const std::string &learner_id,
+                                   const Model &model,
+                                   const MaskingRound *round);
+
+  // Returns the corrections of the masks that the surviving learners of the
+  // round share with the learners that dropped out of it, if any, and of the
+  // self masks of the surviving learners; the models hold num_values values.
+  absl::StatusOr<std::vector<Model>> RecoverMasks(
+      const MaskingRound &round, const std::vector<std::string> &survivors,
+      size_t num_values);
+
+  // Returns the model, or its decoded copy if any of its tensors is encoded or
+  // it is a delta from an earlier community model.
+  absl::StatusOr<const Model *> DecodeModel(const Model &model,
+                                            Model *decoded);
 };
 
 }  // namespace metisfl::controller
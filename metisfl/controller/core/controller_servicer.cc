@@ -1,6 +1,8 @@
 
 #include "metisfl/controller/core/controller_servicer.h"
 
+#include <chrono>
+
 namespace metisfl::controller {
 
 void ControllerServicer::StartService() {
@@ -41,6 +43,10 @@ void ControllerServicer::StartService() {
   builder.AddListeningPort(server_address, creds);
   builder.RegisterService(this);
   builder.SetMaxReceiveMessageSize(INT_MAX);
+  // Accepts the keepalive pings of the pooled (possibly idle) client channels.
+  builder.AddChannelArgument(GRPC_ARG_KEEPALIVE_PERMIT_WITHOUT_CALLS, 1);
+  builder.AddChannelArgument(
+      GRPC_ARG_HTTP2_MIN_RECV_PING_INTERVAL_WITHOUT_DATA_MS, 10 * 1000);
   server_ = builder.BuildAndStart();
 
   if (ssl_enable)
@@ -116,6 +122,24 @@ Status ControllerServicer::SetInitialModel(ServerContext *context,
   return {StatusCode::INVALID_ARGUMENT, std::string(status.message())};
 }
 
+Status ControllerServicer::SetInitialModelStream(
+    ServerContext *context, ServerReader<ModelChunk> *reader, Ack *ack) {
+  proto::ModelAssembler assembler;
+  ModelChunk chunk;
+  while (reader->Read(&chunk)) {
+    auto status = assembler.AddChunk(chunk);
+    if (!status.ok())
+      return {StatusCode::INVALID_ARGUMENT, std::string(status.message())};
+  }
+
+  Model model;
+  auto status = assembler.Release(&model);
+  if (!status.ok())
+    return {StatusCode::INVALID_ARGUMENT, std::string(status.message())};
+
+  return SetInitialModel(context, &model, ack);
+}
+
 Status ControllerServicer::StartTraining(ServerContext *context,
                                          const Empty *request, Ack *ack) {
   const auto status = controller_->StartTraining();
@@ -162,6 +186,9 @@ Status ControllerServicer::TrainDone(ServerContext *context,
       case absl::StatusCode::kNotFound:
         ack->set_status(false);
         return {StatusCode::NOT_FOUND, std::string(status.message())};
+      case absl::StatusCode::kAborted:
+        ack->set_status(false);
+        return {StatusCode::ABORTED, std::string(status.message())};
       default:
         ack->set_status(false);
         return {StatusCode::INTERNAL, std::string(status.message())};
@@ -171,23 +198,85 @@ Status ControllerServicer::TrainDone(ServerContext *context,
   return Status::OK;
 }
 
+Status ControllerServicer::TrainDoneStream(
+    ServerContext *context, ServerReader<TrainDoneRequestChunk> *reader,
+    Ack *ack) {
+  // The upload lasts from the call until its last chunk is received.
+  const auto upload_start = std::chrono::steady_clock::now();
+  TrainDoneRequest request;
+  proto::ModelAssembler assembler;
+  TrainDoneRequestChunk chunk;
+  bool first_chunk = true;
+  while (reader->Read(&chunk)) {
+    if (first_chunk) {
+      // Only the first chunk carries the learner id, task id and metadata.
+      *request.mutable_learner_id() = chunk.learner_id();
+      *request.mutable_task_id() = chunk.task_id();
+      *request.mutable_metadata() = chunk.metadata();
+      first_chunk = false;
+    }
+    if (!chunk.has_model_chunk()) continue;
+
+    auto status = assembler.AddChunk(chunk.model_chunk());
+    if (!status.ok()) {
+      ack->set_status(false);
+      return {StatusCode::INVALID_ARGUMENT, std::string(status.message())};
+    }
+  }
+
+  (*request.mutable_metadata()->mutable_phase_duration_ms())["upload"] =
+      std::chrono::duration<double, std::milli>(
+          std::chrono::steady_clock::now() - upload_start)
+          .count();
+
+  auto status = assembler.Release(request.mutable_model());
+  if (!status.ok()) {
+    ack->set_status(false);
+    return {StatusCode::INVALID_ARGUMENT, std::string(status.message())};
+  }
+
+  return TrainDone(context, &request, ack);
+}
+
+Status ControllerServicer::EvaluateDone(ServerContext *context,
+                                        const EvaluateDoneRequest *request,
+                                        Ack *ack) {
+  const auto status = controller_->EvaluateDone(*request);
+  if (!status.ok()) {
+    ack->set_status(false);
+    if (status.code() == absl::StatusCode::kNotFound)
+      return {StatusCode::NOT_FOUND, std::string(status.message())};
+    return {StatusCode::INTERNAL, std::string(status.message())};
+  }
+  ack->set_status(true);
+  return Status::OK;
+}
+
 Status ControllerServicer::GetLogs(ServerContext *context, const Empty *request,
                                    Logs *logs) {
-  auto training_metadata = controller_->GetTrainingMetadata();
-  auto evaluation_metadata = controller_->GetEvaluationMetadata();
-  auto model_metadata = controller_->GetModelMetadata();
-
-  *logs->mutable_training_metadata() =
-      google::protobuf::Map<std::string, TrainingMetadata>(
-          training_metadata.begin(), training_metadata.end());
-  *logs->mutable_evaluation_metadata() =
-      google::protobuf::Map<std::string, EvaluationMetadata>(
-          evaluation_metadata.begin(), evaluation_metadata.end());
-  *logs->mutable_model_metadata() =
-      google::protobuf::Map<std::string, ModelMetadata>(model_metadata.begin(),
-                                                        model_metadata.end());
-
-  // TODO : Implement this
+  *logs = controller_->GetLogs(0);
+  return Status::OK;
+}
+
+Status ControllerServicer::GetLogsSince(ServerContext *context,
+                                        const GetLogsRequest *request,
+                                        Logs *logs) {
+  *logs = controller_->GetLogs(request->cursor());
+  return Status::OK;
+}
+
+Status ControllerServicer::WatchLogs(ServerContext *context,
+                                     const GetLogsRequest *request,
+                                     ServerWriter<Logs> *writer) {
+  auto cursor = request->cursor();
+  while (!context->IsCancelled() && !shutdown_) {
+    // Wakes up periodically to notice cancellations and shutdowns.
+    if (!controller_->WaitForLogs(cursor, std::chrono::seconds(1))) continue;
+
+    auto logs = controller_->GetLogs(cursor);
+    cursor = logs.cursor();
+    if (!writer->Write(logs)) break;
+  }
   return Status::OK;
 }
 
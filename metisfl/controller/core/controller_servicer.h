@@ -16,6 +16,7 @@
 
 #include "absl/memory/memory.h"
 #include "metisfl/controller/common/bs_thread_pool.h"
+#include "metisfl/controller/common/model_chunking.h"
 #include "metisfl/controller/core/controller.h"
 #include "metisfl/controller/core/types.h"
 #include "metisfl/proto/controller.grpc.pb.h"
@@ -23,6 +24,8 @@
 using ::grpc::Server;
 using ::grpc::ServerBuilder;
 using ::grpc::ServerContext;
+using ::grpc::ServerReader;
+using ::grpc::ServerWriter;
 using ::grpc::Status;
 using ::grpc::StatusCode;
 
@@ -52,6 +55,9 @@ class ControllerServicer final : public ControllerService::Service {
                          metisfl::Ack* response) override;
   Status SetInitialModel(ServerContext* context, const metisfl::Model* request,
                          metisfl::Ack* response) override;
+  Status SetInitialModelStream(ServerContext* context,
+                               ServerReader<metisfl::ModelChunk>* reader,
+                               metisfl::Ack* response) override;
   Status JoinFederation(ServerContext* context, const metisfl::Learner* request,
                         metisfl::LearnerId* response) override;
   Status LeaveFederation(ServerContext* context,
@@ -62,8 +68,20 @@ class ControllerServicer final : public ControllerService::Service {
   Status TrainDone(ServerContext* context,
                    const metisfl::TrainDoneRequest* request,
                    metisfl::Ack* response) override;
+  Status TrainDoneStream(ServerContext* context,
+                         ServerReader<metisfl::TrainDoneRequestChunk>* reader,
+                         metisfl::Ack* response) override;
+  Status EvaluateDone(ServerContext* context,
+                      const metisfl::EvaluateDoneRequest* request,
+                      metisfl::Ack* response) override;
   Status GetLogs(ServerContext* context, const metisfl::Empty* request,
                  metisfl::Logs* response) override;
+  Status GetLogsSince(ServerContext* context,
+                      const metisfl::GetLogsRequest* request,
+                      metisfl::Logs* response) override;
+  Status WatchLogs(ServerContext* context,
+                   const metisfl::GetLogsRequest* request,
+                   ServerWriter<metisfl::Logs>* writer) override;
   Status ShutDown(ServerContext* context, const metisfl::Empty* request,
                   metisfl::Ack* response) override;
 };
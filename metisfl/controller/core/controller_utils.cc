@@ -6,13 +6,17 @@ namespace metisfl::controller {
 std::unique_ptr<AggregationFunction> CreateAggregator(
     const GlobalTrainParams &params) {
   const auto &aggregation_rule = params.aggregation_rule;
+  const auto precision = params.aggregation_precision == "Float32"
+                             ? AggregationPrecision::kFloat32
+                             : AggregationPrecision::kFloat64;
 
   if (aggregation_rule == "FedAvg")
-    return absl::make_unique<FederatedAverage>();
+    return absl::make_unique<FederatedAverage>(precision);
   if (aggregation_rule == "FedRec")
-    return absl::make_unique<FederatedRecency>();
+    return absl::make_unique<FederatedRecency>(precision);
   if (aggregation_rule == "FedStride")
-    return absl::make_unique<FederatedStride>();
+    return absl::make_unique<FederatedStride>(precision);
+  if (aggregation_rule == "MaskedAgg") return absl::make_unique<MaskedAgg>();
   if (aggregation_rule == "SecAgg") {
     return absl::make_unique<SecAgg>(params.he_batch_size,
                                      params.he_scaling_factor_bits,
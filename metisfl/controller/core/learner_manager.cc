@@ -1,15 +1,39 @@
 #include "metisfl/controller/core/learner_manager.h"
 
 namespace metisfl::controller {
+namespace {
+// The community models of the current and the previous rounds suffice for the
+// synchronous protocol; the others also cover learners that lag behind.
+constexpr size_t kNumModelVersions = 4;
+
+// The models are streamed to the learners in parallel on the scheduling pool.
+constexpr size_t kNumSchedulingThreads = 8;
+
+// The time a learner is given to receive a streamed model, such that a hung
+// learner does not hold a thread of the scheduling pool.
+constexpr auto kTrainStreamDeadline = std::chrono::minutes(10);
+}  // namespace
 
 // Constructor
-LearnerManager::LearnerManager()
-    : learners_(),
+LearnerManager::LearnerManager(LogJournal *journal, Codec_Type codec,
+                               bool delta_updates, BS::thread_pool *codec_pool,
+                               bool pairwise_masking,
+                               const std::string &scaling_factor)
+    : journal_(journal),
+      codec_(codec),
+      codec_pool_(codec_pool),
+      model_versions_(delta_updates
+                          ? std::make_unique<proto::ModelVersions>(
+                                kNumModelVersions)
+                          : nullptr),
+      pairwise_masking_(pairwise_masking),
+      scaling_factor_(scaling_factor),
+      learners_(),
       learners_stub_(),
       train_params_(),
       eval_params_(),
       learners_mutex_(),
-      scheduling_pool_(2),
+      scheduling_pool_(kNumSchedulingThreads),
       train_tasks_cq_(),
       eval_tasks_cq_() {
   std::thread run_tasks_digest_t_(&LearnerManager::DigestTrainResponses, this);
@@ -29,6 +53,10 @@ absl::StatusOr<std::string> LearnerManager::AddLearner(const Learner &learner) {
   if (learners_.contains(learner_id)) {
     return absl::AlreadyExistsError("Learner has already joined.");
   }
+  if (pairwise_masking_ && learner.masking_public_key().empty()) {
+    return absl::InvalidArgumentError(
+        "Learner has no masking public key, which MaskedAgg requires.");
+  }
 
   learners_[learner_id] = learner;
   learners_stub_[learner_id] = CreateLearnerStub(learner_id);
@@ -56,6 +84,9 @@ absl::Status LearnerManager::RemoveLearner(const std::string &learner_id) {
   train_params_.erase(learner_id);
   eval_params_.erase(learner_id);
 
+  std::lock_guard<std::mutex> versions_guard(learner_versions_mutex_);
+  learner_versions_.erase(learner_id);
+
   return absl::OkStatus();
 }
 
@@ -65,21 +96,267 @@ void LearnerManager::ScheduleAll(const Model &model) {
 
 void LearnerManager::Schedule(const std::vector<std::string> &learner_ids,
                               const Model &model) {
-  scheduling_pool_.push_task(
-      [this, learner_ids, model] { ScheduleTasks(learner_ids, model); });
+  // The round starts right away, hence the models of the previous round are
+  // no longer accepted once its learners are scheduled again.
+  std::shared_ptr<const MaskingRound> round;
+  if (pairwise_masking_) round = CreateMaskingRound(learner_ids);
+
+  scheduling_pool_.push_task([this, learner_ids, model, round] {
+    ScheduleTasks(learner_ids, model, round);
+  });
+}
+
+std::shared_ptr<const Model> LearnerManager::GetModelVersion(
+    const std::string &version) const {
+  if (model_versions_ == nullptr || version.empty()) return nullptr;
+  return model_versions_->Get(version);
+}
+
+std::shared_ptr<const MaskingRound> LearnerManager::GetMaskingRound() const {
+  std::lock_guard<std::mutex> masking_round_guard(masking_round_mutex_);
+  return masking_round_;
+}
+
+void LearnerManager::AddMaskingShares(const std::string &learner_id,
+                                      const Masking &masking) {
+  std::lock_guard<std::mutex> masking_round_guard(masking_round_mutex_);
+  auto it = masking_shares_.find(masking.round_id());
+  if (it == masking_shares_.end()) return;
+  it->second[learner_id] = masking.encrypted_shares();
+}
+
+absl::StatusOr<std::vector<Model>> LearnerManager::RecoverMasks(
+    const MaskingRound &round, const std::vector<std::string> &survivors,
+    const std::vector<std::string> &dropped, size_t num_values) {
+  if (survivors.size() < round.threshold()) {
+    return absl::FailedPreconditionError(absl::StrCat(
+        "Only ", survivors.size(), " learners survived round ",
+        round.round_id(), ", fewer than its threshold of ", round.threshold()));
+  }
+  // The shares of a round are recovered once.
+  absl::flat_hash_map<std::string,
+                      google::protobuf::RepeatedPtrField<MaskingShare>>
+      encrypted_shares;
+  {
+    std::lock_guard<std::mutex> masking_round_guard(masking_round_mutex_);
+    auto it = masking_shares_.find(round.round_id());
+    if (it != masking_shares_.end()) {
+      encrypted_shares = std::move(it->second);
+      masking_shares_.erase(it);
+    }
+  }
+  // The learners hold the shares of the (1-based) order of the round.
+  absl::flat_hash_map<std::string, uint64_t> indices;
+  for (int index = 0; index < round.peers_size(); ++index) {
+    indices[round.peers(index).learner_id()] = index + 1;
+  }
+
+  // learner_id -> the shares of the seed of its self mask, by index.
+  absl::flat_hash_map<std::string, std::vector<std::pair<uint64_t, std::string>>>
+      shares;
+  std::vector<Model> corrections;
+  uint32_t fraction_bits = 0;
+  for (const auto &learner_id : survivors) {
+    RecoverMasksRequest request;
+    request.set_round_id(round.round_id());
+    for (const auto &dropped_id : dropped) request.add_learner_ids(dropped_id);
+    // The learner is sent the shares that the other survivors encrypted for it.
+    for (const auto &sender_id : survivors) {
+      if (sender_id == learner_id) continue;
+      const MaskingShare *share = nullptr;
+      for (const auto &encrypted : encrypted_shares[sender_id]) {
+        if (encrypted.learner_id() == learner_id) share = &encrypted;
+      }
+      if (share == nullptr) {
+        return absl::FailedPreconditionError(
+            absl::StrCat("Learner: ", sender_id, " sent no share for learner: ",
+                         learner_id, " in round ", round.round_id()));
+      }
+      auto *relayed = request.add_shares();
+      relayed->set_learner_id(sender_id);
+      relayed->set_share(share->share());
+    }
+
+    LearnerStub learner_stub;
+    {
+      std::lock_guard<std::mutex> learners_guard(learners_mutex_);
+      if (!learners_.contains(learner_id)) {
+        return absl::FailedPreconditionError(absl::StrCat(
+            "Learner: ", learner_id, " left before its masks were recovered."));
+      }
+      learner_stub = CreateLearnerStub(learner_id);
+    }
+
+    grpc::ClientContext context;
+    auto reader = learner_stub->RecoverMasks(&context, request);
+    proto::ModelAssembler assembler;
+    ModelChunk chunk;
+    absl::Status status;
+    while (status.ok() && reader->Read(&chunk)) {
+      status = assembler.AddChunk(chunk);
+    }
+    if (!status.ok()) context.TryCancel();
+
+    auto rpc_status = reader->Finish();
+    if (status.ok() && !rpc_status.ok()) {
+      return absl::UnavailableError(absl::StrCat(
+          "RecoverMasks RPC request to learner: ", learner_id,
+          " failed with error: ", rpc_status.error_message()));
+    }
+
+    Model correction;
+    if (status.ok()) status = assembler.Release(&correction);
+    if (!status.ok()) return status;
+    if (!correction.masking().correction() ||
+        correction.masking().round_id() != round.round_id()) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Learner: ", learner_id,
+                       " did not send the correction of round ",
+                       round.round_id()));
+    }
+    for (const auto &share : correction.masking().shares()) {
+      shares[share.learner_id()].emplace_back(indices[learner_id],
+                                              share.share());
+    }
+    fraction_bits = correction.masking().fraction_bits();
+    // Without dropped learners, the correction only carries the shares.
+    if (correction.tensors_size() > 0) {
+      corrections.push_back(std::move(correction));
+    }
+  }
+
+  // The self masks of the survivors, which are subtracted from the sum.
+  std::vector<uint64_t> self_masks(1 + num_values, 0);
+  for (const auto &learner_id : survivors) {
+    auto seed = proto::SelfMasks::ReconstructSeed(shares[learner_id]);
+    if (!seed.ok()) {
+      return absl::InvalidArgumentError(
+          absl::StrCat("Cannot reconstruct the self mask of learner: ",
+                       learner_id, ": ", seed.status().message()));
+    }
+    auto masks = proto::SelfMasks::ExpandMasks(*seed, self_masks.size());
+    for (size_t i = 0; i < masks.size(); ++i) self_masks[i] -= masks[i];
+  }
+
+  Model correction;
+  correction.set_encrypted(true);
+  auto *masking = correction.mutable_masking();
+  masking->set_round_id(round.round_id());
+  masking->set_fraction_bits(fraction_bits);
+  masking->set_weight(self_masks[0]);
+  masking->set_correction(true);
+  auto *tensor = correction.add_tensors();
+  tensor->set_length(num_values);
+  tensor->add_dimensions(num_values);
+  tensor->mutable_type()->set_type(DType_Type_UINT64);
+  tensor->mutable_value()->assign(
+      reinterpret_cast<const char *>(self_masks.data() + 1),
+      num_values * sizeof(uint64_t));
+  corrections.push_back(std::move(correction));
+  return corrections;
 }
 
 void LearnerManager::Shutdown() {
+  // The streamed models are followed by calls on the completion queues.
+  scheduling_pool_.wait_for_tasks();
   train_tasks_cq_.Shutdown();
   eval_tasks_cq_.Shutdown();
-  scheduling_pool_.wait_for_tasks();
+}
+
+TrainingMetadataMap LearnerManager::GetTrainingMetadata() const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  return training_metadata_;
+}
+
+TrainingMetadataMap LearnerManager::GetTrainingMetadata(
+    const std::vector<std::string> &task_ids) const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  TrainingMetadataMap metadata;
+  for (const auto &task_id : task_ids) {
+    auto it = training_metadata_.find(task_id);
+    if (it != training_metadata_.end()) metadata[task_id] = it->second;
+  }
+  return metadata;
+}
+
+EvaluationMetadataMap LearnerManager::GetEvaluationMetadata() const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  return evaluation_metadata_;
+}
+
+EvaluationMetadataMap LearnerManager::GetEvaluationMetadata(
+    const std::vector<std::string> &task_ids) const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  EvaluationMetadataMap metadata;
+  for (const auto &task_id : task_ids) {
+    auto it = evaluation_metadata_.find(task_id);
+    if (it != evaluation_metadata_.end()) metadata[task_id] = it->second;
+  }
+  return metadata;
+}
+
+bool LearnerManager::ClaimTask(const std::string &task_id) {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  if (training_metadata_.contains(task_id)) return false;
+  return claimed_tasks_.insert(task_id).second;
+}
+
+void LearnerManager::ReleaseTask(const std::string &task_id) {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  claimed_tasks_.erase(task_id);
+}
+
+absl::flat_hash_map<std::string, PhaseDurations>
+LearnerManager::GetPhaseDurations(
+    const std::vector<std::string> &learner_ids) const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  absl::flat_hash_map<std::string, PhaseDurations> durations;
+  for (const auto &learner_id : learner_ids) {
+    auto it = phase_durations_.find(learner_id);
+    if (it != phase_durations_.end()) durations[learner_id] = it->second;
+  }
+  return durations;
+}
+
+bool LearnerManager::IsTaskCompleted(const std::string &task_id) const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  return training_metadata_.contains(task_id);
 }
 
 void LearnerManager::UpdateMetadata(const std::string &task_id,
                                     const std::string &learner_id,
                                     const TrainingMetadata &metadata) {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
   num_completed_batches_[learner_id] = metadata.completed_batches();
   training_metadata_[task_id] = metadata;
+  // The task is completed, hence it no longer needs its claim.
+  claimed_tasks_.erase(task_id);
+  journal_->Record(LogKind::kTraining, task_id);
+
+  if (!metadata.phase_duration_ms().empty()) {
+    AddPhaseDurations(metadata, &phase_durations_[learner_id]);
+    journal_->Record(LogKind::kLearner, learner_id);
+  }
+}
+
+absl::Status LearnerManager::UpdateEvaluationMetadata(
+    const std::string &task_id, const std::string &learner_id,
+    const EvaluationMetadata &metadata) {
+  std::lock_guard<std::mutex> learners_guard(learners_mutex_);
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+
+  if (evaluation_metadata_.contains(task_id)) return absl::OkStatus();
+
+  auto task = eval_task_learner_map_.find(task_id);
+  if (task == eval_task_learner_map_.end() || task->second != learner_id)
+    return absl::NotFoundError(
+        absl::StrCat("Evaluation task ", task_id, " was not sent to learner ",
+                     learner_id, "."));
+
+  eval_task_learner_map_.erase(task);
+  evaluation_metadata_[task_id] = metadata;
+  journal_->Record(LogKind::kEvaluation, task_id);
+  return absl::OkStatus();
 }
 
 absl::flat_hash_map<std::string, int> LearnerManager::GetNumTrainingExamples(
@@ -98,6 +375,7 @@ absl::flat_hash_map<std::string, int> LearnerManager::GetNumCompletedBatches(
     const std::vector<std::string> &learner_ids) {
   absl::flat_hash_map<std::string, int> num_completed_batches;
 
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
   for (const auto &learner_id : learner_ids) {
     num_completed_batches[learner_id] = num_completed_batches_[learner_id];
   }
@@ -168,39 +446,245 @@ bool LearnerManager::ValidateLearner(const std::string &learner_id) const {
   return learners_.contains(learner_id);
 }
 
+std::shared_ptr<const MaskingRound> LearnerManager::CreateMaskingRound(
+    const std::vector<std::string> &learner_ids) {
+  auto round = std::make_shared<MaskingRound>();
+  {
+    std::lock_guard<std::mutex> learners_guard(learners_mutex_);
+    for (const auto &learner_id : learner_ids) {
+      if (!learners_.contains(learner_id)) continue;
+      auto *peer = round->add_peers();
+      peer->set_learner_id(learner_id);
+      peer->set_public_key(learners_[learner_id].masking_public_key());
+    }
+  }
+
+  // A majority, since a minority could be told that a learner survived while
+  // the others are told that it dropped out.
+  round->set_threshold(round->peers_size() / 2 + 1);
+
+  std::lock_guard<std::mutex> masking_round_guard(masking_round_mutex_);
+  // The masks of a round are derived from its id, hence it is never reused.
+  round->set_round_id(absl::StrCat(metisfl::controller::GenerateRadnomId(),
+                                   "-", ++num_masking_rounds_));
+  // The shares of the rounds before the previous one are no longer recovered.
+  for (auto it = masking_shares_.begin(); it != masking_shares_.end();) {
+    if (masking_round_ == nullptr ||
+        it->first != masking_round_->round_id()) {
+      masking_shares_.erase(it++);
+    } else {
+      ++it;
+    }
+  }
+  masking_shares_[round->round_id()];
+  masking_round_ = round;
+  return round;
+}
+
+MaskingRound LearnerManager::GetLearnerMaskingRound(
+    const std::string &learner_id, const MaskingRound &round) {
+  MaskingRound learner_round = round;
+  if (scaling_factor_ == "NumParticipants") {
+    learner_round.set_weight(1);
+  } else if (scaling_factor_ == "NumTrainingExamples") {
+    learner_round.set_weight(learners_[learner_id].num_training_examples());
+  } else {
+    // NumCompletedBatches: the learner weighs its model by the number of
+    // batches it completes, which is known only once it is trained.
+    learner_round.set_weight(0);
+  }
+  return learner_round;
+}
+
 void LearnerManager::ScheduleTasks(const std::vector<std::string> &learner_ids,
-                                   const Model &model) {
-  for (const auto &learner_id : learner_ids) {
+                                   Model model,
+                                   std::shared_ptr<const MaskingRound> round) {
+  if (model_versions_ == nullptr ||
+      proto::TensorOps::HasEncryptedTensors(model)) {
+    return SendTasks(learner_ids, EncodeModel(std::move(model)),
+                     /*evaluate=*/true, round.get());
+  }
+
+  model.set_version(proto::ModelDelta::Version(model));
+  model_versions_->Insert(model);
+
+  // The learners that acknowledged the same version share the same delta.
+  absl::flat_hash_map<std::string, std::vector<std::string>> base_learners;
+  {
+    std::lock_guard<std::mutex> versions_guard(learner_versions_mutex_);
+    for (const auto &learner_id : learner_ids) {
+      auto version = learner_versions_.find(learner_id);
+      base_learners[version == learner_versions_.end() ? "" : version->second]
+          .push_back(learner_id);
+    }
+  }
+
+  for (const auto &[base_version, base_learner_ids] : base_learners) {
+    auto base = GetModelVersion(base_version);
+    Model delta;
+    if (base_version == model.version()) {
+      // E.g., the learners rejoined or the model did not change; they already
+      // hold the model, hence it is neither sent again nor re-encoded.
+      SendTasks(base_learner_ids, proto::ModelDelta::Reference(model),
+                /*evaluate=*/true, round.get());
+    } else if (base != nullptr &&
+               proto::ModelDelta::Subtract(model, *base, &delta).ok()) {
+      SendTasks(base_learner_ids, EncodeModel(std::move(delta)),
+                /*evaluate=*/true, round.get());
+    } else {
+      // Learners that are new or whose version is no longer held.
+      SendTasks(base_learner_ids, EncodeModel(model), /*evaluate=*/true,
+                round.get());
+    }
+  }
+}
+
+LearnerManager::LearnerTask LearnerManager::GetLearnerTask(
+    const std::string &learner_id, const MaskingRound *round) {
+  LearnerTask task;
+  task.learner_id = learner_id;
+  task.stub = CreateLearnerStub(learner_id);
+  task.train_params = train_params_[learner_id];
+  task.eval_params = eval_params_[learner_id];
+  if (round != nullptr) {
+    task.masking_round = GetLearnerMaskingRound(learner_id, *round);
+  }
+  return task;
+}
+
+void LearnerManager::SendTasks(const std::vector<std::string> &learner_ids,
+                               Model model, bool evaluate,
+                               const MaskingRound *round) {
+  std::vector<LearnerTask> tasks;
+  {
     std::lock_guard<std::mutex> learners_guard(learners_mutex_);
+    for (const auto &learner_id : learner_ids) {
+      // E.g., the learner left since it was scheduled.
+      if (!learners_.contains(learner_id)) continue;
+      tasks.push_back(GetLearnerTask(learner_id, round));
+    }
+  }
 
-    SendTrainAsync(learner_id, model);
+  // The learners may join, leave and report their evaluations while the
+  // models are sent, since the learners mutex is not held meanwhile.
+  if (model.ByteSizeLong() <= proto::kModelChunkSize) {
+    for (const auto &task : tasks) {
+      SendTrainAsync(task, model);
+      if (evaluate) SendEvaluateAsync(task, model);
+    }
+    return;
+  }
+
+  auto shared_model = std::make_shared<const Model>(std::move(model));
+  for (auto &task : tasks) {
+    scheduling_pool_.push_task(
+        [this, task = std::move(task), shared_model, evaluate] {
+          SendTrainStream(task, *shared_model);
+          if (evaluate) SendEvaluateAsync(task, *shared_model);
+        });
+  }
+}
 
-    // TODO: should we wait before sending the evaluation task?
+Model LearnerManager::EncodeModel(Model model) {
+  if (codec_ == Codec_Type_NONE) return model;
 
-    SendEvaluateAsync(learner_id, model);
+  // Encoded once, for all the learners.
+  auto status = proto::TensorCodec::EncodeModel(&model, codec_, *codec_pool_);
+  if (!status.ok()) {
+    PLOG(ERROR) << "Encoding the model failed, sending it as is: "
+                << status.message();
+    proto::TensorCodec::DecodeModel(&model, *codec_pool_).IgnoreError();
+  }
+  return model;
+}
 
-    // UpdateLearnersTaskTemplates(to_schedule);
+void LearnerManager::AcknowledgeModel(const std::string &learner_id,
+                                      const std::string &version,
+                                      const std::string &base_version,
+                                      bool accepted) {
+  if (model_versions_ == nullptr || version.empty()) return;
+
+  {
+    std::lock_guard<std::mutex> versions_guard(learner_versions_mutex_);
+    if (accepted) {
+      learner_versions_[learner_id] = version;
+      return;
+    }
+    learner_versions_.erase(learner_id);
   }
+
+  // The learner no longer holds the base model of the delta or the model
+  // that was referred to.
+  auto model = GetModelVersion(version);
+  if (base_version.empty() || model == nullptr) return;
+  PLOG(WARNING) << "Learner: " << learner_id << " refused the model as it "
+                << "does not hold version " << base_version
+                << ", sending the full model.";
+  scheduling_pool_.push_task([this, learner_id, model] {
+    SendTasks({learner_id}, EncodeModel(*model), /*evaluate=*/false);
+  });
 }
 
-void LearnerManager::SendTrainAsync(const std::string &learner_id,
+void LearnerManager::SendTrainAsync(const LearnerTask &task,
                                     const Model &model) {
   TrainRequest request;
   *request.mutable_task_id() = metisfl::controller::GenerateRadnomId();
   *request.mutable_model() = model;
-  *request.mutable_params() = train_params_[learner_id];
+  *request.mutable_params() = task.train_params;
+  if (task.masking_round.has_value()) {
+    *request.mutable_masking() = *task.masking_round;
+  }
 
   auto *call = new AsyncLearnerRunTaskCall;
   auto &cq = train_tasks_cq_;
-  auto learner_stub = CreateLearnerStub(learner_id);
 
-  call->learner_id = learner_id;
+  call->learner_id = task.learner_id;
+  call->model_version = model.version();
+  call->base_version = proto::ModelDelta::RequiredVersion(model);
   call->response_reader =
-      learner_stub->PrepareAsyncTrain(&call->context, request, &cq);
+      task.stub->PrepareAsyncTrain(&call->context, request, &cq);
   call->response_reader->StartCall();
   call->response_reader->Finish(&call->reply, &call->status, (void *)call);
 }
 
+void LearnerManager::SendTrainStream(const LearnerTask &task,
+                                     const Model &model) {
+  const auto &learner_id = task.learner_id;
+  grpc::ClientContext context;
+  context.set_deadline(std::chrono::system_clock::now() +
+                       kTrainStreamDeadline);
+  Ack reply;
+  auto writer = task.stub->TrainStream(&context, &reply);
+
+  // Only the first chunk carries the task id, the training parameters and
+  // the masking round.
+  TrainRequestChunk request;
+  *request.mutable_task_id() = metisfl::controller::GenerateRadnomId();
+  *request.mutable_params() = task.train_params;
+  if (task.masking_round.has_value()) {
+    *request.mutable_masking() = *task.masking_round;
+  }
+
+  bool sent = proto::ModelChunking::WriteModelChunks(
+      model, [&request, &writer](ModelChunk &chunk) {
+        request.mutable_model_chunk()->Swap(&chunk);
+        bool ok = writer->Write(request);
+        request.Clear();
+        return ok;
+      });
+  if (sent && model.tensors_size() == 0) sent = writer->Write(request);
+  if (sent) writer->WritesDone();
+
+  auto status = writer->Finish();
+  if (!status.ok()) {
+    PLOG(ERROR) << "TrainStream RPC request to learner: " << learner_id
+                << " failed with error: " << status.error_message();
+    return;
+  }
+  AcknowledgeModel(learner_id, model.version(),
+                   proto::ModelDelta::RequiredVersion(model), reply.status());
+}
+
 void LearnerManager::DigestTrainResponses() {
   void *got_tag;
   bool ok = false;
@@ -215,26 +699,36 @@ void LearnerManager::DigestTrainResponses() {
       if (!call->status.ok()) {
         PLOG(ERROR) << "Train RPC request to learner: " << call->learner_id
                     << " failed with error: " << call->status.error_message();
+      } else {
+        AcknowledgeModel(call->learner_id, call->model_version,
+                         call->base_version, call->reply.status());
       }
     }
     delete call;
   }
 }
 
-void LearnerManager::SendEvaluateAsync(const std::string &learner_id,
+void LearnerManager::SendEvaluateAsync(const LearnerTask &task,
                                        const Model &model) {
   EvaluateRequest request;
   *request.mutable_task_id() = metisfl::controller::GenerateRadnomId();
   *request.mutable_model() = model;
-  *request.mutable_params() = eval_params_[learner_id];
+  *request.mutable_params() = task.eval_params;
+  // The learner evaluates the model in the background and reports the
+  // metrics with EvaluateDone, instead of holding the call open meanwhile.
+  request.set_report_done(true);
+  {
+    std::lock_guard<std::mutex> learners_guard(learners_mutex_);
+    eval_task_learner_map_[request.task_id()] = task.learner_id;
+  }
 
   auto *call = new AsyncLearnerEvalCall;
   auto &cq = eval_tasks_cq_;
-  auto learner_stub = CreateLearnerStub(learner_id);
 
-  call->learner_id = learner_id;
+  call->learner_id = task.learner_id;
+  call->task_id = request.task_id();
   call->response_reader =
-      learner_stub->PrepareAsyncEvaluate(&call->context, request, &cq);
+      task.stub->PrepareAsyncEvaluate(&call->context, request, &cq);
   call->response_reader->StartCall();
   call->response_reader->Finish(&call->reply, &call->status, (void *)call);
 }
@@ -250,8 +744,11 @@ void LearnerManager::DigestEvaluateResponses() {
 
     if (call) {
       if (call->status.ok()) {
-        const std::string &task_id = call->reply.task_id();
-        evaluation_metadata_[task_id] = call->reply.metadata();
+        // Learners that report with EvaluateDone reply without the metrics.
+        if (call->reply.has_metadata())
+          UpdateEvaluationMetadata(call->task_id, call->learner_id,
+                                   call->reply.metadata())
+              .IgnoreError();
       } else {
         PLOG(ERROR) << "EvaluateModel RPC request to learner: "
                     << call->learner_id
@@ -7,13 +7,23 @@
 #include <grpcpp/create_channel.h>
 #include <grpcpp/impl/codegen/async_unary_call.h>
 
+#include <chrono>
+#include <memory>
+#include <optional>
 #include <thread>
 
 #include "absl/container/flat_hash_map.h"
+#include "absl/container/flat_hash_set.h"
 #include "absl/memory/memory.h"
 #include "absl/status/statusor.h"
 #include "metisfl/controller/common/bs_thread_pool.h"
+#include "metisfl/controller/common/log_journal.h"
+#include "metisfl/controller/common/model_chunking.h"
+#include "metisfl/controller/common/model_delta.h"
+#include "metisfl/controller/common/phase_durations.h"
 #include "metisfl/controller/common/proto_tensor_serde.h"
+#include "metisfl/controller/common/self_masks.h"
+#include "metisfl/controller/common/tensor_codec.h"
 #include "metisfl/controller/core/controller_utils.h"
 #include "metisfl/controller/core/model_manager.h"
 #include "metisfl/controller/core/types.h"
@@ -22,6 +32,13 @@ namespace metisfl::controller {
 class LearnerManager {
   std::mutex learners_mutex_;
   BS::thread_pool scheduling_pool_;
+  LogJournal *journal_;
+  // The codec of the models sent to the learners.
+  Codec_Type codec_;
+  BS::thread_pool *codec_pool_;
+  // Set only if the models are sent as deltas from the model that every
+  // learner acknowledged last.
+  std::unique_ptr<proto::ModelVersions> model_versions_;
   grpc::CompletionQueue train_tasks_cq_;
   grpc::CompletionQueue eval_tasks_cq_;
 
@@ -33,30 +50,101 @@ class LearnerManager {
 
   // task_id -> learner_id
   TaskLearnerMap task_learner_map_;
+  // The evaluation tasks whose metrics are not received yet.
+  TaskLearnerMap eval_task_learner_map_;
+
+  // Guards the metadata of the tasks, which the digest and TrainDone threads
+  // update while the logs are read. Apart from the learners mutex.
+  mutable std::mutex metadata_mutex_;
 
   // task_id -> metadata
   TrainingMetadataMap training_metadata_;
   EvaluationMetadataMap evaluation_metadata_;
 
+  // The training tasks whose models are being processed, which are not yet
+  // completed. Guarded by the metadata mutex, along with the metadata.
+  absl::flat_hash_set<std::string> claimed_tasks_;
+
   // learner_id -> num_training_examples
   absl::flat_hash_map<std::string, int> num_training_examples_;
 
   // learner_id -> num_completed_batches in latest training task
   absl::flat_hash_map<std::string, double> num_completed_batches_;
 
+  // learner_id -> phase durations of its training tasks
+  absl::flat_hash_map<std::string, PhaseDurations> phase_durations_;
+
+  // learner_id -> version of the community model the learner acknowledged
+  // last. Guarded by its own mutex, since it is updated by the digest thread
+  // and the streaming train tasks.
+  std::mutex learner_versions_mutex_;
+  absl::flat_hash_map<std::string, std::string> learner_versions_;
+
+  // Whether the learners mask their models pairwise (MaskedAgg), and the
+  // scaling factor they weigh their models with before masking them.
+  bool pairwise_masking_;
+  std::string scaling_factor_;
+  // The masking round of the learners that were scheduled last.
+  mutable std::mutex masking_round_mutex_;
+  std::shared_ptr<const MaskingRound> masking_round_;
+  uint64_t num_masking_rounds_ = 0;
+  // round_id -> learner_id -> the encrypted shares of the seed of the self
+  // mask of the learner, which it sent along with its model. Kept for the
+  // current round and the one before it, whose masks may still be recovered.
+  // Guarded by the masking round mutex.
+  absl::flat_hash_map<
+      std::string,
+      absl::flat_hash_map<std::string,
+                          google::protobuf::RepeatedPtrField<MaskingShare>>>
+      masking_shares_;
+
  public:
-  LearnerManager();
+  LearnerManager(LogJournal *journal, Codec_Type codec, bool delta_updates,
+                 BS::thread_pool *codec_pool, bool pairwise_masking = false,
+                 const std::string &scaling_factor = "");
 
   ~LearnerManager() = default;
 
   // Getters/Setters
-  TrainingMetadataMap GetTrainingMetadata() { return training_metadata_; }
+  TrainingMetadataMap GetTrainingMetadata() const;
+
+  // Returns a copy of the metadata of the tasks; tasks without metadata are
+  // skipped.
+  TrainingMetadataMap GetTrainingMetadata(
+      const std::vector<std::string> &task_ids) const;
+
+  EvaluationMetadataMap GetEvaluationMetadata() const;
+
+  EvaluationMetadataMap GetEvaluationMetadata(
+      const std::vector<std::string> &task_ids) const;
 
-  EvaluationMetadataMap GetEvaluationMetadata() { return evaluation_metadata_; }
+  // Returns a copy of the phase durations of the learners; learners without
+  // durations are skipped.
+  absl::flat_hash_map<std::string, PhaseDurations> GetPhaseDurations(
+      const std::vector<std::string> &learner_ids) const;
 
   void UpdateMetadata(const std::string &task_id, const std::string &learner_id,
                       const TrainingMetadata &metadata);
 
+  // Records the metrics of the evaluation task, which the learner either
+  // replies with or reports later with EvaluateDone. Fails if the task was not
+  // sent to the learner; the metrics of a task are recorded only once.
+  absl::Status UpdateEvaluationMetadata(const std::string &task_id,
+                                        const std::string &learner_id,
+                                        const EvaluationMetadata &metadata);
+
+  // Claims the training task for the caller, which then records its metadata
+  // or releases the claim. Returns false if the task is already completed or
+  // claimed, e.g., by a duplicate of a retried upload.
+  bool ClaimTask(const std::string &task_id);
+
+  // Releases the claim of a training task that could not be completed.
+  void ReleaseTask(const std::string &task_id);
+
+  // Returns whether the training task is completed, i.e., its metadata is
+  // recorded.
+  bool IsTaskCompleted(const std::string &task_id) const;
+
   // Public methods
   absl::StatusOr<std::string> AddLearner(const Learner &learner);
 
@@ -77,19 +165,83 @@ class LearnerManager {
   absl::flat_hash_map<std::string, int> GetNumCompletedBatches(
       const std::vector<std::string> &learner_ids);
 
+  // Returns the community model with the version, or nullptr if it is no
+  // longer held or delta updates are disabled.
+  std::shared_ptr<const Model> GetModelVersion(const std::string &version) const;
+
+  // Returns the masking round of the learners that were scheduled last, or
+  // nullptr if the models are not masked.
+  std::shared_ptr<const MaskingRound> GetMaskingRound() const;
+
+  // Keeps the encrypted shares of the seed of the self mask of the learner,
+  // which it sent along with its model of the masking round.
+  void AddMaskingShares(const std::string &learner_id, const Masking &masking);
+
+  // Asks every surviving learner of the round for the correction of the masks
+  // it shares with the dropped learners and for its shares of the seeds of the
+  // self masks of the surviving learners. Returns the corrections, along with
+  // the correction of the self masks, which together cancel all the masks out
+  // of the sum of the models of the round; the models hold num_values values.
+  // Fails if any correction is not received or any seed is not reconstructed.
+  absl::StatusOr<std::vector<Model>> RecoverMasks(
+      const MaskingRound &round, const std::vector<std::string> &survivors,
+      const std::vector<std::string> &dropped, size_t num_values);
+
   void Shutdown();
 
  private:
+  // What a task is sent to a learner with. Taken under the learners mutex,
+  // hence the model is sent to the learner without holding it.
+  struct LearnerTask {
+    std::string learner_id;
+    std::shared_ptr<LearnerService::Stub> stub;
+    TrainParams train_params;
+    EvaluationParams eval_params;
+    std::optional<MaskingRound> masking_round;
+  };
+
   LearnerStub CreateLearnerStub(const std::string &learner_id);
 
-  void ScheduleTasks(const std::vector<std::string> &learner_ids,
-                     const Model &model);
+  // Returns the task of the learner. Requires the learners mutex.
+  LearnerTask GetLearnerTask(const std::string &learner_id,
+                             const MaskingRound *round);
+
+  // Starts a new masking round for the learners: every learner masks its
+  // model with the masks it agrees on with every other learner of the round.
+  std::shared_ptr<const MaskingRound> CreateMaskingRound(
+      const std::vector<std::string> &learner_ids);
+
+  // Returns the masking round with the weight of the learner.
+  MaskingRound GetLearnerMaskingRound(const std::string &learner_id,
+                                      const MaskingRound &round);
 
-  void SendEvaluateAsync(const std::string &learner_id, const Model &model);
+  void ScheduleTasks(const std::vector<std::string> &learner_ids, Model model,
+                     std::shared_ptr<const MaskingRound> round);
+
+  // Sends the model to the learners. Models that do not fit in a single chunk
+  // are streamed to the learners in parallel on the scheduling pool, hence the
+  // tasks may still be sent once it returns.
+  void SendTasks(const std::vector<std::string> &learner_ids, Model model,
+                 bool evaluate = true, const MaskingRound *round = nullptr);
+
+  Model EncodeModel(Model model);
+
+  // Records the version of the model acknowledged by the learner. If the
+  // learner refused a delta or a reference, i.e., it does not hold the
+  // required version, the full model is sent to it instead.
+  void AcknowledgeModel(const std::string &learner_id, const std::string &version,
+                        const std::string &base_version, bool accepted);
+
+  void SendEvaluateAsync(const LearnerTask &task, const Model &model);
 
   void DigestEvaluateResponses();
 
-  void SendTrainAsync(const std::string &learner_id, const Model &model);
+  void SendTrainAsync(const LearnerTask &task, const Model &model);
+
+  // Streams the model in bounded-size chunks. Used for models that do not
+  // fit in a single chunk, so that they are never buffered as one message.
+  // Blocks until the learner replies or the deadline of the stream expires.
+  void SendTrainStream(const LearnerTask &task, const Model &model);
 
   void DigestTrainResponses();
 };
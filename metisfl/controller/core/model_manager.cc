@@ -4,12 +4,27 @@ namespace metisfl::controller {
 
 // Constructor
 ModelManager::ModelManager(const GlobalTrainParams &global_train_params,
-                           const ModelStoreParams &model_store_params)
+                           const ModelStoreParams &model_store_params,
+                           LogJournal *journal)
     : model_store_mutex_(),
       model_(),
-      global_train_params_(global_train_params) {
+      global_train_params_(global_train_params),
+      journal_(journal) {
   model_store_ = CreateModelStore(model_store_params);
   aggregator_ = CreateAggregator(global_train_params);
+
+  if (global_train_params.incremental_aggregation) {
+    if (global_train_params.aggregation_rule == "FedAvg" &&
+        global_train_params.communication_protocol != "Asynchronous") {
+      running_average_ = absl::make_unique<RunningAverage>(
+          global_train_params.aggregation_precision == "Float32"
+              ? AggregationPrecision::kFloat32
+              : AggregationPrecision::kFloat64);
+    } else {
+      PLOG(WARNING) << "Incremental aggregation only applies to FedAvg with "
+                       "a synchronous protocol. Aggregating at round end.";
+    }
+  }
 }
 
 // Public methods
@@ -31,6 +46,66 @@ void ModelManager::InsertModel(std::string learner_id, const Model &model) {
       std::pair<std::string, Model>(learner_id, model)});
 }
 
+void ModelManager::FoldModel(const std::string &learner_id,
+                             const Model &model, double scaling_factor) {
+  std::lock_guard<std::mutex> model_store_guard(model_store_mutex_);
+
+  if (!folded_learners_.insert(learner_id).second) {
+    PLOG(WARNING) << "Learner " << learner_id
+                  << " already contributed to this round. Ignoring its model.";
+    return;
+  }
+
+  auto start = std::chrono::high_resolution_clock::now();
+  auto status = running_average_->Add(model, scaling_factor);
+  std::chrono::duration<double, std::milli> elapsed =
+      std::chrono::high_resolution_clock::now() - start;
+
+  if (!status.ok()) {
+    folded_learners_.erase(learner_id);
+    PLOG(ERROR) << "Cannot aggregate the model of learner " << learner_id
+                << ": " << status.message();
+    return;
+  }
+  fold_durations_ms_.push_back(elapsed.count());
+}
+
+void ModelManager::ReleaseModel() {
+  std::lock_guard<std::mutex> model_store_guard(model_store_mutex_);
+
+  if (running_average_->NumModels() == 0) return;
+
+  auto update_id = InitializeMetadata();
+  auto start_time_aggregation = std::chrono::high_resolution_clock::now();
+
+  auto block_memory = (double)GetTotalMemory();
+  {
+    std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+    // Each folded model is recorded as a block of its own.
+    for (auto duration_ms : fold_durations_ms_) {
+      *metadata_[update_id].mutable_aggregation_block_size()->Add() = 1;
+      *metadata_[update_id].mutable_aggregation_block_duration_ms()->Add() =
+          duration_ms;
+    }
+    *metadata_[update_id].mutable_aggregation_block_memory_kb()->Add() =
+        block_memory;
+  }
+
+  Model model;
+  auto status = running_average_->Release(&model);
+  if (status.ok()) {
+    model_ = std::move(model);
+  } else {
+    PLOG(ERROR) << "Cannot release the community model: " << status.message();
+  }
+
+  folded_learners_.clear();
+  fold_durations_ms_.clear();
+
+  RecordAggregationTime(update_id, start_time_aggregation);
+  journal_->Record(LogKind::kModel, update_id);
+}
+
 void ModelManager::EraseModels(std::vector<std::string> learner_id) {
   std::lock_guard<std::mutex> model_store_guard(model_store_mutex_);
   model_store_->EraseModels(learner_id);
@@ -38,7 +113,8 @@ void ModelManager::EraseModels(std::vector<std::string> learner_id) {
 
 void ModelManager::UpdateModel(
     std::vector<std::string> learner_ids,
-    absl::flat_hash_map<std::string, double> scaling_factors) {
+    absl::flat_hash_map<std::string, double> scaling_factors,
+    const std::vector<Model> &corrections) {
   std::lock_guard<std::mutex> model_store_guard(model_store_mutex_);
 
   auto update_id = InitializeMetadata();
@@ -47,9 +123,9 @@ void ModelManager::UpdateModel(
   std::chrono::time_point<std::chrono::system_clock> start_time_aggregation =
       std::chrono::high_resolution_clock::now();
 
+  std::vector<std::pair<std::string, int>> to_select_block;
   for (std::string learner_id : learner_ids) {
     auto lineage_length = GetLineageLength(learner_id);
-    std::vector<std::pair<std::string, int>> to_select_block;
 
     to_select_block.emplace_back(learner_id, lineage_length);
     int block_size = to_select_block.size();
@@ -59,24 +135,48 @@ void ModelManager::UpdateModel(
 
       auto to_aggregate_block =
           GetAggregationPairs(selected_models, scaling_factors);
+      if (learner_id == learner_ids.back()) {
+        for (const auto &correction : corrections) {
+          to_aggregate_block.push_back({{&correction, 0.0}});
+        }
+      }
 
       Aggregate(update_id, to_aggregate_block);
 
       RecordBlockSize(update_id, block_size);
 
       model_store_->ResetState();
+      to_select_block.clear();
     }
   }
 
   RecordAggregationTime(update_id, start_time_aggregation);
   RecordModelSize(update_id);
   aggregator_->Reset();
+  journal_->Record(LogKind::kModel, update_id);
 }
 
 void ModelManager::Shutdown() { model_store_->Shutdown(); }
 
+ModelMetadataMap ModelManager::GetModelMetadata() const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  return metadata_;
+}
+
+ModelMetadataMap ModelManager::GetModelMetadata(
+    const std::vector<std::string> &update_ids) const {
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  ModelMetadataMap metadata;
+  for (const auto &update_id : update_ids) {
+    auto it = metadata_.find(update_id);
+    if (it != metadata_.end()) metadata[update_id] = it->second;
+  }
+  return metadata;
+}
+
 std::string ModelManager::InitializeMetadata() {
   auto update_id = metisfl::controller::GenerateRadnomId();
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
   metadata_[update_id] = ModelMetadata();
   return update_id;
 }
@@ -114,8 +214,11 @@ std::map<std::string, std::vector<const Model *>> ModelManager::SelectModels(
   std::chrono::duration<double, std::milli> elapsed_time_selection =
       end_time_selection - start_time_selection;
 
-  metadata_[update_id].set_selection_duration_ms(
-      elapsed_time_selection.count());
+  {
+    std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+    metadata_[update_id].set_selection_duration_ms(
+        elapsed_time_selection.count());
+  }
 
   return selected_models;
 }
@@ -156,13 +259,15 @@ void ModelManager::Aggregate(
   std::chrono::duration<double, std::milli> elapsed_time_block_aggregation =
       end_time_block_aggregation - start_time_block_aggregation;
 
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
   *metadata_[update_id].mutable_aggregation_block_duration_ms()->Add() =
       elapsed_time_block_aggregation.count();
 }
 
 void ModelManager::RecordBlockSize(std::string update_id, int block_size) {
-  *metadata_[update_id].mutable_aggregation_block_size()->Add() = block_size;
   long block_memory = GetTotalMemory();
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
+  *metadata_[update_id].mutable_aggregation_block_size()->Add() = block_size;
   *metadata_[update_id].mutable_aggregation_block_memory_kb()->Add() =
       (double)block_memory;
 }
@@ -172,6 +277,7 @@ void ModelManager::RecordAggregationTime(
     std::chrono::time_point<std::chrono::system_clock> start) {
   auto end = std::chrono::high_resolution_clock::now();
   std::chrono::duration<double, std::milli> elapsed = end - start;
+  std::lock_guard<std::mutex> metadata_guard(metadata_mutex_);
   metadata_[update_id].set_aggregation_duration_ms(elapsed.count());
 }
 
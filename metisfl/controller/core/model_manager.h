@@ -1,7 +1,9 @@
 #ifndef METISFL_CONTROLLER_CORE_MODEL_MANAGER_H_
 #define METISFL_CONTROLLER_CORE_MODEL_MANAGER_H_
 
+#include "absl/container/flat_hash_set.h"
 #include "absl/status/statusor.h"
+#include "metisfl/controller/common/log_journal.h"
 #include "metisfl/controller/common/proto_tensor_serde.h"
 #include "metisfl/controller/core/controller_utils.h"
 #include "metisfl/controller/core/types.h"
@@ -12,32 +14,61 @@ class ModelManager {
   bool is_initialized_ = false;
   Model model_;
   GlobalTrainParams global_train_params_;
+  // Guarded by its own mutex, since the logs are read while the models are
+  // aggregated, under the model store mutex.
+  mutable std::mutex metadata_mutex_;
   ModelMetadataMap metadata_;
+  LogJournal *journal_;
 
   std::mutex model_store_mutex_;
   std::unique_ptr<AggregationFunction> aggregator_;
+  // Set only if the models are aggregated incrementally, as they arrive.
+  std::unique_ptr<RunningAverage> running_average_;
+  absl::flat_hash_set<std::string> folded_learners_;
+  std::vector<double> fold_durations_ms_;
   std::unique_ptr<ModelStore> model_store_;
 
  public:
   ModelManager(const GlobalTrainParams &global_train_params,
-               const ModelStoreParams &model_store_params);
+               const ModelStoreParams &model_store_params,
+               LogJournal *journal);
 
   ~ModelManager() = default;
 
   // Getters
   Model GetModel() const { return model_; }
 
-  ModelMetadataMap GetModelMetadata() const { return metadata_; }
+  ModelMetadataMap GetModelMetadata() const;
+
+  // Returns a copy of the metadata of the updates; updates without metadata
+  // are skipped.
+  ModelMetadataMap GetModelMetadata(
+      const std::vector<std::string> &update_ids) const;
 
   bool IsInitialized() const { return is_initialized_; }
 
+  bool IsIncremental() const { return running_average_ != nullptr; }
+
   // Public methods
   absl::Status SetInitialModel(const Model &model);
 
   void InsertModel(std::string learner_id, const Model &model);
 
+  // Aggregates the latest models of the learners into the community model.
+  // The corrections of the masks of dropped learners (MaskedAgg), if any, are
+  // aggregated along with the models.
   void UpdateModel(std::vector<std::string> learner_ids,
-                   absl::flat_hash_map<std::string, double> scaling_factors);
+                   absl::flat_hash_map<std::string, double> scaling_factors,
+                   const std::vector<Model> &corrections = {});
+
+  // Incremental aggregation: folds the model of the learner, scaled by its
+  // (unnormalized) scaling factor, into the running average of the round.
+  void FoldModel(const std::string &learner_id, const Model &model,
+                 double scaling_factor);
+
+  // Incremental aggregation: closes the round by normalizing its running
+  // average into the new community model.
+  void ReleaseModel();
 
   void EraseModels(std::vector<std::string> learner_ids);
 
@@ -17,6 +17,10 @@ typedef struct ServerParams {
 
 typedef struct GlobalTrainParams {
   std::string aggregation_rule;
+  std::string aggregation_precision;
+  bool incremental_aggregation;
+  std::string tensor_codec;
+  bool delta_updates;
   std::string communication_protocol;
   std::string scaling_factor;
   float participation_ratio;
@@ -63,7 +67,14 @@ struct AsyncLearnerCall {
   grpc::Status status;
   std::unique_ptr<grpc::ClientAsyncResponseReader<T>> response_reader;
 };
-struct AsyncLearnerRunTaskCall : AsyncLearnerCall<Ack> {};
-struct AsyncLearnerEvalCall : AsyncLearnerCall<EvaluateResponse> {};
+struct AsyncLearnerRunTaskCall : AsyncLearnerCall<Ack> {
+  // The version of the model sent and, if it is a delta or a reference, the
+  // version the learner must hold.
+  std::string model_version;
+  std::string base_version;
+};
+struct AsyncLearnerEvalCall : AsyncLearnerCall<EvaluateResponse> {
+  std::string task_id;
+};
 
 #endif  // METISFL_CONTROLLER_CORE_TYPES_H_
\ No newline at end of file
@@ -1,8 +1,9 @@
 
 """A gRPC client used from the driver to communicate with the controller."""
 
-from typing import Callable, Optional
-from ..common.client import get_client
+from typing import AsyncIterator, Callable, Iterator, Optional
+from ..common.chunking import model_to_chunks
+from ..common.client import AsyncClient, get_client
 from ..proto import controller_pb2, controller_pb2_grpc, model_pb2, service_common_pb2
 from ..common.types import ClientParams
 
@@ -71,7 +72,7 @@ class GRPCControllerClient(object):
         request_timeout: Optional[int] = None,
         block: Optional[bool] = True
     ) -> service_common_pb2.Ack:
-        """Sends an initial model to the Controller.
+        """Sends an initial model to the Controller. The model is streamed in bounded-size chunks.
 
         Parameters
         ----------
@@ -94,7 +95,7 @@ class GRPCControllerClient(object):
             schedule: Callable = client[1]
 
             def _request(_timeout=None):
-                return stub.SetInitialModel(model, timeout=_timeout)
+                return stub.SetInitialModelStream(model_to_chunks(model), timeout=_timeout)
 
             return schedule(_request, request_retries, request_timeout, block)
 
@@ -164,6 +165,64 @@ class GRPCControllerClient(object):
 
             return schedule(_request, request_retries, request_timeout, block)
 
+    def get_logs_since(
+        self,
+        cursor: int,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None,
+        block: Optional[bool] = True
+    ) -> controller_pb2.Logs:
+        """Gets from the controller only the log entries that changed after the cursor.
+
+        Parameters
+        ----------
+        cursor : int
+            The cursor of the last logs received. If 0, all the log entries are returned.
+        request_retries : Optional[int], (default=1)
+            The number of retries, by default 1
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds, by default None
+        block : Optional[bool], (default=True)
+            Whether to block until the request is completed, by default True
+
+        Returns
+        -------
+        controller_pb2.Logs
+            The changed log entries, along with the cursor to pass to the next call.
+        """
+        with self._get_client() as client:
+
+            stub: controller_pb2_grpc.ControllerServiceStub = client[0]
+            schedule: Callable = client[1]
+
+            def _request(_timeout=None):
+                request = controller_pb2.GetLogsRequest(cursor=cursor)
+                return stub.GetLogsSince(request, timeout=_timeout)
+
+            return schedule(_request, request_retries, request_timeout, block)
+
+    def watch_logs(
+        self,
+        cursor: Optional[int] = 0
+    ) -> Iterator[controller_pb2.Logs]:
+        """Watches the logs of the controller. The controller pushes the log entries as they change.
+
+        Parameters
+        ----------
+        cursor : Optional[int], (default=0)
+            The cursor of the last logs received. The first logs pushed contain the entries that changed after it.
+
+        Returns
+        -------
+        Iterator[controller_pb2.Logs]
+            The changed log entries, as they change. Cancel the iterator to stop watching.
+        """
+        with self._get_client() as client:
+
+            stub: controller_pb2_grpc.ControllerServiceStub = client[0]
+
+            return stub.WatchLogs(controller_pb2.GetLogsRequest(cursor=cursor))
+
     def shutdown_server(
         self,
         request_retries: Optional[int] = 1,
@@ -202,3 +261,195 @@ class GRPCControllerClient(object):
         with self._get_client() as client:
             shutdown: Callable = client[2]
             shutdown()
+
+
+class AsyncGRPCControllerClient(object):
+    """An asyncio variant of GRPCControllerClient. Its requests are coroutines."""
+
+    def __init__(self, client_params: ClientParams):
+        """Initializes the client.
+
+        Parameters
+        ----------
+        client_params : ClientParams
+            The parameters needed to connect to the Controller.
+        """
+        self._client = AsyncClient(
+            client_params=client_params,
+            stub_class=controller_pb2_grpc.ControllerServiceStub,
+        )
+
+    async def check_health_status(
+        self,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> service_common_pb2.HealthStatusResponse:
+        """Checks the health status of the controller.
+
+        Parameters
+        ----------
+        request_retries : Optional[int], (default=1)
+            The number of retries, by default 1
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds, by default None
+
+        Returns
+        -------
+        service_common_pb2.HealthStatusResponse
+            The response Proto object with the health status from the controller.
+        """
+        async def _request(stub, _timeout=None):
+            return await stub.GetHealthStatus(service_common_pb2.Empty(), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def set_initial_model(
+        self,
+        model: model_pb2.Model,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> service_common_pb2.Ack:
+        """Sends an initial model to the Controller. The model is streamed in bounded-size chunks.
+
+        Parameters
+        ----------
+        model : model_pb2.Model
+            The initial model.
+        request_retries : Optional[int], (default=1)
+            The number of retries, by default 1
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds, by default None
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the ack from the controller.
+        """
+        async def _request(stub, _timeout=None):
+            return await stub.SetInitialModelStream(model_to_chunks(model), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def start_training(
+        self,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> service_common_pb2.Ack:
+        """Starts the federated training.
+
+        Parameters
+        ----------
+        request_retries : Optional[int], optional
+            The number of retries, by default 1
+        request_timeout : Optional[int], optional
+            The timeout in seconds, by default None
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the ack from the controller.
+        """
+        async def _request(stub, _timeout=None):
+            return await stub.StartTraining(service_common_pb2.Empty(), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def get_logs(
+        self,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> controller_pb2.Logs:
+        """Gets logs from the controller.
+
+        Parameters
+        ----------
+        request_retries : Optional[int], (default=1)
+            The number of retries, by default 1
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds, by default None
+
+        Returns
+        -------
+        controller_pb2.Logs
+            The logs of the controller.
+        """
+        async def _request(stub, _timeout=None):
+            return await stub.GetLogs(service_common_pb2.Empty(), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def get_logs_since(
+        self,
+        cursor: int,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> controller_pb2.Logs:
+        """Gets from the controller only the log entries that changed after the cursor.
+
+        Parameters
+        ----------
+        cursor : int
+            The cursor of the last logs received. If 0, all the log entries are returned.
+        request_retries : Optional[int], (default=1)
+            The number of retries, by default 1
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds, by default None
+
+        Returns
+        -------
+        controller_pb2.Logs
+            The changed log entries, along with the cursor to pass to the next call.
+        """
+        async def _request(stub, _timeout=None):
+            request = controller_pb2.GetLogsRequest(cursor=cursor)
+            return await stub.GetLogsSince(request, timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    def watch_logs(
+        self,
+        cursor: Optional[int] = 0
+    ) -> AsyncIterator[controller_pb2.Logs]:
+        """Watches the logs of the controller. The controller pushes the log entries as they change.
+
+        Parameters
+        ----------
+        cursor : Optional[int], (default=0)
+            The cursor of the last logs received. The first logs pushed contain the entries that changed after it.
+
+        Returns
+        -------
+        AsyncIterator[controller_pb2.Logs]
+            The changed log entries, as they change. Cancel the call to stop watching.
+        """
+        stub: controller_pb2_grpc.ControllerServiceStub = self._client.get_stub()
+        return stub.WatchLogs(controller_pb2.GetLogsRequest(cursor=cursor))
+
+    async def shutdown_server(
+        self,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> service_common_pb2.Ack:
+        """Sends a shutdown request to the controller.
+
+        Parameters
+        ----------
+        request_retries : Optional[int], (default=1)
+            The number of retries, by default 1
+        request_timeout : Optional[int], (default=None)
+            The timeout in seconds, by default None
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the ack from the controller.
+        """
+        async def _request(stub, _timeout=None):
+            return await stub.ShutDown(service_common_pb2.ShutDownRequest(), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def shutdown_client(self) -> None:
+        """Shuts down the client."""
+
+        await self._client.close()
@@ -1,23 +1,35 @@
 import random
 from time import sleep
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
-from ..proto import model_pb2
+from ..proto import learner_pb2, model_pb2
+from ..common.broadcast import (DEFAULT_BROADCAST_CONCURRENCY,
+                                broadcast_model, to_relay_peer)
 from ..common.types import ClientParams, FederationEnvironment
-from ..common.logger import MetisASCIIArt
+from ..common.logger import MetisASCIIArt, MetisLogger
 from .controller_client import GRPCControllerClient
 from .federation_monitor import FederationMonitor
 from .learner_client import GRPCLearnerClient
 
 
 class DriverSession(object):
-    def __init__(self, fedenv: Union[str, FederationEnvironment]):
+    def __init__(
+        self,
+        fedenv: Union[str, FederationEnvironment],
+        broadcast_fanout: Optional[int] = 0,
+        broadcast_concurrency: Optional[int] = DEFAULT_BROADCAST_CONCURRENCY
+    ):
         """Initializes a new DriverSession.
 
         Parameters
         ----------
         fedenv : Union[str, FederationEnvironment]
             The path to the YAML file containing the federation environment or a FederationEnvironment object.
+        broadcast_fanout : Optional[int], (default=0)
+            If 0, the initial model is sent directly to every Learner. Otherwise, it is sent to at most
+            broadcast_fanout Learners, which relay it to the rest of the Learners in a tree of this fanout.
+        broadcast_concurrency : Optional[int], (default=DEFAULT_BROADCAST_CONCURRENCY)
+            The maximum number of Learners the initial model is sent to concurrently.
         """
         MetisASCIIArt.print()
 
@@ -25,6 +37,8 @@ class DriverSession(object):
             fedenv = FederationEnvironment.from_yaml(fedenv)
         self._federation_environment = fedenv
         self._num_learners = len(self._federation_environment.learners)
+        self._broadcast_fanout = broadcast_fanout
+        self._broadcast_concurrency = broadcast_concurrency
 
         global_config = self._federation_environment.global_train_config
 
@@ -141,8 +155,12 @@ class DriverSession(object):
             model=model,
         )
 
-    def _ship_model_to_learners(self, model: model_pb2.Model, skip_learner: int = None) -> None:
-        """Ships the given model to all Learners.
+    def _ship_model_to_learners(
+        self,
+        model: model_pb2.Model,
+        skip_learner: int = None
+    ) -> List[learner_pb2.BroadcastReport]:
+        """Ships the given model to all Learners concurrently. The model is serialized only once.
 
         Parameters
         ----------
@@ -150,12 +168,36 @@ class DriverSession(object):
             The Protobuf object containing the model to be shipped.
         skip_learner : Optional[int], (default=None)
             The index of the learner to skip.
+
+        Returns
+        -------
+        List[learner_pb2.BroadcastReport]
+            The latency and outcome of the broadcast, per Learner.
         """
 
-        for idx in range(self._num_learners):
-            if idx == skip_learner:
-                continue
+        peers = [
+            to_relay_peer(ClientParams(
+                hostname=learner.hostname,
+                port=learner.port,
+                root_certificate=learner.root_certificate,
+            ))
+            for idx, learner in enumerate(self._federation_environment.learners)
+            if idx != skip_learner
+        ]
+
+        reports = broadcast_model(
+            model=model,
+            peers=peers,
+            fanout=self._broadcast_fanout,
+            max_concurrency=self._broadcast_concurrency,
+        )
 
-            self._learner_clients[idx].set_initial_model(
-                model=model,
-            )
+        for report in reports:
+            if report.ok:
+                MetisLogger.info("Shipped initial model to learner {} in {:.3f}s.".format(
+                    report.endpoint, report.latency_secs))
+            else:
+                MetisLogger.error("Failed to ship initial model to learner {}: {}".format(
+                    report.endpoint, report.error))
+
+        return reports
@@ -1,13 +1,20 @@
 
 import datetime
+import threading
 import time
 from typing import Dict
 
+import grpc
 from google.protobuf.json_format import MessageToDict
 
 from .controller_client import GRPCControllerClient
 from ..common.types import TerminationSingals
 from ..common.logger import MetisLogger
+from ..proto import controller_pb2
+
+# The fields of the Logs, each a map from a task, update or learner id to its metadata.
+LOG_FIELDS = ("training_metadata", "evaluation_metadata", "model_metadata",
+              "learner_phase_durations")
 
 
 class FederationMonitor:
@@ -35,9 +42,14 @@ class FederationMonitor:
         self._controller_client = controller_client
         self._signals = termination_signals
         self._is_async = is_async
-        self._statistics = None
 
-    def monitor_federation(self, request_every_secs=10) -> Dict:
+        # The logs received so far, merged, and the cursor of the latest change in them.
+        self._statistics = {field: {} for field in LOG_FIELDS}
+        self._latest_evaluations = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def monitor_federation(self, request_every_secs=10, watch=False) -> Dict:
         """Monitors the federation. 
 
         The controller and learners are terminated when any of the termination signals is reached,
@@ -46,7 +58,11 @@ class FederationMonitor:
         Parameters
         ----------
         request_every_secs : int, optional
-            The interval in seconds to request statistics from the Controller, by default 10
+            The interval in seconds to request statistics from the Controller, by default 10.
+            Only the log entries that changed since the previous request are transferred.
+        watch : bool, optional
+            If True, the Controller pushes the log entries as they change, instead of being polled,
+            and request_every_secs is only the interval of the termination checks, by default False
 
         Returns
         -------
@@ -57,13 +73,20 @@ class FederationMonitor:
         st = datetime.datetime.now()
         terminate = False
 
+        watcher = self._watch_statistics() if watch else None
+
         while not terminate:
             time.sleep(request_every_secs)
-            self._collect_statistics()
+            if not watch:
+                self._collect_statistics()
+
+            with self._lock:
+                terminate = self._reached_federation_rounds() or \
+                    self._reached_evaluation_score() or \
+                    self._reached_execution_time(st)
 
-            terminate = self._reached_federation_rounds() or \
-                self._reached_evaluation_score() or \
-                self._reached_execution_time(st)
+        if watcher:
+            watcher.cancel()
 
         return self._statistics
 
@@ -73,44 +96,34 @@ class FederationMonitor:
         if not self._signals.federation_rounds or self._is_async:
             return False
 
-        metadata = self._statistics["metadata"]
-
-        if metadata:
-            current_global_iteration = max(
-                [m.global_iteration for m in metadata])
-
-            if current_global_iteration > self._signals.federation_rounds:
-                MetisLogger.info(
-                    "Exceeded federation rounds cutoff point. Exiting ...")
-                return True
+        # One model update per completed round.
+        if len(self._statistics["model_metadata"]) >= self._signals.federation_rounds:
+            MetisLogger.info(
+                "Exceeded federation rounds cutoff point. Exiting ...")
+            return True
         return False
 
     def _reached_evaluation_score(self) -> bool:
-        """Checks if the federation has reached the maximum evaluation score."""
+        """Checks if the mean score of the latest evaluations has reached the evaluation metric cutoff score."""
 
+        evaluation_metric = self._signals.evaluation_metric
         metric_cutoff_score = self._signals.evaluation_metric_cutoff_score
 
         if not metric_cutoff_score:
             return False
 
-        commmunity_evaluation = [
-            x for x in self._statistics["community_evaluation"]]
+        scores = [
+            float(evaluation["metrics"][evaluation_metric])
+            for evaluation in self._latest_evaluations.values()
+            if evaluation_metric in evaluation.get("metrics", {})
+        ]
 
-        for res in commmunity_evaluation:
-            scores = []
-            for _, evaluations in res.evaluations.items():
-                evaluation_metric = evaluations.evaluation.metric_values
-
-                if evaluation_metric and evaluation_metric in evaluations.evaluation.metric_values:
-                    test_score = evaluations.evaluation.metric_values[evaluation_metric]
-                    scores.append(float(test_score))
-
-            if scores:
-                mean_score = sum(scores) / len(scores)
-                if mean_score >= metric_cutoff_score:
-                    MetisLogger.info(
-                        "Exceeded evaluation metric cutoff score. Exiting...")
-                    return True
+        if scores:
+            mean_score = sum(scores) / len(scores)
+            if mean_score >= metric_cutoff_score:
+                MetisLogger.info(
+                    "Exceeded evaluation metric cutoff score. Exiting...")
+                return True
         return False
 
     def _reached_execution_time(self, st) -> bool:
@@ -128,20 +141,53 @@ class FederationMonitor:
         return False
 
     def _collect_statistics(self) -> None:
-        """Collects statistics from the federation."""
+        """Collects from the federation the log entries that changed since the previous request."""
+
+        logs = self._controller_client.get_logs_since(cursor=self._cursor)
+
+        if logs is not None:
+            with self._lock:
+                self._merge_logs(logs)
+
+    def _watch_statistics(self) -> grpc.Future:
+        """Merges the log entries pushed by the Controller, in a background thread.
 
-        statistics_pb = self._controller_client.get_logs()
+        Returns
+        -------
+        grpc.Future
+            The stream of the log entries. Cancel it to stop watching.
+        """
+
+        stream = self._controller_client.watch_logs(cursor=self._cursor)
+
+        def _watch():
+            try:
+                for logs in stream:
+                    with self._lock:
+                        self._merge_logs(logs)
+            except grpc.RpcError as rpc_error:
+                if rpc_error.code() != grpc.StatusCode.CANCELLED:
+                    MetisLogger.error(
+                        "Watching the logs failed: {}".format(rpc_error))
+
+        threading.Thread(target=_watch, daemon=True).start()
+
+        return stream
+
+    def _merge_logs(self, logs: controller_pb2.Logs) -> None:
+        """Merges the changed log entries into the collected statistics. Only the changed entries are converted."""
 
         def msg_to_dict_fn(x): return MessageToDict(
             x, preserving_proto_field_name=True)
 
-        statistics = {}
-        # FIXME:
-        statistics["learners"] = msg_to_dict_fn(statistics_pb.learners)
-        statistics["metadata"] = msg_to_dict_fn(statistics_pb.metadata)
-        statistics["learners_task"] = msg_to_dict_fn(
-            statistics_pb.learners_task)
-        statistics["community_evaluation"] = msg_to_dict_fn(
-            statistics_pb.community_model_lineage)
+        for field in LOG_FIELDS:
+            for key, value in getattr(logs, field).items():
+                self._statistics[field][key] = msg_to_dict_fn(value)
+
+        if logs.evaluation_metadata:
+            self._latest_evaluations = {
+                key: self._statistics["evaluation_metadata"][key]
+                for key in logs.evaluation_metadata
+            }
 
-        self._statistics = statistics
+        self._cursor = max(self._cursor, logs.cursor)
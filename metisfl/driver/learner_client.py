@@ -3,7 +3,8 @@
 
 from typing import Optional
 
-from ..common.client import get_client
+from ..common.chunking import ModelAssembler, chunks_to_model, model_to_chunks
+from ..common.client import AsyncClient, get_client
 from ..proto import learner_pb2_grpc, model_pb2, service_common_pb2
 from ..common.types import ClientParams
 
@@ -42,7 +43,7 @@ class GRPCLearnerClient(object):
         request_timeout: Optional[int] = None,
         block=True
     ) -> model_pb2.Model:
-        """Requests the Learner to send the current model.
+        """Requests the Learner to send the current model. The model is streamed in bounded-size chunks.
 
         Parameters
         ----------
@@ -55,15 +56,16 @@ class GRPCLearnerClient(object):
 
         Returns
         -------
-        service_common_pb2.Ack
-            The response Proto object with the Ack.
+        model_pb2.Model
+            The Proto object with the model of the Learner.
 
         """
         with self._get_client() as client:
             stub, schedule, _ = client
 
             def _request(_timeout=None):
-                return stub.GetModel(service_common_pb2.Empty(), timeout=_timeout)
+                return chunks_to_model(
+                    stub.GetModelStream(service_common_pb2.Empty(), timeout=_timeout))
 
             return schedule(_request, request_retries, request_timeout, block)
 
@@ -74,7 +76,8 @@ class GRPCLearnerClient(object):
         request_timeout: Optional[int] = None,
         block: Optional[bool] = True
     ) -> service_common_pb2.Ack:
-        """Requests the Learner to set the initial weights.
+        """Requests the Learner to set the initial weights. The model is streamed in bounded-size chunks,
+            unless it is a reference, which is sent as a single message.
 
         Parameters
         ----------
@@ -97,7 +100,9 @@ class GRPCLearnerClient(object):
             stub, schedule, _ = client
 
             def _request(_timeout=None):
-                return stub.SetInitialWeights(model, timeout=_timeout)
+                if model.reference:
+                    return stub.SetInitialWeights(model, timeout=_timeout)
+                return stub.SetInitialWeightsStream(model_to_chunks(model), timeout=_timeout)
 
             return schedule(_request, request_retries, request_timeout, block)
 
@@ -138,3 +143,108 @@ class GRPCLearnerClient(object):
         with self._get_client() as client:
             _, _, shutdown = client
             shutdown()
+
+
+class AsyncGRPCLearnerClient(object):
+
+    """An asyncio variant of GRPCLearnerClient. Its requests are coroutines, hence the Driver
+        can have requests in flight to all the learners from a single event loop."""
+
+    def __init__(self, client_params: ClientParams):
+        """Initializes the client.
+
+        Parameters
+        ----------
+        client_params : ClientParams
+            The client parameters. Contains server hostname and port.
+        """
+        self._client = AsyncClient(
+            client_params=client_params,
+            stub_class=learner_pb2_grpc.LearnerServiceStub,
+        )
+
+    async def get_model(
+        self,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> model_pb2.Model:
+        """Requests the Learner to send the current model. The model is assembled as its chunks arrive.
+
+        Parameters
+        ----------
+        request_retries : Optional[int], (default: 1)
+            The number of retries for the request, by default 1
+        request_timeout : Optional[int], (default: None)
+            The timeout for the request, by default None
+
+        Returns
+        -------
+        model_pb2.Model
+            The Proto object with the model of the Learner.
+        """
+        async def _request(stub, _timeout=None):
+            assembler = ModelAssembler()
+            async for chunk in stub.GetModelStream(service_common_pb2.Empty(), timeout=_timeout):
+                assembler.add_chunk(chunk)
+            return assembler.get_model()
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def set_initial_model(
+        self,
+        model: model_pb2.Model,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> service_common_pb2.Ack:
+        """Requests the Learner to set the initial weights. The model is streamed in bounded-size chunks,
+            unless it is a reference, which is sent as a single message.
+
+        Parameters
+        ----------
+        model : model_pb2.Model
+            The initial model weights
+        request_retries : Optional[int], (default: 1)
+            The number of retries for the request, by default 1
+        request_timeout : Optional[int], (default: None)
+            The timeout for the request, by default None
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the Ack.
+        """
+        async def _request(stub, _timeout=None):
+            if model.reference:
+                return await stub.SetInitialWeights(model, timeout=_timeout)
+            return await stub.SetInitialWeightsStream(model_to_chunks(model), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def shutdown_server(
+        self,
+        request_retries: Optional[int] = 1,
+        request_timeout: Optional[int] = None
+    ) -> service_common_pb2.Ack:
+        """Sends a shutdown request to the Learner server.
+
+        Parameters
+        ----------
+        request_retries : Optional[int], (default: 1)
+            The number of retries for the request, by default 1
+        request_timeout : Optional[int], (default: None)
+            The timeout for the request, by default None
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the Ack.
+        """
+        async def _request(stub, _timeout=None):
+            return await stub.ShutDown(service_common_pb2.Empty(), timeout=_timeout)
+
+        return await self._client.request(_request, request_retries, request_timeout)
+
+    async def shutdown_client(self) -> None:
+        """Shuts down the client."""
+
+        await self._client.close()
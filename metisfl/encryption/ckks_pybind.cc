@@ -46,26 +46,26 @@ class CKKSWrapper : public CKKS {
   py::dict PyGenCryptoParams() {
     py::dict py_dict_crypto_params;
     auto crypto_params = CKKS::GenCryptoParams();
-    // Need to explicitly convert to py::str() to avoid encoding errors.
+    // The parameters are serialized in binary, hence returned as py::bytes.
     py_dict_crypto_params[CRYPTO_CONTEXT] =
-        py::str(crypto_params.crypto_context);
+        py::bytes(crypto_params.crypto_context);
     py_dict_crypto_params[CRYPTO_PUBLIC_KEY] =
-        py::str(crypto_params.public_key);
+        py::bytes(crypto_params.public_key);
     py_dict_crypto_params[CRYPTO_PRIVATE_KEY] =
-        py::str(crypto_params.private_key);
+        py::bytes(crypto_params.private_key);
     return py_dict_crypto_params;
   }
 
   py::dict PyGetCryptoParams() {
     py::dict py_dict_crypto_params;
     auto crypto_params = CKKS::GetCryptoParams();
-    // Need to explicitly convert to py::bytes() to avoid encoding errors.
+    // The parameters are serialized in binary, hence returned as py::bytes.
     py_dict_crypto_params[CRYPTO_CONTEXT] =
-        py::str(crypto_params.crypto_context);
+        py::bytes(crypto_params.crypto_context);
     py_dict_crypto_params[CRYPTO_PUBLIC_KEY] =
-        py::str(crypto_params.public_key);
+        py::bytes(crypto_params.public_key);
     py_dict_crypto_params[CRYPTO_PRIVATE_KEY] =
-        py::str(crypto_params.private_key);
+        py::bytes(crypto_params.private_key);
     return py_dict_crypto_params;
   }
 
@@ -88,7 +88,12 @@ class CKKSWrapper : public CKKS {
 
   py::array_t<double> PyDecrypt(string data,
                                 unsigned long int data_dimensions) {
-    auto data_decrypted = CKKS::Decrypt(data, data_dimensions);
+    std::vector<double> data_decrypted;
+    {
+      // The ciphertexts are decrypted without holding the GIL.
+      py::gil_scoped_release release;
+      data_decrypted = CKKS::Decrypt(std::move(data), data_dimensions);
+    }
     // Cast and release created vector.
     auto py_array_decrypted =
         py::array_t<double>(py::cast(std::move(data_decrypted)));
@@ -98,10 +103,56 @@ class CKKSWrapper : public CKKS {
   py::bytes PyEncrypt(py::array_t<double> data_array) {
     auto data_vec = std::vector<double>(data_array.data(),
                                         data_array.data() + data_array.size());
-    auto data_encrypted_str = CKKS::Encrypt(data_vec);
+    std::string data_encrypted_str;
+    {
+      // The values are encrypted without holding the GIL.
+      py::gil_scoped_release release;
+      data_encrypted_str = CKKS::Encrypt(std::move(data_vec));
+    }
     py::bytes py_bytes(data_encrypted_str);
     return py_bytes;
   }
+
+  py::list PyEncryptMany(py::list data_arrays) {
+    std::vector<std::vector<double>> data_vecs;
+    data_vecs.reserve(data_arrays.size());
+    for (const auto &item : data_arrays) {
+      auto data_array = item.cast<
+          py::array_t<double, py::array::c_style | py::array::forcecast>>();
+      data_vecs.emplace_back(data_array.data(),
+                             data_array.data() + data_array.size());
+    }
+
+    std::vector<std::string> data_encrypted;
+    {
+      py::gil_scoped_release release;
+      data_encrypted = CKKS::EncryptMany(data_vecs);
+    }
+
+    py::list py_list_encrypted;
+    for (const auto &data_encrypted_str : data_encrypted) {
+      py_list_encrypted.append(py::bytes(data_encrypted_str));
+    }
+    return py_list_encrypted;
+  }
+
+  py::list PyDecryptMany(py::list data, py::list data_dimensions) {
+    auto data_vec = data.cast<std::vector<std::string>>();
+    auto data_dimensions_vec =
+        data_dimensions.cast<std::vector<unsigned long int>>();
+
+    std::vector<std::vector<double>> data_decrypted;
+    {
+      py::gil_scoped_release release;
+      data_decrypted = CKKS::DecryptMany(data_vec, data_dimensions_vec);
+    }
+
+    py::list py_list_decrypted;
+    for (auto &values : data_decrypted) {
+      py_list_decrypted.append(py::array_t<double>(py::cast(std::move(values))));
+    }
+    return py_list_decrypted;
+  }
 };
 
 PYBIND11_MODULE(fhe, m) {
@@ -121,6 +172,10 @@ PYBIND11_MODULE(fhe, m) {
       .def("load_public_key", &CKKS::LoadPublicKey)
       .def("aggregate", &CKKSWrapper::PyAggregate)
       .def("encrypt", &CKKSWrapper::PyEncrypt)
+      .def("encrypt_many", &CKKSWrapper::PyEncryptMany, py::arg("data_arrays"))
+      .def("decrypt_many", &CKKSWrapper::PyDecryptMany, py::arg("data"),
+           py::arg("data_dimensions"))
+      .def("set_num_threads", &CKKS::SetNumThreads, py::arg("num_threads"))
       .def(
           "decrypt",
           [](CKKSWrapper& ckks_wrapper, std::string data,
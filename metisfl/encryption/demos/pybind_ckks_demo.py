@@ -1,3 +1,6 @@
+import os
+import time
+
 import numpy as np
 import tempfile
 
@@ -118,6 +121,48 @@ def test_ckks_api(
     MetisLogger.info("Aggregated (Decrypted) Result: {}".format(pwa_dec))
 
 
+def benchmark_parallel_ckks(
+        batch_size,
+        scaling_factor_bits,
+        model_sizes,
+        num_tensors=10,
+        repeats=3):
+    """Measures the speedup of the batched encryption and decryption over the
+    number of threads, for models of the given sizes split into equal tensors."""
+
+    ckks_scheme = CKKS(batch_size, scaling_factor_bits)
+    crypto_params = ckks_scheme.gen_crypto_params()
+    ckks_scheme.load_crypto_context(crypto_params["crypto_context"])
+    ckks_scheme.load_public_key(crypto_params["public_key"])
+    ckks_scheme.load_private_key(crypto_params["private_key"])
+
+    num_cores = os.cpu_count() or 1
+    thread_counts = sorted({1, 2, 4, 8, 16, num_cores} & set(range(1, num_cores + 1)))
+    rng = np.random.default_rng(0)
+    for model_size in model_sizes:
+        tensors = np.array_split(rng.normal(size=model_size), num_tensors)
+        lengths = [len(tensor) for tensor in tensors]
+        baseline = None
+        for num_threads in thread_counts:
+            ckks_scheme.set_num_threads(num_threads)
+            encrypt_time, decrypt_time = float("inf"), float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                tensors_enc = ckks_scheme.encrypt_many(tensors)
+                encrypt_time = min(encrypt_time, time.perf_counter() - start)
+                start = time.perf_counter()
+                ckks_scheme.decrypt_many(tensors_enc, lengths)
+                decrypt_time = min(decrypt_time, time.perf_counter() - start)
+            if baseline is None:
+                baseline = (encrypt_time, decrypt_time)
+            MetisLogger.info(
+                "Model of {} values, {} threads of {} cores: encrypt {:.3f}s ({:.2f}x), "
+                "decrypt {:.3f}s ({:.2f}x)".format(
+                    model_size, num_threads, num_cores,
+                    encrypt_time, baseline[0] / encrypt_time,
+                    decrypt_time, baseline[1] / decrypt_time))
+
+
 if __name__ == "__main__":
     """
     Through this demo we test the encryption, decryption and private weighted
@@ -168,3 +213,8 @@ if __name__ == "__main__":
                   scaling_factors, number_of_elems, file_based_api=True)
     test_ckks_api(batch_size, scaling_factor_bits, learners_data,
                   scaling_factors, number_of_elems, file_based_api=False)
+
+    # Case 3: We measure the speedup of the batched API over the number of threads,
+    # for models of 100K, 1M and 10M parameters.
+    benchmark_parallel_ckks(batch_size, scaling_factor_bits,
+                            model_sizes=[100_000, 1_000_000, 10_000_000])
@@ -20,7 +20,7 @@ def generate_keys(
     public_key_path: Optional[str] = "public_key.txt",
     private_key_path: Optional[str] = "private_key.txt"
 ) -> None:
-    """Generates the crypto context and keys and saves them to the specified paths.
+    """Generates the crypto context and keys and saves them, in binary, to the specified paths.
         If no path is specified, the default paths are used (crypto_context.txt, public_key.txt, private_key.txt).
         and the files are saved in the current working directory.
 
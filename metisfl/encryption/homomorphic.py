@@ -1,14 +1,19 @@
 
 """MetisFL Homomorphic Encryption Module using Palisade."""
 
+from typing import List, Optional
+
 import numpy as np
 from metisfl.encryption import fhe
+from .key_cache import CryptoMaterialCache
 from .scheme import EncryptionScheme
 
 
 class HomomorphicEncryption(EncryptionScheme):
 
-    """Homomorphic Encryption class using Palisade. Wraps the C++ implementation of Palisade."""
+    """Homomorphic Encryption class using Palisade. Wraps the C++ implementation of Palisade.
+        The object is pickled as its arguments, hence a process it is sent to (e.g., a spawned
+        worker) loads the crypto context and keys again, from the key cache of the host."""
 
     def __init__(
         self,
@@ -17,6 +22,8 @@ class HomomorphicEncryption(EncryptionScheme):
         crypto_context_path: str,
         public_key_path: str,
         private_key_path: str,
+        num_threads: Optional[int] = None,
+        use_key_cache: Optional[bool] = True,
     ):
         """Initializes the CKKS Homomorphic Encryption scheme. 
 
@@ -32,13 +39,35 @@ class HomomorphicEncryption(EncryptionScheme):
             The path to the public key file.
         private_key_path : str, optional
             The path to the private key file.
+        num_threads : Optional[int], (default=None)
+            The number of threads that encrypt and decrypt the ciphertexts of a call in parallel.
+            If None, all the cores are used.
+        use_key_cache : Optional[bool], (default=True)
+            Whether to load the crypto context and keys through the CryptoMaterialCache of the host,
+            i.e., from shared memory if another process has already loaded them. Otherwise,
+            they are loaded from their files.
 
         """
-        # TODO: Make it easier to load the crypto context and keys.
+        self._args = (batch_size, scaling_factor_bits, crypto_context_path,
+                      public_key_path, private_key_path, num_threads, use_key_cache)
         self._he_scheme = fhe.CKKS(batch_size, scaling_factor_bits)
-        self._he_scheme.load_crypto_context_from_file(crypto_context_path)
-        self._he_scheme.load_public_key_from_file(public_key_path)
-        self._he_scheme.load_private_key_from_file(private_key_path)
+        if use_key_cache:
+            material = CryptoMaterialCache(
+                crypto_context_path, public_key_path, private_key_path).load()
+            self._he_scheme.load_crypto_context(material.crypto_context)
+            self._he_scheme.load_public_key(material.public_key)
+            self._he_scheme.load_private_key(material.private_key)
+        else:
+            self._he_scheme.load_crypto_context_from_file(crypto_context_path)
+            self._he_scheme.load_public_key_from_file(public_key_path)
+            self._he_scheme.load_private_key_from_file(private_key_path)
+        if num_threads is not None:
+            if num_threads <= 0:
+                raise ValueError("Number of threads must be positive: {}".format(num_threads))
+            self._he_scheme.set_num_threads(num_threads)
+
+    def __reduce__(self):
+        return (HomomorphicEncryption, self._args)
 
     def decrypt(self, value: bytes, length: int) -> np.ndarray:
         """Decrypts the value.
@@ -73,3 +102,39 @@ class HomomorphicEncryption(EncryptionScheme):
         """
 
         return self._he_scheme.encrypt(arr)
+
+    def decrypt_many(self, values: List[bytes], lengths: List[int]) -> List[np.ndarray]:
+        """Decrypts the values in a single call; their ciphertexts are decrypted in parallel,
+            without holding the GIL.
+
+        Parameters
+        ----------
+        values : List[bytes]
+            The values to decrypt as bytes.
+        lengths : List[int]
+            The length of every value.
+
+        Returns
+        -------
+        List[np.ndarray]
+            The decrypted values as numpy arrays, in order.
+        """
+
+        return self._he_scheme.decrypt_many(list(values), list(lengths))
+
+    def encrypt_many(self, arrs: List[np.ndarray]) -> List[bytes]:
+        """Encrypts the arrays in a single call; their ciphertexts are encrypted in parallel,
+            without holding the GIL.
+
+        Parameters
+        ----------
+        arrs : List[np.ndarray]
+            The arrays to encrypt.
+
+        Returns
+        -------
+        List[bytes]
+            The encrypted arrays as bytes, in order.
+        """
+
+        return self._he_scheme.encrypt_many(list(arrs))
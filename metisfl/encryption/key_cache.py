@@ -0,0 +1,230 @@
+"""This module caches the serialized crypto context and public key of a host in a shared memory
+    file, so that the learner processes of the host (e.g., the workers spawned for every task) read
+    the key material from memory instead of loading it from its files every time. The private key
+    is never written to the cache; every process reads it from its file."""
+
+import hashlib
+import os
+import stat
+import struct
+import tempfile
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from ..learner.shared_weights import SHARED_MEMORY_DIR
+
+# Magic, format version, and the sizes of the crypto context and public key.
+_HEADER = struct.Struct("<4sI2Q")
+_MAGIC = b"MFLK"
+_FORMAT_VERSION = 2
+_CACHE_FILE_PREFIX = "metisfl-crypto-"
+
+
+class CryptoMaterial(NamedTuple):
+
+    """The binary serialization of a crypto context and its keys."""
+
+    crypto_context: bytes
+    """The serialized crypto context."""
+    public_key: bytes
+    """The serialized public key."""
+    private_key: bytes
+    """The serialized private key; empty if it was not given."""
+
+
+def read_crypto_material(
+    crypto_context_path: str,
+    public_key_path: str,
+    private_key_path: Optional[str] = None
+) -> CryptoMaterial:
+    """Reads the crypto context and the keys from their files.
+
+    Parameters
+    ----------
+    crypto_context_path : str
+        The path to the crypto context file.
+    public_key_path : str
+        The path to the public key file.
+    private_key_path : Optional[str], (default=None)
+        The path to the private key file, if any.
+
+    Returns
+    -------
+    CryptoMaterial
+        The serialized crypto context and keys.
+    """
+    def _read(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    return CryptoMaterial(
+        crypto_context=_read(crypto_context_path),
+        public_key=_read(public_key_path),
+        private_key=_read(private_key_path) if private_key_path else b"",
+    )
+
+
+class CryptoMaterialCache(object):
+
+    """Caches the crypto context and public key of the given files in a shared memory file of the
+        host. The first process that loads the key material reads it from its files and publishes
+        it; every other process reads it from the cache. The cache file is identified by the paths,
+        sizes and modification times of the key files, hence rotated keys get a new cache file, and
+        the cache files of the keys they replace are removed. The private key is read from its file,
+        so that it is never left behind in shared memory. Within a process, the key material is
+        loaded only once. The cache file is named after the user, and is trusted only if it is a
+        regular file owned by the user and accessible by no one else, since the shared memory
+        directory is writable by every user of the host."""
+
+    # The key material loaded in this process, by cache file.
+    _loaded: Dict[str, CryptoMaterial] = {}
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        crypto_context_path: str,
+        public_key_path: str,
+        private_key_path: Optional[str] = None,
+        cache_dir: Optional[str] = SHARED_MEMORY_DIR
+    ):
+        """Initializes the CryptoMaterialCache object.
+
+        Parameters
+        ----------
+        crypto_context_path : str
+            The path to the crypto context file.
+        public_key_path : str
+            The path to the public key file.
+        private_key_path : Optional[str], (default=None)
+            The path to the private key file, if any.
+        cache_dir : Optional[str], (default=SHARED_MEMORY_DIR)
+            The directory of the cache file.
+
+        Raises
+        ------
+        FileNotFoundError
+            If a key file does not exist.
+        """
+        self._paths = (crypto_context_path, public_key_path, private_key_path)
+
+        # The cache files of the same key files share a prefix, by which stale ones are found.
+        paths_digest = hashlib.blake2b(digest_size=8)
+        files_digest = hashlib.blake2b(digest_size=16)
+        for path in self._paths:
+            if path:
+                stat = os.stat(path)
+                paths_digest.update("{};".format(os.path.realpath(path)).encode())
+                files_digest.update("{}:{}:{};".format(
+                    os.path.realpath(path), stat.st_size, stat.st_mtime_ns).encode())
+            else:
+                paths_digest.update(b"-;")
+                files_digest.update(b"-;")
+        self._prefix = "{}{}-{}-".format(
+            _CACHE_FILE_PREFIX, os.getuid(), paths_digest.hexdigest())
+        self._path = os.path.join(
+            cache_dir, "{}{}".format(self._prefix, files_digest.hexdigest()))
+
+    @property
+    def path(self) -> str:
+        """The path of the cache file."""
+        return self._path
+
+    def load(self) -> CryptoMaterial:
+        """Returns the key material, from this process, from the cache or from its files.
+
+        Returns
+        -------
+        CryptoMaterial
+            The serialized crypto context and keys.
+        """
+        with self._lock:
+            material = self._loaded.get(self._path)
+            if material is None:
+                material = self._read_cache()
+            if material is None:
+                material = read_crypto_material(*self._paths)
+                try:
+                    self._write_cache(material)
+                except PermissionError:
+                    # The cache file is taken by another user; the material is not published.
+                    pass
+                else:
+                    self._remove_stale()
+            self._loaded[self._path] = material
+            return material
+
+    def release(self) -> None:
+        """Removes the cache file, e.g., once the keys are rotated.
+            Processes that have already loaded the key material keep it."""
+        with self._lock:
+            self._loaded.pop(self._path, None)
+            try:
+                os.unlink(self._path)
+            except FileNotFoundError:
+                pass
+
+    def _read_cache(self) -> Optional[CryptoMaterial]:
+        """Returns the key material of the cache file, or None if it is missing, invalid or
+            not trusted, i.e., not a regular file of the user with mode 0600."""
+        try:
+            fd = os.open(self._path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        except OSError:
+            # E.g., the cache file is missing, or is a symbolic link.
+            return None
+        with os.fdopen(fd, "rb") as f:
+            # Checked on the open file, hence the file cannot be swapped after the check.
+            file_stat = os.fstat(f.fileno())
+            if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_uid != os.getuid() or \
+                    stat.S_IMODE(file_stat.st_mode) != 0o600:
+                return None
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, *sizes = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _FORMAT_VERSION or \
+                _HEADER.size + sum(sizes) != len(data):
+            return None
+
+        view, offset, parts = memoryview(data), _HEADER.size, []
+        for size in sizes:
+            parts.append(bytes(view[offset:offset + size]))
+            offset += size
+        private_key_path = self._paths[2]
+        private_key = b""
+        if private_key_path:
+            with open(private_key_path, "rb") as f:
+                private_key = f.read()
+        return CryptoMaterial(*parts, private_key=private_key)
+
+    def _write_cache(self, material: CryptoMaterial) -> None:
+        """Publishes the crypto context and public key. The cache file is replaced atomically,
+            hence other processes never read a partially written cache."""
+        fd, path = tempfile.mkstemp(
+            prefix=os.path.basename(self._path) + "-", dir=os.path.dirname(self._path))
+        try:
+            # Created readable by the owner only, like the key files should be.
+            parts = (material.crypto_context, material.public_key)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, *map(len, parts)))
+                for part in parts:
+                    f.write(part)
+            os.replace(path, self._path)
+        except Exception:
+            if os.path.exists(path):
+                os.unlink(path)
+            raise
+
+    def _remove_stale(self) -> None:
+        """Removes the cache files of earlier versions of the same key files, e.g., of rotated keys.
+            The temporary files that other processes are still writing are left alone."""
+        cache_dir, name = os.path.split(self._path)
+        suffix_length = len(name) - len(self._prefix)
+        for entry in os.listdir(cache_dir):
+            if entry == name or not entry.startswith(self._prefix) or \
+                    len(entry) - len(self._prefix) != suffix_length:
+                continue
+            try:
+                os.unlink(os.path.join(cache_dir, entry))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,554 @@
+"""Secure aggregation with pairwise additive masks, after Bonawitz et al., "Practical Secure
+    Aggregation for Privacy-Preserving Machine Learning" (CCS 2017).
+
+    Every pair of learners of a round agrees on a seed through a Diffie-Hellman key exchange,
+    from which both expand the same pseudorandom masks. The learner with the smaller id adds
+    the masks to its model and the other one subtracts them, modulo 2^64, hence the masks cancel
+    out when the Controller sums the models of all the learners of the round and only the sum
+    is revealed. The masks that the surviving learners share with learners that dropped out of
+    the round are cancelled by corrections, which the surviving learners send on request.
+
+    Every model is also masked with a self mask, whose seed the learner draws for the round and
+    splits into Shamir shares, such that any majority of the learners of the round reconstructs
+    it. The shares are encrypted for every other learner of the round with ChaCha20-Poly1305,
+    bound to the round, sender and recipient as associated data, and sent to the Controller along
+    with the masked model. Once the models of the round are in, every surviving learner
+    reveals its shares of the seeds of the surviving learners, from which the Controller removes
+    their self masks. A learner reveals, for every other learner, either its share of the seed of
+    its self mask or the correction of the masks they share, never both, hence the model of a
+    learner that is late rather than dropped stays masked by its self mask.
+
+    The Controller is assumed to be honest-but-curious: it follows the protocol but may try to
+    learn the models of the learners. Unlike the original protocol, the masks of the dropped
+    learners are cancelled by corrections instead of shares of their keys.
+"""
+
+import hashlib
+import os
+import secrets
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+
+from ..proto import model_pb2
+from .scheme import EncryptionScheme
+
+# The 2048-bit MODP group of RFC 3526 (group 14), with generator 2.
+# The prime is safe, hence the only small subgroups are {1} and {1, p - 1}.
+_PRIME = int(
+    "FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74"
+    "020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437"
+    "4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED"
+    "EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05"
+    "98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB"
+    "9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B"
+    "E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718"
+    "3995497CEA956AE515D2261898FA051015728E5A8AACAA68FFFFFFFFFFFFFFFF", 16)
+_GENERATOR = 2
+_KEY_SIZE = 256
+_PRIVATE_KEY_BITS = 256
+
+# The number of registered rounds whose masks are kept, for learners that lag behind.
+MAX_ROUNDS = 4
+
+# The seeds of the self masks are shared as 32-bit words, in the field of the prime 2^61 - 1.
+SHARING_PRIME = 2 ** 61 - 1
+SEED_SIZE = 32
+_SEED_WORDS = SEED_SIZE // 4
+_SHARE_NONCE_SIZE = 12
+
+
+def expand_masks(seed: bytes, length: int) -> np.ndarray:
+    """Expands the seed into pseudorandom masks.
+
+    Parameters
+    ----------
+    seed : bytes
+        The seed of the masks.
+    length : int
+        The number of masks.
+
+    Returns
+    -------
+    np.ndarray
+        The masks, as uint64 integers.
+    """
+    # SHAKE-256 is a cryptographic extendable-output function, i.e., a stream of any length.
+    return np.frombuffer(hashlib.shake_256(seed).digest(8 * length), dtype="<u8")
+
+
+def share_seed(seed: bytes, indices: List[int], threshold: int) -> Dict[int, bytes]:
+    """Splits the seed into Shamir shares, any threshold of which reconstruct it.
+
+    Parameters
+    ----------
+    seed : bytes
+        The seed, of SEED_SIZE bytes.
+    indices : List[int]
+        The (positive and distinct) indices of the holders of the shares.
+    threshold : int
+        The number of shares that reconstruct the seed.
+
+    Returns
+    -------
+    Dict[int, bytes]
+        The share of every holder, by index.
+    """
+    # Every word of the seed is the constant term of a random polynomial of degree threshold - 1.
+    polynomials = [
+        [word] + [secrets.randbelow(SHARING_PRIME) for _ in range(threshold - 1)]
+        for word in struct.unpack("<{}I".format(_SEED_WORDS), seed)
+    ]
+    shares = {}
+    for index in indices:
+        values = []
+        for polynomial in polynomials:
+            value = 0
+            for coefficient in reversed(polynomial):
+                value = (value * index + coefficient) % SHARING_PRIME
+            values.append(value)
+        shares[index] = struct.pack("<{}Q".format(_SEED_WORDS), *values)
+    return shares
+
+
+def reconstruct_seed(shares: Dict[int, bytes]) -> bytes:
+    """Reconstructs a seed from at least the threshold number of its shares.
+
+    Parameters
+    ----------
+    shares : Dict[int, bytes]
+        The shares, by the index of their holders.
+
+    Returns
+    -------
+    bytes
+        The seed.
+
+    Raises
+    ------
+    ValueError
+        If the shares are invalid or do not reconstruct a seed, e.g., too few of them are given.
+    """
+    if not shares:
+        raise ValueError("No shares are given")
+    points = []
+    for index, share in shares.items():
+        if len(share) != 8 * _SEED_WORDS or not 0 < index < SHARING_PRIME:
+            raise ValueError("Invalid share of index {}".format(index))
+        points.append((index, struct.unpack("<{}Q".format(_SEED_WORDS), share)))
+
+    # The Lagrange coefficients of the polynomials at 0.
+    coefficients = []
+    for index, _ in points:
+        numerator, denominator = 1, 1
+        for other, _ in points:
+            if other != index:
+                numerator = numerator * other % SHARING_PRIME
+                denominator = denominator * (other - index) % SHARING_PRIME
+        coefficients.append(numerator * pow(denominator, SHARING_PRIME - 2, SHARING_PRIME))
+
+    words = [sum(coefficient * values[word] for coefficient, (_, values) in zip(coefficients, points))
+             % SHARING_PRIME for word in range(_SEED_WORDS)]
+    # Too few shares reconstruct random field elements rather than 32-bit words.
+    if any(word >= 2 ** 32 for word in words):
+        raise ValueError("Shares do not reconstruct a seed")
+    return struct.pack("<{}I".format(_SEED_WORDS), *words)
+
+
+def _sharing_key(
+    shared_key: bytes,
+    round_id: str,
+    sender_id: str,
+    recipient_id: str
+) -> Tuple[bytes, bytes]:
+    """Returns the key that encrypts the share that the sender sends to the recipient in the round,
+        along with the associated data that binds the share to the round, sender and recipient."""
+    key = hashlib.blake2b(shared_key, digest_size=32, person=b"metisfl-sharing").digest()
+    return key, "\0".join([round_id, sender_id, recipient_id]).encode()
+
+
+def _seal(share: bytes, key: bytes, associated_data: bytes) -> bytes:
+    """Encrypts and authenticates the share with ChaCha20-Poly1305, under a random nonce."""
+    nonce = secrets.token_bytes(_SHARE_NONCE_SIZE)
+    return nonce + ChaCha20Poly1305(key).encrypt(nonce, share, associated_data)
+
+
+def _open(sealed: bytes, key: bytes, associated_data: bytes) -> bytes:
+    """Authenticates and decrypts the share."""
+    nonce, ciphertext = sealed[:_SHARE_NONCE_SIZE], sealed[_SHARE_NONCE_SIZE:]
+    try:
+        return ChaCha20Poly1305(key).decrypt(nonce, ciphertext, associated_data)
+    except (InvalidTag, ValueError):
+        raise ValueError("Share is not authentic")
+
+
+def _to_fixed_point(values: np.ndarray, fraction_bits: int) -> np.ndarray:
+    """Returns the values in fixed point, as the uint64 integers of their two's complement."""
+    scaled = np.rint(np.asarray(values, dtype=np.float64) * float(2 ** fraction_bits))
+    # Leaves room for the sum of the models of many learners.
+    if not np.all(np.abs(scaled) < 2.0 ** 62):
+        raise ValueError("Values are not finite or too large for {} fraction bits".format(
+            fraction_bits))
+    return scaled.astype(np.int64).view(np.uint64)
+
+
+class _Round(object):
+
+    """The state of a masking round: the seeds shared with the other learners of the round,
+        the seed of the self mask and its shares, and, once the model is masked, the number of
+        masked values."""
+
+    def __init__(
+        self,
+        learner_id: str,
+        seeds: Dict[str, bytes],
+        self_seed: bytes,
+        own_share: bytes,
+        sealed_shares: Dict[str, bytes],
+        opening_keys: Dict[str, Tuple[bytes, bytes]]
+    ):
+        self.learner_id = learner_id
+        self.seeds = seeds
+        self.self_seed = self_seed
+        self.own_share = own_share
+        self.sealed_shares = sealed_shares
+        self.opening_keys = opening_keys
+        self.num_values = None
+        self.recovered = None
+
+
+class PairwiseMasking(EncryptionScheme):
+
+    """Masks the models of the learners pairwise, for the MaskedAgg aggregation rule.
+        The masked values are the weighted values of the model in fixed point, plus the masks,
+        as little-endian uint64 integers; the values of all the tensors of a model are masked as
+        a single stream, preceded by the weight of the model, hence masked models may be packed.
+
+        The values are also masked with the self mask of the round, which the Controller removes
+        with the shares of its seed that the surviving learners of the round reveal.
+
+        Before a model is masked, the round must be registered with the public keys of its
+        learners and activated with the weight of the model."""
+
+    def __init__(
+        self,
+        private_key_path: Optional[str] = None,
+        fraction_bits: Optional[int] = 24
+    ):
+        """Initializes the PairwiseMasking object.
+
+        Parameters
+        ----------
+        private_key_path : Optional[str], (default=None)
+            The file of the private key of the key agreement. If it does not exist, a new key is
+            generated and saved in it, readable by the owner only, hence the learner keeps its key
+            when it rejoins the federation. If None, a new key is generated and not saved.
+        fraction_bits : Optional[int], (default=24)
+            The number of fraction bits of the fixed point values.
+
+        Raises
+        ------
+        ValueError
+            If the number of fraction bits is not in [0, 52].
+        """
+        if not 0 <= fraction_bits <= 52:
+            raise ValueError("Number of fraction bits must be in [0, 52]: {}".format(
+                fraction_bits))
+        self._fraction_bits = fraction_bits
+        self._private_key = self._load_private_key(private_key_path)
+        self._public_key = pow(_GENERATOR, self._private_key, _PRIME)
+
+        self._lock = threading.Lock()
+        self._rounds: "OrderedDict[str, _Round]" = OrderedDict()
+        self._active_round = None
+        self._weight = None
+        self._masked_weight = None
+
+    @property
+    def fraction_bits(self) -> int:
+        """The number of fraction bits of the fixed point values."""
+        return self._fraction_bits
+
+    @property
+    def public_key(self) -> bytes:
+        """The public key of the key agreement, which the learner sends when it joins the federation."""
+        return self._public_key.to_bytes(_KEY_SIZE, "big")
+
+    def register_round(
+        self,
+        round_id: str,
+        peers: Dict[str, bytes],
+        threshold: Optional[int] = None
+    ) -> None:
+        """Agrees on the seeds of the masks of the round with the other learners of the round,
+            and draws the seed of the self mask of the round and shares it with them.
+
+        Parameters
+        ----------
+        round_id : str
+            The id of the round.
+        peers : Dict[str, bytes]
+            The public keys of all the learners of the round, by learner id, including this learner,
+            which is identified by its public key. The learners hold the shares of the order
+            they are given in.
+        threshold : Optional[int], (default=None)
+            The number of shares that reconstruct the seed of the self mask; must be a majority
+            of the learners of the round. If None, the smallest majority.
+
+        Raises
+        ------
+        ValueError
+            If the round is already registered, if a public key is invalid, if the learner is
+            not part of the round or if the threshold is not a majority.
+        """
+        own_key = self.public_key
+        learner_ids = [learner_id for learner_id, key in peers.items() if key == own_key]
+        if len(learner_ids) != 1:
+            raise ValueError("Learner is not part of round {} exactly once".format(round_id))
+        # A minority of the learners could be told that a learner survived while the others are
+        # told that it dropped out, hence the threshold must be a majority.
+        if threshold is None:
+            threshold = len(peers) // 2 + 1
+        if not len(peers) // 2 < threshold <= len(peers):
+            raise ValueError("Threshold {} is not a majority of the {} learners of round {}".format(
+                threshold, len(peers), round_id))
+
+        self_seed = secrets.token_bytes(SEED_SIZE)
+        indices = {learner_id: index for index, learner_id in enumerate(peers, start=1)}
+        shares = share_seed(self_seed, list(indices.values()), threshold)
+
+        seeds, sealed_shares, opening_keys = {}, {}, {}
+        for learner_id, key in peers.items():
+            if learner_id == learner_ids[0]:
+                continue
+            public_key = int.from_bytes(key, "big")
+            if not 1 < public_key < _PRIME - 1:
+                raise ValueError("Invalid public key of learner {}".format(learner_id))
+            shared_key = pow(public_key, self._private_key, _PRIME).to_bytes(_KEY_SIZE, "big")
+            # The masks of every round are different, even though the keys are not.
+            seeds[learner_id] = hashlib.blake2b(
+                shared_key + round_id.encode(), digest_size=32, person=b"metisfl-masking").digest()
+            sealed_shares[learner_id] = _seal(
+                shares[indices[learner_id]],
+                *_sharing_key(shared_key, round_id, learner_ids[0], learner_id))
+            opening_keys[learner_id] = _sharing_key(
+                shared_key, round_id, learner_id, learner_ids[0])
+
+        with self._lock:
+            if round_id in self._rounds:
+                raise ValueError("Round {} is already registered".format(round_id))
+            self._rounds[round_id] = _Round(
+                learner_ids[0], seeds, self_seed, shares[indices[learner_ids[0]]],
+                sealed_shares, opening_keys)
+            while len(self._rounds) > MAX_ROUNDS:
+                self._rounds.popitem(last=False)
+
+    def set_active_round(self, round_id: str, weight: float) -> None:
+        """Sets the round the next model is masked for and the weight the model is scaled by.
+
+        Parameters
+        ----------
+        round_id : str
+            The id of a registered round.
+        weight : float
+            The weight of the model, e.g., its number of training examples.
+
+        Raises
+        ------
+        ValueError
+            If the round is not registered or if the weight is not positive.
+        """
+        if not weight > 0:
+            raise ValueError("Weight must be positive: {}".format(weight))
+        with self._lock:
+            if round_id not in self._rounds:
+                raise ValueError("Round {} is not registered".format(round_id))
+            self._active_round = round_id
+            self._weight = float(weight)
+            self._masked_weight = None
+
+    def encrypt(self, data: np.ndarray) -> bytes:
+        """Masks the values for the active round.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            The values to mask.
+
+        Returns
+        -------
+        bytes
+            The masked values.
+        """
+        return self.encrypt_many([data])[0]
+
+    def encrypt_many(self, data: List[np.ndarray]) -> List[bytes]:
+        """Masks the values of all the tensors of a model for the active round, as a single stream.
+
+        Parameters
+        ----------
+        data : List[np.ndarray]
+            The values of every tensor, in order.
+
+        Returns
+        -------
+        List[bytes]
+            The masked values of every tensor, in order.
+
+        Raises
+        ------
+        ValueError
+            If no round is active or if the values are too large for the fixed point.
+        """
+        with self._lock:
+            if self._active_round not in self._rounds:
+                raise ValueError("No masking round is active")
+            state = self._rounds[self._active_round]
+            if state.recovered is not None:
+                raise ValueError("Masks of round {} are already recovered".format(
+                    self._active_round))
+
+            values = [np.asarray(item, dtype=np.float64).reshape(-1) for item in data]
+            sizes = [len(item) for item in values]
+            state.num_values = sum(sizes)
+
+            masked = _to_fixed_point(
+                np.concatenate([[1.0]] + values) * self._weight, self._fraction_bits)
+            masked += self._masks(state, set(state.seeds))
+            masked += expand_masks(state.self_seed, len(masked))
+            self._masked_weight = int(masked[0])
+
+        offsets = np.cumsum([1] + sizes)
+        return [masked[start:end].astype("<u8").tobytes()
+                for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def decrypt(self, data: bytes, length: int) -> np.ndarray:
+        """Decodes unmasked fixed point values, e.g., the sum of the masked models of a round.
+
+        Parameters
+        ----------
+        data : bytes
+            The fixed point values.
+        length : int
+            The number of values.
+
+        Returns
+        -------
+        np.ndarray
+            The values.
+        """
+        values = np.frombuffer(data, dtype="<i8", count=length)
+        return values.astype(np.float64) / float(2 ** self._fraction_bits)
+
+    def masking(self) -> Optional[model_pb2.Masking]:
+        """Returns the masking of the last masked model, along with the encrypted shares of the
+            seed of its self mask, or None if no model is masked yet."""
+        with self._lock:
+            if self._masked_weight is None:
+                return None
+            state = self._rounds.get(self._active_round)
+            return model_pb2.Masking(
+                round_id=self._active_round,
+                fraction_bits=self._fraction_bits,
+                weight=self._masked_weight,
+                encrypted_shares=[
+                    model_pb2.MaskingShare(learner_id=learner_id, share=share)
+                    for learner_id, share in state.sealed_shares.items()
+                ] if state is not None else [],
+            )
+
+    def recover(
+        self,
+        round_id: str,
+        learner_ids: List[str],
+        shares: Optional[Dict[str, bytes]] = None
+    ) -> Tuple[np.ndarray, Dict[str, bytes]]:
+        """Returns the correction of the masks shared with the learners that dropped out of the
+            round, which cancels them out of the sum of the models of the round, and the shares
+            of the seeds of the self masks of the learners that survived the round, this learner
+            included. A learner either drops out or survives, hence the Controller never learns
+            both the masks shared with a learner and the self mask of the learner. The masks of
+            a round are recovered once, for the same learners only.
+
+        Parameters
+        ----------
+        round_id : str
+            The id of the round.
+        learner_ids : List[str]
+            The ids of the learners that dropped out of the round.
+        shares : Optional[Dict[str, bytes]], (default=None)
+            The encrypted shares that the other learners that survived the round sent to this
+            learner, by learner id.
+
+        Returns
+        -------
+        Tuple[np.ndarray, Dict[str, bytes]]
+            The correction of the weight, followed by the corrections of all the values,
+            as uint64 integers, and the decrypted shares, by the id of the learner whose seed
+            they are a share of.
+
+        Raises
+        ------
+        ValueError
+            If the model of the round is not masked, if a learner is not part of the round,
+            if a learner both dropped out and survived, if a share is not authentic
+            or if the masks of the round are already recovered for other learners.
+        """
+        shares = shares or {}
+        with self._lock:
+            state = self._rounds.get(round_id)
+            if state is None or state.num_values is None:
+                raise ValueError("No model was masked for round {}".format(round_id))
+            dropped, survivors = set(learner_ids), set(shares)
+            if not dropped | survivors <= set(state.seeds):
+                raise ValueError("Learners {} are not part of round {}".format(
+                    sorted((dropped | survivors) - set(state.seeds)), round_id))
+            if dropped & survivors:
+                raise ValueError("Learners {} cannot both drop out of round {} and survive".format(
+                    sorted(dropped & survivors), round_id))
+            if state.recovered is not None and state.recovered != (dropped, survivors):
+                raise ValueError("Masks of round {} are already recovered".format(round_id))
+            if len(state.seeds) > 1 and dropped == set(state.seeds):
+                raise ValueError("All the other learners of round {} cannot drop out".format(
+                    round_id))
+
+            revealed = {learner_id: _open(share, *state.opening_keys[learner_id])
+                        for learner_id, share in shares.items()}
+            revealed[state.learner_id] = state.own_share
+            state.recovered = (dropped, survivors)
+            correction = np.zeros(1 + state.num_values, dtype=np.uint64) - \
+                self._masks(state, dropped)
+            return correction, revealed
+
+    def _masks(self, state: _Round, learner_ids: set) -> np.ndarray:
+        """Returns the sum of the signed masks shared with the learners, modulo 2^64."""
+        masks = np.zeros(1 + state.num_values, dtype=np.uint64)
+        for learner_id in learner_ids:
+            mask = expand_masks(state.seeds[learner_id], len(masks))
+            if state.learner_id < learner_id:
+                masks += mask
+            else:
+                masks -= mask
+        return masks
+
+    @staticmethod
+    def _load_private_key(private_key_path: Optional[str]) -> int:
+        """Loads the private key from its file or generates and saves a new one."""
+        if private_key_path is not None and os.path.exists(private_key_path):
+            with open(private_key_path, "rb") as f:
+                private_key = int.from_bytes(f.read(), "big")
+            if not 1 < private_key < _PRIME - 1:
+                raise ValueError("Invalid private key in {}".format(private_key_path))
+            return private_key
+
+        private_key = secrets.randbits(_PRIVATE_KEY_BITS) | 2
+        if private_key_path is not None:
+            fd = os.open(private_key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(private_key.to_bytes(_PRIVATE_KEY_BITS // 8, "big"))
+        return private_key
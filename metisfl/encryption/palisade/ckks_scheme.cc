@@ -93,16 +93,16 @@ CryptoParams CKKS::GenCryptoParams() {
   cryptoContext->Enable(SHE);
 
   std::stringstream cc_ss;
-  Serial::Serialize(cryptoContext, cc_ss, SerType::JSON);
+  Serial::Serialize(cryptoContext, cc_ss, SerType::BINARY);
 
   LPKeyPair<DCRTPoly> keyPair;
   keyPair = cryptoContext->KeyGen();
 
   std::stringstream pk_ss;
-  Serial::Serialize(keyPair.publicKey, pk_ss, SerType::JSON);
+  Serial::Serialize(keyPair.publicKey, pk_ss, SerType::BINARY);
 
   std::stringstream sk_ss;
-  Serial::Serialize(keyPair.secretKey, sk_ss, SerType::JSON);
+  Serial::Serialize(keyPair.secretKey, sk_ss, SerType::BINARY);
 
   crypto_params_ = CryptoParams{cc_ss.str(), pk_ss.str(), sk_ss.str()};
 
@@ -133,7 +133,7 @@ template <typename T>
 void CKKS::Deserialize(std::string s, T &obj) {
   try {
     std::stringstream ss(s);
-    Serial::Deserialize(obj, ss, SerType::JSON);
+    Serial::Deserialize(obj, ss, SerType::BINARY);
   } catch (const std::exception &e) {
     PLOG(WARNING) << "Deserialization of " << obj << "Failed";
   }
@@ -186,6 +186,16 @@ std::string CKKS::Aggregate(std::vector<std::string> data_array,
 }
 
 std::string CKKS::Encrypt(std::vector<double> data_array) {
+  return EncryptMany({std::move(data_array)}).front();
+}
+
+vector<double> CKKS::Decrypt(std::string data,
+                             unsigned long int data_dimensions) {
+  return DecryptMany({std::move(data)}, {data_dimensions}).front();
+}
+
+std::vector<std::string> CKKS::EncryptMany(
+    const std::vector<std::vector<double>> &data_arrays) {
   if (cc == nullptr) {
     PLOG(FATAL) << "Crypto context is not loaded.";
   }
@@ -194,46 +204,43 @@ std::string CKKS::Encrypt(std::vector<double> data_array) {
     PLOG(FATAL) << "Public key is not loaded.";
   }
 
-  unsigned long int data_size = data_array.size();
-  auto ciphertext_data_size = (data_size + batch_size) / batch_size;
-  if (data_size % batch_size == 0) {
-    ciphertext_data_size = data_size / batch_size;
+  // The (array, batch) pairs of all the ciphertexts.
+  std::vector<std::pair<size_t, size_t>> batches;
+  std::vector<vector<Ciphertext<DCRTPoly>>> ciphertext_data(
+      data_arrays.size());
+  for (size_t i = 0; i < data_arrays.size(); i++) {
+    auto num_batches = (data_arrays[i].size() + batch_size - 1) / batch_size;
+    ciphertext_data[i].resize(num_batches);
+    for (size_t j = 0; j < num_batches; j++) batches.emplace_back(i, j);
   }
-  vector<Ciphertext<DCRTPoly>> ciphertext_data((int)ciphertext_data_size);
-
-  if (data_size > (unsigned long int)batch_size) {
-#pragma omp parallel for
-    for (unsigned long int i = 0; i < data_size; i += batch_size) {
-      unsigned long int last = std::min((long)data_size, (long)i + batch_size);
-      vector<double> batch;
-      batch.reserve(last - i + 1);
-
-      for (unsigned long int j = i; j < last; j++) {
-        batch.push_back(data_array[j]);
-      }
-      Plaintext plaintext_data = cc->MakeCKKSPackedPlaintext(batch);
-      ciphertext_data[(int)(i / batch_size)] = cc->Encrypt(pk, plaintext_data);
-    }
-  } else {
-    vector<double> batch;
-    batch.reserve(data_size);
 
-    for (unsigned long int i = 0; i < data_size; i++) {
-      batch.push_back(data_array[i]);
-    }
+#pragma omp parallel for num_threads(NumThreads()) schedule(dynamic)
+  for (long k = 0; k < (long)batches.size(); k++) {
+    const auto &[i, j] = batches[k];
+    const auto &data_array = data_arrays[i];
+    auto first = data_array.begin() + j * batch_size;
+    auto last = data_array.begin() +
+                std::min(data_array.size(), (j + 1) * (size_t)batch_size);
+    vector<double> batch(first, last);
     Plaintext plaintext_data = cc->MakeCKKSPackedPlaintext(batch);
-    ciphertext_data[0] = cc->Encrypt(pk, plaintext_data);
+    ciphertext_data[i][j] = cc->Encrypt(pk, plaintext_data);
   }
 
-  std::stringstream ss;
-  const SerType::SERBINARY st;
-  Serial::Serialize(ciphertext_data, ss, st);
+  std::vector<std::string> result(data_arrays.size());
+#pragma omp parallel for num_threads(NumThreads())
+  for (long i = 0; i < (long)data_arrays.size(); i++) {
+    std::stringstream ss;
+    const SerType::SERBINARY st;
+    Serial::Serialize(ciphertext_data[i], ss, st);
+    result[i] = ss.str();
+  }
 
-  return ss.str();
+  return result;
 }
 
-vector<double> CKKS::Decrypt(std::string data,
-                             unsigned long int data_dimensions) {
+std::vector<std::vector<double>> CKKS::DecryptMany(
+    const std::vector<std::string> &data,
+    const std::vector<unsigned long int> &data_dimensions) {
   if (cc == nullptr) {
     PLOG(FATAL) << "Crypto context is not loaded.";
   }
@@ -242,34 +249,42 @@ vector<double> CKKS::Decrypt(std::string data,
     PLOG(FATAL) << "Private key is not loaded.";
   }
 
-  const SerType::SERBINARY st;
-  std::stringstream ss(data);
-
-  vector<Ciphertext<DCRTPoly>> data_ciphertext;
-  Serial::Deserialize(data_ciphertext, ss, st);
-
-  vector<double> result(data_dimensions);
+  if (data.size() != data_dimensions.size()) {
+    PLOG(FATAL) << "Error: data and data_dimensions size mismatch";
+  }
 
-#pragma omp parallel for
-  for (unsigned long int i = 0; i < data_ciphertext.size(); i++) {
-    Plaintext pt;
-    cc->Decrypt(sk, data_ciphertext[i], &pt);
-    int length;
+  std::vector<vector<Ciphertext<DCRTPoly>>> data_ciphertext(data.size());
+#pragma omp parallel for num_threads(NumThreads())
+  for (long i = 0; i < (long)data.size(); i++) {
+    const SerType::SERBINARY st;
+    std::stringstream ss(data[i]);
+    Serial::Deserialize(data_ciphertext[i], ss, st);
+  }
 
-    if (i == data_ciphertext.size() - 1) {
-      length = data_dimensions - (i)*batch_size;
-    } else {
-      length = batch_size;
+  // The (array, ciphertext) pairs of all the ciphertexts.
+  std::vector<std::pair<size_t, size_t>> batches;
+  std::vector<std::vector<double>> result(data.size());
+  for (size_t i = 0; i < data.size(); i++) {
+    result[i].resize(data_dimensions[i]);
+    for (size_t j = 0; j < data_ciphertext[i].size(); j++) {
+      batches.emplace_back(i, j);
     }
+  }
 
-    pt->SetLength(length);
-    vector<double> layer_data = pt->GetRealPackedValue();
-    int m = i * batch_size;
+#pragma omp parallel for num_threads(NumThreads()) schedule(dynamic)
+  for (long k = 0; k < (long)batches.size(); k++) {
+    const auto &[i, j] = batches[k];
+    const size_t first = j * batch_size;
+    if (first >= data_dimensions[i]) continue;
 
-    for (unsigned long int j = 0; j < layer_data.size(); j++) {
-      result[m++] = layer_data[j];
-    }
+    Plaintext pt;
+    cc->Decrypt(sk, data_ciphertext[i][j], &pt);
+    pt->SetLength(std::min((size_t)batch_size, data_dimensions[i] - first));
+    vector<double> layer_data = pt->GetRealPackedValue();
+    std::copy(layer_data.begin(), layer_data.end(), result[i].begin() + first);
   }
 
   return result;
 }
+
+void CKKS::SetNumThreads(int num_threads) { num_threads_ = num_threads; }
@@ -35,7 +35,8 @@ class CKKS : public EncryptionScheme {
   void LoadPublicKeyFromFile(std::string public_key_file) override;
   void LoadPrivateKeyFromFile(std::string private_key_file) override;
 
-  // String-based API.
+  // String-based API. The strings hold the same binary serialization as the
+  // files of the file-based API.
   CryptoParams GenCryptoParams() override;
   CryptoParams GetCryptoParams() override;
   void LoadCryptoParams(CryptoParams crypto_params) override;
@@ -49,11 +50,25 @@ class CKKS : public EncryptionScheme {
   std::string Encrypt(vector<double> data_array) override;
   std::vector<double> Decrypt(std::string data,
                               unsigned long int data_dimensions) override;
+
+  // Batched variants of Encrypt and Decrypt. The ciphertexts of all the
+  // arrays are processed in a single parallel loop, hence many small arrays
+  // keep all the threads busy just as well as a single large array.
+  std::vector<std::string> EncryptMany(
+      const std::vector<std::vector<double>> &data_arrays);
+  std::vector<std::vector<double>> DecryptMany(
+      const std::vector<std::string> &data,
+      const std::vector<unsigned long int> &data_dimensions);
+
+  // Sets the number of threads of the parallel loops; if 0, all the cores
+  // are used (the OpenMP default).
+  void SetNumThreads(int num_threads);
   void Print();
 
  private:
   uint32_t batch_size;
   uint32_t scaling_factor_bits;
+  int num_threads_ = 0;
   CryptoParamsFiles crypto_params_files_;
   CryptoParams crypto_params_;
 
@@ -63,6 +78,10 @@ class CKKS : public EncryptionScheme {
   LPPublicKey<DCRTPoly> pk;
   LPPrivateKey<DCRTPoly> sk;
 
+  int NumThreads() const {
+    return num_threads_ > 0 ? num_threads_ : omp_get_max_threads();
+  }
+
   template <typename T>
   bool DeserializeFromFile(std::string filepath, T &obj);
 
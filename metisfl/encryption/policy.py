@@ -0,0 +1,88 @@
+"""This module contains the policy that selects the tensors of a model to be encrypted,
+    such that only the tensors that need protection pay for homomorphic encryption."""
+
+import fnmatch
+from typing import List, Optional
+
+import numpy as np
+
+
+class EncryptionPolicy(object):
+
+    """Selects the tensors of a model to be encrypted, e.g., the last layers or the largest tensors,
+        while the others are sent in plaintext. Used by the MessageHelper along with its
+        encryption scheme, e.g., HomomorphicEncryption; not with PairwiseMasking, which masks
+        all the tensors."""
+
+    def __init__(
+        self,
+        last_tensors: Optional[int] = None,
+        name_patterns: Optional[List[str]] = None,
+        min_size: Optional[int] = None,
+        tensor_names: Optional[List[str]] = None
+    ) -> None:
+        """Initializes the EncryptionPolicy object. A tensor is encrypted if it meets any
+            of the given criteria; if none is given, all the tensors are encrypted.
+
+        Parameters
+        ----------
+        last_tensors : Optional[int], (default=None)
+            The number of tensors, counted from the last one, to be encrypted.
+        name_patterns : Optional[List[str]], (default=None)
+            Shell-style patterns (e.g., "dense_2/*") of the names of the tensors to be encrypted.
+        min_size : Optional[int], (default=None)
+            The number of values from which on tensors are encrypted.
+        tensor_names : Optional[List[str]], (default=None)
+            The names of the tensors of the model, in order. Required by the name patterns,
+            since the weights of the model carry no names.
+
+        Raises
+        ------
+        ValueError
+            If a criterion is invalid or if name patterns are given without the tensor names.
+        """
+        if last_tensors is not None and last_tensors < 0:
+            raise ValueError("The number of last tensors must not be negative")
+        if min_size is not None and min_size < 0:
+            raise ValueError("The minimum size must not be negative")
+        if name_patterns and tensor_names is None:
+            raise ValueError("Name patterns require the names of the tensors")
+        self.last_tensors = last_tensors
+        self.name_patterns = name_patterns or []
+        self.min_size = min_size
+        self.tensor_names = tensor_names
+
+    def select(self, weights: List[np.ndarray]) -> List[bool]:
+        """Returns whether every weight of the model is to be encrypted.
+
+        Parameters
+        ----------
+        weights : List[np.ndarray]
+            The weights of the model.
+
+        Returns
+        -------
+        List[bool]
+            Whether every weight is to be encrypted, in order.
+
+        Raises
+        ------
+        ValueError
+            If the names of the tensors do not match the weights.
+        """
+        if self.tensor_names is not None and len(self.tensor_names) != len(weights):
+            raise ValueError("The model has {} tensors but {} names were given".format(
+                len(weights), len(self.tensor_names)))
+        if self.last_tensors is None and not self.name_patterns and self.min_size is None:
+            return [True] * len(weights)
+
+        selected = [False] * len(weights)
+        for index, weight in enumerate(weights):
+            if self.last_tensors is not None and index >= len(weights) - self.last_tensors:
+                selected[index] = True
+            elif self.min_size is not None and int(np.prod(weight.shape)) >= self.min_size:
+                selected[index] = True
+            elif any(fnmatch.fnmatchcase(self.tensor_names[index], pattern)
+                     for pattern in self.name_patterns):
+                selected[index] = True
+        return selected
@@ -1,7 +1,9 @@
 """This file contains the abstract class for encryption schemes."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional
+
+from ..proto import model_pb2
 
 
 class EncryptionScheme(ABC):
@@ -15,3 +17,18 @@ class EncryptionScheme(ABC):
     def decrypt(self, data: bytes) -> Any:
         """Decrypts the data and returns it."""
         pass
+
+    def encrypt_many(self, data: List[Any]) -> List[bytes]:
+        """Encrypts every item of the data and returns them, in order.
+            Schemes that can encrypt in parallel should override it."""
+        return [self.encrypt(item) for item in data]
+
+    def decrypt_many(self, data: List[bytes], lengths: List[int]) -> List[Any]:
+        """Decrypts every item of the data to its length and returns them, in order.
+            Schemes that can decrypt in parallel should override it."""
+        return [self.decrypt(item, length) for item, length in zip(data, lengths)]
+
+    def masking(self) -> Optional[model_pb2.Masking]:
+        """Returns the masking of the last encrypted model, for schemes that mask
+            the models instead of encrypting them, or None."""
+        return None
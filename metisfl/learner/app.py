@@ -1,14 +1,25 @@
 
+import asyncio
 import signal
 
-from typing import Optional
+from typing import List, Optional
 
 from ..config import get_auth_token_fp
 from ..common.types import ClientParams, ServerParams
+from ..encryption.masking import PairwiseMasking
+from ..encryption.policy import EncryptionPolicy
+from ..encryption.scheme import EncryptionScheme
 from .controller_client import GRPCClient
+from .async_learner_server import AsyncLearnerServer
+from .evaluation_cache import DEFAULT_EVALUATION_CACHE_SIZE, EvaluationCache
+from .evaluation_executor import EvaluationExecutor
 from .learner import Learner
 from .learner_server import LearnerServer
+from .message_helper import MessageHelper
+from .quantization import UpdateQuantizer
+from .sparsification import UpdateSparsifier
 from .task_manager import TaskManager
+from .upload_queue import UploadQueue
 
 
 def register_handlers(client: GRPCClient, server: LearnerServer):
@@ -25,7 +36,7 @@ def register_handlers(client: GRPCClient, server: LearnerServer):
     def handler(signum, frame):
         print("Received SIGTERM, leaving federation...")
         client.leave_federation()
-        server.ShutDown()
+        server.stop()
 
     signal.signal(signal.SIGTERM, handler)
     signal.signal(signal.SIGINT, handler)
@@ -36,6 +47,20 @@ def app(
     client_params: ClientParams,
     server_params: ServerParams,
     num_training_examples: Optional[int] = None,
+    encryption_scheme: Optional[EncryptionScheme] = None,
+    persistent_worker: Optional[bool] = False,
+    update_quantizer: Optional[UpdateQuantizer] = None,
+    update_sparsifier: Optional[UpdateSparsifier] = None,
+    encryption_policy: Optional[EncryptionPolicy] = None,
+    queue_uploads: Optional[bool] = False,
+    upload_spill_dir: Optional[str] = None,
+    evaluation_worker: Optional[bool] = False,
+    max_pending_evaluations: Optional[int] = 4,
+    evaluation_niceness: Optional[int] = 0,
+    training_cpus: Optional[List[int]] = None,
+    evaluation_cpus: Optional[List[int]] = None,
+    evaluation_cache_size: Optional[int] = DEFAULT_EVALUATION_CACHE_SIZE,
+    asyncio_server: Optional[bool] = False,
 ):
     """Entry point for the MetisFL Learner application.
 
@@ -50,32 +75,124 @@ def app(
     num_training_examples : Optional[int], (default=None)
         The number of training examples. Used when the scaling factor is "NumTrainingExamples".
         If not provided, this scaling factor cannot be used.
+    encryption_scheme : Optional[EncryptionScheme], (default=None)
+        The encryption scheme used to encrypt the model weights. If not provided, weights are sent in plaintext.
+        With PairwiseMasking, the models sent to the Controller are masked pairwise, for the MaskedAgg rule;
+        the models sent to the Driver are not.
+    persistent_worker : Optional[bool], (default=False)
+        Whether to train in a long-lived worker process that keeps the Learner, and any model or data
+        pipeline it builds, resident across training tasks. If False, every training task runs in a fresh process.
+    update_quantizer : Optional[UpdateQuantizer], (default=None)
+        Quantizes the trained models sent to the Controller, e.g., UpdateQuantizer(bits=8, block_size=256).
+        Cannot be used along with an encryption scheme.
+    update_sparsifier : Optional[UpdateSparsifier], (default=None)
+        Sparsifies the deltas sent to the Controller, e.g., UpdateSparsifier(ratio=0.01).
+        Requires delta updates and cannot be used along with an encryption scheme.
+    encryption_policy : Optional[EncryptionPolicy], (default=None)
+        Selects the tensors encrypted with the encryption scheme, e.g., EncryptionPolicy(last_tensors=2);
+        the others are sent in plaintext. If not provided, all the tensors are encrypted.
+        Cannot be used along with PairwiseMasking, which masks all the tensors.
+    queue_uploads : Optional[bool], (default=False)
+        Whether to upload the completed tasks to the Controller from a queue, in order and with retries,
+        by a thread of its own, such that training does not wait for the Controller. If False, every
+        completed task is sent right away.
+    upload_spill_dir : Optional[str], (default=None)
+        The directory the completed tasks are spilled to while the Controller is slow or unavailable,
+        and delivered from after a restart. Requires queue_uploads. If not provided, training waits
+        while the upload queue is full.
+    evaluation_worker : Optional[bool], (default=False)
+        Whether to evaluate the models in a long-lived worker process of their own, apart from training,
+        which holds a copy of the Learner. If False, the models are evaluated by the thread of the request.
+    max_pending_evaluations : Optional[int], (default=4)
+        The maximum number of evaluation tasks waiting for, or running in, the evaluation worker.
+        Further evaluation tasks are refused until one completes. Requires evaluation_worker.
+    evaluation_niceness : Optional[int], (default=0)
+        How much lower the scheduling priority of the evaluation worker is than the one of the training worker.
+        Requires evaluation_worker.
+    training_cpus : Optional[List[int]], (default=None)
+        The CPUs the training worker is pinned to. If not provided, it may run on any CPU.
+    evaluation_cpus : Optional[List[int]], (default=None)
+        The CPUs the evaluation worker is pinned to, e.g., others than the training CPUs, such that
+        evaluation and training do not contend for the same cores and caches. Requires evaluation_worker.
+        If not provided, it may run on any CPU.
+    evaluation_cache_size : Optional[int], (default=DEFAULT_EVALUATION_CACHE_SIZE)
+        The number of evaluated models whose metrics are cached, such that a model evaluated again
+        with the same parameters is not run over the test set again. The cache is dropped whenever
+        the version returned by the get_dataset_version method of the Learner changes, hence Learners
+        whose dataset changes must implement it. If 0, the metrics are not cached.
+    asyncio_server : Optional[bool], (default=False)
+        Whether to serve the requests of the Controller with the asyncio Learner server, on a single
+        event loop, instead of with a thread per request.
     """
 
+    if upload_spill_dir is not None and not queue_uploads:
+        raise ValueError("An upload spill directory requires queue_uploads")
+
     port = client_params.port
 
+    # Shared by the client and the server to convert weights to/from Proto objects.
+    # Masked models are only summed by the Controller, hence only the client masks them.
+    pairwise_masking = encryption_scheme if isinstance(
+        encryption_scheme, PairwiseMasking) else None
+    if pairwise_masking is not None and encryption_policy is not None:
+        raise ValueError("An encryption policy cannot be used along with PairwiseMasking")
+    message_helper = MessageHelper(
+        scheme=None if pairwise_masking is not None else encryption_scheme,
+        encryption_policy=encryption_policy)
+
     # Create the gRPC client to communicate with the Controller
     client = GRPCClient(
         client_params=client_params,
         learner_id_fp=get_auth_token_fp(port),
+        message_helper=MessageHelper(scheme=pairwise_masking)
+        if pairwise_masking is not None else message_helper,
     )
 
+    # Completed tasks are uploaded by the thread of the queue, in order,
+    # hence training does not wait for the Controller.
+    upload_queue = UploadQueue(send_fn=client.send_train_done, spill_dir=upload_spill_dir) \
+        if queue_uploads else None
+
+    evaluation_cache = EvaluationCache(evaluation_cache_size) if evaluation_cache_size else None
+
     # Create the gRPC server for the Controller to communicate with the Learner
-    server = LearnerServer(
+    server_class = AsyncLearnerServer if asyncio_server else LearnerServer
+    server = server_class(
         learner=learner,
         server_params=server_params,
-        task_manager=TaskManager(),
+        task_manager=TaskManager(
+            resident_kwargs={"learner": learner} if persistent_worker else None,
+            cpu_affinity=training_cpus,
+        ),
         client=client,
+        message_helper=message_helper,
+        update_quantizer=update_quantizer,
+        update_sparsifier=update_sparsifier,
+        pairwise_masking=pairwise_masking,
+        upload_queue=upload_queue,
+        # If enabled, evaluation tasks are run apart from training and reported with EvaluateDone.
+        evaluation_executor=EvaluationExecutor(
+            learner=learner,
+            max_pending=max_pending_evaluations,
+            niceness=evaluation_niceness,
+            cpu_affinity=evaluation_cpus,
+            evaluation_cache=evaluation_cache,
+        ) if evaluation_worker else None,
+        evaluation_cache=evaluation_cache if not evaluation_worker else None,
     )
 
     # Register with the Controller
     client.join_federation(
         num_training_examples=num_training_examples,
         server_params=server_params,
+        masking_public_key=pairwise_masking.public_key if pairwise_masking is not None else b"",
     )
 
     # Register handlers
     register_handlers(client, server)
 
     # Blocking until Shutdown endpoint is called
-    server.start()
+    if asyncio_server:
+        asyncio.run(server.start())
+    else:
+        server.start()
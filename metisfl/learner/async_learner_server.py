@@ -0,0 +1,230 @@
+"""This module contains the asyncio variant of the Learner server, on grpc.aio. The requests are
+    handled by coroutines on a single event loop, hence a unary request holds no thread while it
+    waits on the network. The (blocking) work of a request, i.e., (de)serializing models and calling
+    the Learner, is run in a small pool of threads, and training still runs in the worker process
+    of the TaskManager. A streaming request holds a thread of a pool of its own while the chunks
+    of its model arrive, since its handler consumes them as they arrive; hence slow uploads
+    do not hold the threads of the other requests."""
+
+import asyncio
+from concurrent import futures
+from typing import (Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator,
+                    Optional, TypeVar)
+
+from ..common.logger import MetisLogger
+from ..common.server import get_aio_server
+from ..proto import learner_pb2, learner_pb2_grpc, model_pb2, service_common_pb2
+from .learner_server import LearnerServer
+
+# The time in seconds the requests in flight are given to complete on shutdown.
+SERVER_STOP_GRACE = 5
+
+# The number of chunks of a request that are received ahead of the handler that consumes them.
+STREAM_BUFFER_SIZE = 8
+
+T = TypeVar("T")
+
+
+class AsyncLearnerServer(LearnerServer):
+
+    def __init__(
+        self,
+        *args,
+        max_workers: Optional[int] = 4,
+        max_stream_workers: Optional[int] = 4,
+        **kwargs
+    ):
+        """The asyncio variant of the Learner server. Takes the arguments of LearnerServer, along with:
+
+        Parameters
+        ----------
+        max_workers : Optional[int], (default=4)
+            The number of threads the blocking work of the unary requests is run in. Requests beyond it
+            wait on the event loop, without holding a thread.
+        max_stream_workers : Optional[int], (default=4)
+            The number of threads the streaming requests are handled in, for as long as their chunks
+            arrive. Streams beyond it wait on the event loop, with at most STREAM_BUFFER_SIZE chunks
+            received ahead of their handler.
+        """
+        self._max_workers = max_workers
+        self._max_stream_workers = max_stream_workers
+        self._executor: Optional[futures.ThreadPoolExecutor] = None
+        self._stream_executor: Optional[futures.ThreadPoolExecutor] = None
+        super().__init__(*args, **kwargs)
+
+    def _create_server(self) -> None:
+        # The server is bound to the event loop it runs on, hence it is created by start.
+        return None
+
+    async def start(self) -> None:
+        """Starts the server on the running event loop. Returns once the server is shut down."""
+
+        loop = asyncio.get_running_loop()
+        self._executor = futures.ThreadPoolExecutor(max_workers=self._max_workers)
+        self._stream_executor = futures.ThreadPoolExecutor(max_workers=self._max_stream_workers)
+        self._server = get_aio_server(
+            server_params=self._server_params,
+            servicer=self,
+            add_servicer_to_server_fn=learner_pb2_grpc.add_LearnerServiceServicer_to_server,
+        )
+        await self._server.start()
+
+        self._status = service_common_pb2.ServingStatus.SERVING
+        MetisLogger.info("Learner server started. Listening on: {}:{}".format(
+            self._server_params.hostname,
+            self._server_params.port,
+        ))
+        # The server may be stopped from any thread, e.g., from a signal handler.
+        await loop.run_in_executor(None, self._shutdown_event.wait)
+
+        await self._server.stop(SERVER_STOP_GRACE)
+        await loop.run_in_executor(None, self._close)
+        self._executor.shutdown()
+        self._stream_executor.shutdown()
+
+    async def GetHealthStatus(
+        self,
+        _: Optional[service_common_pb2.Empty] = None,
+        context: Optional[Any] = None
+    ) -> service_common_pb2.HealthStatusResponse:
+        return super().GetHealthStatus()
+
+    async def GetModel(
+        self,
+        request: service_common_pb2.Empty,
+        context: Any
+    ) -> model_pb2.Model:
+        return await self._offload(super().GetModel, request, context)
+
+    async def GetModelStream(
+        self,
+        request: service_common_pb2.Empty,
+        context: Any
+    ) -> AsyncIterator[model_pb2.ModelChunk]:
+        async for chunk in self._offload_iterator(super().GetModelStream(request, context)):
+            yield chunk
+
+    async def SetInitialWeights(
+        self,
+        model: model_pb2.Model,
+        context: Any
+    ) -> service_common_pb2.Ack:
+        return await self._offload(super().SetInitialWeights, model, context)
+
+    async def SetInitialWeightsStream(
+        self,
+        request_iterator: AsyncIterable[model_pb2.ModelChunk],
+        context: Any
+    ) -> service_common_pb2.Ack:
+        return await self._offload_stream(super().SetInitialWeightsStream, request_iterator, context)
+
+    async def SetInitialWeightsRelayStream(
+        self,
+        request_iterator: AsyncIterable[learner_pb2.SetInitialWeightsRelayChunk],
+        context: Any
+    ) -> learner_pb2.BroadcastResponse:
+        return await self._offload_stream(
+            super().SetInitialWeightsRelayStream, request_iterator, context)
+
+    async def Evaluate(
+        self,
+        request: learner_pb2.EvaluateRequest,
+        context: Any
+    ) -> learner_pb2.EvaluateResponse:
+        result = await self._offload(self._evaluate, request, context)
+        if not isinstance(result, futures.Future):
+            return result
+
+        try:
+            # Waits for the evaluation worker on the event loop.
+            await asyncio.wrap_future(result)
+        except Exception:
+            # Reported in the response.
+            pass
+        return self._evaluation_response(request.task_id, result, context)
+
+    async def Train(
+        self,
+        request: learner_pb2.TrainRequest,
+        context: Any
+    ) -> service_common_pb2.Ack:
+        return await self._offload(super().Train, request, context)
+
+    async def TrainStream(
+        self,
+        request_iterator: AsyncIterable[learner_pb2.TrainRequestChunk],
+        context: Any
+    ) -> service_common_pb2.Ack:
+        return await self._offload_stream(super().TrainStream, request_iterator, context)
+
+    async def RecoverMasks(
+        self,
+        request: learner_pb2.RecoverMasksRequest,
+        context: Any
+    ) -> AsyncIterator[model_pb2.ModelChunk]:
+        async for chunk in self._offload_iterator(super().RecoverMasks(request, context)):
+            yield chunk
+
+    async def ShutDown(
+        self,
+        _: Optional[service_common_pb2.Empty] = None,
+        context: Optional[Any] = None
+    ) -> service_common_pb2.Ack:
+        return super().ShutDown()
+
+    async def _offload(self, fn: Callable[..., T], *args) -> T:
+        """Runs the blocking function in the threads of the server."""
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _offload_iterator(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """Yields the items of the blocking iterator, each produced in the threads of the server."""
+
+        done = object()
+        while True:
+            item = await self._offload(next, iterator, done)
+            if item is done:
+                return
+            yield item
+
+    async def _offload_stream(
+        self,
+        fn: Callable[[Iterable[Any], Any], T],
+        request_iterator: AsyncIterable[Any],
+        context: Any
+    ) -> T:
+        """Runs the blocking handler of a streaming request in the stream threads of the server. The
+            chunks are received on the event loop and fed to the handler through a bounded queue, hence
+            the handler consumes them as they arrive and at most STREAM_BUFFER_SIZE of them are held."""
+
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=STREAM_BUFFER_SIZE)
+        done = object()
+
+        async def _receive():
+            try:
+                async for request in request_iterator:
+                    await chunks.put(request)
+            except Exception as error:
+                await chunks.put(error)
+            else:
+                await chunks.put(done)
+
+        def _chunks():
+            while True:
+                chunk = asyncio.run_coroutine_threadsafe(chunks.get(), loop).result()
+                if chunk is done:
+                    return
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+
+        receiver = asyncio.ensure_future(_receive())
+        try:
+            return await loop.run_in_executor(self._stream_executor, fn, _chunks(), context)
+        finally:
+            receiver.cancel()
+            # Unblocks the handler if the request is cancelled while the handler waits for a chunk.
+            while not chunks.empty():
+                chunks.get_nowait()
+            chunks.put_nowait(asyncio.CancelledError())
@@ -3,11 +3,14 @@ from typing import Any, Dict, List, Optional
 import grpc
 import numpy as np
 
+from ..common.chunking import model_to_chunks
 from ..common.client import get_client
 from ..common.logger import MetisLogger
+from ..common.timing import PhaseTimer, optional_phase
 from ..common.types import ClientParams, ServerParams
-from ..proto import (controller_pb2, controller_pb2_grpc, model_pb2,
-                     service_common_pb2)
+from ..proto import (controller_pb2, controller_pb2_grpc, learner_pb2,
+                     model_pb2, service_common_pb2)
+from .message_helper import MessageHelper
 
 
 def read_certificate(fp: str) -> bytes:
@@ -17,12 +20,22 @@ def read_certificate(fp: str) -> bytes:
         return f.read()
 
 
+def evaluation_metadata(metrics: Dict[str, Any]) -> learner_pb2.EvaluationMetadata:
+    """Returns the Proto object with the evaluation metrics that are numbers."""
+
+    return learner_pb2.EvaluationMetadata(metrics={
+        key: float(value) for key, value in metrics.items()
+        if isinstance(value, (int, float, np.number))
+    })
+
+
 class GRPCClient(object):
 
     def __init__(
         self,
         client_params: ClientParams,
         learner_id_fp: str,
+        message_helper: Optional[MessageHelper] = None,
         max_workers: Optional[int] = 1
     ):
         """A gRPC client used from the Learner to communicate with the Controller.
@@ -35,12 +48,16 @@ class GRPCClient(object):
             The file where the learner id is stored. 
         auth_token_fp : str
             The file where the auth token is stored.
+        message_helper : Optional[MessageHelper], (default: None)
+            The MessageHelper used to convert the weights to a Proto object.
+            If None, a MessageHelper without encryption is used.
         max_workers : Optional[int], (default: 1)
             The maximum number of workers for the client ThreadPool, by default 1
         """
         self._client_params = client_params
         self._learner_id_fp = learner_id_fp
         self._max_workers = max_workers
+        self._message_helper = message_helper or MessageHelper()
 
         # Must be initialized after joining the federation
         self._learner_id = None
@@ -57,6 +74,7 @@ class GRPCClient(object):
         self,
         num_training_examples: int,
         server_params: ServerParams,
+        masking_public_key: Optional[bytes] = b"",
         request_retries: Optional[int] = 1,
         request_timeout: Optional[int] = None,
         block: Optional[bool] = True
@@ -70,6 +88,8 @@ class GRPCClient(object):
         server_params : ServerParams
             The server parameters of the Learner server. They are sent to the Controller 
             when joining the federation so that the Controller can connect to the Learner Server.
+        masking_public_key : Optional[bytes], (default=b"")
+            The public key the learner agrees on the masks of its model with, if the models are masked pairwise.
         request_retries : int, optional
             The number of retries, by default 1
         request_timeout : int, optional
@@ -96,7 +116,8 @@ class GRPCClient(object):
                         server_params.root_certificate),
                     public_certificate_bytes=read_certificate(
                         server_params.server_certificate),
-                    num_training_examples=num_training_examples
+                    num_training_examples=num_training_examples,
+                    masking_public_key=masking_public_key,
                 )
 
                 return self._join_federation(stub, request, timeout=_timeout)
@@ -158,9 +179,12 @@ class GRPCClient(object):
         weights: List[np.ndarray],
         metrics: Dict[str, Any],
         metadata: Dict[str, str],
+        codec: Optional[int] = None,
+        base_version: Optional[str] = "",
         request_retries=1,
         request_timeout=None,
-        block=True
+        block=True,
+        timer: Optional[PhaseTimer] = None
     ) -> service_common_pb2.Ack:
         """Sends the completed task to the Controller.
 
@@ -171,15 +195,22 @@ class GRPCClient(object):
         weights : List[np.ndarray]
             The weights of the model.
         metrics : Dict[str, Any]
-            The metrics produced during training.
+            The metrics produced during training. They are recorded in the metrics of the training metadata.
         metadata : Dict[str, str]
             The metadata to be sent.
+        codec : Optional[int], (default=None)
+            The Codec.Type to encode the weights with. If None, the default codec of the MessageHelper.
+        base_version : Optional[str], (default="")
+            If the weights are a delta, the version of the community model they are a delta from.
         request_retries : int, optional
             The number of retries, by default 1
         request_timeout : int, optional
             The timeout in seconds, by default None
         block : bool, optional
             Whether to block until the request is completed, by default True
+        timer : Optional[PhaseTimer], (default=None)
+            If given, the phase durations of the task timed so far are sent in the metadata.
+            The model is serialized while it is streamed, hence its serialization is not timed.
 
         Returns
         -------
@@ -204,15 +235,200 @@ class GRPCClient(object):
 
             def _request(_timeout=None):
 
-                request = controller_pb2.TrainDoneRequest(
+                # The model is streamed in chunks; the first chunk carries the
+                # learner id, the task id and the metadata of the request.
+                header = controller_pb2.TrainDoneRequestChunk(
                     learner_id=self._learner_id,
                     task_id=task_id,
-                    model=weights_to_model_proto(weights),
-                    metrics=metrics,
                     metadata=metadata
                 )
+                header.metadata.metrics.update(
+                    {key: str(value) for key, value in metrics.items()})
+                if timer is not None:
+                    header.metadata.phase_duration_ms.update(timer.durations_ms())
+
+                def _request_iterator():
+                    request = header
+                    for model_chunk in self._message_helper.weights_to_model_chunks(
+                            weights, codec=codec, base_version=base_version):
+                        request.model_chunk.CopyFrom(model_chunk)
+                        yield request
+                        request = controller_pb2.TrainDoneRequestChunk()
+                    if request is header:
+                        yield header
+
+                return stub.TrainDoneStream(
+                    _request_iterator(),
+                    timeout=_timeout
+                )
+
+            return schedule(_request, request_retries, request_timeout, block)
+
+    def train_done_request(
+        self,
+        task_id: str,
+        weights: List[np.ndarray],
+        metrics: Dict[str, Any],
+        metadata: Dict[str, str],
+        codec: Optional[int] = None,
+        base_version: Optional[str] = "",
+        timer: Optional[PhaseTimer] = None
+    ) -> controller_pb2.TrainDoneRequest:
+        """Returns the request with the completed task, to be sent later with send_train_done.
+            The weights are encoded (and encrypted) right away.
+
+        Parameters
+        ----------
+        task_id : str
+            The task id.
+        weights : List[np.ndarray]
+            The weights of the model.
+        metrics : Dict[str, Any]
+            The metrics produced during training. They are recorded in the metrics of the training metadata.
+        metadata : Dict[str, str]
+            The metadata to be sent.
+        codec : Optional[int], (default=None)
+            The Codec.Type to encode the weights with. If None, the default codec of the MessageHelper.
+        base_version : Optional[str], (default="")
+            If the weights are a delta, the version of the community model they are a delta from.
+        timer : Optional[PhaseTimer], (default=None)
+            If given, times the serialization of the weights as the "serialize" phase, and their
+            encryption as the "encrypt" phase, and sends the phase durations of the task in the metadata.
+
+        Returns
+        -------
+        controller_pb2.TrainDoneRequest
+            The request Proto object with the completed task.
+
+        Raises
+        ------
+        RuntimeError
+            If the learner id does not exist,
+            which means that the Learner has not joined the federation.
+        """
+
+        if not self._has_learner_id():
+            raise RuntimeError(
+                "Cannot send train done before joining the federation.")
+
+        with optional_phase(timer, "serialize"):
+            model = self._message_helper.weights_to_model_proto(
+                weights, codec=codec, base_version=base_version, timer=timer)
+        request = controller_pb2.TrainDoneRequest(
+            learner_id=self._learner_id,
+            task_id=task_id,
+            model=model,
+            metadata=metadata
+        )
+        request.metadata.metrics.update(
+            {key: str(value) for key, value in metrics.items()})
+        if timer is not None:
+            request.metadata.phase_duration_ms.update(timer.durations_ms())
+        return request
+
+    def send_train_done(
+        self,
+        request: controller_pb2.TrainDoneRequest,
+        request_timeout: Optional[float] = None
+    ) -> service_common_pb2.Ack:
+        """Sends the request with the completed task to the Controller, once.
+
+        Parameters
+        ----------
+        request : controller_pb2.TrainDoneRequest
+            The request Proto object with the completed task.
+        request_timeout : Optional[float], (default=None)
+            The timeout in seconds.
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the Ack.
+
+        Raises
+        ------
+        grpc.RpcError
+            If the request fails.
+        """
+
+        with self._get_client() as client:
+
+            stub: controller_pb2_grpc.ControllerServiceStub = client[0]
+            schedule = client[1]
+
+            def _request(_timeout=None):
+
+                def _request_iterator():
+                    header = controller_pb2.TrainDoneRequestChunk(
+                        learner_id=request.learner_id,
+                        task_id=request.task_id,
+                        metadata=request.metadata
+                    )
+                    for model_chunk in model_to_chunks(request.model):
+                        header.model_chunk.CopyFrom(model_chunk)
+                        yield header
+                        header = controller_pb2.TrainDoneRequestChunk()
+                    if header.task_id:
+                        yield header
+
+                return stub.TrainDoneStream(
+                    _request_iterator(),
+                    timeout=_timeout
+                )
+
+            return schedule(_request, 1, request_timeout, block=True, raise_errors=True)
+
+    def evaluate_done(
+        self,
+        task_id: str,
+        metrics: Dict[str, Any],
+        request_retries=1,
+        request_timeout=None,
+        block=True
+    ) -> service_common_pb2.Ack:
+        """Sends the metrics of the completed evaluation task to the Controller.
 
-                return stub.TrainDone(
+        Parameters
+        ----------
+        task_id : str
+            The task id.
+        metrics : Dict[str, Any]
+            The metrics produced during evaluation. The metrics that are not numbers are not sent.
+        request_retries : int, optional
+            The number of retries, by default 1
+        request_timeout : int, optional
+            The timeout in seconds, by default None
+        block : bool, optional
+            Whether to block until the request is completed, by default True
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response Proto object with the Ack.
+
+        Raises
+        ------
+        RuntimeError
+            If the learner id does not exist,
+            which means that the Learner has not joined the federation.
+        """
+
+        if not self._has_learner_id():
+            raise RuntimeError(
+                "Cannot send evaluate done before joining the federation.")
+
+        with self._get_client() as client:
+
+            stub: controller_pb2_grpc.ControllerServiceStub = client[0]
+            schedule = client[1]
+
+            def _request(_timeout=None):
+                request = controller_pb2.EvaluateDoneRequest(
+                    learner_id=self._learner_id,
+                    task_id=task_id,
+                    metadata=evaluation_metadata(metrics),
+                )
+                return stub.EvaluateDone(
                     request=request,
                     timeout=_timeout
                 )
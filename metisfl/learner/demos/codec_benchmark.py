@@ -0,0 +1,77 @@
+import argparse
+import time
+
+import numpy as np
+
+from metisfl.common.codec import CODEC_NAME_TO_PROTO
+from metisfl.common.logger import MetisLogger
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.proto import model_pb2
+
+
+def load_checkpoint(path):
+    # A .npz archive of the weights, e.g., np.savez(path, *model.get_weights())
+    # for a Keras model or np.savez(path, *[p.numpy() for p in model.state_dict().values()])
+    # for a PyTorch model.
+    with np.load(path) as checkpoint:
+        return [checkpoint[key] for key in checkpoint.files]
+
+
+def synthetic_checkpoint(num_params):
+    # Trained weights are roughly normally distributed around zero.
+    rng = np.random.default_rng(0)
+    return [rng.normal(scale=0.05, size=num_params).astype(np.float32)]
+
+
+def benchmark(weights, codec, num_runs):
+    helper = MessageHelper(codec=codec)
+    raw_bytes = sum(np.asarray(weight).nbytes for weight in weights)
+
+    encode_secs, decode_secs = [], []
+    for _ in range(num_runs):
+        start = time.perf_counter()
+        model = helper.weights_to_model_proto(weights)
+        encode_secs.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        helper.model_proto_to_weights(model)
+        decode_secs.append(time.perf_counter() - start)
+
+    encoded_bytes = sum(len(tensor.value) for tensor in model.tensors)
+    return (raw_bytes / encoded_bytes,
+            raw_bytes / np.median(encode_secs) / 2**20,
+            raw_bytes / np.median(decode_secs) / 2**20)
+
+
+if __name__ == "__main__":
+    """
+    Through this demo we measure the compression ratio and the encoding/decoding
+    throughput of every tensor codec, on the weights of a model checkpoint and,
+    if a previous checkpoint is given, on the delta between the two checkpoints.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="A .npz archive of the weights. If not given, synthetic weights are used.")
+    parser.add_argument("--previous_checkpoint", type=str, default=None,
+                        help="A .npz archive of the weights of an earlier round.")
+    parser.add_argument("--num_params", type=int, default=10_000_000)
+    parser.add_argument("--num_runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.checkpoint:
+        weights = load_checkpoint(args.checkpoint)
+    else:
+        weights = synthetic_checkpoint(args.num_params)
+
+    inputs = [("Weights", weights)]
+    if args.previous_checkpoint:
+        previous = load_checkpoint(args.previous_checkpoint)
+        inputs.append(("Delta", [current - before for current, before in zip(weights, previous)]))
+
+    codecs = [("None", model_pb2.Codec.Type.NONE)] + list(CODEC_NAME_TO_PROTO.items())
+    for input_name, input_weights in inputs:
+        for codec_name, codec in codecs:
+            ratio, encode_mbps, decode_mbps = benchmark(input_weights, codec, args.num_runs)
+            MetisLogger.info(
+                "{} with {}: ratio {:.2f}, encode {:.0f} MB/s, decode {:.0f} MB/s".format(
+                    input_name, codec_name, ratio, encode_mbps, decode_mbps))
@@ -0,0 +1,108 @@
+import argparse
+import multiprocessing as mp
+import resource
+import time
+
+import numpy as np
+
+from metisfl.common.logger import MetisLogger
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.proto import model_pb2
+
+
+def legacy_weights_to_model_proto(weights):
+    # The serialization path before the zero-copy changes, kept as a baseline.
+    model = model_pb2.Model()
+    for weight in weights:
+        tensor = model.tensors.add()
+        tensor.length = weight.size
+        tensor.dimensions.extend(weight.shape)
+        tensor.value = weight.flatten().tobytes()
+    return model
+
+
+def legacy_model_proto_to_weights(model, dtype):
+    # Read-only frombuffer views that learners had to copy before using them.
+    return [
+        np.frombuffer(tensor.value, dtype=dtype, count=tensor.length)
+        .reshape(tensor.dimensions).copy()
+        for tensor in model.tensors
+    ]
+
+
+def make_weights(model_size_mb, num_tensors, dtype):
+    dtype = np.dtype(dtype)
+    values_per_tensor = (model_size_mb * 2**20) // (num_tensors * dtype.itemsize)
+    return [np.ones((values_per_tensor,), dtype=dtype) for _ in range(num_tensors)]
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_round(model_size_mb, num_tensors, dtype, legacy, queue):
+    weights = make_weights(model_size_mb, num_tensors, dtype)
+    helper = MessageHelper()
+    baseline_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    if legacy:
+        model = legacy_weights_to_model_proto(weights)
+    else:
+        model = helper.weights_to_model_proto(weights)
+    serialized = model.SerializeToString()
+    serialize_secs = time.perf_counter() - start
+    del model
+
+    start = time.perf_counter()
+    model = model_pb2.Model()
+    model.ParseFromString(serialized)
+    del serialized
+    if legacy:
+        restored = legacy_model_proto_to_weights(model, dtype)
+    else:
+        restored = helper.model_proto_to_weights(model)
+    deserialize_secs = time.perf_counter() - start
+
+    assert all(w.flags.writeable for w in restored)
+    queue.put((serialize_secs, deserialize_secs, peak_rss_mb() - baseline_rss))
+
+
+def benchmark(model_size_mb, num_tensors, dtype, legacy):
+    # Every round runs in a fresh process, since the peak RSS never decreases.
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(
+        target=run_round,
+        args=(model_size_mb, num_tensors, dtype, legacy, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+if __name__ == "__main__":
+    """
+    Through this demo we measure the time and the peak resident memory that the
+    learner needs to serialize a model into a Model proto (and its wire bytes)
+    and to deserialize it back into writable numpy arrays, for the current
+    MessageHelper and for the legacy (flatten + tobytes / frombuffer + copy) path.
+
+    The reported peak RSS is the memory on top of the memory of the model itself.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes_mb", type=int, nargs="+",
+                        default=[100, 500, 1000, 2000])
+    parser.add_argument("--num_tensors", type=int, default=100)
+    parser.add_argument("--dtype", type=str, default="float32")
+    args = parser.parse_args()
+
+    for size_mb in args.sizes_mb:
+        for legacy in [True, False]:
+            ser, deser, rss = benchmark(
+                size_mb, args.num_tensors, args.dtype, legacy)
+            MetisLogger.info(
+                "{} model of {} MB: serialize {:.3f}s, deserialize {:.3f}s, "
+                "peak RSS +{:.0f} MB".format(
+                    "Legacy" if legacy else "Current", size_mb, ser, deser, rss))
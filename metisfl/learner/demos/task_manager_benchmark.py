@@ -0,0 +1,87 @@
+import argparse
+import queue
+import time
+
+import numpy as np
+
+from metisfl.common.logger import MetisLogger
+from metisfl.learner.learner import Learner, try_call_train
+from metisfl.learner.task_manager import TaskManager
+
+
+class SlowStartLearner(Learner):
+    """A Learner that, like TensorFlow/PyTorch learners, pays a one-off start-up cost
+        (imports, model graph, data pipeline) the first time it trains in a process."""
+
+    def __init__(self, startup_secs: float, num_params: int):
+        self._startup_secs = startup_secs
+        self._num_params = num_params
+        self._model = None
+
+    def _build_model(self):
+        time.sleep(self._startup_secs)
+        self._model = np.zeros(self._num_params, dtype=np.float32)
+
+    def get_weights(self):
+        return [self._model]
+
+    def set_weights(self, weights):
+        self._model = weights[0]
+        return True
+
+    def train(self, weights, params):
+        if self._model is None:
+            self._build_model()
+        self._model[:] = weights[0] + 1
+        return [self._model], {}, {}
+
+    def evaluate(self, weights, params):
+        return {}
+
+
+def benchmark(task_manager, learner, weights, num_rounds):
+    results = queue.Queue()
+    round_secs = []
+    for _ in range(num_rounds):
+        start = time.perf_counter()
+        task_manager.run_task(
+            task_fn=try_call_train,
+            task_kwargs={
+                "learner": learner,
+                "weights": weights,
+                "params": {},
+            },
+            callback=results.put,
+        )
+        weights = results.get()[0]
+        round_secs.append(time.perf_counter() - start)
+    task_manager.shutdown()
+    return round_secs
+
+
+if __name__ == "__main__":
+    """
+    Through this demo we measure the per-round overhead of running the training
+    tasks of a learner in a fresh worker process per task (the default) and in a
+    long-lived worker process that keeps the learner resident across tasks.
+
+    The learner simulates the start-up cost of a deep learning framework with the
+    --startup_secs argument; the cost of spawning and importing is real.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_rounds", type=int, default=10)
+    parser.add_argument("--startup_secs", type=float, default=2.0)
+    parser.add_argument("--num_params", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    learner = SlowStartLearner(args.startup_secs, args.num_params)
+    weights = [np.zeros(args.num_params, dtype=np.float32)]
+
+    for mode, task_manager in [
+        ("Fresh worker", TaskManager()),
+        ("Resident worker", TaskManager(resident_kwargs={"learner": learner})),
+    ]:
+        round_secs = benchmark(task_manager, learner, weights, args.num_rounds)
+        MetisLogger.info(
+            "{}: first round {:.3f}s, mean of subsequent rounds {:.3f}s".format(
+                mode, round_secs[0], np.mean(round_secs[1:])))
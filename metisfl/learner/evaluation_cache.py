@@ -0,0 +1,116 @@
+"""This module memoizes the metrics of evaluated models, such that a model that is evaluated
+    again with the same parameters (e.g., after a rejoin) is not run over the test set again."""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .model_delta import content_version
+
+# The number of evaluated models whose metrics are held.
+DEFAULT_EVALUATION_CACHE_SIZE = 32
+
+
+class EvaluationCache(object):
+
+    """Holds the metrics of the most recently evaluated models, for one version of the local dataset."""
+
+    def __init__(self, capacity: Optional[int] = DEFAULT_EVALUATION_CACHE_SIZE):
+        """Initializes the EvaluationCache object.
+
+        Parameters
+        ----------
+        capacity : Optional[int], (default=DEFAULT_EVALUATION_CACHE_SIZE)
+            The number of evaluated models to hold. The least recently used model is evicted first.
+
+        Raises
+        ------
+        ValueError
+            If the capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("The capacity must be positive")
+        self._capacity = capacity
+        self._metrics = OrderedDict()
+        self._dataset_version = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(weights: List[np.ndarray], params: Dict[str, Any]) -> str:
+        """Returns the key of the evaluation of the model with the parameters, e.g., the batch size
+            and the metrics, i.e., the hash of the weights followed by the canonical parameters."""
+
+        return "{}:{}".format(content_version(weights),
+                              json.dumps(params, sort_keys=True, default=str))
+
+    def get(self, key: str, dataset_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Returns the metrics of the evaluation, or None if they are not held.
+
+        Parameters
+        ----------
+        key : str
+            The key of the evaluation.
+        dataset_version : Optional[str], (default=None)
+            The version of the local dataset. If it has changed, all the metrics are dropped.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            A copy of the metrics, or None.
+        """
+        with self._lock:
+            self._check_dataset_version(dataset_version)
+            metrics = self._metrics.get(key)
+            if metrics is None:
+                return None
+            self._metrics.move_to_end(key)
+            return dict(metrics)
+
+    def put(self, key: str, metrics: Dict[str, Any], dataset_version: Optional[str] = None) -> None:
+        """Inserts the metrics of the evaluation.
+
+        Parameters
+        ----------
+        key : str
+            The key of the evaluation.
+        metrics : Dict[str, Any]
+            The metrics of the evaluation. A copy is held.
+        dataset_version : Optional[str], (default=None)
+            The version of the local dataset the model was evaluated on.
+        """
+        with self._lock:
+            self._check_dataset_version(dataset_version)
+            self._metrics[key] = dict(metrics)
+            self._metrics.move_to_end(key)
+            while len(self._metrics) > self._capacity:
+                self._metrics.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drops all the metrics, e.g., after the local dataset is changed."""
+
+        with self._lock:
+            self._metrics.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._metrics)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # E.g., sent to the evaluation worker; the copy gets a lock of its own.
+        with self._lock:
+            state = self.__dict__.copy()
+            state["_metrics"] = self._metrics.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _check_dataset_version(self, dataset_version: Optional[str]) -> None:
+        if dataset_version != self._dataset_version:
+            self._metrics.clear()
+            self._dataset_version = dataset_version
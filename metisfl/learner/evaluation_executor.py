@@ -0,0 +1,233 @@
+"""This module contains the executor that evaluates models in a worker process of its own,
+    apart from the training worker, such that evaluation neither holds the gRPC threads
+    of the Learner server nor waits for, or slows down, the running training task."""
+
+import multiprocessing as mp
+import threading
+from concurrent import futures
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from pebble import ProcessPool
+
+from ..common.logger import MetisLogger
+from .evaluation_cache import EvaluationCache
+from .learner import Learner, has_get_dataset_version
+from .shared_weights import (release_shared_weights, share_weights,
+                             try_call_evaluate_shared)
+from .task_manager import check_cpu_affinity, init_worker, run_resident_task
+
+
+class EvaluationExecutor(object):
+
+    """Evaluates models in a long-lived worker process of its own, apart from training.
+
+        The Learner is sent to the worker when the worker starts, hence the worker evaluates
+        with a snapshot of it: changes made to the Learner in this process afterwards, e.g.,
+        a reloaded test set, do not reach the worker. The Learner is sent to a new worker
+        whenever the version returned by its get_dataset_version method changes, or when
+        refresh is called. Likewise, the worker holds a copy of the EvaluationCache; it is
+        cleared with invalidate_cache."""
+
+    def __init__(
+        self,
+        learner: Learner,
+        max_pending: Optional[int] = 4,
+        niceness: Optional[int] = 0,
+        cpu_affinity: Optional[Iterable[int]] = None,
+        evaluation_cache: Optional[EvaluationCache] = None
+    ):
+        """Initializes the EvaluationExecutor object. The models are evaluated one at a time,
+            in the order they are submitted, by a long-lived worker that keeps the Learner resident.
+
+        Parameters
+        ----------
+        learner : Learner
+            The Learner object to evaluate the models with. Sent to the worker only once.
+        max_pending : Optional[int], (default=4)
+            The maximum number of submitted evaluations, including the running one.
+            Further evaluations are refused until one completes.
+        niceness : Optional[int], (default=0)
+            The niceness added to the worker, i.e., how much lower its scheduling priority is
+            than the one of the Learner server and the training worker.
+        cpu_affinity : Optional[Iterable[int]], (default=None)
+            The CPUs the worker is pinned to, e.g., the cores not used for training.
+            If None, the worker may run on any CPU.
+        evaluation_cache : Optional[EvaluationCache], (default=None)
+            If given, the worker keeps the metrics of the evaluated models in (its copy of) the cache
+            and returns them right away if a model is evaluated again with the same parameters.
+
+        Raises
+        ------
+        ValueError
+            If max_pending or niceness is invalid, or if the worker cannot be pinned to the given CPUs.
+        """
+        if max_pending < 1:
+            raise ValueError("At least one evaluation must be allowed to be pending")
+        if niceness < 0:
+            raise ValueError("The niceness must not be negative")
+
+        self._learner = learner
+        self._evaluation_cache = evaluation_cache
+        self._niceness = niceness
+        self._cpu_affinity = check_cpu_affinity(cpu_affinity)
+        self._max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._dataset_version = self._get_dataset_version()
+        self._worker_pool = self._create_worker_pool()
+        # The pools of the workers replaced by refresh, which complete their evaluations.
+        self._retired_pools: List[ProcessPool] = []
+
+    def submit(
+        self,
+        weights: List[np.ndarray],
+        params: Dict[str, Any],
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Optional[futures.Future]:
+        """Schedules the evaluation of the model, unless too many evaluations are pending.
+
+        Parameters
+        ----------
+        weights : List[np.ndarray]
+            The weights of the model to be evaluated. Handed over to the worker through shared memory.
+        params : Dict[str, Any]
+            A dictionary of evaluation parameters.
+        callback : Optional[Callable[[Dict[str, Any]], None]], (default=None)
+            Called with the metrics of the model once it is evaluated. Not called if the evaluation fails.
+
+        Returns
+        -------
+        Optional[futures.Future]
+            The future of the metrics of the model, or None if the evaluation is refused.
+        """
+        with self._lock:
+            if self._pending >= self._max_pending:
+                return None
+            self._pending += 1
+
+        shared_weights = None
+        try:
+            dataset_version = self._get_dataset_version()
+            if dataset_version != self._dataset_version:
+                MetisLogger.info("The dataset version changed, sending the Learner to the evaluation worker")
+                self.refresh()
+
+            shared_weights = share_weights(weights)
+            with self._lock:
+                future = self._worker_pool.schedule(
+                    function=run_resident_task,
+                    args=(try_call_evaluate_shared, None,
+                          {"weights": shared_weights, "params": params,
+                           "dataset_version": dataset_version}))
+        except BaseException:
+            # E.g., the shared memory is full or the executor is shut down.
+            if shared_weights is not None:
+                release_shared_weights(shared_weights)
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        def _done(future: futures.Future) -> None:
+            # Normally already released by the worker.
+            release_shared_weights(shared_weights)
+            with self._lock:
+                self._pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                MetisLogger.error("Evaluation failed: {}".format(future.exception()))
+                return
+            if callback is not None:
+                callback(future.result())
+
+        future.add_done_callback(_done)
+        return future
+
+    def refresh(self, learner: Optional[Learner] = None) -> None:
+        """Sends the Learner to a new worker, which evaluates the models submitted from now on.
+            The evaluations already submitted are completed by the previous worker.
+
+        Parameters
+        ----------
+        learner : Optional[Learner], (default=None)
+            The Learner to evaluate the models with from now on. If None, the current one,
+            as it is in this process now.
+        """
+        with self._lock:
+            if learner is not None:
+                self._learner = learner
+            self._dataset_version = self._get_dataset_version()
+            retired = self._worker_pool
+            self._worker_pool = self._create_worker_pool()
+            self._retired_pools = [pool for pool in self._retired_pools if pool.active]
+            self._retired_pools.append(retired)
+        retired.close()
+
+    def invalidate_cache(self) -> Optional[futures.Future]:
+        """Drops the metrics held by the EvaluationCache of the worker, once the evaluations
+            submitted before are completed, along with those held by the cache of this process
+            that is sent to new workers.
+
+        Returns
+        -------
+        Optional[futures.Future]
+            The future of the invalidation, or None if the executor has no EvaluationCache.
+        """
+        if self._evaluation_cache is None:
+            return None
+        self._evaluation_cache.invalidate()
+        with self._lock:
+            return self._worker_pool.schedule(function=run_resident_task,
+                                              args=(_invalidate_evaluation_cache,))
+
+    def pending(self) -> int:
+        """Returns the number of submitted evaluations that are not completed yet."""
+
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, force: Optional[bool] = False) -> None:
+        """Shuts down the worker.
+
+        Parameters
+        ----------
+        force : Optional[bool], (default=False)
+            Whether to stop the pending evaluations instead of completing them.
+        """
+        with self._lock:
+            pools = self._retired_pools + [self._worker_pool]
+        for pool in pools:
+            if force:
+                pool.stop()
+            else:
+                pool.close()
+        for pool in pools:
+            pool.join()
+
+    def _create_worker_pool(self) -> ProcessPool:
+        """Creates the pool of the worker, to which the Learner is sent when the worker starts."""
+
+        resident_kwargs = {"learner": self._learner, "evaluation_cache": self._evaluation_cache}
+        return ProcessPool(max_workers=1,
+                           max_tasks=0,
+                           initializer=init_worker,
+                           initargs=(resident_kwargs, self._cpu_affinity, self._niceness),
+                           context=mp.get_context("spawn"))
+
+    def _get_dataset_version(self) -> Optional[str]:
+        """Returns the version of the local dataset of the Learner, as it is in this process."""
+
+        if has_get_dataset_version(self._learner):
+            return self._learner.get_dataset_version()
+        return None
+
+
+def _invalidate_evaluation_cache(
+    evaluation_cache: Optional[EvaluationCache] = None,
+    **kwargs
+) -> None:
+    """Drops the metrics held by the EvaluationCache resident in the worker."""
+
+    if evaluation_cache is not None:
+        evaluation_cache.invalidate()
@@ -2,11 +2,12 @@
 """This module contains the abstract class for all MetisFL Learners."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
 from ..common.logger import MetisLogger
+from .evaluation_cache import EvaluationCache
 
 
 class Learner(ABC):
@@ -31,6 +32,7 @@ class Learner(ABC):
         ----------
         weights : List[np.ndarray]
             A list of numpy arrays representing the weights of the model to be set.
+            The arrays are writable and owned by the learner, so they can be used in place.
 
         Returns
         -------
@@ -74,6 +76,17 @@ class Learner(ABC):
         """Evaluates the given model using the given evaluation parameters."""
         return {}
 
+    def get_dataset_version(self) -> Optional[str]:
+        """Returns the version of the local dataset, e.g., a hash of its files or a counter
+            increased whenever it is changed. The cached evaluation metrics are dropped when it changes.
+
+        Returns
+        -------
+        Optional[str]
+            The version of the local dataset, or None if the dataset never changes.
+        """
+        return None
+
 
 def has_get_weights(learner: Learner) -> bool:
     """Returns True if the given learner has a get_weights method, False otherwise."""
@@ -95,6 +108,11 @@ def has_evaluate(learner: Learner) -> bool:
     return hasattr(learner, 'evaluate')
 
 
+def has_get_dataset_version(learner: Learner) -> bool:
+    """Returns True if the given learner has a get_dataset_version method, False otherwise."""
+    return hasattr(learner, 'get_dataset_version')
+
+
 def has_all(learner: Learner) -> bool:
     """Returns True if the given learner has all methods, False otherwise."""
     return has_get_weights(learner) and has_set_weights(learner) and \
@@ -216,7 +234,9 @@ def try_call_train(
 def try_call_evaluate(
     learner: Learner,
     weights: List[np.ndarray],
-    params: Dict[str, Any]
+    params: Dict[str, Any],
+    cache: Optional[EvaluationCache] = None,
+    dataset_version: Optional[str] = None
 ) -> Dict[str, Any]:
     """Tries to call the evaluate method of the given learner.
 
@@ -228,6 +248,12 @@ def try_call_evaluate(
         The weights of the model to be evaluated.
     params : Dict[str, Any]
         A dictionary of evaluation parameters.
+    cache : Optional[EvaluationCache], (default=None)
+        If given, the metrics of a model already evaluated with the same parameters, on the same
+        version of the local dataset, are returned without calling the evaluate method.
+    dataset_version : Optional[str], (default=None)
+        The version of the local dataset, e.g., as queried in the process that holds the Learner
+        while the learner is a copy of it. If None, it is queried from the learner.
 
     Returns
     -------
@@ -243,6 +269,15 @@ def try_call_evaluate(
     """
 
     if has_evaluate(learner):
+        if cache is not None:
+            key = EvaluationCache.key(weights, params)
+            if dataset_version is None and has_get_dataset_version(learner):
+                dataset_version = learner.get_dataset_version()
+            eval_res = cache.get(key, dataset_version)
+            if eval_res is not None:
+                MetisLogger.info("Reusing the metrics of an evaluated model")
+                return eval_res
+
         eval_res = learner.evaluate(weights, params)
 
         for metrics in params.get('metrics', []):
@@ -250,6 +285,8 @@ def try_call_evaluate(
                 raise ValueError(
                     f"Metric {metrics} not found in evaluation results")
 
+        if cache is not None:
+            cache.put(key, eval_res, dataset_version)
         return eval_res
 
     raise ValueError("Learner does not have an evaluate method")
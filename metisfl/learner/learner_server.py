@@ -1,21 +1,52 @@
 
 
+import itertools
 import threading
-from typing import Any, Dict
+from concurrent import futures
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 import grpc
+import numpy as np
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.timestamp_pb2 import Timestamp
 
+from ..common.broadcast import ChunkRelay
+from ..common.chunking import tensor_to_chunks
 from ..common.logger import MetisLogger
 from ..common.server import get_server
+from ..common.timing import PhaseTimer
 from ..common.types import ServerParams
+from ..encryption.masking import PairwiseMasking
 from ..proto import (learner_pb2, learner_pb2_grpc, model_pb2,
                      service_common_pb2)
-from .controller_client import GRPCClient
+from .controller_client import GRPCClient, evaluation_metadata
+from .evaluation_cache import EvaluationCache
+from .evaluation_executor import EvaluationExecutor
 from .learner import (Learner, try_call_evaluate, try_call_get_weights,
-                      try_call_set_weights, try_call_train)
+                      try_call_set_weights)
+from .message_helper import MessageHelper, numpy_dtype_to_proto
+from .model_delta import (ModelVersionCache, add_weights, content_version,
+                          subtract_weights)
+from .quantization import QuantizedWeight, UpdateQuantizer
+from .sparsification import SparseWeight, UpdateSparsifier
+from .shared_weights import (load_shared_weights, release_shared_weights,
+                             share_weights, try_call_train_shared)
 from .task_manager import TaskManager
+from .upload_queue import UploadQueue
+
+
+# The time in seconds the queued uploads are given to be delivered on shutdown.
+UPLOAD_QUEUE_CLOSE_TIMEOUT = 30
+
+
+def _held_copy(weights: List[np.ndarray]) -> List[np.ndarray]:
+    """Copies the weights of a model that is held as a base for deltas. The copies are read-only,
+        since the arrays handed to the Learner may be modified, e.g., trained in place."""
+
+    held = [np.array(weight) for weight in weights]
+    for weight in held:
+        weight.setflags(write=False)
+    return held
 
 
 class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
@@ -26,6 +57,13 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
         client: GRPCClient,
         task_manager: TaskManager,
         server_params: ServerParams,
+        message_helper: Optional[MessageHelper] = None,
+        update_quantizer: Optional[UpdateQuantizer] = None,
+        update_sparsifier: Optional[UpdateSparsifier] = None,
+        pairwise_masking: Optional[PairwiseMasking] = None,
+        upload_queue: Optional[UploadQueue] = None,
+        evaluation_executor: Optional[EvaluationExecutor] = None,
+        evaluation_cache: Optional[EvaluationCache] = None,
     ):
         """The Learner server. Impliments the LearnerServiceServicer endponits.
 
@@ -39,18 +77,70 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
             The task manager object. Udse to run tasks in a pool of workers.
         client : GRPCControllerClient
             The client object. Used to communicate with the controller.
-
+        message_helper : Optional[MessageHelper], (default=None)
+            The MessageHelper used to convert between weights and Proto objects.
+            If None, a MessageHelper without encryption is used.
+        update_quantizer : Optional[UpdateQuantizer], (default=None)
+            If given, quantizes the trained models sent to the Controller. Works best along with
+            delta updates, where the (small) differences from the community model are quantized.
+        update_sparsifier : Optional[UpdateSparsifier], (default=None)
+            If given, sparsifies the deltas sent to the Controller; the full models are not sparsified.
+            Along with an update quantizer, the kept values are also quantized.
+        pairwise_masking : Optional[PairwiseMasking], (default=None)
+            If given, registers the masking rounds of the training tasks, recovers the masks
+            of the learners that drop out of a round and reveals the shares of the self masks
+            of the learners that survive it. The models sent to the Controller are masked
+            by the MessageHelper of the client, which must use the same PairwiseMasking.
+        upload_queue : Optional[UploadQueue], (default=None)
+            If given, the completed tasks are queued for upload to the Controller, which is done by
+            the thread of the queue; it must send the requests with the client. If None, every completed
+            task is sent right away, by the thread that runs the callbacks of the task manager.
+        evaluation_executor : Optional[EvaluationExecutor], (default=None)
+            If given, the models are evaluated by the worker of the executor, apart from training.
+            If the Controller asks for it, the metrics are reported with the EvaluateDone endpoint
+            instead of the response. If None, the models are evaluated by the thread of the request.
+        evaluation_cache : Optional[EvaluationCache], (default=None)
+            If given, the metrics of the models evaluated by the thread of the request are cached.
+            The evaluation executor, if any, has a cache of its own.
+
+        Raises
+        ------
+        ValueError
+            If an update quantizer or sparsifier is used along with an encryption scheme
+            or pairwise masking.
         """
         self._learner = learner
         self._client = client
         self._task_manager = task_manager
+        self._message_helper = message_helper or MessageHelper()
+        encrypted = self._message_helper.scheme is not None or pairwise_masking is not None
+        if update_quantizer is not None and encrypted:
+            raise ValueError("Encrypted models cannot be quantized")
+        if update_sparsifier is not None and encrypted:
+            raise ValueError("Encrypted models cannot be sparsified")
+        self._pairwise_masking = pairwise_masking
+        self._update_quantizer = update_quantizer
+        self._update_sparsifier = update_sparsifier
+        self._upload_queue = upload_queue
+        self._evaluation_executor = evaluation_executor
+        self._evaluation_cache = evaluation_cache
+        # The recent versioned models, i.e., the community models if the Controller sends
+        # deltas and the models sent to the Driver, which may be referred to by their version.
+        self._model_versions = ModelVersionCache()
+        # The codec of the last received model, for models received as references.
+        self._codec = None
 
         self._status = service_common_pb2.ServingStatus.UNKNOWN
         self._shutdown_event = threading.Event()
         self._server_params = server_params
 
-        self._server = get_server(
-            server_params=server_params,
+        self._server = self._create_server()
+
+    def _create_server(self) -> grpc.Server:
+        """Creates the gRPC server of the servicer, whose requests are handled by a pool of threads."""
+
+        return get_server(
+            server_params=self._server_params,
             servicer=self,
             add_servicer_to_server_fn=learner_pb2_grpc.add_LearnerServiceServicer_to_server,
         )
@@ -71,7 +161,22 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
             # TODO: Should we raise an exception here?
             MetisLogger.error("Learner server failed to start.")
 
-    def GetHealthStatus(self) -> service_common_pb2.HealthStatusResponse:
+        self._close()
+
+    def _close(self) -> None:
+        """Delivers (or spills) the queued uploads and stops the evaluation worker."""
+
+        if self._upload_queue is not None:
+            # The uploads that cannot be delivered in time are spilled, if possible.
+            self._upload_queue.close(timeout=UPLOAD_QUEUE_CLOSE_TIMEOUT)
+        if self._evaluation_executor is not None:
+            self._evaluation_executor.shutdown(force=True)
+
+    def GetHealthStatus(
+        self,
+        _: Optional[service_common_pb2.Empty] = None,
+        context: Optional[Any] = None
+    ) -> service_common_pb2.HealthStatusResponse:
         """Returns the health status of the server."""
 
         return service_common_pb2.HealthStatusResponse(
@@ -101,11 +206,41 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
         if not self._is_serving(context):
             return None
 
-        model = try_call_get_weights(
+        weights = try_call_get_weights(
+            learner=self._learner,
+        )
+
+        return self._message_helper.weights_to_model_proto(
+            weights, version=self._hold_model(weights))
+
+    def GetModelStream(
+        self,
+        _: service_common_pb2.Empty,
+        context: Any
+    ) -> Iterator[model_pb2.ModelChunk]:
+        """Streaming variant of GetModel. Streams the model in bounded-size chunks.
+
+        Parameters
+        ----------
+        _ : service_common_pb2.Empty
+            An empty request. No parameters are needed.
+        context : Any
+            The gRPC context of the request.
+
+        Yields
+        ------
+        model_pb2.ModelChunk
+            The chunks of the model.
+        """
+        if not self._is_serving(context):
+            return
+
+        weights = try_call_get_weights(
             learner=self._learner,
         )
 
-        return model
+        yield from self._message_helper.weights_to_model_chunks(
+            weights, version=self._hold_model(weights))
 
     def SetInitialWeights(
         self,
@@ -130,9 +265,18 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
         if not self._is_serving(context):
             return service_common_pb2.Ack(status=False)
 
+        weights = self._resolve_model(
+            weights=self._message_helper.model_proto_to_weights(model),
+            version=model.version,
+            base_version=model.base_version,
+            reference=model.reference,
+        )
+        if weights is None:
+            return service_common_pb2.Ack(status=False)
+
         status = try_call_set_weights(
             learner=self._learner,
-            model=model,
+            weights=weights,
         )
 
         return service_common_pb2.Ack(
@@ -140,12 +284,126 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
             timestamp=Timestamp().GetCurrentTime()
         )
 
+    def SetInitialWeightsStream(
+        self,
+        request_iterator: Iterable[model_pb2.ModelChunk],
+        context: Any
+    ) -> service_common_pb2.Ack:
+        """Streaming variant of SetInitialWeights. The weights are assembled as the chunks arrive.
+
+        Parameters
+        ----------
+        request_iterator : Iterable[model_pb2.ModelChunk]
+            The chunks of the model.
+        context : Any
+            The gRPC context of the request.
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response containing the acknoledgement.
+        """
+
+        if not self._is_serving(context):
+            return service_common_pb2.Ack(status=False)
+
+        header = {}
+
+        def _model_chunks():
+            for chunk in request_iterator:
+                if not header:
+                    header["version"] = chunk.version
+                    header["base_version"] = chunk.base_version
+                yield chunk
+
+        weights = self._resolve_model(
+            weights=self._message_helper.model_chunks_to_weights(_model_chunks()),
+            version=header.get("version", ""),
+            base_version=header.get("base_version", ""),
+        )
+        if weights is None:
+            return service_common_pb2.Ack(status=False)
+
+        status = try_call_set_weights(
+            learner=self._learner,
+            weights=weights,
+        )
+
+        return service_common_pb2.Ack(
+            status=status,
+            timestamp=Timestamp().GetCurrentTime()
+        )
+
+    def SetInitialWeightsRelayStream(
+        self,
+        request_iterator: Iterable[learner_pb2.SetInitialWeightsRelayChunk],
+        context: Any
+    ) -> learner_pb2.BroadcastResponse:
+        """Relay variant of SetInitialWeightsStream. Sets the initial weights and forwards
+            the model to the peers of the first chunk, every chunk as it arrives.
+
+        Parameters
+        ----------
+        request_iterator : Iterable[learner_pb2.SetInitialWeightsRelayChunk]
+            The chunks of the request.
+        context : Any
+            The gRPC context of the request.
+
+        Returns
+        -------
+        learner_pb2.BroadcastResponse
+            The response containing the acknoledgement and the reports of the peers.
+        """
+
+        if not self._is_serving(context):
+            return learner_pb2.BroadcastResponse(
+                ack=service_common_pb2.Ack(status=False))
+
+        header = {}
+        requests = iter(request_iterator)
+        # Only the first chunk carries the peers and the fanout.
+        first = next(requests, learner_pb2.SetInitialWeightsRelayChunk())
+        relay = ChunkRelay(peers=list(first.peers), fanout=first.fanout)
+
+        def _model_chunks():
+            for request in itertools.chain([first], requests):
+                if request.HasField("model_chunk"):
+                    if "version" not in header:
+                        header["version"] = request.model_chunk.version
+                    relay.put(request.model_chunk)
+                    yield request.model_chunk
+
+        try:
+            weights = self._message_helper.model_chunks_to_weights(_model_chunks())
+        except BaseException:
+            relay.abort()
+            relay.result()
+            raise
+        relay.close()
+        weights = self._resolve_model(weights, header.get("version", ""), "")
+
+        status = try_call_set_weights(
+            learner=self._learner,
+            weights=weights,
+        )
+        reports = relay.result()
+
+        return learner_pb2.BroadcastResponse(
+            ack=service_common_pb2.Ack(
+                status=status,
+                timestamp=Timestamp().GetCurrentTime()
+            ),
+            reports=reports,
+        )
+
     def Evaluate(
         self,
         request: learner_pb2.EvaluateRequest,
         context: Any
     ) -> learner_pb2.EvaluateResponse:
-        """Evaluation endpoint. Evaluates the given model.
+        """Evaluation endpoint. Evaluates the given model. If the request asks for the metrics
+            to be reported with the EvaluateDone Controller endpoint and an evaluation executor is used,
+            the Learner server responds once the evaluation is scheduled, without the metrics.
 
         Parameters
         ----------
@@ -157,21 +415,81 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
         Returns
         -------
         learner_pb2.EvaluateResponse
-            The response containing the evaluation metrics.
+            The response containing the evaluation metrics, if they are not reported later.
         """
+        result = self._evaluate(request, context)
+        if not isinstance(result, futures.Future):
+            return result
+        return self._evaluation_response(request.task_id, result, context)
+
+    def _evaluate(
+        self,
+        request: learner_pb2.EvaluateRequest,
+        context: Any
+    ) -> Union[learner_pb2.EvaluateResponse, futures.Future]:
+        """Evaluates the model of the request, or schedules its evaluation with the evaluation executor.
+            Returns the response, or the future of the metrics if the response must wait for them."""
+
         if not self._is_serving(context):
-            return learner_pb2.EvaluateResponse(ack=None)
+            return learner_pb2.EvaluateResponse()
 
-        metrics = try_call_evaluate(
-            learner=self._learner,
-            model=request.model,
-            params=request.params,
+        task_id: str = request.task_id
+        weights = self._resolve_model(
+            weights=self._message_helper.model_proto_to_weights(request.model),
+            version=request.model.version,
+            base_version=request.model.base_version,
+            reference=request.model.reference,
         )
+        if weights is None:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            return learner_pb2.EvaluateResponse(task_id=task_id)
+        params_dict: Dict = MessageToDict(request.params)
 
-        # TODO: need to ensure that metrics is a dict containing the metrics in request.params.
-
+        if self._evaluation_executor is None:
+            metrics = try_call_evaluate(
+                learner=self._learner,
+                weights=weights,
+                params=params_dict,
+                cache=self._evaluation_cache,
+            )
+            return learner_pb2.EvaluateResponse(
+                task_id=task_id,
+                metadata=evaluation_metadata(metrics),
+            )
+
+        def _evaluate_done(metrics):
+            self._client.evaluate_done(task_id=task_id, metrics=metrics)
+
+        future = self._evaluation_executor.submit(
+            weights=weights,
+            params=params_dict,
+            callback=_evaluate_done if request.report_done else None,
+        )
+        if future is None:
+            MetisLogger.warning("Too many pending evaluations, refusing task {}".format(task_id))
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            return learner_pb2.EvaluateResponse(task_id=task_id)
+        if request.report_done:
+            return learner_pb2.EvaluateResponse(task_id=task_id)
+        return future
+
+    def _evaluation_response(
+        self,
+        task_id: str,
+        future: futures.Future,
+        context: Any
+    ) -> learner_pb2.EvaluateResponse:
+        """Returns the response with the metrics of the evaluation, once it completes."""
+
+        try:
+            metrics = future.result()
+        except Exception as error:
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details("Evaluation failed: {}".format(error))
+            return learner_pb2.EvaluateResponse(task_id=task_id)
         return learner_pb2.EvaluateResponse(
-            metrics=metrics
+            task_id=task_id,
+            metadata=evaluation_metadata(metrics),
         )
 
     def Train(
@@ -201,17 +519,121 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
             return service_common_pb2.Ack(status=False)
 
         task_id: str = request.task_id
-        model_dict: Dict = MessageToDict(request.model)
+        masking_round = request.masking if request.HasField("masking") else None
+        if not self._register_round(masking_round):
+            return service_common_pb2.Ack(status=False)
+        timer = PhaseTimer()
+        with timer.phase("deserialize"):
+            weights = self._resolve_model(
+                weights=self._message_helper.model_proto_to_weights(request.model, timer=timer),
+                version=request.model.version,
+                base_version=request.model.base_version,
+                reference=request.model.reference,
+                acknowledged=True,
+            )
+        if weights is None:
+            return service_common_pb2.Ack(status=False)
         params_dict: Dict = MessageToDict(request.params)
+        if request.model.tensors:
+            self._codec = request.model.tensors[0].codec
+
+        return self._run_train_task(
+            task_id, weights, params_dict, self._codec, request.model.version, masking_round,
+            timer)
+
+    def TrainStream(
+        self,
+        request_iterator: Iterable[learner_pb2.TrainRequestChunk],
+        context: Any
+    ) -> service_common_pb2.Ack:
+        """Streaming variant of Train. The task id and training parameters arrive with the
+            first chunk and the weights are assembled as the chunks arrive.
+
+        Parameters
+        ----------
+        request_iterator : Iterable[learner_pb2.TrainRequestChunk]
+            The chunks of the request.
+        context : Any
+            The gRPC context of the request.
+
+        Returns
+        -------
+        service_common_pb2.Ack
+            The response containing the acknoledgement.
+            The acknoledgement contains the status, i.e. True if the training was started, False otherwise.
+        """
+        if not self._is_serving(context):
+            return service_common_pb2.Ack(status=False)
+
+        header = {}
+
+        def _model_chunks():
+            for request in request_iterator:
+                if not header:
+                    # Only the first chunk carries the training parameters.
+                    header["task_id"] = request.task_id
+                    header["params"] = MessageToDict(request.params)
+                    header["masking"] = request.masking if request.HasField("masking") else None
+                if request.HasField("model_chunk"):
+                    if "codec" not in header:
+                        header["codec"] = self._codec = request.model_chunk.tensor_spec.codec
+                        header["version"] = request.model_chunk.version
+                        header["base_version"] = request.model_chunk.base_version
+                    yield request.model_chunk
+
+        timer = PhaseTimer()
+        # The chunks are deserialized as they are received.
+        with timer.phase("receive"):
+            weights = self._resolve_model(
+                weights=self._message_helper.model_chunks_to_weights(_model_chunks(), timer=timer),
+                version=header.get("version", ""),
+                base_version=header.get("base_version", ""),
+                acknowledged=True,
+            )
+        if weights is None or not self._register_round(header.get("masking")):
+            return service_common_pb2.Ack(status=False)
+
+        return self._run_train_task(
+            header.get("task_id", ""), weights, header.get("params", {}),
+            header.get("codec"), header.get("version", ""), header.get("masking"), timer)
+
+    def _run_train_task(
+        self,
+        task_id: str,
+        weights: List[np.ndarray],
+        params_dict: Dict,
+        codec: Optional[int] = None,
+        version: Optional[str] = "",
+        masking_round: Optional[learner_pb2.MaskingRound] = None,
+        timer: Optional[PhaseTimer] = None
+    ) -> service_common_pb2.Ack:
+        """Schedules a training task and acknowledges the request.
+            The weights are handed over to and back from the training worker
+            through shared memory; only their descriptors are pickled.
+            The trained weights are sent back with the codec of the received model,
+            hence the codec of the federation is set by the Controller alone.
+            If the received model is versioned, the trained weights are sent back
+            as a delta from it. If the task is part of a masking round,
+            the trained weights are masked for the round. The phases of the task
+            are timed with the timer and reported to the Controller along with it."""
+
+        timer = timer or PhaseTimer()
+        with timer.phase("handover"):
+            shared_weights = share_weights(weights)
 
         self._task_manager.run_task(
-            task_fn=try_call_train,
+            task_fn=try_call_train_shared,
             task_kwargs={
                 'learner': self._learner,
-                'model': model_dict,
+                'weights': shared_weights,
                 'params': params_dict,
             },
-            callback=self._client.train_done,
+            callback=self._train_done_callback(
+                task_id, codec, version, masking_round, timer),
+            timer=timer,
+            phase="train",
+            # Normally already released by the worker, unless the task is cancelled or fails.
+            cleanup=lambda: release_shared_weights(shared_weights),
         )
 
         return service_common_pb2.Ack(
@@ -219,17 +641,333 @@ class LearnerServer(learner_pb2_grpc.LearnerServiceServicer):
             timestamp=Timestamp().GetCurrentTime(),
         )
 
-    def ShutDown(self) -> service_common_pb2.Ack:
+    def _train_done_callback(
+        self,
+        task_id: str,
+        codec: Optional[int] = None,
+        version: Optional[str] = "",
+        masking_round: Optional[learner_pb2.MaskingRound] = None,
+        timer: Optional[PhaseTimer] = None
+    ):
+        """Returns the callback that sends the trained weights of the task to the Controller."""
+
+        timer = timer or PhaseTimer()
+
+        def callback(result):
+            trained_weights, metrics, metadata = result
+            with timer.phase("handover"):
+                weights = load_shared_weights(trained_weights)
+                release_shared_weights(trained_weights)
+
+            if masking_round is not None:
+                # Weighed by the number of completed batches, unless the Controller sets the weight.
+                weight = masking_round.weight or float(metadata.get("completed_batches", 0))
+                try:
+                    self._pairwise_masking.set_active_round(masking_round.round_id, weight)
+                except ValueError as error:
+                    MetisLogger.error("Cannot mask the model of task {}: {}".format(task_id, error))
+                    return
+
+            base = self._model_versions.get(version) if version else None
+            if self._upload_queue is not None:
+                self._queue_train_done(
+                    task_id, weights, metrics, metadata, codec, version, base, timer)
+                return
+            if base is None:
+                with timer.phase("compress"):
+                    compressed = self._quantize(weights)
+                self._client.train_done(
+                    task_id=task_id,
+                    weights=compressed,
+                    metrics=metrics,
+                    metadata=metadata,
+                    codec=codec,
+                    timer=timer,
+                )
+                return
+
+            try:
+                with timer.phase("compress"):
+                    compressed = self._compress_delta(subtract_weights(weights, base))
+                response = self._client.train_done(
+                    task_id=task_id,
+                    weights=compressed,
+                    metrics=metrics,
+                    metadata=metadata,
+                    codec=codec,
+                    base_version=version,
+                    timer=timer,
+                )
+                if response is not None and response.status:
+                    return
+            except ValueError as error:
+                MetisLogger.warning("Cannot send a delta: {}".format(error))
+            # E.g., the Controller no longer holds the base model. The full model is sent
+            # uncompressed and the residuals of the lost delta are dropped.
+            MetisLogger.warning(
+                "Delta of task {} was not accepted, sending the full model".format(task_id))
+            self._reset_compression()
+            self._client.train_done(
+                task_id=task_id,
+                weights=weights,
+                metrics=metrics,
+                metadata=metadata,
+                codec=codec,
+                timer=timer,
+            )
+
+        return callback
+
+    def _queue_train_done(
+        self,
+        task_id: str,
+        weights: List[np.ndarray],
+        metrics: Dict[str, Any],
+        metadata: Dict[str, str],
+        codec: Optional[int] = None,
+        version: Optional[str] = "",
+        base: Optional[List[np.ndarray]] = None,
+        timer: Optional[PhaseTimer] = None
+    ) -> None:
+        """Queues the trained weights of the task for upload. If the weights are sent as a delta
+            and the Controller refuses it, the full model is sent instead."""
+
+        timer = timer or PhaseTimer()
+
+        def _full_request():
+            return self._client.train_done_request(
+                task_id=task_id,
+                weights=weights,
+                metrics=metrics,
+                metadata=metadata,
+                codec=codec,
+                timer=timer,
+            )
+
+        if base is None:
+            with timer.phase("compress"):
+                compressed = self._quantize(weights)
+            self._upload_queue.put(self._client.train_done_request(
+                task_id=task_id,
+                weights=compressed,
+                metrics=metrics,
+                metadata=metadata,
+                codec=codec,
+                timer=timer,
+            ))
+            return
+
+        try:
+            with timer.phase("compress"):
+                compressed = self._compress_delta(subtract_weights(weights, base))
+            request = self._client.train_done_request(
+                task_id=task_id,
+                weights=compressed,
+                metrics=metrics,
+                metadata=metadata,
+                codec=codec,
+                base_version=version,
+                timer=timer,
+            )
+        except ValueError as error:
+            MetisLogger.warning("Cannot send a delta: {}".format(error))
+            self._reset_compression()
+            self._upload_queue.put(_full_request())
+            return
+        # The full model is encoded only if it is needed.
+        self._upload_queue.put(
+            request,
+            fallback=lambda: _full_request().model,
+            on_fallback=self._reset_compression,
+        )
+
+    def _reset_compression(self) -> None:
+        """Drops the residuals of the update quantizer and sparsifier, e.g., if a delta is lost."""
+
+        if self._update_quantizer is not None:
+            self._update_quantizer.reset()
+        if self._update_sparsifier is not None:
+            self._update_sparsifier.reset()
+
+    def _quantize(self, weights: List[np.ndarray]) -> List[Union[np.ndarray, QuantizedWeight]]:
+        """Quantizes the weights sent to the Controller, if an update quantizer is used."""
+
+        if self._update_quantizer is None:
+            return weights
+        return self._update_quantizer.quantize(weights)
+
+    def _compress_delta(
+        self,
+        delta: List[np.ndarray]
+    ) -> List[Union[np.ndarray, QuantizedWeight, SparseWeight]]:
+        """Sparsifies and/or quantizes the delta sent to the Controller."""
+
+        if self._update_sparsifier is None:
+            return self._quantize(delta)
+        return self._update_sparsifier.sparsify(delta, quantizer=self._update_quantizer)
+
+    def _hold_model(self, weights: List[np.ndarray]) -> str:
+        """Holds on to a copy of the model sent to the Driver and returns its version, such that
+            the model can be sent back as a reference, e.g., as the initial model of the federation."""
+
+        version = content_version(weights)
+        self._model_versions.put(version, _held_copy(weights))
+        return version
+
+    def _resolve_model(
+        self,
+        weights: List[np.ndarray],
+        version: str,
+        base_version: str,
+        reference: Optional[bool] = False,
+        acknowledged: Optional[bool] = False
+    ) -> Optional[List[np.ndarray]]:
+        """Reconstructs a model that is sent as a delta from the base model it is a delta from,
+            or as a reference to a held model, and holds on to a copy of the model, if it is
+            versioned. The model of a training task is acknowledged to the Controller, which sends
+            the next deltas and references against it, hence it is held until the next one is.
+            Returns None if the base model or the referred model is not held."""
+
+        if reference:
+            held = self._model_versions.get(version)
+            if held is None:
+                MetisLogger.warning(
+                    "Received a reference to model version {}, which is not held".format(version))
+                return None
+            if acknowledged:
+                self._model_versions.put(version, held, acknowledged=True)
+            # The Learner may modify the weights it is given, e.g., train them in place.
+            return [np.array(weight) for weight in held]
+        if base_version:
+            base = self._model_versions.get(base_version)
+            if base is None:
+                MetisLogger.warning(
+                    "Received a delta from model version {}, which is not held".format(base_version))
+                return None
+            weights = add_weights(weights, base)
+        if version:
+            self._model_versions.put(version, _held_copy(weights), acknowledged=acknowledged)
+        return weights
+
+    def RecoverMasks(
+        self,
+        request: learner_pb2.RecoverMasksRequest,
+        context: Any
+    ) -> Iterator[model_pb2.ModelChunk]:
+        """Streams the correction of the masks the learner shares with the learners that dropped
+            out of the round, which the Controller sums along with the masked models of the round,
+            and the shares of the seeds of the self masks of the learners that survived the round.
+
+        Parameters
+        ----------
+        request : learner_pb2.RecoverMasksRequest
+            The request containing the round, the learners that dropped out of it and the
+            encrypted shares of the learners that survived it.
+        context : Any
+            The gRPC context of the request.
+
+        Yields
+        ------
+        model_pb2.ModelChunk
+            The chunks of the correction, a model with a single tensor, or without tensors
+            if no learner dropped out of the round.
+        """
+        if not self._is_serving(context):
+            return
+        if self._pairwise_masking is None:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details("Learner does not mask its models")
+            return
+
+        try:
+            correction, shares = self._pairwise_masking.recover(
+                request.round_id,
+                list(request.learner_ids),
+                {share.learner_id: share.share for share in request.shares},
+            )
+        except ValueError as error:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(str(error))
+            return
+
+        masking = model_pb2.Masking(
+            round_id=request.round_id,
+            fraction_bits=self._pairwise_masking.fraction_bits,
+            weight=int(correction[0]),
+            correction=True,
+            shares=[model_pb2.MaskingShare(learner_id=learner_id, share=share)
+                    for learner_id, share in shares.items()],
+        )
+        if not request.learner_ids:
+            # Nothing is corrected, hence only the shares are sent.
+            yield model_pb2.ModelChunk(encrypted=True, masking=masking)
+            return
+
+        values = correction[1:].astype("<u8")
+        yield from tensor_to_chunks(
+            tensor_index=0,
+            tensor_spec=model_pb2.Tensor(
+                length=values.size,
+                dimensions=[values.size],
+                type=numpy_dtype_to_proto(values.dtype),
+            ),
+            value=values.view(np.uint8),
+            encrypted=True,
+            masking=masking,
+        )
+
+    def _register_round(self, masking_round: Optional[learner_pb2.MaskingRound]) -> bool:
+        """Registers the masking round of a training task, if any. Returns False
+            if the round cannot be registered, hence the task must be refused."""
+
+        if masking_round is None:
+            return True
+        if self._pairwise_masking is None:
+            MetisLogger.error(
+                "Received masking round {}, but the learner does not mask its models".format(
+                    masking_round.round_id))
+            return False
+        try:
+            self._pairwise_masking.register_round(
+                masking_round.round_id,
+                {peer.learner_id: peer.public_key for peer in masking_round.peers},
+                threshold=masking_round.threshold or None,
+            )
+        except ValueError as error:
+            MetisLogger.error("Cannot register masking round {}: {}".format(
+                masking_round.round_id, error))
+            return False
+        return True
+
+    def ShutDown(
+        self,
+        _: Optional[service_common_pb2.Empty] = None,
+        context: Optional[Any] = None
+    ) -> service_common_pb2.Ack:
         """Shuts down the server."""
 
-        self._status = service_common_pb2.ServingStatus.NOT_SERVING
-        self._shutdown_event.set()
+        self.stop()
 
         return service_common_pb2.Ack(
             status=True,
             timestamp=Timestamp().GetCurrentTime(),
         )
 
+    def invalidate_evaluation_cache(self) -> None:
+        """Drops the metrics of the evaluated models, e.g., after the local dataset is changed, both
+            from the cache of this process and from that of the evaluation worker."""
+
+        if self._evaluation_cache is not None:
+            self._evaluation_cache.invalidate()
+        if self._evaluation_executor is not None:
+            self._evaluation_executor.invalidate_cache()
+
+    def stop(self) -> None:
+        """Stops serving, such that start returns. Safe to call from any thread and from signal handlers."""
+
+        self._status = service_common_pb2.ServingStatus.NOT_SERVING
+        self._shutdown_event.set()
+
     def _is_serving(self, context) -> bool:
         """Returns True if the server is serving, False otherwise."""
 
@@ -1,20 +1,204 @@
-
 """This module contains the MessageHelper class of the learner,
     which is used to convert the weights of the model to a Proto object and vice versa."""
 
-from typing import List, Optional
+import sys
+from concurrent import futures
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
+from ..common.chunking import DEFAULT_CHUNK_SIZE, tensor_to_chunks, validate_chunk
+from ..common.codec import decode_value, encode_value, map_in_order, submit
+from ..common.timing import PhaseTimer, optional_phase
+from ..encryption.policy import EncryptionPolicy
 from ..encryption.scheme import EncryptionScheme
 from ..proto import model_pb2
+from .quantization import QuantizedWeight, dequantize_value, quantized_size
+from .sparsification import SparseWeight, decode_indices
+
+try:
+    # bfloat16 is not a native numpy type; it is provided by
+    # ml_dtypes, which ships along with recent TensorFlow/JAX versions.
+    from ml_dtypes import bfloat16
+except ImportError:
+    bfloat16 = None
+
+NUMPY_DTYPE_TO_PROTO_LOOKUP = {
+    "float64": model_pb2.DType.Type.FLOAT64,
+    "float32": model_pb2.DType.Type.FLOAT32,
+    "float16": model_pb2.DType.Type.FLOAT16,
+    "bfloat16": model_pb2.DType.Type.BFLOAT16,
+    "int8": model_pb2.DType.Type.INT8,
+    "int16": model_pb2.DType.Type.INT16,
+    "int32": model_pb2.DType.Type.INT32,
+    "int64": model_pb2.DType.Type.INT64,
+    "uint8": model_pb2.DType.Type.UINT8,
+    "uint16": model_pb2.DType.Type.UINT16,
+    "uint32": model_pb2.DType.Type.UINT32,
+    "uint64": model_pb2.DType.Type.UINT64,
+}
+
+INV_NUMPY_DTYPE_TO_PROTO_LOOKUP = {
+    v: k for k, v in NUMPY_DTYPE_TO_PROTO_LOOKUP.items()
+}
+
+# Alignment (in bytes) of every tensor inside the
+# deserialization buffer; matches a cache line.
+TENSOR_BUFFER_ALIGNMENT = 64
+
+
+def numpy_dtype_to_proto(dtype: np.dtype) -> model_pb2.DType:
+    """Converts a numpy data type to a DType Proto object.
+
+    Parameters
+    ----------
+    dtype : np.dtype
+        The numpy data type.
+
+    Returns
+    -------
+    model_pb2.DType
+        The DType Proto object. Values are always serialized in little-endian order.
+
+    Raises
+    ------
+    TypeError
+        If the data type is not supported.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.name not in NUMPY_DTYPE_TO_PROTO_LOOKUP:
+        raise TypeError("Data type {} is not supported".format(dtype.name))
+
+    return model_pb2.DType(
+        type=NUMPY_DTYPE_TO_PROTO_LOOKUP[dtype.name],
+        byte_order=model_pb2.DType.ByteOrder.LITTLE_ENDIAN_ORDER,
+        fortran_order=False,
+    )
+
+
+def proto_to_numpy_dtype(dtype: model_pb2.DType) -> np.dtype:
+    """Converts a DType Proto object to a numpy data type.
+
+    Parameters
+    ----------
+    dtype : model_pb2.DType
+        The DType Proto object.
+
+    Returns
+    -------
+    np.dtype
+        The numpy data type, in the byte order of the Proto object.
+
+    Raises
+    ------
+    TypeError
+        If the data type is bfloat16 and ml_dtypes is not installed.
+    """
+    name = INV_NUMPY_DTYPE_TO_PROTO_LOOKUP[dtype.type]
+    if name == "bfloat16":
+        if bfloat16 is None:
+            raise TypeError(
+                "Received a bfloat16 tensor but ml_dtypes is not installed")
+        np_dtype = np.dtype(bfloat16)
+    else:
+        np_dtype = np.dtype(name)
+
+    if dtype.byte_order == model_pb2.DType.ByteOrder.BIG_ENDIAN_ORDER:
+        return np_dtype.newbyteorder(">")
+    return np_dtype.newbyteorder("<")
+
+
+def _aligned(offset: int) -> int:
+    """Rounds the offset up to the next multiple of TENSOR_BUFFER_ALIGNMENT."""
+    return -(-offset // TENSOR_BUFFER_ALIGNMENT) * TENSOR_BUFFER_ALIGNMENT
+
+
+def _to_little_endian(weight: np.ndarray) -> np.ndarray:
+    """Returns the array in little-endian byte order, which is the order used on the wire."""
+    if weight.dtype.byteorder == ">" or \
+            (weight.dtype.byteorder == "=" and sys.byteorder == "big"):
+        return weight.astype(weight.dtype.newbyteorder("<"))
+    return weight
+
+
+def _prepare_weight(
+    weight: Union[np.ndarray, QuantizedWeight, SparseWeight]
+) -> Union[np.ndarray, QuantizedWeight, SparseWeight]:
+    """Returns the weight ready to be serialized; quantized weights are already bytes."""
+    if isinstance(weight, SparseWeight):
+        return weight._replace(values=_prepare_weight(weight.values))
+    if isinstance(weight, QuantizedWeight):
+        return weight
+    return _to_little_endian(np.asarray(weight))
+
+
+def _tensor_spec(
+    weight: Union[np.ndarray, QuantizedWeight, SparseWeight],
+    codec: int
+) -> model_pb2.Tensor:
+    """Returns the Tensor Proto object of the weight, without its value."""
+    if isinstance(weight, SparseWeight):
+        tensor = _tensor_spec(weight.values, codec)
+        tensor.length = int(np.prod(weight.shape))
+        tensor.dimensions[:] = weight.shape
+        tensor.type.CopyFrom(numpy_dtype_to_proto(weight.dtype))
+        tensor.sparsity.CopyFrom(model_pb2.Sparsity(
+            encoding=weight.encoding,
+            num_values=len(weight.values.values) if isinstance(
+                weight.values, QuantizedWeight) else weight.values.size,
+            indices=weight.indices,
+        ))
+        return tensor
+    if isinstance(weight, QuantizedWeight):
+        return model_pb2.Tensor(
+            length=int(np.prod(weight.shape)),
+            dimensions=weight.shape,
+            type=numpy_dtype_to_proto(weight.dtype),
+            codec=codec,
+            quantization=model_pb2.Quantization(
+                type=weight.quantization,
+                block_size=weight.block_size,
+                scales=weight.scales.tolist(),
+            ),
+        )
+    return model_pb2.Tensor(
+        length=weight.size,
+        dimensions=weight.shape,
+        type=numpy_dtype_to_proto(weight.dtype),
+        codec=codec,
+    )
+
+
+def _pack_weights(weights: List[np.ndarray]) -> np.ndarray:
+    """Returns the values of all the weights, concatenated in order, as doubles."""
+    return np.concatenate([np.asarray(weight, dtype=np.float64).reshape(-1) for weight in weights])
+
+
+def _is_compressed(tensor: model_pb2.Tensor) -> bool:
+    """Returns whether the tensor is quantized and/or sparse."""
+    return tensor.quantization.type != model_pb2.Quantization.Type.NONE or \
+        tensor.HasField("sparsity")
+
+
+def _weight_value(
+    weight: Union[np.ndarray, QuantizedWeight, SparseWeight]
+) -> Tuple[np.ndarray, int]:
+    """Returns the bytes of the (little-endian) weight, without a copy, and the size of its items."""
+    if isinstance(weight, SparseWeight):
+        return _weight_value(weight.values)
+    if isinstance(weight, QuantizedWeight):
+        return weight.values, 1
+    return np.ascontiguousarray(weight).reshape(-1).view(np.uint8), weight.dtype.itemsize
 
 
 class MessageHelper:
 
     def __init__(
         self,
-        scheme: Optional[EncryptionScheme] = None
+        scheme: Optional[EncryptionScheme] = None,
+        codec: Optional[int] = model_pb2.Codec.Type.NONE,
+        pack_tensors: Optional[bool] = True,
+        encryption_policy: Optional[EncryptionPolicy] = None
     ) -> None:
         """Initializes the MessageHelper object.
 
@@ -22,45 +206,295 @@ class MessageHelper:
         ----------
         scheme : Optional[EncryptionScheme], optional
             The encryption scheme to be used, by default None (no encryption).
+        codec : Optional[int], (default=model_pb2.Codec.Type.NONE)
+            The default Codec.Type the plaintext tensors are encoded with.
+            Tensors are always decoded with the codec recorded in them.
+        pack_tensors : Optional[bool], (default=True)
+            Whether to encrypt all the tensors of a model together, packed into as few ciphertexts
+            as possible, such that small tensors do not take up a ciphertext each. If False, every
+            tensor is encrypted on its own. Models are always decrypted as they were encrypted.
+        encryption_policy : Optional[EncryptionPolicy], (default=None)
+            The policy that selects the tensors to be encrypted with the scheme; the others are
+            sent in plaintext. If None, all the tensors are encrypted.
         """
         self.scheme = scheme
+        self.codec = codec
+        self.pack_tensors = pack_tensors
+        self.encryption_policy = encryption_policy
 
-    def weights_to_model_proto(self, weights: List[np.ndarray]) -> model_pb2.Model:
+    def weights_to_model_proto(
+        self,
+        weights: List[np.ndarray],
+        codec: Optional[int] = None,
+        base_version: Optional[str] = "",
+        version: Optional[str] = "",
+        timer: Optional[PhaseTimer] = None
+    ) -> model_pb2.Model:
         """Converts the weights of the model to a Proto object.
+            The data type of each weight is preserved and recorded in the tensor.
+            Every plaintext weight is copied from the array (in C order) into a bytes object,
+            without an intermediate flattened copy, which the C++ protobuf runtime copies again
+            into the tensor; a protobuf bytes field cannot be set from a buffer without a copy.
+            If a codec is used, the weights are encoded in parallel, one per thread.
 
         Parameters
         ----------
         weights : List[np.ndarray]
             The weights of the model.
+        codec : Optional[int], (default=None)
+            The Codec.Type to encode the plaintext tensors with. If None, the default codec.
+        base_version : Optional[str], (default="")
+            If the weights are a delta, the version of the model they are a delta from.
+        version : Optional[str], (default="")
+            The version of the model, if any.
+        timer : Optional[PhaseTimer], (default=None)
+            If given, times the encryption of the weights as the "encrypt" phase.
 
         Returns
         -------
         model_pb2.Model
             The Proto object with the model.
         """
+        codec = self._get_codec(codec)
+        encrypted = self._select_encrypted(weights)
+        weights = self._prepare_weights(weights, encrypted)
 
-        model = model_pb2.Model()
-        for weight in weights:
+        # Models whose tensors are encrypted selectively flag every encrypted tensor.
+        model = model_pb2.Model(version=version, base_version=base_version)
+        model.encrypted = len(weights) > 0 and all(encrypted)
+        for weight, is_encrypted in zip(weights, encrypted):
             tensor = model.tensors.add()
-            tensor.length = weight.size
-            tensor.dimensions.extend(weight.shape)
+            tensor.CopyFrom(_tensor_spec(weight, model_pb2.Codec.Type.NONE))
 
-            if self.scheme is not None:
-                model.encrypted = True
-                tensor.value = self.scheme.encrypt(weight.flatten())
-            else:
-                model.encrypted = False
-                tensor.value = weight.flatten().tobytes()
+            if is_encrypted:
+                tensor.encrypted = not model.encrypted
+            elif codec == model_pb2.Codec.Type.NONE:
+                tensor.value = _weight_value(weight)[0].tobytes()
+
+        encrypted_tensors = [tensor for tensor, is_encrypted in zip(model.tensors, encrypted)
+                             if is_encrypted]
+        encrypted_weights = [weight for weight, is_encrypted in zip(weights, encrypted)
+                             if is_encrypted]
+        with optional_phase(timer if encrypted_weights else None, "encrypt"):
+            if encrypted_weights and self.pack_tensors:
+                model.packed = True
+                encrypted_tensors[0].value = self.scheme.encrypt(_pack_weights(encrypted_weights))
+            elif encrypted_weights:
+                # All the tensors are encrypted in a single call, hence in parallel.
+                values = self.scheme.encrypt_many(
+                    [weight.flatten() for weight in encrypted_weights])
+                for tensor, value in zip(encrypted_tensors, values):
+                    tensor.value = value
+
+        masking = self.scheme.masking() if self.scheme is not None else None
+        if masking is not None:
+            model.masking.CopyFrom(masking)
+
+        plaintext = [(tensor, weight) for tensor, weight, is_encrypted
+                     in zip(model.tensors, weights, encrypted) if not is_encrypted]
+        if plaintext and codec != model_pb2.Codec.Type.NONE:
+            values = map_in_order(
+                lambda weight: self._encode_weight(weight, codec),
+                [weight for _, weight in plaintext])
+            for (tensor, _), value in zip(plaintext, values):
+                tensor.codec = codec
+                tensor.value = value
 
         return model
 
-    def model_proto_to_weights(self, model: model_pb2.Model) -> List[np.ndarray]:
+    def weights_to_model_chunks(
+        self,
+        weights: List[np.ndarray],
+        chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+        codec: Optional[int] = None,
+        base_version: Optional[str] = "",
+        version: Optional[str] = ""
+    ) -> Iterator[model_pb2.ModelChunk]:
+        """Converts the weights of the model to a stream of ModelChunk Proto objects.
+            The chunks are produced lazily, one at a time, hence the model is never
+            serialized as a whole and serialization overlaps with the transfer.
+            If a codec is used, the next few weights are encoded in parallel
+            while the chunks of the current one are sent.
+
+        Parameters
+        ----------
+        weights : List[np.ndarray]
+            The weights of the model.
+        chunk_size : Optional[int], (default=DEFAULT_CHUNK_SIZE)
+            The maximum number of value bytes per chunk.
+        codec : Optional[int], (default=None)
+            The Codec.Type to encode the plaintext tensors with. If None, the default codec.
+        base_version : Optional[str], (default="")
+            If the weights are a delta, the version of the model they are a delta from.
+        version : Optional[str], (default="")
+            The version of the model, if any.
+
+        Yields
+        ------
+        model_pb2.ModelChunk
+            The chunks of the model, in order.
+        """
+        codec = self._get_codec(codec)
+        encrypted = self._select_encrypted(weights)
+        weights = self._prepare_weights(weights, encrypted)
+        fully_encrypted = len(weights) > 0 and all(encrypted)
+
+        encrypted_weights = [weight for weight, is_encrypted in zip(weights, encrypted)
+                             if is_encrypted]
+        packed = self.pack_tensors and len(encrypted_weights) > 0
+        if packed:
+            # All the tensors are encrypted at once, into the value of the first encrypted tensor.
+            ciphertexts = iter([self.scheme.encrypt(_pack_weights(encrypted_weights))] +
+                               [b""] * (len(encrypted_weights) - 1))
+        else:
+            # All the tensors are encrypted in a single call, hence in parallel.
+            ciphertexts = iter(self.scheme.encrypt_many(
+                [weight.flatten() for weight in encrypted_weights]) if encrypted_weights else [])
+        plaintext_weights = [weight for weight, is_encrypted in zip(weights, encrypted)
+                             if not is_encrypted]
+        encoded = None
+        if codec != model_pb2.Codec.Type.NONE and plaintext_weights:
+            encoded = map_in_order(
+                lambda weight: self._encode_weight(weight, codec), plaintext_weights)
+        # Masking schemes mask the model on encryption, hence it is known by now.
+        masking = self.scheme.masking() if self.scheme is not None else None
+
+        for index, (weight, is_encrypted) in enumerate(zip(weights, encrypted)):
+            if is_encrypted:
+                tensor_spec = _tensor_spec(weight, model_pb2.Codec.Type.NONE)
+                tensor_spec.encrypted = not fully_encrypted
+                value = next(ciphertexts)
+            elif encoded is not None:
+                tensor_spec = _tensor_spec(weight, codec)
+                value = next(encoded)
+            else:
+                tensor_spec = _tensor_spec(weight, model_pb2.Codec.Type.NONE)
+                value = _weight_value(weight)[0]
+
+            yield from tensor_to_chunks(
+                tensor_index=index,
+                tensor_spec=tensor_spec,
+                value=value,
+                encrypted=fully_encrypted,
+                chunk_size=chunk_size,
+                version=version,
+                base_version=base_version,
+                packed=packed,
+                masking=masking if index == 0 else None,
+            )
+
+    def model_chunks_to_weights(
+        self,
+        chunks: Iterable[model_pb2.ModelChunk],
+        timer: Optional[PhaseTimer] = None
+    ) -> List[np.ndarray]:
+        """Converts a stream of ModelChunk Proto objects to the weights of the model.
+            Every chunk is copied into its (writable) weight as soon as it arrives,
+            hence deserialization overlaps with the transfer. Encoded tensors are
+            decoded in a separate thread once all their chunks have arrived.
+
+        Parameters
+        ----------
+        chunks : Iterable[model_pb2.ModelChunk]
+            The chunks of the model, in order.
+        timer : Optional[PhaseTimer], (default=None)
+            If given, times the decryption of the weights as the "decrypt" phase.
+
+        Returns
+        -------
+        List[np.ndarray]
+            The weights of the model.
+
+        Raises
+        ------
+        ValueError
+            If the chunks are out of order or incomplete, or if the model
+            is encrypted but no encryption scheme was provided.
+        """
+
+        weights = []
+        spec, value, received, packed = None, None, 0, False
+        encrypted_tensors = []
+
+        def _finalize():
+            if received != len(value):
+                raise ValueError("Tensor {} is incomplete: received {} of {} bytes".format(
+                    len(weights), received, len(value)))
+            if isinstance(value, bytearray):
+                # Decrypted at once, in parallel, once all the encrypted tensors have arrived.
+                encrypted_tensors.append((len(weights), spec, bytes(value)))
+                weights.append(None)
+                return
+            dtype = proto_to_numpy_dtype(spec.type)
+            if spec.codec != model_pb2.Codec.Type.NONE or _is_compressed(spec):
+                # Decoded while the chunks of the next tensors arrive.
+                weights.append(submit(self._decode_tensor, spec, value))
+                return
+            if len(value) != spec.length * dtype.itemsize:
+                raise ValueError(
+                    "Tensor has {} bytes but {} values of type {} require {} bytes".format(
+                        len(value), spec.length, dtype.name, spec.length * dtype.itemsize))
+            else:
+                weight = value.view(dtype)
+            weights.append(weight.reshape(spec.dimensions))
+
+        for chunk in chunks:
+            if chunk.HasField("tensor_spec"):
+                if spec is not None:
+                    _finalize()
+                if chunk.tensor_index != len(weights):
+                    raise ValueError("Expected tensor {} but received tensor {}".format(
+                        len(weights), chunk.tensor_index))
+                is_encrypted = chunk.encrypted or chunk.tensor_spec.encrypted
+                if is_encrypted and self.scheme is None:
+                    raise ValueError(
+                        "Model is encrypted but no encryption scheme was provided")
+
+                spec, received, packed = chunk.tensor_spec, 0, chunk.packed
+                if is_encrypted:
+                    value = bytearray(chunk.value_size)
+                else:
+                    value = np.empty(chunk.value_size, dtype=np.uint8)
+
+            validate_chunk(chunk, len(weights) if spec is not None else -1,
+                           received, 0 if value is None else len(value))
+            memoryview(value)[received:received + len(chunk.data)] = chunk.data
+            received += len(chunk.data)
+
+        if spec is not None:
+            _finalize()
+
+        if encrypted_tensors:
+            specs = [spec for _, spec, _ in encrypted_tensors]
+            with optional_phase(timer, "decrypt"):
+                if packed:
+                    decrypted = self._decrypt_packed(encrypted_tensors[0][2], specs)
+                else:
+                    decrypted = self._decrypt_tensors(
+                        [value for _, _, value in encrypted_tensors], specs)
+            for (index, _, _), weight in zip(encrypted_tensors, decrypted):
+                weights[index] = weight
+
+        return [weight.result() if isinstance(weight, futures.Future) else weight
+                for weight in weights]
+
+    def model_proto_to_weights(
+        self,
+        model: model_pb2.Model,
+        timer: Optional[PhaseTimer] = None
+    ) -> List[np.ndarray]:
         """Converts the Proto object with the model to the weights of the model.
+            Each weight is restored with the data type recorded in its tensor.
+            All plaintext weights are views over a single, writable backing buffer
+            that is allocated once per model, hence the returned arrays can be
+            modified in place by the learner without any further copy.
 
         Parameters
         ----------
         model : model_pb2.Model
             The Proto object with the model.
+        timer : Optional[PhaseTimer], (default=None)
+            If given, times the decryption of the weights as the "decrypt" phase.
 
         Returns
         -------
@@ -68,27 +502,183 @@ class MessageHelper:
             The weights of the model.
         """
 
+        encrypted_tensors = [tensor for tensor in model.tensors if tensor.encrypted]
+        if (model.encrypted or encrypted_tensors) and self.scheme is None:
+            raise ValueError(
+                "Model is encrypted but no encryption scheme was provided")
         if model.encrypted:
-            if self.scheme is None:
-                raise ValueError(
-                    "Model is encrypted but no encryption scheme was provided")
+            with optional_phase(timer, "decrypt"):
+                return self._decrypt_model_proto(model, model.tensors)
+
+        encoded = []
+        encrypted_indices = []
 
+        dtypes = [proto_to_numpy_dtype(tensor.type) for tensor in model.tensors]
+        offsets, total_size = [], 0
+        for tensor, dtype in zip(model.tensors, dtypes):
+            offsets.append(total_size)
+            total_size = _aligned(total_size + tensor.length * dtype.itemsize)
+
+        buffer = bytearray(total_size)
+        buffer_view = memoryview(buffer)
         weights = []
-        for tensor in model.tensors:
-            if model.encrypted:
-                decrypted = self.scheme.decrypt(tensor.value, tensor.length)
-                weights.append(
-                    np.array(
-                        decrypted,
-                        dtype=np.float64
-                    ).reshape(tensor.dimensions)
-                )
+        compressed = []
+        for tensor, dtype, offset in zip(model.tensors, dtypes, offsets):
+            nbytes = tensor.length * dtype.itemsize
+            if tensor.encrypted:
+                # Decrypted at once, in parallel, then copied into the buffer.
+                encrypted_indices.append(len(weights))
+            elif _is_compressed(tensor):
+                compressed.append((tensor, len(weights)))
+            elif tensor.codec != model_pb2.Codec.Type.NONE:
+                # Decoded straight into the buffer, all tensors in parallel.
+                encoded.append((tensor, dtype, buffer_view[offset:offset + nbytes]))
+            elif len(tensor.value) != nbytes:
+                raise ValueError(
+                    "Tensor has {} bytes but {} values of type {} require {} bytes".format(
+                        len(tensor.value), tensor.length, dtype.name, nbytes))
             else:
-                weights.append(
-                    np.frombuffer(
-                        buffer=tensor.value,
-                        dtype=np.float64,
-                        count=tensor.length
-                    ).reshape(tensor.dimensions)
-                )
+                buffer_view[offset:offset + nbytes] = tensor.value
+            weights.append(
+                np.frombuffer(
+                    buffer=buffer,
+                    dtype=dtype,
+                    count=tensor.length,
+                    offset=offset
+                ).reshape(tensor.dimensions)
+            )
+
+        for _ in map_in_order(
+            lambda args: decode_value(
+                args[0].value, args[0].codec, args[2], args[1].itemsize),
+            encoded,
+            lookahead=len(encoded)
+        ):
+            pass
+
+        # Dequantized and/or scattered all in parallel, then copied into the buffer.
+        for (_, index), weight in zip(compressed, map_in_order(
+            lambda args: self._decode_tensor(args[0], args[0].value), compressed,
+            lookahead=len(compressed)
+        )):
+            weights[index][...] = weight
+
+        if encrypted_tensors:
+            with optional_phase(timer, "decrypt"):
+                decrypted = self._decrypt_model_proto(model, encrypted_tensors)
+            for index, weight in zip(encrypted_indices, decrypted):
+                weights[index][...] = weight
+
+        return weights
+
+    def _get_codec(self, codec: Optional[int]) -> int:
+        """Returns the given codec or, if None, the default codec."""
+        return self.codec if codec is None else codec
+
+    def _select_encrypted(
+        self,
+        weights: List[Union[np.ndarray, QuantizedWeight, SparseWeight]]
+    ) -> List[bool]:
+        """Returns whether every weight is to be encrypted, as selected by the policy."""
+        if self.scheme is None:
+            return [False] * len(weights)
+        if self.encryption_policy is None:
+            return [True] * len(weights)
+        return self.encryption_policy.select(weights)
+
+    def _prepare_weights(
+        self,
+        weights: List[Union[np.ndarray, QuantizedWeight, SparseWeight]],
+        encrypted: List[bool]
+    ) -> List[Union[np.ndarray, QuantizedWeight, SparseWeight]]:
+        weights = [_prepare_weight(weight) for weight in weights]
+        if any(isinstance(weight, (QuantizedWeight, SparseWeight)) and is_encrypted
+               for weight, is_encrypted in zip(weights, encrypted)):
+            raise ValueError("Quantized or sparse weights cannot be encrypted")
         return weights
+
+    def _encode_weight(
+        self,
+        weight: Union[np.ndarray, QuantizedWeight, SparseWeight],
+        codec: int
+    ) -> bytes:
+        """Encodes the (little-endian) weight with the codec."""
+        value, itemsize = _weight_value(weight)
+        return encode_value(value, codec, itemsize)
+
+    def _decode_tensor(self, spec: model_pb2.Tensor, value: np.ndarray) -> np.ndarray:
+        """Decodes, dequantizes and/or scatters the value of a tensor into a new weight."""
+        dtype = proto_to_numpy_dtype(spec.type)
+        if not spec.HasField("sparsity"):
+            return self._decode_values(spec, value, dtype, spec.length).reshape(spec.dimensions)
+
+        indices = decode_indices(spec.sparsity, spec.length)
+        weight = np.zeros(spec.length, dtype=dtype)
+        weight[indices] = self._decode_values(spec, value, dtype, spec.sparsity.num_values)
+        return weight.reshape(spec.dimensions)
+
+    def _decode_values(
+        self,
+        spec: model_pb2.Tensor,
+        value: np.ndarray,
+        dtype: np.dtype,
+        num_values: int
+    ) -> np.ndarray:
+        """Decodes and/or dequantizes the stored values of a tensor into a new, flat array."""
+        if spec.quantization.type != model_pb2.Quantization.Type.NONE:
+            if spec.codec != model_pb2.Codec.Type.NONE:
+                decoded = np.empty(quantized_size(num_values, spec.quantization.type),
+                                   dtype=np.uint8)
+                decode_value(value, spec.codec, decoded, 1)
+                value = decoded
+            return dequantize_value(value, spec, dtype)
+        values = np.empty(num_values, dtype=dtype)
+        if spec.codec != model_pb2.Codec.Type.NONE:
+            decode_value(value, spec.codec, values.view(np.uint8), dtype.itemsize)
+        elif len(value) != values.nbytes:
+            raise ValueError(
+                "Tensor has {} bytes but {} values of type {} require {} bytes".format(
+                    len(value), num_values, dtype.name, values.nbytes))
+        else:
+            values.view(np.uint8)[...] = np.frombuffer(value, dtype=np.uint8)
+        return values
+
+    def _decrypt_packed(
+        self,
+        value: bytes,
+        specs: List[model_pb2.Tensor]
+    ) -> List[np.ndarray]:
+        """Decrypts the packed tensors at once and splits them at their offsets."""
+        lengths = [spec.length for spec in specs]
+        decrypted = np.zeros(0, dtype=np.float64)
+        if sum(lengths) > 0:
+            decrypted = np.asarray(self.scheme.decrypt(value, sum(lengths)), dtype=np.float64)
+        return [
+            values.astype(proto_to_numpy_dtype(spec.type)).reshape(spec.dimensions)
+            for values, spec in zip(np.split(decrypted, np.cumsum(lengths)[:-1]), specs)
+        ]
+
+    def _decrypt_model_proto(
+        self,
+        model: model_pb2.Model,
+        tensors: List[model_pb2.Tensor]
+    ) -> List[np.ndarray]:
+        """Decrypts the encrypted tensors of the model, in order."""
+        if model.packed:
+            return self._decrypt_packed(tensors[0].value, tensors) if tensors else []
+        return self._decrypt_tensors([tensor.value for tensor in tensors], tensors)
+
+    def _decrypt_tensors(
+        self,
+        values: List[bytes],
+        specs: List[model_pb2.Tensor]
+    ) -> List[np.ndarray]:
+        """Decrypts the tensors in a single call, hence in parallel."""
+        decrypted = self.scheme.decrypt_many(values, [spec.length for spec in specs])
+        # The CKKS scheme operates on doubles, hence we
+        # cast the decrypted values back to the tensor's type.
+        return [
+            np.array(values, dtype=np.float64).astype(
+                proto_to_numpy_dtype(spec.type)).reshape(spec.dimensions)
+            for values, spec in zip(decrypted, specs)
+        ]
@@ -0,0 +1,161 @@
+"""This module delta-encodes the weights of a model against an earlier community model.
+    Differences are taken in the data type of every weight; integer weights wrap around,
+    hence their deltas are reversed exactly."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+# The number of models the Learner holds besides the community model it acknowledged last,
+# e.g., the models it sent back with GetModel and the ones it received to evaluate.
+DEFAULT_NUM_CACHED_VERSIONS = 2
+
+
+def content_version(weights: List[np.ndarray]) -> str:
+    """Returns the version of a model that identifies it by the hash of its weights,
+        i.e., of their data types, shapes and values.
+
+    Parameters
+    ----------
+    weights : List[np.ndarray]
+        The weights of the model.
+
+    Returns
+    -------
+    str
+        The version, as 16 hex digits.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for weight in weights:
+        weight = np.ascontiguousarray(weight)
+        digest.update("{}{}".format(weight.dtype.str, weight.shape).encode())
+        digest.update(memoryview(weight.reshape(-1).view(np.uint8)))
+    return digest.hexdigest()
+
+
+def subtract_weights(weights: List[np.ndarray], base: List[np.ndarray]) -> List[np.ndarray]:
+    """Returns the difference of the weights from the base weights.
+
+    Parameters
+    ----------
+    weights : List[np.ndarray]
+        The weights of the model.
+    base : List[np.ndarray]
+        The weights of the base model, with the same shapes and data types.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The delta of every weight, in the data type of the weight.
+
+    Raises
+    ------
+    ValueError
+        If the weights do not match the base weights.
+    """
+    _validate(weights, base)
+    with np.errstate(over="ignore"):
+        return [np.subtract(weight, base_weight, dtype=weight.dtype)
+                for weight, base_weight in zip(weights, base)]
+
+
+def add_weights(delta: List[np.ndarray], base: List[np.ndarray]) -> List[np.ndarray]:
+    """Adds the delta to the base weights, in place of the (writable) delta.
+
+    Parameters
+    ----------
+    delta : List[np.ndarray]
+        The delta of every weight; overwritten with the result.
+    base : List[np.ndarray]
+        The weights of the base model, with the same shapes and data types.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The weights of the model.
+
+    Raises
+    ------
+    ValueError
+        If the delta does not match the base weights.
+    """
+    _validate(delta, base)
+    with np.errstate(over="ignore"):
+        for delta_weight, base_weight in zip(delta, base):
+            np.add(delta_weight, base_weight, out=delta_weight)
+    return delta
+
+
+class ModelVersionCache(object):
+
+    """Holds the weights of the most recent versions of the community model. The version the
+        Learner acknowledged last, i.e., the one the Controller sends the next deltas and references
+        against, is held in a slot of its own, hence the other versions never evict it."""
+
+    def __init__(self, capacity: Optional[int] = DEFAULT_NUM_CACHED_VERSIONS):
+        """Initializes the ModelVersionCache object.
+
+        Parameters
+        ----------
+        capacity : Optional[int], (default=DEFAULT_NUM_CACHED_VERSIONS)
+            The number of versions to hold besides the acknowledged one. The least recently
+            inserted version is evicted first.
+        """
+        self._capacity = capacity
+        self._versions = OrderedDict()
+        self._acknowledged = None
+        self._lock = threading.Lock()
+
+    def put(
+        self,
+        version: str,
+        weights: List[np.ndarray],
+        acknowledged: Optional[bool] = False
+    ) -> None:
+        """Inserts the weights of a version. The weights must not be modified afterwards.
+
+        Parameters
+        ----------
+        version : str
+            The version of the weights.
+        weights : List[np.ndarray]
+            The weights of the model.
+        acknowledged : Optional[bool], (default=False)
+            Whether the version is acknowledged to the Controller, e.g., it is the model of a
+            training task. The version acknowledged before it is then held as any other version.
+        """
+        with self._lock:
+            if self._acknowledged is not None and self._acknowledged[0] == version:
+                return
+            if acknowledged:
+                self._versions.pop(version, None)
+                previous, self._acknowledged = self._acknowledged, (version, weights)
+                if previous is None:
+                    return
+                version, weights = previous
+            self._versions.pop(version, None)
+            self._versions[version] = weights
+            while len(self._versions) > self._capacity:
+                self._versions.popitem(last=False)
+
+    def get(self, version: str) -> Optional[List[np.ndarray]]:
+        """Returns the weights of the version, or None if the version is not held."""
+        with self._lock:
+            if self._acknowledged is not None and self._acknowledged[0] == version:
+                return self._acknowledged[1]
+            return self._versions.get(version)
+
+
+def _validate(weights: List[np.ndarray], base: List[np.ndarray]) -> None:
+    if len(weights) != len(base):
+        raise ValueError("Model has {} weights but the base model has {}".format(
+            len(weights), len(base)))
+    for index, (weight, base_weight) in enumerate(zip(weights, base)):
+        if weight.shape != base_weight.shape or weight.dtype != base_weight.dtype:
+            raise ValueError("Weight {} of shape {} and type {} does not match the base weight "
+                             "of shape {} and type {}".format(
+                                 index, weight.shape, weight.dtype.name,
+                                 base_weight.shape, base_weight.dtype.name))
@@ -0,0 +1,295 @@
+"""This module quantizes the weight updates a learner sends to the controller to 8 or 4 bits.
+    The values are quantized symmetrically, with one scale per tensor or per block of values,
+    optionally with stochastic rounding; the quantization error is fed back into the next update."""
+
+import threading
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from ..proto import model_pb2
+
+QUANTIZATION_BITS_TO_PROTO = {
+    8: model_pb2.Quantization.Type.INT8,
+    4: model_pb2.Quantization.Type.INT4,
+}
+
+# The largest magnitude of the quantized values, which are symmetric around zero.
+QUANTIZATION_LEVELS = {
+    model_pb2.Quantization.Type.INT8: 127,
+    model_pb2.Quantization.Type.INT4: 7,
+}
+
+
+class QuantizedWeight(NamedTuple):
+
+    """The quantized values of a weight, as sent in a Tensor Proto object."""
+
+    values: np.ndarray
+    """The quantized values, as bytes; two values per byte for INT4."""
+    scales: np.ndarray
+    """The float32 scale of every block."""
+    dtype: np.dtype
+    """The data type the values are restored to."""
+    shape: Tuple[int, ...]
+    """The shape of the weight."""
+    quantization: int
+    """The Quantization.Type."""
+    block_size: int
+    """The number of values per block; 0 means a single block."""
+
+
+def quantize_weight(
+    weight: np.ndarray,
+    quantization: int,
+    block_size: Optional[int] = 0,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[QuantizedWeight, np.ndarray]:
+    """Quantizes the values of a floating point weight.
+
+    Parameters
+    ----------
+    weight : np.ndarray
+        The weight.
+    quantization : int
+        The Quantization.Type.
+    block_size : Optional[int], (default=0)
+        The number of values that share a scale. If 0, all the values of the weight share a scale.
+    rng : Optional[np.random.Generator], (default=None)
+        If given, the values are rounded stochastically, i.e., up with a probability equal
+        to their fractional part, hence the quantization is unbiased. Otherwise, to the nearest.
+
+    Returns
+    -------
+    Tuple[QuantizedWeight, np.ndarray]
+        The quantized weight and its dequantized, float32 values.
+    """
+    levels = QUANTIZATION_LEVELS[quantization]
+    values = np.asarray(weight, dtype=np.float32).reshape(-1)
+    num_values = values.size
+    block_size = block_size or max(num_values, 1)
+    num_blocks = -(-num_values // block_size)
+
+    blocks = np.zeros((num_blocks, block_size), dtype=np.float32)
+    blocks.reshape(-1)[:num_values] = values
+    scales = np.abs(blocks).max(axis=1, initial=0) / levels
+    blocks /= np.where(scales > 0, scales, 1)[:, None]
+    if rng is not None:
+        blocks += rng.random(blocks.shape, dtype=np.float32)
+        np.floor(blocks, out=blocks)
+    else:
+        np.rint(blocks, out=blocks)
+    np.clip(blocks, -levels, levels, out=blocks)
+    quantized = blocks.astype(np.int8)
+
+    blocks[...] = quantized
+    blocks *= scales[:, None]
+    dequantized = blocks.reshape(-1)[:num_values].reshape(weight.shape)
+
+    quantized = quantized.reshape(-1)[:num_values]
+    if quantization == model_pb2.Quantization.Type.INT4:
+        quantized = _pack_nibbles(quantized)
+    return QuantizedWeight(
+        values=quantized.view(np.uint8),
+        scales=scales,
+        dtype=weight.dtype,
+        shape=weight.shape,
+        quantization=quantization,
+        block_size=0 if block_size >= num_values else block_size,
+    ), dequantized
+
+
+def dequantize_value(
+    value: np.ndarray,
+    tensor: model_pb2.Tensor,
+    dtype: np.dtype
+) -> np.ndarray:
+    """Restores the quantized values of a tensor.
+
+    Parameters
+    ----------
+    value : np.ndarray
+        The (decoded) value of the tensor, as bytes.
+    tensor : model_pb2.Tensor
+        The tensor spec, with its quantization and, if sparse, its sparsity.
+    dtype : np.dtype
+        The data type to restore the values to.
+
+    Returns
+    -------
+    np.ndarray
+        The flat, restored values.
+
+    Raises
+    ------
+    ValueError
+        If the value or the scales do not match the length of the tensor.
+    """
+    quantization = tensor.quantization
+    # Only the stored values of a sparse tensor are quantized.
+    num_values = tensor.sparsity.num_values if tensor.HasField("sparsity") else tensor.length
+    value = np.frombuffer(value, dtype=np.int8)
+    if len(value) != quantized_size(num_values, quantization.type):
+        raise ValueError("Quantized tensor has {} bytes but {} values require {} bytes".format(
+            len(value), num_values, quantized_size(num_values, quantization.type)))
+    if quantization.type == model_pb2.Quantization.Type.INT4:
+        value = _unpack_nibbles(value, num_values)
+
+    block_size = quantization.block_size or max(num_values, 1)
+    num_blocks = -(-num_values // block_size)
+    if len(quantization.scales) != num_blocks:
+        raise ValueError("Quantized tensor has {} scales but {} blocks".format(
+            len(quantization.scales), num_blocks))
+
+    scales = np.repeat(np.asarray(quantization.scales, dtype=np.float32), block_size)
+    return (value * scales[:num_values]).astype(dtype)
+
+
+def quantized_size(num_values: int, quantization: int) -> int:
+    """Returns the size in bytes of the quantized values."""
+    if quantization == model_pb2.Quantization.Type.INT4:
+        return (num_values + 1) // 2
+    return num_values
+
+
+class UpdateQuantizer(object):
+
+    """Quantizes the weight updates sent to the controller. If error feedback is enabled,
+        the quantization error of every weight is kept and added to the weight that is
+        sent next, hence the errors do not accumulate across rounds."""
+
+    def __init__(
+        self,
+        bits: Optional[int] = 8,
+        block_size: Optional[int] = None,
+        stochastic_rounding: Optional[bool] = True,
+        error_feedback: Optional[bool] = True,
+        seed: Optional[int] = None
+    ):
+        """Initializes the UpdateQuantizer object.
+
+        Parameters
+        ----------
+        bits : Optional[int], (default=8)
+            The number of bits per value. Must be one of the following: [8, 4].
+        block_size : Optional[int], (default=None)
+            The number of consecutive values that share a scale. If None, all the values of a weight share a scale.
+            Smaller blocks are more accurate, at the cost of one float32 scale per block.
+        stochastic_rounding : Optional[bool], (default=True)
+            Whether to round the values stochastically, which makes the quantization unbiased.
+        error_feedback : Optional[bool], (default=True)
+            Whether to carry the quantization error over to the next update.
+            Keeps a float32 residual of every weight in memory.
+        seed : Optional[int], (default=None)
+            The seed of the stochastic rounding.
+
+        Raises
+        ------
+        ValueError
+            If the number of bits or the block size are invalid.
+        """
+        if bits not in QUANTIZATION_BITS_TO_PROTO:
+            raise ValueError("Invalid number of quantization bits: {}".format(bits))
+        if block_size is not None and block_size <= 0:
+            raise ValueError("Block size must be positive")
+
+        self._quantization = QUANTIZATION_BITS_TO_PROTO[bits]
+        self._block_size = block_size or 0
+        self._rng = np.random.default_rng(seed) if stochastic_rounding else None
+        self._error_feedback = error_feedback
+        self._residuals = None
+        self._lock = threading.Lock()
+
+    @property
+    def quantization(self) -> int:
+        """The Quantization.Type of the quantized weights."""
+        return self._quantization
+
+    def quantize_values(self, values: np.ndarray) -> Tuple[QuantizedWeight, np.ndarray]:
+        """Quantizes floating point values without error feedback, e.g., the values
+            kept by the UpdateSparsifier, which feeds the error back on its own.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The finite values.
+
+        Returns
+        -------
+        Tuple[QuantizedWeight, np.ndarray]
+            The quantized values and their dequantized, float32 values.
+        """
+        with self._lock:
+            return quantize_weight(values, self._quantization, self._block_size, self._rng)
+
+    def quantize(
+        self,
+        weights: List[np.ndarray]
+    ) -> List[Union[np.ndarray, QuantizedWeight]]:
+        """Quantizes the floating point weights; the other weights are returned as they are.
+
+        Parameters
+        ----------
+        weights : List[np.ndarray]
+            The weights, typically the difference of the trained model from the community model.
+
+        Returns
+        -------
+        List[Union[np.ndarray, QuantizedWeight]]
+            The weights to send, in order.
+        """
+        with self._lock:
+            residuals = self._residuals
+            if residuals is None or len(residuals) != len(weights) or any(
+                    residual is not None and residual.shape != np.shape(weight)
+                    for weight, residual in zip(weights, residuals)):
+                residuals = [None] * len(weights)
+
+            quantized_weights = []
+            for index, weight in enumerate(weights):
+                weight = np.asarray(weight)
+                if not _is_float(weight.dtype):
+                    quantized_weights.append(weight)
+                    continue
+
+                target = weight.astype(np.float32)
+                if self._error_feedback and residuals[index] is not None:
+                    target += residuals[index]
+                if not np.all(np.isfinite(target)):
+                    # Sent as is; a single non-finite value would void the scale of its block.
+                    residuals[index] = None
+                    quantized_weights.append(weight)
+                    continue
+
+                quantized, dequantized = quantize_weight(
+                    target, self._quantization, self._block_size, self._rng)
+                quantized_weights.append(quantized._replace(dtype=weight.dtype))
+                if self._error_feedback:
+                    residuals[index] = np.subtract(target, dequantized, out=target)
+
+            self._residuals = residuals if self._error_feedback else None
+            return quantized_weights
+
+    def reset(self) -> None:
+        """Drops the quantization error, e.g., if the last update was not delivered."""
+        with self._lock:
+            self._residuals = None
+
+
+def _is_float(dtype: np.dtype) -> bool:
+    return dtype.kind == "f" or dtype.name == "bfloat16"
+
+
+def _pack_nibbles(values: np.ndarray) -> np.ndarray:
+    if len(values) % 2:
+        values = np.append(values, np.int8(0))
+    nibbles = values.view(np.uint8) & 0x0F
+    return nibbles[0::2] | (nibbles[1::2] << 4)
+
+
+def _unpack_nibbles(value: np.ndarray, num_values: int) -> np.ndarray:
+    nibbles = np.empty(2 * len(value), dtype=np.int8)
+    nibbles[0::2] = (value << 4).view(np.int8)
+    nibbles[1::2] = value
+    # Arithmetic shifts sign-extend the nibbles.
+    return (nibbles >> 4)[:num_values]
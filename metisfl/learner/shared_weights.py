@@ -0,0 +1,195 @@
+"""This module hands model weights over between the Learner server and its training and evaluation
+    workers through a shared memory file, so that only a small descriptor crosses the process boundary."""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .evaluation_cache import EvaluationCache
+from .learner import Learner, try_call_evaluate, try_call_train
+
+# tmpfs-backed on Linux, hence the file is never written to disk.
+SHARED_MEMORY_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Alignment (in bytes) of every weight inside the shared memory file.
+SHARED_WEIGHT_ALIGNMENT = 64
+
+
+@dataclass
+class SharedWeights(object):
+    """Descriptor of the weights of a model stored in a shared memory file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the shared memory file.
+    offsets : List[int]
+        The byte offset of every weight in the file.
+    shapes : List[Tuple[int, ...]]
+        The shape of every weight.
+    dtypes : List[str]
+        The numpy data type string of every weight.
+    """
+
+    path: str
+    offsets: List[int]
+    shapes: List[Tuple[int, ...]]
+    dtypes: List[str]
+
+
+def share_weights(weights: List[np.ndarray]) -> SharedWeights:
+    """Copies the weights into a new shared memory file.
+
+    Parameters
+    ----------
+    weights : List[np.ndarray]
+        The weights of the model.
+
+    Returns
+    -------
+    SharedWeights
+        The descriptor of the shared weights. The receiver is responsible
+        for calling release_shared_weights once it has loaded them.
+    """
+    weights = [np.asarray(weight) for weight in weights]
+
+    offsets, size = [], 0
+    for weight in weights:
+        offsets.append(size)
+        size += -(-weight.nbytes // SHARED_WEIGHT_ALIGNMENT) * \
+            SHARED_WEIGHT_ALIGNMENT
+
+    fd, path = tempfile.mkstemp(prefix="metisfl-weights-", dir=SHARED_MEMORY_DIR)
+    try:
+        # A memory map cannot be empty.
+        os.ftruncate(fd, max(size, 1))
+        buffer = np.memmap(path, dtype=np.uint8, mode="r+", shape=(max(size, 1),))
+        for weight, offset in zip(weights, offsets):
+            view = np.ndarray(weight.shape, dtype=weight.dtype,
+                              buffer=buffer, offset=offset)
+            np.copyto(view, weight)
+        buffer.flush()
+    except Exception:
+        os.unlink(path)
+        raise
+    finally:
+        os.close(fd)
+
+    return SharedWeights(
+        path=path,
+        offsets=offsets,
+        shapes=[weight.shape for weight in weights],
+        dtypes=[weight.dtype.str for weight in weights],
+    )
+
+
+def load_shared_weights(shared_weights: SharedWeights) -> List[np.ndarray]:
+    """Maps the weights of a shared memory file into the current process without copying them.
+
+    Parameters
+    ----------
+    shared_weights : SharedWeights
+        The descriptor of the shared weights.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The weights of the model. They are writable and copy-on-write, i.e.,
+        changes are private to the current process. The weights remain valid
+        after the shared memory file is released.
+    """
+    buffer = np.memmap(shared_weights.path, dtype=np.uint8, mode="c")
+    return [
+        np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+        for offset, shape, dtype in zip(
+            shared_weights.offsets, shared_weights.shapes, shared_weights.dtypes)
+    ]
+
+
+def release_shared_weights(shared_weights: SharedWeights) -> None:
+    """Removes the shared memory file. Memory maps of the file remain valid.
+
+    Parameters
+    ----------
+    shared_weights : SharedWeights
+        The descriptor of the shared weights.
+    """
+    try:
+        os.unlink(shared_weights.path)
+    except FileNotFoundError:
+        pass
+
+
+def try_call_train_shared(
+    learner: Learner,
+    weights: SharedWeights,
+    params: Dict[str, Any]
+) -> Tuple[SharedWeights, Dict[str, Any], Dict[str, Any]]:
+    """Calls try_call_train with weights that are handed over through shared memory, in both directions.
+
+    Parameters
+    ----------
+    learner : Learner
+        The Learner object to call the train method on.
+    weights : SharedWeights
+        The descriptor of the weights of the model to be trained. Released once loaded.
+    params : Dict[str, Any]
+        A dictionary of training parameters.
+
+    Returns
+    -------
+    Tuple[SharedWeights, Dict[str, Any], Dict[str, Any]]
+        The result of try_call_train, with the trained weights replaced by their shared memory descriptor.
+    """
+    incoming_weights = load_shared_weights(weights)
+    release_shared_weights(weights)
+
+    trained_weights, metrics, metadata = try_call_train(
+        learner=learner,
+        weights=incoming_weights,
+        params=params,
+    )
+
+    return share_weights(trained_weights), metrics, metadata
+
+
+def try_call_evaluate_shared(
+    learner: Learner,
+    weights: SharedWeights,
+    params: Dict[str, Any],
+    evaluation_cache: Optional[EvaluationCache] = None,
+    dataset_version: Optional[str] = None
+) -> Dict[str, Any]:
+    """Calls try_call_evaluate with weights that are handed over through shared memory.
+
+    Parameters
+    ----------
+    learner : Learner
+        The Learner object to call the evaluate method on.
+    weights : SharedWeights
+        The descriptor of the weights of the model to be evaluated. Released once loaded.
+    params : Dict[str, Any]
+        A dictionary of evaluation parameters.
+    evaluation_cache : Optional[EvaluationCache], (default=None)
+        If given, the cache of the metrics of the evaluated models.
+    dataset_version : Optional[str], (default=None)
+        The version of the local dataset. If None, it is queried from the learner.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The metrics computed during evaluation.
+    """
+    incoming_weights = load_shared_weights(weights)
+    release_shared_weights(weights)
+
+    return try_call_evaluate(
+        learner=learner,
+        weights=incoming_weights,
+        params=params,
+        cache=evaluation_cache,
+        dataset_version=dataset_version,
+    )
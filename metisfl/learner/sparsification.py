@@ -0,0 +1,263 @@
+"""This module sparsifies the weight updates a learner sends to the controller, i.e., keeps only
+    the values of the largest magnitude, and encodes the indices of the kept values compactly.
+    The values that are not sent are kept as a residual and added to the next update."""
+
+import threading
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from ..proto import model_pb2
+from .quantization import (QuantizedWeight, UpdateQuantizer, _is_float,
+                           quantized_size)
+
+
+class SparseWeight(NamedTuple):
+
+    """The values of a weight at a subset of its indices, as sent in a Tensor Proto object."""
+
+    values: Union[np.ndarray, QuantizedWeight]
+    """The stored values, flat; possibly quantized."""
+    encoding: int
+    """The Sparsity.Encoding of the indices."""
+    indices: bytes
+    """The encoded indices of the stored values."""
+    dtype: np.dtype
+    """The data type of the weight."""
+    shape: Tuple[int, ...]
+    """The shape of the weight."""
+
+
+def encode_indices(indices: np.ndarray, num_values: int) -> Tuple[int, bytes]:
+    """Encodes increasing indices with the smaller of the delta and the bitmap encodings.
+
+    Parameters
+    ----------
+    indices : np.ndarray
+        The increasing indices.
+    num_values : int
+        The number of values of the tensor.
+
+    Returns
+    -------
+    Tuple[int, bytes]
+        The Sparsity.Encoding and the encoded indices.
+    """
+    gaps = np.diff(np.asarray(indices, dtype=np.uint64), prepend=np.uint64(0))
+    # The number of 7-bit groups of every gap.
+    num_groups = np.ones(len(gaps), dtype=np.int64)
+    for shift in (7, 14, 21, 28):
+        num_groups += gaps >= (1 << shift)
+
+    if num_groups.sum() >= (num_values + 7) // 8:
+        bitmap = np.zeros(num_values, dtype=bool)
+        bitmap[indices] = True
+        return model_pb2.Sparsity.Encoding.BITMAP, np.packbits(bitmap, bitorder="little").tobytes()
+
+    groups = np.empty((len(gaps), 5), dtype=np.uint8)
+    for group in range(5):
+        groups[:, group] = ((gaps >> np.uint64(7 * group)) & np.uint64(0x7F)).astype(np.uint8)
+        groups[:, group] |= (num_groups > group + 1).astype(np.uint8) << 7
+    return model_pb2.Sparsity.Encoding.DELTA, \
+        groups[np.arange(5) < num_groups[:, None]].tobytes()
+
+
+def decode_indices(sparsity: model_pb2.Sparsity, num_values: int) -> np.ndarray:
+    """Decodes the indices of the values stored in a sparse tensor.
+
+    Parameters
+    ----------
+    sparsity : model_pb2.Sparsity
+        The sparsity of the tensor.
+    num_values : int
+        The number of values of the tensor.
+
+    Returns
+    -------
+    np.ndarray
+        The increasing indices.
+
+    Raises
+    ------
+    ValueError
+        If the indices are malformed or do not match the tensor.
+    """
+    encoded = np.frombuffer(sparsity.indices, dtype=np.uint8)
+    if sparsity.encoding == model_pb2.Sparsity.Encoding.BITMAP:
+        if len(encoded) != (num_values + 7) // 8:
+            raise ValueError("Bitmap of {} bytes does not match {} values".format(
+                len(encoded), num_values))
+        indices = np.flatnonzero(np.unpackbits(encoded, bitorder="little"))
+    elif sparsity.encoding == model_pb2.Sparsity.Encoding.DELTA and not len(encoded):
+        indices = np.zeros(0, dtype=np.uint64)
+    elif sparsity.encoding == model_pb2.Sparsity.Encoding.DELTA:
+        if encoded[-1] & 0x80:
+            raise ValueError("Sparse tensor indices are truncated")
+        ends = np.flatnonzero((encoded & 0x80) == 0)
+        starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.int64)
+        shifts = np.arange(len(encoded)) - np.repeat(starts, ends - starts + 1)
+        if shifts.max() > 4:
+            raise ValueError("Sparse tensor indices are malformed")
+        groups = (encoded & 0x7F).astype(np.uint64) << (7 * shifts).astype(np.uint64)
+        gaps = np.bitwise_or.reduceat(groups, starts)
+        if len(gaps) > 1 and not np.all(gaps[1:]):
+            raise ValueError("Sparse tensor indices are not increasing")
+        indices = np.cumsum(gaps)
+    else:
+        raise ValueError("Unsupported sparse tensor encoding: {}".format(sparsity.encoding))
+
+    if len(indices) != sparsity.num_values or (len(indices) and indices[-1] >= num_values):
+        raise ValueError("Sparse tensor indices do not match its {} stored values".format(
+            sparsity.num_values))
+    return indices.astype(np.int64)
+
+
+class UpdateSparsifier(object):
+
+    """Sparsifies the weight updates sent to the controller. Either the given ratio of the values
+        of every weight with the largest magnitude is kept (top-k), or the values whose magnitude
+        is at least the threshold. The values that are not sent are accumulated in a residual,
+        which is added to the next update, hence small updates are eventually sent too."""
+
+    def __init__(
+        self,
+        ratio: Optional[float] = None,
+        threshold: Optional[float] = None,
+        error_feedback: Optional[bool] = True
+    ):
+        """Initializes the UpdateSparsifier object.
+
+        Parameters
+        ----------
+        ratio : Optional[float], (default=None)
+            The ratio of the values of every weight to keep, in (0, 1].
+        threshold : Optional[float], (default=None)
+            The minimum magnitude of the values to keep.
+        error_feedback : Optional[bool], (default=True)
+            Whether to carry the values that are not sent over to the next update.
+            Keeps a float32 residual of every weight in memory.
+
+        Raises
+        ------
+        ValueError
+            If not exactly one of the ratio and the threshold is given, or if it is invalid.
+        """
+        if (ratio is None) == (threshold is None):
+            raise ValueError("Exactly one of the ratio and the threshold must be given")
+        if ratio is not None and not 0 < ratio <= 1:
+            raise ValueError("Ratio must be in (0, 1]: {}".format(ratio))
+        if threshold is not None and threshold < 0:
+            raise ValueError("Threshold must be non-negative: {}".format(threshold))
+
+        self._ratio = ratio
+        self._threshold = threshold
+        self._error_feedback = error_feedback
+        self._residuals = None
+        self._lock = threading.Lock()
+
+    def sparsify(
+        self,
+        weights: List[np.ndarray],
+        quantizer: Optional[UpdateQuantizer] = None
+    ) -> List[Union[np.ndarray, SparseWeight, QuantizedWeight]]:
+        """Sparsifies the floating point weights. A weight is sent dense if its sparse
+            encoding would not be smaller; the other weights are returned as they are.
+
+        Parameters
+        ----------
+        weights : List[np.ndarray]
+            The weights, typically the difference of the trained model from the community model.
+        quantizer : Optional[UpdateQuantizer], (default=None)
+            If given, quantizes the sent values. Its quantization error is then kept in
+            the residual of the sparsifier, in place of the error feedback of the quantizer.
+
+        Returns
+        -------
+        List[Union[np.ndarray, SparseWeight, QuantizedWeight]]
+            The weights to send, in order.
+        """
+        with self._lock:
+            residuals = self._residuals
+            if residuals is None or len(residuals) != len(weights) or any(
+                    residual is not None and residual.shape != np.shape(weight)
+                    for weight, residual in zip(weights, residuals)):
+                residuals = [None] * len(weights)
+
+            sent_weights = []
+            for index, weight in enumerate(weights):
+                weight = np.asarray(weight)
+                if not _is_float(weight.dtype):
+                    sent_weights.append(weight)
+                    continue
+
+                target = weight.astype(np.float32).reshape(-1)
+                if self._error_feedback and residuals[index] is not None:
+                    target += residuals[index].reshape(-1)
+                if not np.all(np.isfinite(target)):
+                    # Sent as is; non-finite values must reach the controller in full.
+                    residuals[index] = None
+                    sent_weights.append(weight)
+                    continue
+                sent_weight, sent_values = self._sparsify_weight(target, weight, quantizer)
+                sent_weights.append(sent_weight)
+
+                if self._error_feedback:
+                    # The residual is what was not sent; sent_values are the restored sent values.
+                    target -= sent_values
+                    residuals[index] = target.reshape(weight.shape)
+
+            self._residuals = residuals if self._error_feedback else None
+            return sent_weights
+
+    def reset(self) -> None:
+        """Drops the residual, e.g., if the last update was not delivered."""
+        with self._lock:
+            self._residuals = None
+
+    def _sparsify_weight(
+        self,
+        target: np.ndarray,
+        weight: np.ndarray,
+        quantizer: Optional[UpdateQuantizer]
+    ) -> Tuple[Union[np.ndarray, SparseWeight, QuantizedWeight], np.ndarray]:
+        """Returns the weight to send and the dense values the controller restores from it."""
+        num_values = target.size
+        magnitudes = np.abs(target)
+        if self._ratio is not None:
+            num_kept = min(num_values, int(np.ceil(self._ratio * num_values)))
+            indices = np.argpartition(magnitudes, num_values - num_kept)[num_values - num_kept:] \
+                if num_kept else np.zeros(0, dtype=np.int64)
+            indices.sort()
+        else:
+            indices = np.flatnonzero(magnitudes >= self._threshold)
+
+        values = target[indices]
+        if quantizer is not None:
+            values, restored = quantizer.quantize_values(values)
+            values = values._replace(dtype=weight.dtype)
+            value_size = len(values.values)
+        else:
+            values = values.astype(weight.dtype)
+            restored = values.astype(np.float32)
+            value_size = values.nbytes
+
+        encoding, encoded = encode_indices(indices, num_values)
+        dense_size = quantized_size(num_values, quantizer.quantization) \
+            if quantizer is not None else num_values * weight.dtype.itemsize
+        if value_size + len(encoded) >= dense_size:
+            # Sent dense, i.e., in full.
+            if quantizer is not None:
+                quantized, restored = quantizer.quantize_values(target)
+                return quantized._replace(dtype=weight.dtype, shape=weight.shape), restored
+            dense = target.astype(weight.dtype)
+            return dense.reshape(weight.shape), dense.astype(np.float32)
+
+        sent_values = np.zeros(num_values, dtype=np.float32)
+        sent_values[indices] = restored
+        return SparseWeight(
+            values=values,
+            encoding=encoding,
+            indices=encoded,
+            dtype=weight.dtype,
+            shape=weight.shape,
+        ), sent_values
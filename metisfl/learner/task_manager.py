@@ -1,9 +1,114 @@
 import multiprocessing as mp
+import os
 import queue
-from typing import Callable, Optional
+import time
+from concurrent import futures
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 from pebble import ProcessFuture, ProcessPool
 
+from ..common.logger import MetisLogger
+from ..common.timing import PhaseTimer
+
+# Keyword arguments kept resident in a long-lived worker process.
+# Populated once, by the worker initializer, when the worker starts.
+_RESIDENT_KWARGS: Dict[str, Any] = {}
+
+
+def _init_resident_worker(resident_kwargs: Dict[str, Any]) -> None:
+    """Initializer of a long-lived worker. Keeps the given keyword arguments resident."""
+    _RESIDENT_KWARGS.clear()
+    _RESIDENT_KWARGS.update(resident_kwargs)
+
+
+def init_worker(
+    resident_kwargs: Optional[Dict[str, Any]] = None,
+    cpu_affinity: Optional[Iterable[int]] = None,
+    niceness: Optional[int] = 0
+) -> None:
+    """Initializer of a worker process, e.g., of a pebble ProcessPool.
+
+    Parameters
+    ----------
+    resident_kwargs : Optional[Dict[str, Any]], (default=None)
+        If given, the keyword arguments kept resident in the worker and passed to every task
+        run with run_resident_task.
+    cpu_affinity : Optional[Iterable[int]], (default=None)
+        If given, the CPUs the worker is pinned to; see check_cpu_affinity.
+    niceness : Optional[int], (default=0)
+        How much the scheduling priority of the worker is lowered.
+    """
+    if cpu_affinity:
+        os.sched_setaffinity(0, cpu_affinity)
+    if niceness:
+        os.nice(niceness)
+    if resident_kwargs is not None:
+        _init_resident_worker(resident_kwargs)
+
+
+def check_cpu_affinity(cpu_affinity: Optional[Iterable[int]]) -> Optional[frozenset]:
+    """Returns the set of CPUs to pin a worker to, if any.
+
+    Parameters
+    ----------
+    cpu_affinity : Optional[Iterable[int]]
+        The CPUs to pin a worker to.
+
+    Returns
+    -------
+    Optional[frozenset]
+        The set of CPUs, or None if no CPUs are given.
+
+    Raises
+    ------
+    ValueError
+        If the platform does not support pinning processes to CPUs or if a CPU is not available.
+    """
+    if cpu_affinity is None:
+        return None
+    cpu_affinity = frozenset(cpu_affinity)
+    if not hasattr(os, "sched_setaffinity"):
+        raise ValueError("Workers cannot be pinned to CPUs on this platform")
+    unavailable = cpu_affinity - os.sched_getaffinity(0)
+    if not cpu_affinity or unavailable:
+        raise ValueError("The CPUs {} are not available".format(sorted(unavailable)))
+    return cpu_affinity
+
+
+def run_resident_task(
+    task_fn: Callable,
+    task_args: Optional[tuple] = None,
+    task_kwargs: Optional[dict] = None
+) -> Any:
+    """Runs the task in a long-lived worker, along with the keyword arguments resident in the worker.
+
+    Parameters
+    ----------
+    task_fn : Callable
+        The task function.
+    task_args : Optional[tuple], (default=None)
+        The arguments of the task function.
+    task_kwargs : Optional[dict], (default=None)
+        The keyword arguments of the task function, which take precedence over the resident ones.
+
+    Returns
+    -------
+    Any
+        The result of the task function.
+    """
+    return task_fn(*(task_args or ()), **{**_RESIDENT_KWARGS, **(task_kwargs or {})})
+
+
+def _run_timed_task(
+    task_fn: Callable,
+    task_args: Optional[tuple] = None,
+    task_kwargs: Optional[dict] = None
+) -> Tuple[Any, int]:
+    """Runs the task and returns its result along with its duration in nanoseconds, measured in the worker."""
+    start_ns = time.perf_counter_ns()
+    result = task_fn(*(task_args or ()), **(task_kwargs or {}))
+    return result, time.perf_counter_ns() - start_ns
+
 
 class TaskManager(object):
 
@@ -13,7 +118,9 @@ class TaskManager(object):
         self,
         max_workers: Optional[int] = 1,
         max_tasks: Optional[int] = 1,
-        max_queue_size: Optional[int] = 1
+        max_queue_size: Optional[int] = 1,
+        resident_kwargs: Optional[Dict[str, Any]] = None,
+        cpu_affinity: Optional[Iterable[int]] = None
     ):
         """Initializes a TaskManager object.
 
@@ -22,13 +129,34 @@ class TaskManager(object):
         max_workers : Optional[int], (default=1)
             The maximum number of workers in the pool, by default 1
         max_tasks : Optional[int], (default=1)
-            The maximum number of tasks that can be scheduled in each worker before it is restarted, by default 1
+            The maximum number of tasks that can be scheduled in each worker before it is restarted, by default 1.
+            Ignored if resident_kwargs is given, in which case workers are never restarted after a task.
         max_queue_size : Optional[int], (default=1)
             The maximum size of the future queue, by default 1
+        resident_kwargs : Optional[Dict[str, Any]], (default=None)
+            If given, the workers are long-lived: these keyword arguments (e.g., the Learner) are sent
+            to each worker only once, when the worker starts, and are passed to every task it runs.
+            Any state they build (e.g., the model graph or the data pipeline) therefore stays resident
+            across tasks. Keyword arguments of a task with the same name are not sent to the worker.
+            A worker is restarted, and its resident state rebuilt, only if it crashes or if its
+            running task is cancelled.
+        cpu_affinity : Optional[Iterable[int]], (default=None)
+            The CPUs the workers are pinned to, e.g., the cores not used for evaluation. If None,
+            the workers may run on any CPU.
+
+        Raises
+        ------
+        ValueError
+            If the workers cannot be pinned to the given CPUs.
         """
         mp_ctx = mp.get_context("spawn")
+        self._resident_kwargs = resident_kwargs
+
         self._worker_pool = ProcessPool(max_workers=max_workers,
-                                        max_tasks=max_tasks,
+                                        max_tasks=0 if resident_kwargs is not None else max_tasks,
+                                        initializer=init_worker,
+                                        initargs=(resident_kwargs,
+                                                  check_cpu_affinity(cpu_affinity)),
                                         context=mp_ctx)
         self._future_queue = queue.Queue(maxsize=max_queue_size)
 
@@ -38,7 +166,10 @@ class TaskManager(object):
         task_args: Optional[tuple] = None,
         task_kwargs: Optional[dict] = None,
         callback: Optional[Callable] = None,
-        cancel_running: Optional[bool] = False
+        cancel_running: Optional[bool] = False,
+        timer: Optional[PhaseTimer] = None,
+        phase: Optional[str] = "task",
+        cleanup: Optional[Callable[[], None]] = None
     ) -> None:
         """Runs a task in the pool of workers.
 
@@ -54,25 +185,63 @@ class TaskManager(object):
             A Callable object that represents the callback function to be run after the task is completed, by default None
         cancel_running : Optional[bool], (default=False)
             Whether to cancel the running task before running the new one, by default False
+        timer : Optional[PhaseTimer], (default=None)
+            If given, the duration of the task, measured in the worker, is added to the phase,
+            and the rest of the time until the task completes (i.e., waiting for the previous task
+            and handing the task over to the worker and back) to the "queue" phase, before the callback is run.
+        phase : Optional[str], (default="task")
+            The phase the duration of the task is added to.
+        cleanup : Optional[Callable[[], None]], (default=None)
+            Called once the task is over, before the callback, whether it completed, failed or was
+            cancelled, e.g., to release the resources handed over to the task.
 
         """
         self._empty_tasks_q(force=cancel_running)
-        
+        scheduled_ns = time.perf_counter_ns()
+
+        if self._resident_kwargs is not None:
+            # The resident keyword arguments are already in the worker.
+            task_kwargs = {
+                key: value for key, value in (task_kwargs or {}).items()
+                if key not in self._resident_kwargs
+            }
+            task_fn, task_args, task_kwargs = run_resident_task, (task_fn, task_args, task_kwargs), {}
+        if timer is not None:
+            task_fn, task_args, task_kwargs = _run_timed_task, (task_fn, task_args, task_kwargs), {}
         future = self._worker_pool.schedule(function=task_fn,
-                                            args=task_args,
-                                            kwargs={**task_kwargs})
+                                            args=task_args or (),
+                                            kwargs={**(task_kwargs or {})})
+        if cleanup is not None:
+            future.add_done_callback(lambda _: cleanup())
         if callback:
             future.add_done_callback(
-                self._callback_wrapper(callback)
+                self._callback_wrapper(callback, timer, phase, scheduled_ns)
             )
 
         self._future_queue.put(future)
 
-    def _callback_wrapper(self, callback: Callable) -> Callable:
+    def _callback_wrapper(
+        self,
+        callback: Callable,
+        timer: Optional[PhaseTimer] = None,
+        phase: Optional[str] = "task",
+        scheduled_ns: Optional[int] = 0
+    ) -> Callable:
 
         def callback_wrapper(future: ProcessFuture) -> None:
             if future.done() and not future.cancelled():
-                callback(future.result())
+                if future.exception() is not None:
+                    # E.g., the task raised or its worker crashed; the
+                    # pool has already replaced a crashed worker.
+                    MetisLogger.error(
+                        "Task failed: {}".format(future.exception()))
+                    return
+                result = future.result()
+                if timer is not None:
+                    result, duration_ns = result
+                    timer.add(phase, duration_ns)
+                    timer.add("queue", time.perf_counter_ns() - scheduled_ns - duration_ns)
+                callback(result)
 
         return callback_wrapper
 
@@ -101,4 +270,8 @@ class TaskManager(object):
             if force:
                 self._future_queue.get(block=False).cancel()
             else:
-                self._future_queue.get().result()
+                future = self._future_queue.get()
+                # Waits for the task to finish; failures of the
+                # task are reported by its callback, if any.
+                if not future.cancelled():
+                    futures.wait([future])
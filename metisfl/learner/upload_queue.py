@@ -0,0 +1,366 @@
+"""This module contains the queue of the completed tasks a learner uploads to the Controller.
+    Uploads are delivered in order by a dedicated thread, hence training never waits for the
+    Controller, and failed uploads are retried with exponential backoff and jitter."""
+
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Optional
+
+import grpc
+
+from ..common.logger import MetisLogger
+from ..proto import controller_pb2, model_pb2
+
+# The errors after which an upload is retried; other errors are not transient.
+RETRYABLE_STATUS_CODES = frozenset([
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.ABORTED,
+])
+
+# The number of delivered task ids remembered to drop duplicate uploads.
+NUM_DELIVERED_TASK_IDS = 1024
+
+SPILL_FILE_SUFFIX = ".pb"
+FALLBACK_FILE_SUFFIX = ".fallback.pb"
+
+
+class _Upload(object):
+
+    """A queued upload; its request is held in memory or spilled to disk."""
+
+    def __init__(
+        self,
+        task_id: str,
+        request: Optional[controller_pb2.TrainDoneRequest],
+        fallback: Optional[Callable[[], model_pb2.Model]],
+        on_fallback: Optional[Callable[[], None]],
+        deadline: float
+    ):
+        self.task_id = task_id
+        self.request = request
+        self.fallback = fallback
+        self.on_fallback = on_fallback
+        self.deadline = deadline
+        self.queued_ns = time.perf_counter_ns()
+        self.path = None
+        self.size = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self.path is not None
+
+
+class UploadQueue(object):
+
+    """Delivers the completed tasks of a learner to the Controller, in order and at most once per task id."""
+
+    def __init__(
+        self,
+        send_fn: Callable[[controller_pb2.TrainDoneRequest, Optional[float]], Any],
+        max_pending: Optional[int] = 2,
+        spill_dir: Optional[str] = None,
+        max_spill_bytes: Optional[int] = 1 << 30,
+        deadline: Optional[float] = 3600.0,
+        request_timeout: Optional[float] = None,
+        initial_backoff: Optional[float] = 1.0,
+        max_backoff: Optional[float] = 60.0
+    ):
+        """Initializes the UploadQueue object and starts its delivery thread.
+            Uploads spilled to the spill directory by a previous queue are delivered first.
+
+        Parameters
+        ----------
+        send_fn : Callable[[controller_pb2.TrainDoneRequest, Optional[float]], Any]
+            Sends a request with the given timeout in seconds; raises a grpc.RpcError if it fails.
+        max_pending : Optional[int], (default=2)
+            The maximum number of uploads held in memory. Further uploads are spilled to disk,
+            or, if the spill directory is full or not given, wait until an upload is delivered.
+        spill_dir : Optional[str], (default=None)
+            The directory the uploads are spilled to. If None, uploads are never spilled.
+        max_spill_bytes : Optional[int], (default=1 << 30)
+            The maximum size in bytes of the spilled requests. The fallback models of spilled
+            uploads are counted once they are spilled.
+        deadline : Optional[float], (default=3600.0)
+            The time in seconds within which an upload is to be delivered, counted from the time it
+            is queued, or loaded from disk. Uploads that are not delivered in time are dropped.
+        request_timeout : Optional[float], (default=None)
+            The timeout in seconds of every attempt. If None, an attempt may take the whole deadline.
+        initial_backoff : Optional[float], (default=1.0)
+            The maximum time in seconds to wait before the first retry. The maximum doubles on every
+            retry and the time waited is drawn uniformly up to it, such that learners do not retry in step.
+        max_backoff : Optional[float], (default=60.0)
+            The maximum time in seconds to wait before any retry.
+        """
+        if max_pending < 1:
+            raise ValueError("At least one upload must be held in memory")
+        self._send_fn = send_fn
+        self._max_pending = max_pending
+        self._spill_dir = spill_dir
+        self._max_spill_bytes = max_spill_bytes
+        self._deadline = deadline
+        self._request_timeout = request_timeout
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+
+        self._uploads: Deque[_Upload] = deque()
+        self._delivered = OrderedDict()
+        self._spilled_bytes = 0
+        self._spill_seq = 0
+        self._closing = False
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._load_spilled()
+
+        self._thread = threading.Thread(target=self._run, name="UploadQueue", daemon=True)
+        self._thread.start()
+
+    def put(
+        self,
+        request: controller_pb2.TrainDoneRequest,
+        fallback: Optional[Callable[[], model_pb2.Model]] = None,
+        on_fallback: Optional[Callable[[], None]] = None,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """Queues the request for delivery. Blocks while the queue is full.
+
+        Parameters
+        ----------
+        request : controller_pb2.TrainDoneRequest
+            The request with the completed task. Must not be modified afterwards. The time it waits
+            in the queue, including its retries, is recorded in its metadata as the "upload_wait" phase.
+        fallback : Optional[Callable[[], model_pb2.Model]], (default=None)
+            Returns the model to send instead, if the Controller refuses the model of the request,
+            e.g., the full model if a delta is refused. Called when the upload is spilled, if ever.
+        on_fallback : Optional[Callable[[], None]], (default=None)
+            Called when the fallback model is sent. Not kept across restarts.
+        timeout : Optional[float], (default=None)
+            The time in seconds to wait for space in the queue. If None, waits indefinitely.
+
+        Returns
+        -------
+        bool
+            True if the request was queued, False if its task was already queued or delivered,
+            if the queue is closed, or if the queue remained full for the timeout.
+        """
+        upload = _Upload(request.task_id, request, fallback, on_fallback,
+                         time.monotonic() + self._deadline)
+        with self._cond:
+            if self._is_duplicate(upload.task_id):
+                MetisLogger.warning(
+                    "Task {} is already queued or delivered.".format(upload.task_id))
+                return False
+
+            def _has_space():
+                return self._closing or self._num_in_memory() < self._max_pending or \
+                    self._can_spill(request.ByteSize())
+
+            if not self._cond.wait_for(_has_space, timeout) or self._closing:
+                return False
+            if self._num_in_memory() >= self._max_pending:
+                self._spill(upload)
+            self._uploads.append(upload)
+            self._cond.notify_all()
+        return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all the queued uploads are delivered or dropped.
+
+        Parameters
+        ----------
+        timeout : Optional[float], (default=None)
+            The time in seconds to wait. If None, waits indefinitely.
+
+        Returns
+        -------
+        bool
+            True if the queue is empty, False otherwise.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._uploads, timeout)
+
+    def pending(self) -> int:
+        """Returns the number of uploads that are not delivered yet."""
+        with self._cond:
+            return len(self._uploads)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stops accepting uploads and waits for the queued uploads to be delivered.
+            The uploads still queued after the timeout are spilled, if they fit, or dropped.
+
+        Parameters
+        ----------
+        timeout : Optional[float], (default=None)
+            The time in seconds to wait for the uploads. If None, waits indefinitely.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Interrupts the wait for the next retry, but not a running attempt.
+            self._stop.set()
+            self._thread.join()
+
+        with self._cond:
+            for upload in self._uploads:
+                if upload.spilled:
+                    continue
+                if self._can_spill(upload.request.ByteSize()):
+                    self._spill(upload)
+                else:
+                    MetisLogger.error(
+                        "Dropping the upload of task {}, it was not delivered.".format(upload.task_id))
+            self._uploads.clear()
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._uploads or self._closing)
+                if not self._uploads or self._stop.is_set():
+                    return
+                upload = self._uploads[0]
+
+            try:
+                if not self._deliver(upload):
+                    return
+            except Exception as error:
+                # E.g., the spilled upload cannot be read or its fallback fails; the upload is
+                # dropped such that the uploads after it are still delivered.
+                MetisLogger.error("Dropping the upload of task {}, it failed with: {!r}".format(
+                    upload.task_id, error))
+
+            with self._cond:
+                self._uploads.popleft()
+                if upload.spilled:
+                    self._remove_spilled(upload)
+                self._delivered[upload.task_id] = True
+                while len(self._delivered) > NUM_DELIVERED_TASK_IDS:
+                    self._delivered.popitem(last=False)
+                self._cond.notify_all()
+
+    def _deliver(self, upload: _Upload) -> bool:
+        """Sends the upload until it is delivered, refused or its deadline passes.
+            Returns False if the queue is stopped before."""
+        request = upload.request if not upload.spilled else self._read_spilled(upload)
+        attempt = 0
+        while True:
+            remaining = upload.deadline - time.monotonic()
+            if remaining <= 0:
+                MetisLogger.error("Dropping the upload of task {}, its deadline passed after {} "
+                                  "attempts.".format(upload.task_id, attempt))
+                return True
+            timeout = remaining if self._request_timeout is None \
+                else min(self._request_timeout, remaining)
+
+            # The time the upload waited for the previous uploads and its own retries.
+            request.metadata.phase_duration_ms["upload_wait"] = \
+                (time.perf_counter_ns() - upload.queued_ns) / 1e6
+            try:
+                self._send_fn(request, timeout)
+                return True
+            except grpc.RpcError as rpc_error:
+                if rpc_error.code() in RETRYABLE_STATUS_CODES:
+                    backoff = random.uniform(
+                        0, min(self._max_backoff, self._initial_backoff * 2 ** attempt))
+                    attempt += 1
+                    MetisLogger.warning("Upload of task {} failed with {}, retrying in {:.1f}s.".format(
+                        upload.task_id, rpc_error.code(), backoff))
+                    if self._stop.wait(min(backoff, remaining)):
+                        return False
+                    continue
+
+                if upload.fallback is None:
+                    MetisLogger.error("Upload of task {} was refused: {}".format(
+                        upload.task_id, rpc_error))
+                    return True
+                MetisLogger.warning("Upload of task {} was refused, sending its fallback: {}".format(
+                    upload.task_id, rpc_error))
+                if upload.on_fallback is not None:
+                    upload.on_fallback()
+                request.model.CopyFrom(upload.fallback())
+                upload.fallback, upload.on_fallback, attempt = None, None, 0
+
+    def _is_duplicate(self, task_id: str) -> bool:
+        return task_id in self._delivered or \
+            any(upload.task_id == task_id for upload in self._uploads)
+
+    def _num_in_memory(self) -> int:
+        return sum(1 for upload in self._uploads if not upload.spilled)
+
+    def _can_spill(self, size: int) -> bool:
+        return self._spill_dir is not None and \
+            self._spilled_bytes + size <= self._max_spill_bytes
+
+    def _spill(self, upload: _Upload) -> None:
+        """Writes the upload to the spill directory and releases its request."""
+        path = os.path.join(self._spill_dir, "{:020d}".format(self._spill_seq))
+        self._spill_seq += 1
+        size = 0
+        if upload.fallback is not None:
+            size += _write_atomically(path + FALLBACK_FILE_SUFFIX,
+                                      upload.fallback().SerializeToString())
+            upload.fallback = _read_fallback(path + FALLBACK_FILE_SUFFIX)
+        size += _write_atomically(path + SPILL_FILE_SUFFIX, upload.request.SerializeToString())
+        upload.path, upload.size, upload.request = path, size, None
+        self._spilled_bytes += upload.size
+
+    def _read_spilled(self, upload: _Upload) -> controller_pb2.TrainDoneRequest:
+        with open(upload.path + SPILL_FILE_SUFFIX, "rb") as f:
+            return controller_pb2.TrainDoneRequest.FromString(f.read())
+
+    def _remove_spilled(self, upload: _Upload) -> None:
+        for suffix in [SPILL_FILE_SUFFIX, FALLBACK_FILE_SUFFIX]:
+            if os.path.exists(upload.path + suffix):
+                os.remove(upload.path + suffix)
+        self._spilled_bytes -= upload.size
+
+    def _load_spilled(self) -> None:
+        """Queues the uploads spilled by a previous queue, in order."""
+        names = sorted(name for name in os.listdir(self._spill_dir)
+                       if name.endswith(SPILL_FILE_SUFFIX) and
+                       name[:-len(SPILL_FILE_SUFFIX)].isdigit())
+        for name in names:
+            path = os.path.join(self._spill_dir, name[:-len(SPILL_FILE_SUFFIX)])
+            with open(path + SPILL_FILE_SUFFIX, "rb") as f:
+                data = f.read()
+            size = len(data)
+            fallback = None
+            if os.path.exists(path + FALLBACK_FILE_SUFFIX):
+                fallback = _read_fallback(path + FALLBACK_FILE_SUFFIX)
+                size += os.path.getsize(path + FALLBACK_FILE_SUFFIX)
+            upload = _Upload(controller_pb2.TrainDoneRequest.FromString(data).task_id, None,
+                             fallback, None, time.monotonic() + self._deadline)
+            upload.path, upload.size = path, size
+            self._spilled_bytes += upload.size
+            self._uploads.append(upload)
+            self._spill_seq = max(self._spill_seq, int(os.path.basename(path)) + 1)
+        if names:
+            MetisLogger.info("Loaded {} spilled uploads.".format(len(names)))
+
+
+def _read_fallback(path: str) -> Callable[[], model_pb2.Model]:
+    """Returns the function that reads the spilled fallback model."""
+    def _fallback():
+        with open(path, "rb") as f:
+            return model_pb2.Model.FromString(f.read())
+    return _fallback
+
+
+def _write_atomically(path: str, data: bytes) -> int:
+    """Writes the data such that the file is either complete or missing, also after a crash.
+        Returns the number of bytes written."""
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+    return len(data)
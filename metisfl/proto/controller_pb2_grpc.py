@@ -26,6 +26,11 @@ class ControllerServiceStub(object):
                 request_serializer=metisfl_dot_proto_dot_model__pb2.Model.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
                 )
+        self.SetInitialModelStream = channel.stream_unary(
+                '/metisfl.ControllerService/SetInitialModelStream',
+                request_serializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+                )
         self.JoinFederation = channel.unary_unary(
                 '/metisfl.ControllerService/JoinFederation',
                 request_serializer=metisfl_dot_proto_dot_controller__pb2.Learner.SerializeToString,
@@ -46,11 +51,31 @@ class ControllerServiceStub(object):
                 request_serializer=metisfl_dot_proto_dot_controller__pb2.TrainDoneRequest.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
                 )
+        self.TrainDoneStream = channel.stream_unary(
+                '/metisfl.ControllerService/TrainDoneStream',
+                request_serializer=metisfl_dot_proto_dot_controller__pb2.TrainDoneRequestChunk.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+                )
+        self.EvaluateDone = channel.unary_unary(
+                '/metisfl.ControllerService/EvaluateDone',
+                request_serializer=metisfl_dot_proto_dot_controller__pb2.EvaluateDoneRequest.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+                )
         self.GetLogs = channel.unary_unary(
                 '/metisfl.ControllerService/GetLogs',
                 request_serializer=metisfl_dot_proto_dot_service__common__pb2.Empty.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_controller__pb2.Logs.FromString,
                 )
+        self.GetLogsSince = channel.unary_unary(
+                '/metisfl.ControllerService/GetLogsSince',
+                request_serializer=metisfl_dot_proto_dot_controller__pb2.GetLogsRequest.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_controller__pb2.Logs.FromString,
+                )
+        self.WatchLogs = channel.unary_stream(
+                '/metisfl.ControllerService/WatchLogs',
+                request_serializer=metisfl_dot_proto_dot_controller__pb2.GetLogsRequest.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_controller__pb2.Logs.FromString,
+                )
         self.ShutDown = channel.unary_unary(
                 '/metisfl.ControllerService/ShutDown',
                 request_serializer=metisfl_dot_proto_dot_service__common__pb2.Empty.SerializeToString,
@@ -73,6 +98,12 @@ class ControllerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SetInitialModelStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def JoinFederation(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -97,12 +128,36 @@ class ControllerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def TrainDoneStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EvaluateDone(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetLogs(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetLogsSince(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchLogs(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ShutDown(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -122,6 +177,11 @@ def add_ControllerServiceServicer_to_server(servicer, server):
                     request_deserializer=metisfl_dot_proto_dot_model__pb2.Model.FromString,
                     response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
             ),
+            'SetInitialModelStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.SetInitialModelStream,
+                    request_deserializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.FromString,
+                    response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
+            ),
             'JoinFederation': grpc.unary_unary_rpc_method_handler(
                     servicer.JoinFederation,
                     request_deserializer=metisfl_dot_proto_dot_controller__pb2.Learner.FromString,
@@ -142,11 +202,31 @@ def add_ControllerServiceServicer_to_server(servicer, server):
                     request_deserializer=metisfl_dot_proto_dot_controller__pb2.TrainDoneRequest.FromString,
                     response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
             ),
+            'TrainDoneStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.TrainDoneStream,
+                    request_deserializer=metisfl_dot_proto_dot_controller__pb2.TrainDoneRequestChunk.FromString,
+                    response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
+            ),
+            'EvaluateDone': grpc.unary_unary_rpc_method_handler(
+                    servicer.EvaluateDone,
+                    request_deserializer=metisfl_dot_proto_dot_controller__pb2.EvaluateDoneRequest.FromString,
+                    response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
+            ),
             'GetLogs': grpc.unary_unary_rpc_method_handler(
                     servicer.GetLogs,
                     request_deserializer=metisfl_dot_proto_dot_service__common__pb2.Empty.FromString,
                     response_serializer=metisfl_dot_proto_dot_controller__pb2.Logs.SerializeToString,
             ),
+            'GetLogsSince': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLogsSince,
+                    request_deserializer=metisfl_dot_proto_dot_controller__pb2.GetLogsRequest.FromString,
+                    response_serializer=metisfl_dot_proto_dot_controller__pb2.Logs.SerializeToString,
+            ),
+            'WatchLogs': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchLogs,
+                    request_deserializer=metisfl_dot_proto_dot_controller__pb2.GetLogsRequest.FromString,
+                    response_serializer=metisfl_dot_proto_dot_controller__pb2.Logs.SerializeToString,
+            ),
             'ShutDown': grpc.unary_unary_rpc_method_handler(
                     servicer.ShutDown,
                     request_deserializer=metisfl_dot_proto_dot_service__common__pb2.Empty.FromString,
@@ -196,6 +276,23 @@ class ControllerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def SetInitialModelStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/metisfl.ControllerService/SetInitialModelStream',
+            metisfl_dot_proto_dot_model__pb2.ModelChunk.SerializeToString,
+            metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def JoinFederation(request,
             target,
@@ -264,6 +361,40 @@ class ControllerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def TrainDoneStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/metisfl.ControllerService/TrainDoneStream',
+            metisfl_dot_proto_dot_controller__pb2.TrainDoneRequestChunk.SerializeToString,
+            metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def EvaluateDone(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/metisfl.ControllerService/EvaluateDone',
+            metisfl_dot_proto_dot_controller__pb2.EvaluateDoneRequest.SerializeToString,
+            metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetLogs(request,
             target,
@@ -281,6 +412,40 @@ class ControllerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetLogsSince(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/metisfl.ControllerService/GetLogsSince',
+            metisfl_dot_proto_dot_controller__pb2.GetLogsRequest.SerializeToString,
+            metisfl_dot_proto_dot_controller__pb2.Logs.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WatchLogs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/metisfl.ControllerService/WatchLogs',
+            metisfl_dot_proto_dot_controller__pb2.GetLogsRequest.SerializeToString,
+            metisfl_dot_proto_dot_controller__pb2.Logs.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def ShutDown(request,
             target,
@@ -2,9 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: metisfl/proto/learner.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -15,452 +15,45 @@ from metisfl.proto import model_pb2 as metisfl_dot_proto_dot_model__pb2
 from metisfl.proto import service_common_pb2 as metisfl_dot_proto_dot_service__common__pb2
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='metisfl/proto/learner.proto',
-  package='metisfl',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x1bmetisfl/proto/learner.proto\x12\x07metisfl\x1a\x19metisfl/proto/model.proto\x1a\"metisfl/proto/service_common.proto\"{\n\x0cTrainRequest\x12\x17\n\x07task_id\x18\x01 \x01(\tR\x06taskId\x12$\n\x05model\x18\x02 \x01(\x0b\x32\x0e.metisfl.ModelR\x05model\x12,\n\x06params\x18\x03 \x01(\x0b\x32\x14.metisfl.TrainParamsR\x06params\"\x8a\x01\n\x0bTrainParams\x12\x1d\n\nbatch_size\x18\x02 \x01(\rR\tbatchSize\x12\x16\n\x06\x65pochs\x18\x03 \x01(\rR\x06\x65pochs\x12*\n\x11num_local_updates\x18\x04 \x01(\rR\x0fnumLocalUpdates\x12\x18\n\x07metrics\x18\x05 \x03(\tR\x07metrics\"\x83\x01\n\x0f\x45valuateRequest\x12\x17\n\x07task_id\x18\x01 \x01(\tR\x06taskId\x12$\n\x05model\x18\x02 \x01(\x0b\x32\x0e.metisfl.ModelR\x05model\x12\x31\n\x06params\x18\x03 \x01(\x0b\x32\x19.metisfl.EvaluationParamsR\x06params\"K\n\x10\x45valuationParams\x12\x1d\n\nbatch_size\x18\x01 \x01(\rR\tbatchSize\x12\x18\n\x07metrics\x18\x02 \x03(\tR\x07metrics\"d\n\x10\x45valuateResponse\x12\x17\n\x07task_id\x18\x01 \x01(\tR\x06taskId\x12\x37\n\x08metadata\x18\x02 \x01(\x0b\x32\x1b.metisfl.EvaluationMetadataR\x08metadata\"\x94\x01\n\x12\x45valuationMetadata\x12\x42\n\x07metrics\x18\x01 \x03(\x0b\x32(.metisfl.EvaluationMetadata.MetricsEntryR\x07metrics\x1a:\n\x0cMetricsEntry\x12\x10\n\x03key\x18\x01 \x01(\tR\x03key\x12\x14\n\x05value\x18\x02 \x01(\x02R\x05value:\x02\x38\x01\x32\xc5\x02\n\x0eLearnerService\x12\x31\n\x0fGetHealthStatus\x12\x0e.metisfl.Empty\x1a\x0c.metisfl.Ack\"\x00\x12,\n\x08GetModel\x12\x0e.metisfl.Empty\x1a\x0e.metisfl.Model\"\x00\x12\x33\n\x11SetInitialWeights\x12\x0e.metisfl.Model\x1a\x0c.metisfl.Ack\"\x00\x12.\n\x05Train\x12\x15.metisfl.TrainRequest\x1a\x0c.metisfl.Ack\"\x00\x12\x41\n\x08\x45valuate\x12\x18.metisfl.EvaluateRequest\x1a\x19.metisfl.EvaluateResponse\"\x00\x12*\n\x08ShutDown\x12\x0e.metisfl.Empty\x1a\x0c.metisfl.Ack\"\x00\x62\x06proto3'
-  ,
-  dependencies=[metisfl_dot_proto_dot_model__pb2.DESCRIPTOR,metisfl_dot_proto_dot_service__common__pb2.DESCRIPTOR,])
-
-
-
-
-_TRAINREQUEST = _descriptor.Descriptor(
-  name='TrainRequest',
-  full_name='metisfl.TrainRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='task_id', full_name='metisfl.TrainRequest.task_id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='taskId', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='model', full_name='metisfl.TrainRequest.model', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='model', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='params', full_name='metisfl.TrainRequest.params', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='params', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=103,
-  serialized_end=226,
-)
-
-
-_TRAINPARAMS = _descriptor.Descriptor(
-  name='TrainParams',
-  full_name='metisfl.TrainParams',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='batch_size', full_name='metisfl.TrainParams.batch_size', index=0,
-      number=2, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='batchSize', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='epochs', full_name='metisfl.TrainParams.epochs', index=1,
-      number=3, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='epochs', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='num_local_updates', full_name='metisfl.TrainParams.num_local_updates', index=2,
-      number=4, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='numLocalUpdates', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='metrics', full_name='metisfl.TrainParams.metrics', index=3,
-      number=5, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='metrics', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=229,
-  serialized_end=367,
-)
-
-
-_EVALUATEREQUEST = _descriptor.Descriptor(
-  name='EvaluateRequest',
-  full_name='metisfl.EvaluateRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='task_id', full_name='metisfl.EvaluateRequest.task_id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='taskId', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='model', full_name='metisfl.EvaluateRequest.model', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='model', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='params', full_name='metisfl.EvaluateRequest.params', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='params', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=370,
-  serialized_end=501,
-)
-
-
-_EVALUATIONPARAMS = _descriptor.Descriptor(
-  name='EvaluationParams',
-  full_name='metisfl.EvaluationParams',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='batch_size', full_name='metisfl.EvaluationParams.batch_size', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='batchSize', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='metrics', full_name='metisfl.EvaluationParams.metrics', index=1,
-      number=2, type=9, cpp_type=9, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='metrics', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=503,
-  serialized_end=578,
-)
-
-
-_EVALUATERESPONSE = _descriptor.Descriptor(
-  name='EvaluateResponse',
-  full_name='metisfl.EvaluateResponse',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='task_id', full_name='metisfl.EvaluateResponse.task_id', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='taskId', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='metadata', full_name='metisfl.EvaluateResponse.metadata', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='metadata', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=580,
-  serialized_end=680,
-)
-
-
-_EVALUATIONMETADATA_METRICSENTRY = _descriptor.Descriptor(
-  name='MetricsEntry',
-  full_name='metisfl.EvaluationMetadata.MetricsEntry',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='key', full_name='metisfl.EvaluationMetadata.MetricsEntry.key', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='key', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='value', full_name='metisfl.EvaluationMetadata.MetricsEntry.value', index=1,
-      number=2, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='value', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=b'8\001',
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=773,
-  serialized_end=831,
-)
-
-_EVALUATIONMETADATA = _descriptor.Descriptor(
-  name='EvaluationMetadata',
-  full_name='metisfl.EvaluationMetadata',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='metrics', full_name='metisfl.EvaluationMetadata.metrics', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='metrics', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[_EVALUATIONMETADATA_METRICSENTRY, ],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=683,
-  serialized_end=831,
-)
-
-_TRAINREQUEST.fields_by_name['model'].message_type = metisfl_dot_proto_dot_model__pb2._MODEL
-_TRAINREQUEST.fields_by_name['params'].message_type = _TRAINPARAMS
-_EVALUATEREQUEST.fields_by_name['model'].message_type = metisfl_dot_proto_dot_model__pb2._MODEL
-_EVALUATEREQUEST.fields_by_name['params'].message_type = _EVALUATIONPARAMS
-_EVALUATERESPONSE.fields_by_name['metadata'].message_type = _EVALUATIONMETADATA
-_EVALUATIONMETADATA_METRICSENTRY.containing_type = _EVALUATIONMETADATA
-_EVALUATIONMETADATA.fields_by_name['metrics'].message_type = _EVALUATIONMETADATA_METRICSENTRY
-DESCRIPTOR.message_types_by_name['TrainRequest'] = _TRAINREQUEST
-DESCRIPTOR.message_types_by_name['TrainParams'] = _TRAINPARAMS
-DESCRIPTOR.message_types_by_name['EvaluateRequest'] = _EVALUATEREQUEST
-DESCRIPTOR.message_types_by_name['EvaluationParams'] = _EVALUATIONPARAMS
-DESCRIPTOR.message_types_by_name['EvaluateResponse'] = _EVALUATERESPONSE
-DESCRIPTOR.message_types_by_name['EvaluationMetadata'] = _EVALUATIONMETADATA
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-TrainRequest = _reflection.GeneratedProtocolMessageType('TrainRequest', (_message.Message,), {
-  'DESCRIPTOR' : _TRAINREQUEST,
-  '__module__' : 'metisfl.proto.learner_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.TrainRequest)
-  })
-_sym_db.RegisterMessage(TrainRequest)
-
-TrainParams = _reflection.GeneratedProtocolMessageType('TrainParams', (_message.Message,), {
-  'DESCRIPTOR' : _TRAINPARAMS,
-  '__module__' : 'metisfl.proto.learner_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.TrainParams)
-  })
-_sym_db.RegisterMessage(TrainParams)
-
-EvaluateRequest = _reflection.GeneratedProtocolMessageType('EvaluateRequest', (_message.Message,), {
-  'DESCRIPTOR' : _EVALUATEREQUEST,
-  '__module__' : 'metisfl.proto.learner_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.EvaluateRequest)
-  })
-_sym_db.RegisterMessage(EvaluateRequest)
-
-EvaluationParams = _reflection.GeneratedProtocolMessageType('EvaluationParams', (_message.Message,), {
-  'DESCRIPTOR' : _EVALUATIONPARAMS,
-  '__module__' : 'metisfl.proto.learner_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.EvaluationParams)
-  })
-_sym_db.RegisterMessage(EvaluationParams)
-
-EvaluateResponse = _reflection.GeneratedProtocolMessageType('EvaluateResponse', (_message.Message,), {
-  'DESCRIPTOR' : _EVALUATERESPONSE,
-  '__module__' : 'metisfl.proto.learner_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.EvaluateResponse)
-  })
-_sym_db.RegisterMessage(EvaluateResponse)
-
-EvaluationMetadata = _reflection.GeneratedProtocolMessageType('EvaluationMetadata', (_message.Message,), {
-
-  'MetricsEntry' : _reflection.GeneratedProtocolMessageType('MetricsEntry', (_message.Message,), {
-    'DESCRIPTOR' : _EVALUATIONMETADATA_METRICSENTRY,
-    '__module__' : 'metisfl.proto.learner_pb2'
-    # @@protoc_insertion_point(class_scope:metisfl.EvaluationMetadata.MetricsEntry)
-    })
-  ,
-  'DESCRIPTOR' : _EVALUATIONMETADATA,
-  '__module__' : 'metisfl.proto.learner_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.EvaluationMetadata)
-  })
-_sym_db.RegisterMessage(EvaluationMetadata)
-_sym_db.RegisterMessage(EvaluationMetadata.MetricsEntry)
-
-
-_EVALUATIONMETADATA_METRICSENTRY._options = None
-
-_LEARNERSERVICE = _descriptor.ServiceDescriptor(
-  name='LearnerService',
-  full_name='metisfl.LearnerService',
-  file=DESCRIPTOR,
-  index=0,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=834,
-  serialized_end=1159,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='GetHealthStatus',
-    full_name='metisfl.LearnerService.GetHealthStatus',
-    index=0,
-    containing_service=None,
-    input_type=metisfl_dot_proto_dot_service__common__pb2._EMPTY,
-    output_type=metisfl_dot_proto_dot_service__common__pb2._ACK,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='GetModel',
-    full_name='metisfl.LearnerService.GetModel',
-    index=1,
-    containing_service=None,
-    input_type=metisfl_dot_proto_dot_service__common__pb2._EMPTY,
-    output_type=metisfl_dot_proto_dot_model__pb2._MODEL,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='SetInitialWeights',
-    full_name='metisfl.LearnerService.SetInitialWeights',
-    index=2,
-    containing_service=None,
-    input_type=metisfl_dot_proto_dot_model__pb2._MODEL,
-    output_type=metisfl_dot_proto_dot_service__common__pb2._ACK,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='Train',
-    full_name='metisfl.LearnerService.Train',
-    index=3,
-    containing_service=None,
-    input_type=_TRAINREQUEST,
-    output_type=metisfl_dot_proto_dot_service__common__pb2._ACK,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='Evaluate',
-    full_name='metisfl.LearnerService.Evaluate',
-    index=4,
-    containing_service=None,
-    input_type=_EVALUATEREQUEST,
-    output_type=_EVALUATERESPONSE,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='ShutDown',
-    full_name='metisfl.LearnerService.ShutDown',
-    index=5,
-    containing_service=None,
-    input_type=metisfl_dot_proto_dot_service__common__pb2._EMPTY,
-    output_type=metisfl_dot_proto_dot_service__common__pb2._ACK,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_LEARNERSERVICE)
-
-DESCRIPTOR.services_by_name['LearnerService'] = _LEARNERSERVICE
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1bmetisfl/proto/learner.proto\x12\x07metisfl\x1a\x19metisfl/proto/model.proto\x1a\"metisfl/proto/service_common.proto\"\x8c\x01\n\x0cTrainRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x1d\n\x05model\x18\x02 \x01(\x0b\x32\x0e.metisfl.Model\x12$\n\x06params\x18\x03 \x01(\x0b\x32\x14.metisfl.TrainParams\x12&\n\x07masking\x18\x04 \x01(\x0b\x32\x15.metisfl.MaskingRound\"\x9c\x01\n\x11TrainRequestChunk\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12$\n\x06params\x18\x02 \x01(\x0b\x32\x14.metisfl.TrainParams\x12(\n\x0bmodel_chunk\x18\x03 \x01(\x0b\x32\x13.metisfl.ModelChunk\x12&\n\x07masking\x18\x04 \x01(\x0b\x32\x15.metisfl.MaskingRound\"h\n\x0cMaskingRound\x12\x10\n\x08round_id\x18\x01 \x01(\t\x12#\n\x05peers\x18\x02 \x03(\x0b\x32\x14.metisfl.MaskingPeer\x12\x0e\n\x06weight\x18\x03 \x01(\x01\x12\x11\n\tthreshold\x18\x04 \x01(\r\"5\n\x0bMaskingPeer\x12\x12\n\nlearner_id\x18\x01 \x01(\t\x12\x12\n\npublic_key\x18\x02 \x01(\x0c\"c\n\x13RecoverMasksRequest\x12\x10\n\x08round_id\x18\x01 \x01(\t\x12\x13\n\x0blearner_ids\x18\x02 \x03(\t\x12%\n\x06shares\x18\x03 \x03(\x0b\x32\x15.metisfl.MaskingShare\"z\n\x1bSetInitialWeightsRelayChunk\x12!\n\x05peers\x18\x01 \x03(\x0b\x32\x12.metisfl.RelayPeer\x12\x0e\n\x06\x66\x61nout\x18\x02 \x01(\r\x12(\n\x0bmodel_chunk\x18\x03 \x01(\x0b\x32\x13.metisfl.ModelChunk\"E\n\tRelayPeer\x12\x10\n\x08hostname\x18\x01 \x01(\t\x12\x0c\n\x04port\x18\x02 \x01(\r\x12\x18\n\x10root_certificate\x18\x03 \x01(\x0c\"Y\n\x11\x42roadcastResponse\x12\x19\n\x03\x61\x63k\x18\x01 \x01(\x0b\x32\x0c.metisfl.Ack\x12)\n\x07reports\x18\x02 \x03(\x0b\x32\x18.metisfl.BroadcastReport\"T\n\x0f\x42roadcastReport\x12\x10\n\x08\x65ndpoint\x18\x01 \x01(\t\x12\n\n\x02ok\x18\x02 \x01(\x08\x12\x14\n\x0clatency_secs\x18\x03 \x01(\x01\x12\r\n\x05\x65rror\x18\x04 \x01(\t\"]\n\x0bTrainParams\x12\x12\n\nbatch_size\x18\x02 \x01(\r\x12\x0e\n\x06\x65pochs\x18\x03 \x01(\r\x12\x19\n\x11num_local_updates\x18\x04 \x01(\r\x12\x0f\n\x07metrics\x18\x05 \x03(\t\"\x81\x01\n\x0f\x45valuateRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x1d\n\x05model\x18\x02 \x01(\x0b\x32\x0e.metisfl.Model\x12)\n\x06params\x18\x03 \x01(\x0b\x32\x19.metisfl.EvaluationParams\x12\x13\n\x0breport_done\x18\x04 \x01(\x08\"7\n\x10\x45valuationParams\x12\x12\n\nbatch_size\x18\x01 \x01(\r\x12\x0f\n\x07metrics\x18\x02 \x03(\t\"R\n\x10\x45valuateResponse\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12-\n\x08metadata\x18\x02 \x01(\x0b\x32\x1b.metisfl.EvaluationMetadata\"\x7f\n\x12\x45valuationMetadata\x12\x39\n\x07metrics\x18\x01 \x03(\x0b\x32(.metisfl.EvaluationMetadata.MetricsEntry\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\x32\xac\x05\n\x0eLearnerService\x12\x31\n\x0fGetHealthStatus\x12\x0e.metisfl.Empty\x1a\x0c.metisfl.Ack\"\x00\x12,\n\x08GetModel\x12\x0e.metisfl.Empty\x1a\x0e.metisfl.Model\"\x00\x12\x39\n\x0eGetModelStream\x12\x0e.metisfl.Empty\x1a\x13.metisfl.ModelChunk\"\x00\x30\x01\x12\x33\n\x11SetInitialWeights\x12\x0e.metisfl.Model\x1a\x0c.metisfl.Ack\"\x00\x12@\n\x17SetInitialWeightsStream\x12\x13.metisfl.ModelChunk\x1a\x0c.metisfl.Ack\"\x00(\x01\x12\x64\n\x1cSetInitialWeightsRelayStream\x12$.metisfl.SetInitialWeightsRelayChunk\x1a\x1a.metisfl.BroadcastResponse\"\x00(\x01\x12.\n\x05Train\x12\x15.metisfl.TrainRequest\x1a\x0c.metisfl.Ack\"\x00\x12;\n\x0bTrainStream\x12\x1a.metisfl.TrainRequestChunk\x1a\x0c.metisfl.Ack\"\x00(\x01\x12\x41\n\x08\x45valuate\x12\x18.metisfl.EvaluateRequest\x1a\x19.metisfl.EvaluateResponse\"\x00\x12\x45\n\x0cRecoverMasks\x12\x1c.metisfl.RecoverMasksRequest\x1a\x13.metisfl.ModelChunk\"\x00\x30\x01\x12*\n\x08ShutDown\x12\x0e.metisfl.Empty\x1a\x0c.metisfl.Ack\"\x00\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'metisfl.proto.learner_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _EVALUATIONMETADATA_METRICSENTRY._options = None
+  _EVALUATIONMETADATA_METRICSENTRY._serialized_options = b'8\001'
+  _TRAINREQUEST._serialized_start=104
+  _TRAINREQUEST._serialized_end=244
+  _TRAINREQUESTCHUNK._serialized_start=247
+  _TRAINREQUESTCHUNK._serialized_end=403
+  _MASKINGROUND._serialized_start=405
+  _MASKINGROUND._serialized_end=509
+  _MASKINGPEER._serialized_start=511
+  _MASKINGPEER._serialized_end=564
+  _RECOVERMASKSREQUEST._serialized_start=566
+  _RECOVERMASKSREQUEST._serialized_end=665
+  _SETINITIALWEIGHTSRELAYCHUNK._serialized_start=667
+  _SETINITIALWEIGHTSRELAYCHUNK._serialized_end=789
+  _RELAYPEER._serialized_start=791
+  _RELAYPEER._serialized_end=860
+  _BROADCASTRESPONSE._serialized_start=862
+  _BROADCASTRESPONSE._serialized_end=951
+  _BROADCASTREPORT._serialized_start=953
+  _BROADCASTREPORT._serialized_end=1037
+  _TRAINPARAMS._serialized_start=1039
+  _TRAINPARAMS._serialized_end=1132
+  _EVALUATEREQUEST._serialized_start=1135
+  _EVALUATEREQUEST._serialized_end=1264
+  _EVALUATIONPARAMS._serialized_start=1266
+  _EVALUATIONPARAMS._serialized_end=1321
+  _EVALUATERESPONSE._serialized_start=1323
+  _EVALUATERESPONSE._serialized_end=1405
+  _EVALUATIONMETADATA._serialized_start=1407
+  _EVALUATIONMETADATA._serialized_end=1534
+  _EVALUATIONMETADATA_METRICSENTRY._serialized_start=1488
+  _EVALUATIONMETADATA_METRICSENTRY._serialized_end=1534
+  _LEARNERSERVICE._serialized_start=1537
+  _LEARNERSERVICE._serialized_end=2221
 # @@protoc_insertion_point(module_scope)
@@ -26,21 +26,46 @@ class LearnerServiceStub(object):
                 request_serializer=metisfl_dot_proto_dot_service__common__pb2.Empty.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_model__pb2.Model.FromString,
                 )
+        self.GetModelStream = channel.unary_stream(
+                '/metisfl.LearnerService/GetModelStream',
+                request_serializer=metisfl_dot_proto_dot_service__common__pb2.Empty.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.FromString,
+                )
         self.SetInitialWeights = channel.unary_unary(
                 '/metisfl.LearnerService/SetInitialWeights',
                 request_serializer=metisfl_dot_proto_dot_model__pb2.Model.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
                 )
+        self.SetInitialWeightsStream = channel.stream_unary(
+                '/metisfl.LearnerService/SetInitialWeightsStream',
+                request_serializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+                )
+        self.SetInitialWeightsRelayStream = channel.stream_unary(
+                '/metisfl.LearnerService/SetInitialWeightsRelayStream',
+                request_serializer=metisfl_dot_proto_dot_learner__pb2.SetInitialWeightsRelayChunk.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_learner__pb2.BroadcastResponse.FromString,
+                )
         self.Train = channel.unary_unary(
                 '/metisfl.LearnerService/Train',
                 request_serializer=metisfl_dot_proto_dot_learner__pb2.TrainRequest.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
                 )
+        self.TrainStream = channel.stream_unary(
+                '/metisfl.LearnerService/TrainStream',
+                request_serializer=metisfl_dot_proto_dot_learner__pb2.TrainRequestChunk.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+                )
         self.Evaluate = channel.unary_unary(
                 '/metisfl.LearnerService/Evaluate',
                 request_serializer=metisfl_dot_proto_dot_learner__pb2.EvaluateRequest.SerializeToString,
                 response_deserializer=metisfl_dot_proto_dot_learner__pb2.EvaluateResponse.FromString,
                 )
+        self.RecoverMasks = channel.unary_stream(
+                '/metisfl.LearnerService/RecoverMasks',
+                request_serializer=metisfl_dot_proto_dot_learner__pb2.RecoverMasksRequest.SerializeToString,
+                response_deserializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.FromString,
+                )
         self.ShutDown = channel.unary_unary(
                 '/metisfl.LearnerService/ShutDown',
                 request_serializer=metisfl_dot_proto_dot_service__common__pb2.Empty.SerializeToString,
@@ -63,24 +88,54 @@ class LearnerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetModelStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def SetInitialWeights(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SetInitialWeightsStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetInitialWeightsRelayStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Train(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def TrainStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Evaluate(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RecoverMasks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ShutDown(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -100,21 +155,46 @@ def add_LearnerServiceServicer_to_server(servicer, server):
                     request_deserializer=metisfl_dot_proto_dot_service__common__pb2.Empty.FromString,
                     response_serializer=metisfl_dot_proto_dot_model__pb2.Model.SerializeToString,
             ),
+            'GetModelStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetModelStream,
+                    request_deserializer=metisfl_dot_proto_dot_service__common__pb2.Empty.FromString,
+                    response_serializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.SerializeToString,
+            ),
             'SetInitialWeights': grpc.unary_unary_rpc_method_handler(
                     servicer.SetInitialWeights,
                     request_deserializer=metisfl_dot_proto_dot_model__pb2.Model.FromString,
                     response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
             ),
+            'SetInitialWeightsStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.SetInitialWeightsStream,
+                    request_deserializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.FromString,
+                    response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
+            ),
+            'SetInitialWeightsRelayStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.SetInitialWeightsRelayStream,
+                    request_deserializer=metisfl_dot_proto_dot_learner__pb2.SetInitialWeightsRelayChunk.FromString,
+                    response_serializer=metisfl_dot_proto_dot_learner__pb2.BroadcastResponse.SerializeToString,
+            ),
             'Train': grpc.unary_unary_rpc_method_handler(
                     servicer.Train,
                     request_deserializer=metisfl_dot_proto_dot_learner__pb2.TrainRequest.FromString,
                     response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
             ),
+            'TrainStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.TrainStream,
+                    request_deserializer=metisfl_dot_proto_dot_learner__pb2.TrainRequestChunk.FromString,
+                    response_serializer=metisfl_dot_proto_dot_service__common__pb2.Ack.SerializeToString,
+            ),
             'Evaluate': grpc.unary_unary_rpc_method_handler(
                     servicer.Evaluate,
                     request_deserializer=metisfl_dot_proto_dot_learner__pb2.EvaluateRequest.FromString,
                     response_serializer=metisfl_dot_proto_dot_learner__pb2.EvaluateResponse.SerializeToString,
             ),
+            'RecoverMasks': grpc.unary_stream_rpc_method_handler(
+                    servicer.RecoverMasks,
+                    request_deserializer=metisfl_dot_proto_dot_learner__pb2.RecoverMasksRequest.FromString,
+                    response_serializer=metisfl_dot_proto_dot_model__pb2.ModelChunk.SerializeToString,
+            ),
             'ShutDown': grpc.unary_unary_rpc_method_handler(
                     servicer.ShutDown,
                     request_deserializer=metisfl_dot_proto_dot_service__common__pb2.Empty.FromString,
@@ -164,6 +244,23 @@ class LearnerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetModelStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/metisfl.LearnerService/GetModelStream',
+            metisfl_dot_proto_dot_service__common__pb2.Empty.SerializeToString,
+            metisfl_dot_proto_dot_model__pb2.ModelChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def SetInitialWeights(request,
             target,
@@ -181,6 +278,40 @@ class LearnerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def SetInitialWeightsStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/metisfl.LearnerService/SetInitialWeightsStream',
+            metisfl_dot_proto_dot_model__pb2.ModelChunk.SerializeToString,
+            metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SetInitialWeightsRelayStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/metisfl.LearnerService/SetInitialWeightsRelayStream',
+            metisfl_dot_proto_dot_learner__pb2.SetInitialWeightsRelayChunk.SerializeToString,
+            metisfl_dot_proto_dot_learner__pb2.BroadcastResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Train(request,
             target,
@@ -198,6 +329,23 @@ class LearnerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def TrainStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/metisfl.LearnerService/TrainStream',
+            metisfl_dot_proto_dot_learner__pb2.TrainRequestChunk.SerializeToString,
+            metisfl_dot_proto_dot_service__common__pb2.Ack.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Evaluate(request,
             target,
@@ -215,6 +363,23 @@ class LearnerService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def RecoverMasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/metisfl.LearnerService/RecoverMasks',
+            metisfl_dot_proto_dot_learner__pb2.RecoverMasksRequest.SerializeToString,
+            metisfl_dot_proto_dot_model__pb2.ModelChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def ShutDown(request,
             target,
@@ -2,9 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: metisfl/proto/model.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -13,190 +13,41 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='metisfl/proto/model.proto',
-  package='metisfl',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x19metisfl/proto/model.proto\x12\x07metisfl\"\xbb\x01\n\x10TensorQuantifier\x12-\n\x10tensor_non_zeros\x18\x01 \x01(\rH\x00R\x0etensorNonZeros\x88\x01\x01\x12&\n\x0ctensor_zeros\x18\x02 \x01(\rH\x01R\x0btensorZeros\x88\x01\x01\x12*\n\x11tensor_size_bytes\x18\x03 \x01(\rR\x0ftensorSizeBytesB\x13\n\x11_tensor_non_zerosB\x0f\n\r_tensor_zeros\"V\n\x06Tensor\x12\x16\n\x06length\x18\x01 \x01(\rR\x06length\x12\x1e\n\ndimensions\x18\x02 \x03(\x03R\ndimensions\x12\x14\n\x05value\x18\x03 \x01(\x0cR\x05value\"P\n\x05Model\x12\x1c\n\tencrypted\x18\x01 \x01(\x08R\tencrypted\x12)\n\x07tensors\x18\x02 \x03(\x0b\x32\x0f.metisfl.TensorR\x07tensorsb\x06proto3'
-)
-
-
-
-
-_TENSORQUANTIFIER = _descriptor.Descriptor(
-  name='TensorQuantifier',
-  full_name='metisfl.TensorQuantifier',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='tensor_non_zeros', full_name='metisfl.TensorQuantifier.tensor_non_zeros', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='tensorNonZeros', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='tensor_zeros', full_name='metisfl.TensorQuantifier.tensor_zeros', index=1,
-      number=2, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='tensorZeros', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='tensor_size_bytes', full_name='metisfl.TensorQuantifier.tensor_size_bytes', index=2,
-      number=3, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='tensorSizeBytes', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-    _descriptor.OneofDescriptor(
-      name='_tensor_non_zeros', full_name='metisfl.TensorQuantifier._tensor_non_zeros',
-      index=0, containing_type=None,
-      create_key=_descriptor._internal_create_key,
-    fields=[]),
-    _descriptor.OneofDescriptor(
-      name='_tensor_zeros', full_name='metisfl.TensorQuantifier._tensor_zeros',
-      index=1, containing_type=None,
-      create_key=_descriptor._internal_create_key,
-    fields=[]),
-  ],
-  serialized_start=39,
-  serialized_end=226,
-)
-
-
-_TENSOR = _descriptor.Descriptor(
-  name='Tensor',
-  full_name='metisfl.Tensor',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='length', full_name='metisfl.Tensor.length', index=0,
-      number=1, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='length', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='dimensions', full_name='metisfl.Tensor.dimensions', index=1,
-      number=2, type=3, cpp_type=2, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='dimensions', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='value', full_name='metisfl.Tensor.value', index=2,
-      number=3, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='value', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=228,
-  serialized_end=314,
-)
-
-
-_MODEL = _descriptor.Descriptor(
-  name='Model',
-  full_name='metisfl.Model',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='encrypted', full_name='metisfl.Model.encrypted', index=0,
-      number=1, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='encrypted', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='tensors', full_name='metisfl.Model.tensors', index=1,
-      number=2, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, json_name='tensors', file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=316,
-  serialized_end=396,
-)
-
-_TENSORQUANTIFIER.oneofs_by_name['_tensor_non_zeros'].fields.append(
-  _TENSORQUANTIFIER.fields_by_name['tensor_non_zeros'])
-_TENSORQUANTIFIER.fields_by_name['tensor_non_zeros'].containing_oneof = _TENSORQUANTIFIER.oneofs_by_name['_tensor_non_zeros']
-_TENSORQUANTIFIER.oneofs_by_name['_tensor_zeros'].fields.append(
-  _TENSORQUANTIFIER.fields_by_name['tensor_zeros'])
-_TENSORQUANTIFIER.fields_by_name['tensor_zeros'].containing_oneof = _TENSORQUANTIFIER.oneofs_by_name['_tensor_zeros']
-_MODEL.fields_by_name['tensors'].message_type = _TENSOR
-DESCRIPTOR.message_types_by_name['TensorQuantifier'] = _TENSORQUANTIFIER
-DESCRIPTOR.message_types_by_name['Tensor'] = _TENSOR
-DESCRIPTOR.message_types_by_name['Model'] = _MODEL
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-TensorQuantifier = _reflection.GeneratedProtocolMessageType('TensorQuantifier', (_message.Message,), {
-  'DESCRIPTOR' : _TENSORQUANTIFIER,
-  '__module__' : 'metisfl.proto.model_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.TensorQuantifier)
-  })
-_sym_db.RegisterMessage(TensorQuantifier)
-
-Tensor = _reflection.GeneratedProtocolMessageType('Tensor', (_message.Message,), {
-  'DESCRIPTOR' : _TENSOR,
-  '__module__' : 'metisfl.proto.model_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.Tensor)
-  })
-_sym_db.RegisterMessage(Tensor)
-
-Model = _reflection.GeneratedProtocolMessageType('Model', (_message.Message,), {
-  'DESCRIPTOR' : _MODEL,
-  '__module__' : 'metisfl.proto.model_pb2'
-  # @@protoc_insertion_point(class_scope:metisfl.Model)
-  })
-_sym_db.RegisterMessage(Model)
-
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19metisfl/proto/model.proto\x12\x07metisfl\"\x8d\x01\n\x10TensorQuantifier\x12\x1d\n\x10tensor_non_zeros\x18\x01 \x01(\rH\x00\x88\x01\x01\x12\x19\n\x0ctensor_zeros\x18\x02 \x01(\rH\x01\x88\x01\x01\x12\x19\n\x11tensor_size_bytes\x18\x03 \x01(\rB\x13\n\x11_tensor_non_zerosB\x0f\n\r_tensor_zeros\"\xcb\x02\n\x05\x44Type\x12!\n\x04type\x18\x01 \x01(\x0e\x32\x13.metisfl.DType.Type\x12,\n\nbyte_order\x18\x02 \x01(\x0e\x32\x18.metisfl.DType.ByteOrder\x12\x15\n\rfortran_order\x18\x03 \x01(\x08\"\x95\x01\n\x04Type\x12\x0b\n\x07\x46LOAT64\x10\x00\x12\x0b\n\x07\x46LOAT32\x10\x01\x12\x0b\n\x07\x46LOAT16\x10\x02\x12\x0c\n\x08\x42\x46LOAT16\x10\x03\x12\x08\n\x04INT8\x10\x04\x12\t\n\x05INT16\x10\x05\x12\t\n\x05INT32\x10\x06\x12\t\n\x05INT64\x10\x07\x12\t\n\x05UINT8\x10\x08\x12\n\n\x06UINT16\x10\t\x12\n\n\x06UINT32\x10\n\x12\n\n\x06UINT64\x10\x0b\"B\n\tByteOrder\x12\x06\n\x02NA\x10\x00\x12\x14\n\x10\x42IG_ENDIAN_ORDER\x10\x01\x12\x17\n\x13LITTLE_ENDIAN_ORDER\x10\x02\">\n\x05\x43odec\"5\n\x04Type\x12\x08\n\x04NONE\x10\x00\x12\x08\n\x04ZSTD\x10\x01\x12\x07\n\x03LZ4\x10\x02\x12\x10\n\x0cSHUFFLE_ZSTD\x10\x03\"\x82\x01\n\x0cQuantization\x12(\n\x04type\x18\x01 \x01(\x0e\x32\x1a.metisfl.Quantization.Type\x12\x12\n\nblock_size\x18\x02 \x01(\r\x12\x0e\n\x06scales\x18\x03 \x03(\x02\"$\n\x04Type\x12\x08\n\x04NONE\x10\x00\x12\x08\n\x04INT8\x10\x01\x12\x08\n\x04INT4\x10\x02\"\x8a\x01\n\x08Sparsity\x12,\n\x08\x65ncoding\x18\x01 \x01(\x0e\x32\x1a.metisfl.Sparsity.Encoding\x12\x12\n\nnum_values\x18\x02 \x01(\r\x12\x0f\n\x07indices\x18\x03 \x01(\x0c\"+\n\x08\x45ncoding\x12\x08\n\x04NONE\x10\x00\x12\t\n\x05\x44\x45LTA\x10\x01\x12\n\n\x06\x42ITMAP\x10\x02\"\xe2\x01\n\x06Tensor\x12\x0e\n\x06length\x18\x01 \x01(\r\x12\x12\n\ndimensions\x18\x02 \x03(\x03\x12\r\n\x05value\x18\x03 \x01(\x0c\x12\x1c\n\x04type\x18\x04 \x01(\x0b\x32\x0e.metisfl.DType\x12\"\n\x05\x63odec\x18\x05 \x01(\x0e\x32\x13.metisfl.Codec.Type\x12+\n\x0cquantization\x18\x06 \x01(\x0b\x32\x15.metisfl.Quantization\x12#\n\x08sparsity\x18\x07 \x01(\x0b\x32\x11.metisfl.Sparsity\x12\x11\n\tencrypted\x18\x08 \x01(\x08\"\xa9\x01\n\x05Model\x12\x11\n\tencrypted\x18\x01 \x01(\x08\x12 \n\x07tensors\x18\x02 \x03(\x0b\x32\x0f.metisfl.Tensor\x12\x0f\n\x07version\x18\x03 \x01(\t\x12\x14\n\x0c\x62\x61se_version\x18\x04 \x01(\t\x12\x11\n\treference\x18\x05 \x01(\x08\x12\x0e\n\x06packed\x18\x06 \x01(\x08\x12!\n\x07masking\x18\x07 \x01(\x0b\x32\x10.metisfl.Masking\"\xae\x01\n\x07Masking\x12\x10\n\x08round_id\x18\x01 \x01(\t\x12\x15\n\rfraction_bits\x18\x02 \x01(\r\x12\x0e\n\x06weight\x18\x03 \x01(\x06\x12\x12\n\ncorrection\x18\x04 \x01(\x08\x12/\n\x10\x65ncrypted_shares\x18\x05 \x03(\x0b\x32\x15.metisfl.MaskingShare\x12%\n\x06shares\x18\x06 \x03(\x0b\x32\x15.metisfl.MaskingShare\"1\n\x0cMaskingShare\x12\x12\n\nlearner_id\x18\x01 \x01(\t\x12\r\n\x05share\x18\x02 \x01(\x0c\"\xe7\x01\n\nModelChunk\x12\x11\n\tencrypted\x18\x01 \x01(\x08\x12\x14\n\x0ctensor_index\x18\x02 \x01(\r\x12$\n\x0btensor_spec\x18\x03 \x01(\x0b\x32\x0f.metisfl.Tensor\x12\x12\n\nvalue_size\x18\x04 \x01(\x04\x12\x0e\n\x06offset\x18\x05 \x01(\x04\x12\x0c\n\x04\x64\x61ta\x18\x06 \x01(\x0c\x12\x0f\n\x07version\x18\x07 \x01(\t\x12\x14\n\x0c\x62\x61se_version\x18\x08 \x01(\t\x12\x0e\n\x06packed\x18\t \x01(\x08\x12!\n\x07masking\x18\n \x01(\x0b\x32\x10.metisfl.Maskingb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'metisfl.proto.model_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _TENSORQUANTIFIER._serialized_start=39
+  _TENSORQUANTIFIER._serialized_end=180
+  _DTYPE._serialized_start=183
+  _DTYPE._serialized_end=514
+  _DTYPE_TYPE._serialized_start=297
+  _DTYPE_TYPE._serialized_end=446
+  _DTYPE_BYTEORDER._serialized_start=448
+  _DTYPE_BYTEORDER._serialized_end=514
+  _CODEC._serialized_start=516
+  _CODEC._serialized_end=578
+  _CODEC_TYPE._serialized_start=525
+  _CODEC_TYPE._serialized_end=578
+  _QUANTIZATION._serialized_start=581
+  _QUANTIZATION._serialized_end=711
+  _QUANTIZATION_TYPE._serialized_start=675
+  _QUANTIZATION_TYPE._serialized_end=711
+  _SPARSITY._serialized_start=714
+  _SPARSITY._serialized_end=852
+  _SPARSITY_ENCODING._serialized_start=809
+  _SPARSITY_ENCODING._serialized_end=852
+  _TENSOR._serialized_start=855
+  _TENSOR._serialized_end=1081
+  _MODEL._serialized_start=1084
+  _MODEL._serialized_end=1253
+  _MASKING._serialized_start=1256
+  _MASKING._serialized_end=1430
+  _MASKINGSHARE._serialized_start=1432
+  _MASKINGSHARE._serialized_end=1481
+  _MODELCHUNK._serialized_start=1484
+  _MODELCHUNK._serialized_end=1715
 # @@protoc_insertion_point(module_scope)
@@ -19,6 +19,7 @@ class ModelProtoMessages(object):
             "u2": model_pb2.DType.Type.UINT16,
             "u4": model_pb2.DType.Type.UINT32,
             "u8": model_pb2.DType.Type.UINT64,
+            "f2": model_pb2.DType.Type.FLOAT16,
             "f4": model_pb2.DType.Type.FLOAT32,
             "f8": model_pb2.DType.Type.FLOAT64
         }
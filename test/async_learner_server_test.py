@@ -0,0 +1,181 @@
+import asyncio
+import queue
+import socket
+import unittest
+
+import numpy as np
+
+from metisfl.common.client import AsyncClient
+from metisfl.common.types import ClientParams, ServerParams
+from metisfl.driver.learner_client import AsyncGRPCLearnerClient
+from metisfl.learner.async_learner_server import AsyncLearnerServer
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.learner.task_manager import TaskManager
+from metisfl.proto import learner_pb2, learner_pb2_grpc, service_common_pb2
+
+
+class InMemoryLearner(object):
+
+    def __init__(self):
+        self.weights = [np.zeros((2, 3), dtype=np.float32)]
+
+    def get_weights(self):
+        return self.weights
+
+    def set_weights(self, weights):
+        self.weights = weights
+        return True
+
+    def train(self, weights, params):
+        return [weight + 1 for weight in weights], {"loss": 0.5}, {}
+
+    def evaluate(self, weights, params):
+        return {"sum": float(sum(weight.sum() for weight in weights))}
+
+
+class RecordingClient(object):
+
+    def __init__(self):
+        self.completed = queue.Queue()
+
+    def train_done(self, task_id, weights, metrics, metadata, **kwargs):
+        self.completed.put((task_id, weights, metrics))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+class AsyncLearnerServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        port = _free_port()
+        self.weights = [np.arange(6, dtype=np.float32).reshape(2, 3)]
+        self.message_helper = MessageHelper()
+        self.client = RecordingClient()
+        self.task_manager = TaskManager()
+        self.server = AsyncLearnerServer(
+            learner=InMemoryLearner(),
+            client=self.client,
+            task_manager=self.task_manager,
+            server_params=ServerParams(hostname="localhost", port=port),
+            max_workers=1,
+        )
+        self.serving = asyncio.create_task(self.server.start())
+
+        client_params = ClientParams(hostname="localhost", port=port)
+        self.learner_client = AsyncGRPCLearnerClient(client_params)
+        self.rpc_client = AsyncClient(client_params, learner_pb2_grpc.LearnerServiceStub)
+        self.stub = self.rpc_client.get_stub()
+        await self.stub.GetHealthStatus(
+            service_common_pb2.Empty(), wait_for_ready=True, timeout=10)
+
+    async def asyncTearDown(self):
+        if not self.serving.done():
+            self.server.stop()
+        await asyncio.wait_for(self.serving, timeout=30)
+        await self.learner_client.shutdown_client()
+        await self.rpc_client.close()
+        self.task_manager.shutdown(force=True)
+
+    async def test_streams_the_model_both_ways(self):
+        ack = await self.learner_client.set_initial_model(
+            self.message_helper.weights_to_model_proto(self.weights), request_timeout=10)
+        self.assertTrue(ack.status)
+
+        model = await self.learner_client.get_model(request_timeout=10)
+        weights = self.message_helper.model_proto_to_weights(model)
+        np.testing.assert_array_equal(weights[0], self.weights[0])
+
+    async def test_consumes_the_chunks_as_they_arrive(self):
+        loop = asyncio.get_running_loop()
+        first_consumed = asyncio.Event()
+        message_helper = self.server._message_helper
+        model_chunks_to_weights = message_helper.model_chunks_to_weights
+
+        def _model_chunks_to_weights(chunks, **kwargs):
+            def _chunks():
+                for index, chunk in enumerate(chunks):
+                    if index == 0:
+                        loop.call_soon_threadsafe(first_consumed.set)
+                    yield chunk
+            return model_chunks_to_weights(_chunks(), **kwargs)
+
+        message_helper.model_chunks_to_weights = _model_chunks_to_weights
+        weights = [np.arange(64, dtype=np.float32)]
+        chunks = list(self.message_helper.weights_to_model_chunks(weights, chunk_size=32))
+        self.assertGreater(len(chunks), 1)
+
+        async def _requests():
+            yield chunks[0]
+            # The rest of the model is sent only once the server consumed the first chunk.
+            await asyncio.wait_for(first_consumed.wait(), timeout=10)
+            for chunk in chunks[1:]:
+                yield chunk
+
+        ack = await self.stub.SetInitialWeightsStream(_requests(), timeout=20)
+        self.assertTrue(ack.status)
+        np.testing.assert_array_equal(self.server._learner.weights[0], weights[0])
+
+    async def test_streams_do_not_hold_the_threads_of_other_requests(self):
+        chunks = list(self.message_helper.weights_to_model_chunks(
+            [np.arange(64, dtype=np.float32)], chunk_size=32))
+        unblocked = asyncio.Event()
+
+        async def _requests():
+            yield chunks[0]
+            await unblocked.wait()
+            for chunk in chunks[1:]:
+                yield chunk
+
+        # The server has a single thread for the other requests, yet they are served meanwhile.
+        upload = asyncio.ensure_future(self.stub.SetInitialWeightsStream(_requests(), timeout=20))
+        await asyncio.sleep(0.2)
+        model = await self.learner_client.get_model(request_timeout=5)
+        self.assertTrue(model.tensors)
+        self.assertFalse(upload.done())
+
+        unblocked.set()
+        self.assertTrue((await upload).status)
+
+    async def test_requests_do_not_hold_threads(self):
+        # The server has a single thread, yet all the streams are served concurrently.
+        models = await asyncio.gather(*[
+            self.learner_client.get_model(request_timeout=10) for _ in range(16)])
+        self.assertEqual(len(models), 16)
+        self.assertTrue(all(model.tensors for model in models))
+
+    async def test_evaluate(self):
+        response = await self.stub.Evaluate(learner_pb2.EvaluateRequest(
+            task_id="evaluate",
+            model=self.message_helper.weights_to_model_proto(self.weights),
+        ), timeout=10)
+        self.assertEqual(response.task_id, "evaluate")
+        self.assertEqual(response.metadata.metrics["sum"], 15.0)
+
+    async def test_trains_in_the_worker(self):
+        ack = await self.stub.Train(learner_pb2.TrainRequest(
+            task_id="train",
+            model=self.message_helper.weights_to_model_proto(self.weights),
+        ), timeout=10)
+        self.assertTrue(ack.status)
+
+        task_id, weights, metrics = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.client.completed.get(timeout=60))
+        self.assertEqual(task_id, "train")
+        self.assertEqual(metrics, {"loss": 0.5})
+        np.testing.assert_array_equal(weights[0], self.weights[0] + 1)
+
+    async def test_shutdown(self):
+        ack = await self.learner_client.shutdown_server(request_timeout=10)
+        self.assertTrue(ack.status)
+        await asyncio.wait_for(self.serving, timeout=30)
+
+        # The server no longer listens.
+        self.assertIsNone(await self.learner_client.get_model(request_timeout=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
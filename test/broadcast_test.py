@@ -0,0 +1,199 @@
+import queue
+import socket
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from metisfl.common.broadcast import ChunkRelay, broadcast_model
+from metisfl.common.chunking import model_to_chunks
+from metisfl.common.server import get_server
+from metisfl.common.types import ClientParams, ServerParams
+from metisfl.driver.learner_client import GRPCLearnerClient
+from metisfl.learner.learner import Learner
+from metisfl.learner.learner_server import LearnerServer
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.proto import learner_pb2, learner_pb2_grpc, model_pb2, service_common_pb2
+
+
+class RecordingLearner(Learner):
+
+    def __init__(self):
+        self.weights = None
+
+    def get_weights(self):
+        return self.weights
+
+    def set_weights(self, weights):
+        self.weights = weights
+        return True
+
+    def train(self, weights, params):
+        return weights, {}, {}
+
+    def evaluate(self, weights, params):
+        return {}
+
+
+class ChunkRecordingServicer(learner_pb2_grpc.LearnerServiceServicer):
+
+    """Records the chunks of SetInitialWeightsStream as they arrive."""
+
+    def __init__(self):
+        self.received = queue.Queue()
+
+    def SetInitialWeightsStream(self, request_iterator, context):
+        for chunk in request_iterator:
+            self.received.put(chunk)
+        return service_common_pb2.Ack(status=True)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+class BroadcastTest(unittest.TestCase):
+
+    NUM_LEARNERS = 7
+
+    def setUp(self):
+        self.weights = [np.arange(300_000, dtype=np.float32), np.ones((3, 3))]
+        # Larger than a chunk.
+        self.model = MessageHelper().weights_to_model_proto(self.weights)
+
+        self.learners, self.servers, self.peers = [], [], []
+        for _ in range(self.NUM_LEARNERS):
+            port = _free_port()
+            learner = RecordingLearner()
+            server = LearnerServer(
+                learner=learner,
+                client=None,
+                task_manager=None,
+                server_params=ServerParams(hostname="localhost", port=port),
+            )
+            threading.Thread(target=server.start, daemon=True).start()
+            self.learners.append(learner)
+            self.servers.append(server)
+            self.peers.append(learner_pb2.RelayPeer(hostname="localhost", port=port))
+
+        for server in self.servers:
+            while server._status != service_common_pb2.ServingStatus.SERVING:
+                time.sleep(0.01)
+
+    def tearDown(self):
+        for server in self.servers:
+            server._server.stop(None)
+
+    def _assert_received(self, learners):
+        for learner in learners:
+            for weight, received in zip(self.weights, learner.weights):
+                np.testing.assert_array_equal(weight, received)
+
+    def test_direct_broadcast(self):
+        reports = broadcast_model(self.model, self.peers, max_concurrency=3)
+
+        self.assertEqual([report.endpoint for report in reports],
+                         ["localhost:{}".format(peer.port) for peer in self.peers])
+        self.assertTrue(all(report.ok for report in reports))
+        self._assert_received(self.learners)
+
+    def test_relay_broadcast(self):
+        reports = broadcast_model(self.model, self.peers, fanout=2)
+
+        self.assertEqual(len(reports), self.NUM_LEARNERS)
+        self.assertTrue(all(report.ok for report in reports))
+        self.assertTrue(all(report.latency_secs > 0 for report in reports))
+        self._assert_received(self.learners)
+
+    def test_failures_are_reported(self):
+        self.servers[0]._server.stop(None)
+
+        reports = broadcast_model(self.model, self.peers, request_timeout=5)
+
+        self.assertFalse(reports[0].ok)
+        self.assertTrue(all(report.ok for report in reports[1:]))
+        self._assert_received(self.learners[1:])
+
+    def test_failed_relay_fails_its_subtree(self):
+        self.servers[0]._server.stop(None)
+
+        reports = broadcast_model(self.model, self.peers, fanout=2, request_timeout=5)
+
+        # Learner 0 relays to learners 2, 4 and 6.
+        self.assertEqual([report.ok for report in reports],
+                         [False, True, False, True, False, True, False])
+        self.assertIn("Relay", reports[2].error)
+        self._assert_received(self.learners[1::2])
+
+    def test_holders_receive_references(self):
+        # The model is obtained from learner 0, which holds it as of then.
+        self.learners[0].weights = self.weights
+        model = self.servers[0].GetModel(service_common_pb2.Empty(), None)
+        self.assertTrue(model.version)
+        self.learners[0].weights = None
+
+        reports = broadcast_model(model, self.peers)
+        self.assertTrue(all(report.ok for report in reports))
+        self._assert_received(self.learners)
+
+        # Every learner holds the model now.
+        reference = model_pb2.Model(version=model.version, reference=True)
+        for peer in self.peers:
+            client = GRPCLearnerClient(ClientParams(hostname="localhost", port=peer.port))
+            self.assertTrue(client.set_initial_model(reference).status)
+            client.shutdown_client()
+
+        unknown = model_pb2.Model(version="unknown", reference=True)
+        client = GRPCLearnerClient(ClientParams(hostname="localhost", port=self.peers[0].port))
+        self.assertFalse(client.set_initial_model(unknown).status)
+        client.shutdown_client()
+
+
+class ChunkRelayTest(unittest.TestCase):
+
+    def setUp(self):
+        model = MessageHelper().weights_to_model_proto([np.arange(300_000, dtype=np.float32)])
+        self.chunks = list(model_to_chunks(model))
+        self.assertGreater(len(self.chunks), 1)
+
+        port = _free_port()
+        self.servicer = ChunkRecordingServicer()
+        server = get_server(
+            ServerParams(hostname="localhost", port=port),
+            self.servicer,
+            learner_pb2_grpc.add_LearnerServiceServicer_to_server,
+        )
+        server.start()
+        self.addCleanup(server.stop, None)
+        self.peers = [learner_pb2.RelayPeer(hostname="localhost", port=port)]
+
+    def test_chunks_are_forwarded_as_they_arrive(self):
+        relay = ChunkRelay(self.peers, request_timeout=10)
+        relay.put(self.chunks[0])
+        # The first chunk is forwarded before the others are given.
+        self.assertEqual(self.servicer.received.get(timeout=5), self.chunks[0])
+
+        for chunk in self.chunks[1:]:
+            relay.put(chunk)
+        relay.close()
+        reports = relay.result()
+
+        self.assertEqual([report.ok for report in reports], [True])
+        self.assertEqual(self.servicer.received.qsize(), len(self.chunks) - 1)
+
+    def test_aborted_relay_fails_the_peers(self):
+        relay = ChunkRelay(self.peers, request_timeout=10)
+        relay.put(self.chunks[0])
+        relay.abort()
+        reports = relay.result()
+
+        self.assertFalse(reports[0].ok)
+        # The request may be cancelled before the peer reads the chunk it was sent.
+        self.assertLessEqual(self.servicer.received.qsize(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
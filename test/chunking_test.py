@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from metisfl.common.chunking import (ModelAssembler, chunks_to_model,
+                                     model_to_chunks)
+from metisfl.learner.message_helper import MessageHelper
+
+
+class ChunkingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.weights = [
+            np.arange(1000, dtype=np.float32).reshape(10, 100),
+            np.zeros((0, 3), dtype=np.float64),
+            np.arange(7, dtype=np.int64),
+        ]
+        self.helper = MessageHelper()
+
+    def test_model_round_trip(self):
+        model = self.helper.weights_to_model_proto(self.weights)
+        chunks = list(model_to_chunks(model, chunk_size=256))
+
+        self.assertTrue(all(len(chunk.data) <= 256 for chunk in chunks))
+        # 4000 bytes in chunks of 256, one chunk for the empty
+        # tensor and one chunk for the 56 bytes of the last tensor.
+        self.assertEqual(len(chunks), 16 + 1 + 1)
+        self.assertEqual(chunks_to_model(chunks), model)
+
+    def test_weights_round_trip(self):
+        chunks = self.helper.weights_to_model_chunks(
+            self.weights, chunk_size=256)
+        converted = self.helper.model_chunks_to_weights(chunks)
+
+        for original, restored in zip(self.weights, converted):
+            self.assertEqual(original.dtype, restored.dtype)
+            self.assertTrue(restored.flags.writeable)
+            self.assertTrue(np.array_equal(original, restored))
+
+    def test_chunks_match_model_proto(self):
+        chunks = self.helper.weights_to_model_chunks(
+            self.weights, chunk_size=256)
+        self.assertEqual(chunks_to_model(chunks),
+                         self.helper.weights_to_model_proto(self.weights))
+
+    def test_out_of_order_chunks(self):
+        chunks = list(self.helper.weights_to_model_chunks(
+            self.weights, chunk_size=256))
+
+        with self.assertRaises(ValueError):
+            chunks_to_model([chunks[0], chunks[2]])
+        with self.assertRaises(ValueError):
+            chunks_to_model(chunks[1:])
+        with self.assertRaises(ValueError):
+            self.helper.model_chunks_to_weights([chunks[0], chunks[2]])
+
+    def test_incomplete_model(self):
+        chunks = list(self.helper.weights_to_model_chunks(
+            self.weights, chunk_size=256))
+
+        assembler = ModelAssembler()
+        assembler.add_chunk(chunks[0])
+        with self.assertRaises(ValueError):
+            assembler.get_model()
+        with self.assertRaises(ValueError):
+            self.helper.model_chunks_to_weights(chunks[:3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+import asyncio
+import socket
+import threading
+import time
+import unittest
+
+import grpc
+
+from metisfl.common.client import AsyncClient, ChannelPool, get_channel_pool, get_client
+from metisfl.common.server import get_server
+from metisfl.common.types import ClientParams, ServerParams
+from metisfl.proto import learner_pb2_grpc, service_common_pb2
+
+
+class HealthyLearnerServicer(learner_pb2_grpc.LearnerServiceServicer):
+
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.num_requests = 0
+        self.lock = threading.Lock()
+
+    def GetHealthStatus(self, request, context):
+        time.sleep(self.delay)
+        with self.lock:
+            self.num_requests += 1
+        return service_common_pb2.Ack(status=True)
+
+
+class FlakyLearnerServicer(learner_pb2_grpc.LearnerServiceServicer):
+
+    """Answers the first request after a second and fails the others with UNAVAILABLE."""
+
+    def __init__(self):
+        self.num_requests = 0
+        self.lock = threading.Lock()
+
+    def GetHealthStatus(self, request, context):
+        with self.lock:
+            self.num_requests += 1
+            first = self.num_requests == 1
+        if not first:
+            context.abort(grpc.StatusCode.UNAVAILABLE, "Unavailable")
+        time.sleep(1)
+        return service_common_pb2.Ack(status=True)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+class ChannelPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.port = _free_port()
+        self.client_params = ClientParams(hostname="localhost", port=self.port)
+
+    def _get_health_status(self):
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            stub, schedule, _ = client
+
+            def _request(_timeout=None):
+                return stub.GetHealthStatus(
+                    service_common_pb2.Empty(), timeout=_timeout)
+
+            return schedule(_request, request_timeout=5)
+
+    def _stats(self):
+        return get_channel_pool().stats()
+
+    def test_channel_is_reused(self):
+        server = get_server(
+            ServerParams(hostname="localhost", port=self.port),
+            HealthyLearnerServicer(),
+            learner_pb2_grpc.add_LearnerServiceServicer_to_server,
+            max_workers=4,
+        )
+        server.start()
+        try:
+            before = self._stats()
+            for _ in range(3):
+                self.assertTrue(self._get_health_status().status)
+            after = self._stats()
+        finally:
+            server.stop(None)
+
+        self.assertEqual(after["channels_created"] - before["channels_created"], 1)
+        self.assertEqual(after["channels_reused"] - before["channels_reused"], 2)
+
+    def test_shutdown_closes_channel(self):
+        before = self._stats()
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            client[2]()
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            client[2]()
+        after = self._stats()
+
+        self.assertEqual(after["channels_created"] - before["channels_created"], 2)
+
+    def test_unavailable_channel_is_replaced(self):
+        before = self._stats()
+        # Nothing listens on the port, hence the request fails with UNAVAILABLE.
+        self.assertIsNone(self._get_health_status())
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            client[2]()
+        after = self._stats()
+
+        self.assertEqual(after["channels_created"] - before["channels_created"], 2)
+        self.assertEqual(after["channels_reused"] - before["channels_reused"], 0)
+
+    def _start_server(self, delay):
+        servicer = HealthyLearnerServicer(delay=delay)
+        server = get_server(
+            ServerParams(hostname="localhost", port=self.port),
+            servicer,
+            learner_pb2_grpc.add_LearnerServiceServicer_to_server,
+            max_workers=4,
+        )
+        server.start()
+        self.addCleanup(server.stop, None)
+        return servicer
+
+    def test_shutdown_does_not_cancel_calls_in_flight(self):
+        self._start_server(delay=1)
+        responses = []
+        call = threading.Thread(target=lambda: responses.append(self._get_health_status()))
+        call.start()
+        time.sleep(0.5)
+
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            client[2]()
+        call.join()
+        self.assertTrue(responses[0].status)
+
+    def test_shutdown_sends_the_scheduled_requests(self):
+        servicer = self._start_server(delay=0.5)
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            stub, schedule, _ = client
+            # The client has a single worker, hence the second request waits for the first one.
+            for _ in range(2):
+                schedule(lambda _timeout=None: stub.GetHealthStatus(
+                    service_common_pb2.Empty(), timeout=_timeout), request_timeout=5, block=False)
+        time.sleep(0.1)
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            client[2]()
+
+        deadline = time.time() + 10
+        while servicer.num_requests < 2 and time.time() < deadline:
+            time.sleep(0.1)
+        self.assertEqual(servicer.num_requests, 2)
+
+    def test_shutdown_does_not_close_the_channel_of_other_clients(self):
+        self._start_server(delay=0)
+        with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as client:
+            stub, schedule, _ = client
+            with get_client(self.client_params, learner_pb2_grpc.LearnerServiceStub) as other:
+                other[2]()
+            response = schedule(lambda _timeout=None: stub.GetHealthStatus(
+                service_common_pb2.Empty(), timeout=_timeout), request_timeout=5)
+        self.assertTrue(response.status)
+
+    def test_clients_do_not_wait_for_each_other(self):
+        self._start_server(delay=1)
+        calls = [threading.Thread(target=self._get_health_status) for _ in range(3)]
+        start = time.perf_counter()
+        for call in calls:
+            call.start()
+        for call in calls:
+            call.join()
+        self.assertLess(time.perf_counter() - start, 2.5)
+
+    def test_pool_per_endpoint(self):
+        pool = ChannelPool()
+        first = pool.acquire("localhost:1")
+        self.assertIs(pool.acquire("localhost:1"), first)
+        self.assertIsNot(pool.acquire("localhost:2"), first)
+        self.assertEqual(pool.stats(), {"channels_created": 2, "channels_reused": 1})
+        pool.close()
+
+
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_unavailable_does_not_cancel_calls_in_flight(self):
+        port = _free_port()
+        server = get_server(
+            ServerParams(hostname="localhost", port=port),
+            FlakyLearnerServicer(),
+            learner_pb2_grpc.add_LearnerServiceServicer_to_server,
+            max_workers=4,
+        )
+        server.start()
+        self.addCleanup(server.stop, None)
+        client = AsyncClient(ClientParams(hostname="localhost", port=port),
+                             learner_pb2_grpc.LearnerServiceStub)
+
+        async def _request(stub, _timeout=None):
+            return await stub.GetHealthStatus(
+                service_common_pb2.Empty(), wait_for_ready=True, timeout=_timeout)
+
+        in_flight = asyncio.ensure_future(client.request(_request, request_timeout=10))
+        await asyncio.sleep(0.5)
+        channel = client._channel
+        self.assertIsNone(await client.request(_request, request_timeout=10))
+
+        # The request in flight on the shared channel completes.
+        self.assertTrue((await in_flight).status)
+        self.assertIs(client._channel, channel)
+        await client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+from metisfl.common import codec
+from metisfl.common.codec import codec_from_name, decode_value, encode_value
+from metisfl.common.types import GlobalTrainConfig
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.proto import model_pb2
+
+CODECS = [
+    model_pb2.Codec.Type.ZSTD,
+    model_pb2.Codec.Type.LZ4,
+    model_pb2.Codec.Type.SHUFFLE_ZSTD,
+]
+
+
+@unittest.skipIf(codec.zstandard is None or codec.lz4_frame is None,
+                 "zstandard or lz4 is not installed")
+class CodecTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.weights = [
+            rng.normal(size=(64, 32)).astype(np.float32),
+            np.zeros(1000, dtype=np.float64),
+            np.arange(7, dtype=np.int16),
+            np.zeros(0, dtype=np.float32),
+        ]
+
+    def _assert_weights_equal(self, weights):
+        self.assertEqual(len(weights), len(self.weights))
+        for original, restored in zip(self.weights, weights):
+            self.assertEqual(original.dtype, restored.dtype)
+            self.assertEqual(original.shape, restored.shape)
+            self.assertTrue(np.array_equal(original, restored))
+
+    def test_value_round_trip(self):
+        value = self.weights[0].tobytes()
+        for tensor_codec in CODECS:
+            encoded = encode_value(value, tensor_codec, itemsize=4)
+            out = bytearray(len(value))
+            decode_value(encoded, tensor_codec, memoryview(out), itemsize=4)
+            self.assertEqual(bytes(out), value)
+
+    def test_decoded_size_is_checked(self):
+        value = self.weights[1].tobytes()
+        for tensor_codec in CODECS:
+            encoded = encode_value(value, tensor_codec, itemsize=8)
+            with self.assertRaises(Exception):
+                decode_value(encoded, tensor_codec,
+                             memoryview(bytearray(len(value) - 8)), itemsize=8)
+
+    def test_model_proto_round_trip(self):
+        for tensor_codec in CODECS:
+            helper = MessageHelper(codec=tensor_codec)
+            model = helper.weights_to_model_proto(self.weights)
+            for tensor in model.tensors:
+                self.assertEqual(tensor.codec, tensor_codec)
+            # Zeros compress well with every codec.
+            self.assertLess(len(model.tensors[1].value), 1000 * 8 / 10)
+            self._assert_weights_equal(MessageHelper().model_proto_to_weights(model))
+
+    def test_model_chunks_round_trip(self):
+        helper = MessageHelper()
+        for tensor_codec in CODECS:
+            chunks = list(helper.weights_to_model_chunks(
+                self.weights, chunk_size=1000, codec=tensor_codec))
+            self.assertEqual(chunks[0].tensor_spec.codec, tensor_codec)
+            weights = helper.model_chunks_to_weights(chunks)
+            self._assert_weights_equal(weights)
+            weights[0][0, 0] = 1.0
+
+    def test_codec_from_name(self):
+        self.assertEqual(codec_from_name(None), model_pb2.Codec.Type.NONE)
+        self.assertEqual(codec_from_name("ShuffleZstd"),
+                         model_pb2.Codec.Type.SHUFFLE_ZSTD)
+        with self.assertRaises(ValueError):
+            codec_from_name("Gzip")
+
+    def test_global_train_config(self):
+        config = GlobalTrainConfig(
+            aggregation_rule="FedAvg",
+            communication_protocol="Synchronous",
+            scaling_factor="NumParticipants",
+            tensor_codec="LZ4",
+        )
+        self.assertEqual(config.tensor_codec, "LZ4")
+        with self.assertRaises(ValueError):
+            GlobalTrainConfig(
+                aggregation_rule="FedAvg",
+                communication_protocol="Synchronous",
+                scaling_factor="NumParticipants",
+                tensor_codec="Gzip",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
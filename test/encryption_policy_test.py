@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+from metisfl.common.chunking import chunks_to_model
+from metisfl.encryption.policy import EncryptionPolicy
+from metisfl.encryption.scheme import EncryptionScheme
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.proto import model_pb2
+
+
+class PlaintextScheme(EncryptionScheme):
+
+    """Stands in for CKKS: "encrypts" the doubles as they are."""
+
+    def encrypt(self, data):
+        return np.asarray(data, dtype=np.float64).tobytes()
+
+    def decrypt(self, data, length):
+        return np.frombuffer(data, dtype=np.float64)[:length]
+
+
+class EncryptionPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.weights = [
+            np.arange(12, dtype=np.float32).reshape(3, 4),
+            np.array([1, 2, 3], dtype=np.int64),
+            np.linspace(0, 1, 50, dtype=np.float64).reshape(5, 10),
+            np.array([0.5, -0.5], dtype=np.float32),
+        ]
+        self.names = ["dense/kernel", "dense/bias", "output/kernel", "output/bias"]
+
+    def test_select(self):
+        self.assertEqual(EncryptionPolicy().select(self.weights), [True] * 4)
+        self.assertEqual(EncryptionPolicy(last_tensors=2).select(self.weights),
+                         [False, False, True, True])
+        self.assertEqual(EncryptionPolicy(min_size=12).select(self.weights),
+                         [True, False, True, False])
+        policy = EncryptionPolicy(name_patterns=["*/bias"], tensor_names=self.names)
+        self.assertEqual(policy.select(self.weights), [False, True, False, True])
+        # The criteria are combined.
+        policy = EncryptionPolicy(last_tensors=1, min_size=50)
+        self.assertEqual(policy.select(self.weights), [False, False, True, True])
+
+    def test_invalid_policies(self):
+        with self.assertRaises(ValueError):
+            EncryptionPolicy(name_patterns=["*/bias"])
+        with self.assertRaises(ValueError):
+            EncryptionPolicy(last_tensors=-1)
+        with self.assertRaises(ValueError):
+            EncryptionPolicy(tensor_names=self.names[:2]).select(self.weights)
+
+    def test_mixed_models_round_trip(self):
+        policy = EncryptionPolicy(last_tensors=2)
+        for pack_tensors in [True, False]:
+            for codec in [model_pb2.Codec.Type.NONE, model_pb2.Codec.Type.ZSTD]:
+                helper = MessageHelper(scheme=PlaintextScheme(), codec=codec,
+                                       pack_tensors=pack_tensors, encryption_policy=policy)
+
+                model = helper.weights_to_model_proto(self.weights)
+                self.assertFalse(model.encrypted)
+                self.assertEqual(model.packed, pack_tensors)
+                self.assertEqual([tensor.encrypted for tensor in model.tensors],
+                                 [False, False, True, True])
+                self.assertEqual([tensor.codec for tensor in model.tensors],
+                                 [codec, codec, model_pb2.Codec.Type.NONE,
+                                  model_pb2.Codec.Type.NONE])
+                if pack_tensors:
+                    # The first encrypted tensor carries the ciphertexts of all of them.
+                    self.assertEqual(len(model.tensors[2].value), 52 * 8)
+                    self.assertEqual(model.tensors[3].value, b"")
+
+                chunks = list(helper.weights_to_model_chunks(self.weights, chunk_size=16))
+                self.assertFalse(any(chunk.encrypted for chunk in chunks))
+                self.assertEqual(chunks_to_model(chunks), model)
+                for converted in [helper.model_proto_to_weights(model),
+                                  helper.model_chunks_to_weights(chunks)]:
+                    for original, restored in zip(self.weights, converted):
+                        self.assertEqual(original.dtype, restored.dtype)
+                        self.assertEqual(original.shape, restored.shape)
+                        np.testing.assert_array_equal(original, restored)
+
+    def test_mixed_models_require_a_scheme(self):
+        helper = MessageHelper(scheme=PlaintextScheme(),
+                               encryption_policy=EncryptionPolicy(last_tensors=1))
+        model = helper.weights_to_model_proto(self.weights)
+        chunks = list(helper.weights_to_model_chunks(self.weights))
+        with self.assertRaises(ValueError):
+            MessageHelper().model_proto_to_weights(model)
+        with self.assertRaises(ValueError):
+            MessageHelper().model_chunks_to_weights(chunks)
+
+    def test_policy_without_a_scheme(self):
+        helper = MessageHelper(encryption_policy=EncryptionPolicy(last_tensors=1))
+        model = helper.weights_to_model_proto(self.weights)
+        self.assertFalse(any(tensor.encrypted for tensor in model.tensors))
+        for original, restored in zip(self.weights, helper.model_proto_to_weights(model)):
+            np.testing.assert_array_equal(original, restored)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+
+from metisfl.learner.evaluation_cache import EvaluationCache
+from metisfl.learner.learner import try_call_evaluate
+
+
+class CountingLearner(object):
+
+    def __init__(self):
+        self.num_evaluations = 0
+        self.dataset_version = "1"
+
+    def evaluate(self, weights, params):
+        self.num_evaluations += 1
+        return {"accuracy": float(weights[0].sum()), "loss": 0.5}
+
+    def get_dataset_version(self):
+        return self.dataset_version
+
+
+class EvaluationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.weights = [np.ones((2, 3), dtype=np.float32), np.zeros(4, dtype=np.int64)]
+        self.params = {"batchSize": 32, "metrics": ["accuracy"]}
+
+    def test_key(self):
+        key = EvaluationCache.key(self.weights, self.params)
+        self.assertEqual(key, EvaluationCache.key(
+            [weight.copy() for weight in self.weights],
+            {"metrics": ["accuracy"], "batchSize": 32}))
+        self.assertNotEqual(key, EvaluationCache.key(self.weights, {"batchSize": 64}))
+        self.assertNotEqual(key, EvaluationCache.key(
+            [self.weights[0] * 2, self.weights[1]], self.params))
+        self.assertNotEqual(key, EvaluationCache.key(
+            [self.weights[0].astype(np.float64), self.weights[1]], self.params))
+
+    def test_least_recently_used_models_are_evicted(self):
+        cache = EvaluationCache(capacity=2)
+        cache.put("a", {"loss": 1.0})
+        cache.put("b", {"loss": 2.0})
+        self.assertEqual(cache.get("a"), {"loss": 1.0})
+        cache.put("c", {"loss": 3.0})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"loss": 1.0})
+        self.assertEqual(cache.get("c"), {"loss": 3.0})
+
+        # The held metrics are copies.
+        cache.get("a")["loss"] = 0.0
+        self.assertEqual(cache.get("a"), {"loss": 1.0})
+
+    def test_dataset_changes_drop_the_metrics(self):
+        cache = EvaluationCache()
+        cache.put("a", {"loss": 1.0}, dataset_version="1")
+        self.assertEqual(cache.get("a", dataset_version="1"), {"loss": 1.0})
+        self.assertIsNone(cache.get("a", dataset_version="2"))
+        self.assertIsNone(cache.get("a", dataset_version="1"))
+
+        cache.put("a", {"loss": 1.0})
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_repeat_evaluations_are_not_run(self):
+        learner = CountingLearner()
+        cache = EvaluationCache()
+        for _ in range(3):
+            metrics = try_call_evaluate(learner, self.weights, self.params, cache=cache)
+        self.assertEqual(metrics, {"accuracy": 6.0, "loss": 0.5})
+        self.assertEqual(learner.num_evaluations, 1)
+
+        try_call_evaluate(learner, self.weights, {"batchSize": 64}, cache=cache)
+        self.assertEqual(learner.num_evaluations, 2)
+
+        learner.dataset_version = "2"
+        try_call_evaluate(learner, self.weights, self.params, cache=cache)
+        self.assertEqual(learner.num_evaluations, 3)
+
+        try_call_evaluate(learner, self.weights, self.params)
+        self.assertEqual(learner.num_evaluations, 4)
+
+    def test_given_dataset_version_takes_precedence(self):
+        # E.g., the learner is a copy in a worker, while the dataset changed in the parent.
+        learner = CountingLearner()
+        cache = EvaluationCache()
+        try_call_evaluate(learner, self.weights, self.params, cache=cache, dataset_version="1")
+        try_call_evaluate(learner, self.weights, self.params, cache=cache, dataset_version="1")
+        self.assertEqual(learner.num_evaluations, 1)
+
+        try_call_evaluate(learner, self.weights, self.params, cache=cache, dataset_version="2")
+        self.assertEqual(learner.num_evaluations, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import glob
+import os
+import queue
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from metisfl.learner.evaluation_cache import EvaluationCache
+from metisfl.learner.evaluation_executor import EvaluationExecutor
+from metisfl.learner.shared_weights import SHARED_MEMORY_DIR
+
+
+class CountingLearner(object):
+
+    def __init__(self):
+        self.num_evaluations = 0
+
+    def evaluate(self, weights, params):
+        if params.get("crash"):
+            raise RuntimeError("Evaluation crashed")
+        if params.get("wait_for"):
+            while not os.path.exists(params["wait_for"]):
+                time.sleep(0.01)
+        self.num_evaluations += 1
+        return {
+            "sum": float(sum(weight.sum() for weight in weights)),
+            "num_evaluations": self.num_evaluations,
+            "pid": os.getpid(),
+            "cpus": sorted(os.sched_getaffinity(0)),
+            "niceness": os.nice(0),
+        }
+
+
+class VersionedLearner(CountingLearner):
+
+    def __init__(self):
+        super().__init__()
+        self.dataset_version = "v1"
+
+    def get_dataset_version(self):
+        return self.dataset_version
+
+    def evaluate(self, weights, params):
+        metrics = super().evaluate(weights, params)
+        metrics["dataset_version"] = self.dataset_version
+        return metrics
+
+
+class EvaluationExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.weights = [np.ones((3, 4), dtype=np.float32), np.arange(5, dtype=np.float64)]
+
+    def _executor(self, **kwargs):
+        executor = EvaluationExecutor(learner=CountingLearner(), **kwargs)
+        self.addCleanup(executor.shutdown, True)
+        return executor
+
+    def test_evaluates_in_a_resident_worker(self):
+        executor = self._executor()
+        results = queue.Queue()
+        futures = [executor.submit(self.weights, {}, callback=results.put) for _ in range(3)]
+        metrics = [future.result(timeout=60) for future in futures]
+
+        self.assertEqual([m["sum"] for m in metrics], [22.0] * 3)
+        # The same learner evaluates all the models, apart from this process.
+        self.assertEqual([m["num_evaluations"] for m in metrics], [1, 2, 3])
+        self.assertEqual(len({m["pid"] for m in metrics}), 1)
+        self.assertNotEqual(metrics[0]["pid"], os.getpid())
+        self.assertEqual(sorted(results.get(timeout=5)["num_evaluations"] for _ in range(3)),
+                         [1, 2, 3])
+
+    def test_caches_the_metrics_in_the_worker(self):
+        executor = self._executor(evaluation_cache=EvaluationCache())
+        metrics = [executor.submit(self.weights, {}).result(timeout=60) for _ in range(2)]
+        self.assertEqual([m["num_evaluations"] for m in metrics], [1, 1])
+
+        metrics = executor.submit(self.weights, {"batchSize": 8}).result(timeout=60)
+        self.assertEqual(metrics["num_evaluations"], 2)
+
+    def test_invalidates_the_cache_of_the_worker(self):
+        cache = EvaluationCache()
+        executor = self._executor(evaluation_cache=cache)
+        self.assertEqual(executor.submit(self.weights, {}).result(timeout=60)["num_evaluations"], 1)
+
+        executor.invalidate_cache().result(timeout=60)
+        metrics = executor.submit(self.weights, {}).result(timeout=60)
+        self.assertEqual(metrics["num_evaluations"], 2)
+        self.assertIsNone(self._executor().invalidate_cache())
+
+    def test_failed_evaluations_are_not_reported(self):
+        executor = self._executor()
+        results = []
+        future = executor.submit(self.weights, {"crash": True}, callback=results.append)
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=60)
+        self.assertEqual(executor.submit(self.weights, {}).result(timeout=60)["sum"], 22.0)
+        self.assertEqual(results, [])
+
+    def test_refuses_evaluations_beyond_the_queue_depth(self):
+        executor = self._executor(max_pending=2)
+        flag = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            ".evaluation_executor_test_{}".format(os.getpid()))
+        self.addCleanup(lambda: os.path.exists(flag) and os.remove(flag))
+
+        first = executor.submit(self.weights, {"wait_for": flag})
+        second = executor.submit(self.weights, {})
+        self.assertIsNone(executor.submit(self.weights, {}))
+        self.assertEqual(executor.pending(), 2)
+
+        open(flag, "w").close()
+        first.result(timeout=60)
+        second.result(timeout=60)
+        self.assertIsNotNone(executor.submit(self.weights, {}))
+
+    def test_failed_submissions_are_not_pending(self):
+        executor = self._executor(max_pending=1)
+        with mock.patch("metisfl.learner.evaluation_executor.share_weights",
+                        side_effect=OSError("No space left on device")):
+            with self.assertRaises(OSError):
+                executor.submit(self.weights, {})
+        self.assertEqual(executor.pending(), 0)
+        self.assertEqual(executor.submit(self.weights, {}).result(timeout=60)["sum"], 22.0)
+
+        pattern = os.path.join(SHARED_MEMORY_DIR, "metisfl-weights-*")
+        shared = set(glob.glob(pattern))
+        executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            executor.submit(self.weights, {})
+        self.assertEqual(executor.pending(), 0)
+        self.assertEqual(set(glob.glob(pattern)), shared)
+
+    def test_pins_and_deprioritizes_the_worker(self):
+        cpu = min(os.sched_getaffinity(0))
+        executor = self._executor(niceness=5, cpu_affinity=[cpu])
+        metrics = executor.submit(self.weights, {}).result(timeout=60)
+
+        self.assertEqual(metrics["cpus"], [cpu])
+        self.assertEqual(metrics["niceness"], os.nice(0) + 5)
+
+    def test_sends_the_learner_again_when_refreshed(self):
+        executor = self._executor()
+        first = executor.submit(self.weights, {}).result(timeout=60)
+        executor.refresh()
+        second = executor.submit(self.weights, {}).result(timeout=60)
+
+        # A new worker evaluates with a new snapshot of the learner.
+        self.assertNotEqual(first["pid"], second["pid"])
+        self.assertEqual(second["num_evaluations"], 1)
+
+    def test_sends_the_learner_again_when_the_dataset_changes(self):
+        learner = VersionedLearner()
+        executor = EvaluationExecutor(learner=learner)
+        self.addCleanup(executor.shutdown, True)
+        self.assertEqual(executor.submit(self.weights, {}).result(timeout=60)["dataset_version"],
+                         "v1")
+
+        learner.dataset_version = "v2"
+        metrics = executor.submit(self.weights, {}).result(timeout=60)
+        self.assertEqual(metrics["dataset_version"], "v2")
+        self.assertEqual(metrics["num_evaluations"], 1)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            EvaluationExecutor(learner=CountingLearner(), max_pending=0)
+        with self.assertRaises(ValueError):
+            EvaluationExecutor(learner=CountingLearner(), niceness=-1)
+        with self.assertRaises(ValueError):
+            EvaluationExecutor(learner=CountingLearner(), cpu_affinity=[os.cpu_count() + 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
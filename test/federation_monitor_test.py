@@ -0,0 +1,126 @@
+import unittest
+
+from metisfl.common.types import TerminationSingals
+from metisfl.driver.federation_monitor import FederationMonitor
+from metisfl.proto import controller_pb2, learner_pb2
+
+
+def _logs(cursor, training=(), evaluations=None, updates=()):
+    logs = controller_pb2.Logs(cursor=cursor)
+    for task_id in training:
+        logs.training_metadata[task_id].completed_batches = 10
+    for task_id, accuracy in (evaluations or {}).items():
+        logs.evaluation_metadata[task_id].CopyFrom(
+            learner_pb2.EvaluationMetadata(metrics={"accuracy": accuracy}))
+    for update_id in updates:
+        logs.model_metadata[update_id].aggregation_duration_ms = 1.0
+    return logs
+
+
+class FakeControllerClient(object):
+
+    def __init__(self, deltas):
+        self.deltas = list(deltas)
+        self.cursors = []
+
+    def get_logs_since(self, cursor):
+        self.cursors.append(cursor)
+        return self.deltas.pop(0)
+
+
+class FederationMonitorTest(unittest.TestCase):
+
+    def _monitor(self, client, **signals):
+        return FederationMonitor(
+            termination_signals=TerminationSingals(**signals),
+            controller_client=client,
+            is_async=False,
+        )
+
+    def test_merges_deltas(self):
+        client = FakeControllerClient([
+            _logs(2, training=["t1", "t2"]),
+            _logs(4, training=["t3"], updates=["u1"]),
+            _logs(4),
+        ])
+        monitor = self._monitor(client)
+
+        for _ in range(3):
+            monitor._collect_statistics()
+
+        # Every request asks only for what changed after the previous one.
+        self.assertEqual(client.cursors, [0, 2, 4])
+        self.assertEqual(set(monitor._statistics["training_metadata"]), {"t1", "t2", "t3"})
+        self.assertEqual(monitor._statistics["training_metadata"]["t3"]["completed_batches"], 10)
+        self.assertEqual(set(monitor._statistics["model_metadata"]), {"u1"})
+
+    def test_merges_learner_phase_durations(self):
+        first = _logs(1, training=["t1"])
+        first.learner_phase_durations["l1"].phases["train"].CopyFrom(
+            controller_pb2.PhaseDurationSummary(count=1, total_ms=100, max_ms=100, last_ms=100))
+        second = _logs(2, training=["t2"])
+        second.learner_phase_durations["l1"].phases["train"].CopyFrom(
+            controller_pb2.PhaseDurationSummary(count=2, total_ms=250, max_ms=150, last_ms=150))
+        monitor = self._monitor(FakeControllerClient([first, second]))
+
+        monitor._collect_statistics()
+        monitor._collect_statistics()
+
+        # The summaries are cumulative, hence the latest one replaces the previous one.
+        self.assertEqual(monitor._statistics["learner_phase_durations"]["l1"]["phases"]["train"],
+                         {"count": 2, "total_ms": 250.0, "max_ms": 150.0, "last_ms": 150.0})
+
+    def test_federation_rounds(self):
+        client = FakeControllerClient([
+            _logs(1, updates=["u1"]),
+            _logs(2, updates=["u2"]),
+        ])
+        monitor = self._monitor(client, federation_rounds=2)
+
+        monitor._collect_statistics()
+        self.assertFalse(monitor._reached_federation_rounds())
+        monitor._collect_statistics()
+        self.assertTrue(monitor._reached_federation_rounds())
+
+    def test_evaluation_score_of_latest_evaluations(self):
+        client = FakeControllerClient([
+            _logs(2, evaluations={"e1": 0.5, "e2": 0.7}),
+            _logs(3, training=["t1"]),
+            _logs(5, evaluations={"e3": 0.9, "e4": 0.95}),
+        ])
+        monitor = self._monitor(
+            client, evaluation_metric="accuracy", evaluation_metric_cutoff_score=0.9)
+
+        monitor._collect_statistics()
+        self.assertFalse(monitor._reached_evaluation_score())
+        monitor._collect_statistics()
+        self.assertFalse(monitor._reached_evaluation_score())
+        monitor._collect_statistics()
+        self.assertTrue(monitor._reached_evaluation_score())
+
+    def test_watch(self):
+        class FakeStream(object):
+            def __init__(self, deltas):
+                self._deltas = iter(deltas)
+                self.cancelled = False
+
+            def __iter__(self):
+                return self._deltas
+
+            def cancel(self):
+                self.cancelled = True
+
+        stream = FakeStream([_logs(1, updates=["u1"]), _logs(2, updates=["u2"])])
+        client = FakeControllerClient([])
+        client.watch_logs = lambda cursor: stream
+        monitor = self._monitor(client, federation_rounds=2)
+
+        statistics = monitor.monitor_federation(request_every_secs=0.01, watch=True)
+
+        self.assertEqual(set(statistics["model_metadata"]), {"u1", "u2"})
+        self.assertTrue(stream.cancelled)
+        self.assertEqual(client.cursors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
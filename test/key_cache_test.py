@@ -0,0 +1,111 @@
+import multiprocessing as mp
+import os
+import stat
+import struct
+import tempfile
+import unittest
+
+from metisfl.encryption.key_cache import CryptoMaterialCache, read_crypto_material
+
+
+def _load_in_process(paths, cache_dir):
+    return CryptoMaterialCache(*paths, cache_dir=cache_dir).load()
+
+
+class KeyCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, content in [("crypto_context.bin", b"\x00context\xff"),
+                              ("public_key.bin", b"public"),
+                              ("private_key.bin", b"\x01private")]:
+            path = os.path.join(self.dir.name, name)
+            with open(path, "wb") as f:
+                f.write(content)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.dir.cleanup()
+        self.cache_dir.cleanup()
+
+    def test_other_processes_read_the_cache(self):
+        cache = CryptoMaterialCache(*self.paths, cache_dir=self.cache_dir.name)
+        material = cache.load()
+        self.assertEqual(material, read_crypto_material(*self.paths))
+        self.assertTrue(os.path.exists(cache.path))
+
+        # The cache is identified by the key files; once it is published, the crypto context and
+        # the public key are not read again. Overwriting them in place with the same size and
+        # time shows that.
+        for path in self.paths[:2]:
+            stat = os.stat(path)
+            with open(path, "r+b") as f:
+                f.write(b"x" * stat.st_size)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with mp.get_context("spawn").Pool(1) as pool:
+            loaded = pool.apply(_load_in_process, (self.paths, self.cache_dir.name))
+        self.assertEqual(loaded, material)
+
+    def test_private_key_is_not_cached(self):
+        cache = CryptoMaterialCache(*self.paths, cache_dir=self.cache_dir.name)
+        self.assertEqual(cache.load().private_key, b"\x01private")
+        with open(cache.path, "rb") as f:
+            self.assertNotIn(b"\x01private", f.read())
+        self.assertEqual(
+            _load_in_process(self.paths, self.cache_dir.name).private_key, b"\x01private")
+
+    def test_rotated_keys_get_a_new_cache(self):
+        cache = CryptoMaterialCache(*self.paths, cache_dir=self.cache_dir.name)
+        cache.load()
+
+        with open(self.paths[1], "wb") as f:
+            f.write(b"rotated public key")
+        rotated = CryptoMaterialCache(*self.paths, cache_dir=self.cache_dir.name)
+        self.assertNotEqual(rotated.path, cache.path)
+        self.assertEqual(rotated.load().public_key, b"rotated public key")
+
+        # The cache of the replaced keys is removed.
+        self.assertEqual(os.listdir(self.cache_dir.name), [os.path.basename(rotated.path)])
+
+    def test_invalid_cache_is_replaced(self):
+        cache = CryptoMaterialCache(*self.paths[:2], cache_dir=self.cache_dir.name)
+        with open(cache.path, "wb") as f:
+            f.write(b"MFLK truncated")
+
+        material = cache.load()
+        self.assertEqual(material.private_key, b"")
+        self.assertEqual(material.crypto_context, b"\x00context\xff")
+        self.assertEqual(_load_in_process(self.paths[:2], self.cache_dir.name), material)
+
+        cache.release()
+        self.assertFalse(os.path.exists(cache.path))
+
+    def test_cache_accessible_by_others_is_not_trusted(self):
+        cache = CryptoMaterialCache(*self.paths[:2], cache_dir=self.cache_dir.name)
+        forged = (b"forged context", b"forged public key")
+        with open(cache.path, "wb") as f:
+            f.write(struct.pack("<4sI2Q", b"MFLK", 2, *map(len, forged)) + b"".join(forged))
+        os.chmod(cache.path, 0o666)
+
+        self.assertEqual(cache.load(), read_crypto_material(*self.paths[:2]))
+        self.assertEqual(stat.S_IMODE(os.stat(cache.path).st_mode), 0o600)
+        self.assertEqual(_load_in_process(self.paths[:2], self.cache_dir.name),
+                         read_crypto_material(*self.paths[:2]))
+
+    @unittest.skipUnless(os.getuid() == 0, "Changing the owner of a file requires root")
+    def test_cache_of_another_user_is_not_trusted(self):
+        cache = CryptoMaterialCache(*self.paths[:2], cache_dir=self.cache_dir.name)
+        forged = (b"forged context", b"forged public key")
+        with open(cache.path, "wb") as f:
+            f.write(struct.pack("<4sI2Q", b"MFLK", 2, *map(len, forged)) + b"".join(forged))
+        os.chmod(cache.path, 0o600)
+        os.chown(cache.path, 65534, -1)
+
+        self.assertEqual(cache.load(), read_crypto_material(*self.paths[:2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
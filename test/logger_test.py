@@ -0,0 +1,65 @@
+import logging
+import logging.handlers
+import sys
+import threading
+import unittest
+from unittest import mock
+
+from metisfl.common.logger import MetisLogger
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+
+
+class MetisLoggerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = MetisLogger.getlogger()
+        self.handler = RecordingHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        MetisLogger.disable_async()
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+
+    def test_caller_location(self):
+        lineno = sys._getframe().f_lineno + 1
+        MetisLogger.info("hello")
+        record, = self.handler.records
+        self.assertEqual(record.getMessage(), "hello")
+        self.assertEqual(record.pathname, __file__)
+        self.assertEqual(record.lineno, lineno)
+
+    def test_disabled_level_does_no_work(self):
+        with mock.patch.object(self.logger, "findCaller") as find_caller:
+            MetisLogger.debug("hidden")
+        find_caller.assert_not_called()
+        self.assertEqual(self.handler.records, [])
+
+    def test_async_logging(self):
+        MetisLogger.enable_async()
+        MetisLogger.enable_async()
+        MetisLogger.warning("queued")
+        MetisLogger.disable_async()
+
+        record, = self.handler.records
+        self.assertEqual(record.getMessage(), "queued")
+        self.assertEqual(record.pathname, __file__)
+        self.assertIsNot(self.handler.threads[0], threading.current_thread())
+        self.assertIn(self.handler, self.logger.handlers)
+        self.assertFalse(any(isinstance(handler, logging.handlers.QueueHandler)
+                             for handler in self.logger.handlers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+import os
+import stat
+import tempfile
+import unittest
+
+import numpy as np
+
+from metisfl.common.chunking import chunks_to_model
+from metisfl.encryption.masking import (PairwiseMasking, expand_masks,
+                                        reconstruct_seed, share_seed)
+from metisfl.learner.message_helper import MessageHelper
+
+
+def _values(model):
+    """Returns the masked weight of the model, followed by all its masked values."""
+    return np.concatenate([[np.uint64(model.masking.weight)], np.frombuffer(
+        b"".join(tensor.value for tensor in model.tensors), dtype="<u8")])
+
+
+def _average(total):
+    """Returns the average of the unmasked sum of the weighted values and the weights."""
+    signed = total.view(np.int64)
+    return signed[1:] / float(signed[0])
+
+
+class PairwiseMaskingTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.learners = {name: PairwiseMasking(fraction_bits=20) for name in ["a", "b", "c"]}
+        self.peers = {name: masking.public_key for name, masking in self.learners.items()}
+        self.weights = {
+            name: [rng.normal(size=(4, 3)).astype(np.float32), rng.normal(size=5)]
+            for name in self.learners
+        }
+        self.scales = {"a": 1.0, "b": 2.0, "c": 5.0}
+
+    def _masked_models(self, names, round_id="round-1", pack_tensors=True):
+        models = []
+        for name in names:
+            masking = self.learners[name]
+            masking.set_active_round(round_id, self.scales[name])
+            helper = MessageHelper(scheme=masking, pack_tensors=pack_tensors)
+            models.append(helper.weights_to_model_proto(self.weights[name]))
+        return models
+
+    def _recover(self, models, survivors, dropped):
+        """Recovers the masks like the Controller does: relays the encrypted shares of the
+            survivors, sums the corrections and removes the reconstructed self masks."""
+        encrypted = {
+            name: {share.learner_id: share.share for share in model.masking.encrypted_shares}
+            for name, model in zip(survivors, models)
+        }
+        indices = {name: index for index, name in enumerate(self.peers, start=1)}
+
+        total = sum((_values(model) for model in models[1:]), _values(models[0]))
+        shares = {name: {} for name in survivors}
+        for name in survivors:
+            correction, revealed = self.learners[name].recover(
+                "round-1", dropped,
+                {sender: encrypted[sender][name] for sender in survivors if sender != name})
+            total += correction
+            for owner, share in revealed.items():
+                shares[owner][indices[name]] = share
+        for name in survivors:
+            total -= expand_masks(reconstruct_seed(shares[name]), len(total))
+        return total
+
+    def _expected(self, names):
+        total = sum(self.scales[name] for name in names)
+        return np.concatenate([
+            sum(self.scales[name] * np.asarray(self.weights[name][i], np.float64).reshape(-1)
+                for name in names) / total
+            for i in range(2)
+        ])
+
+    def test_masks_cancel_out(self):
+        for masking in self.learners.values():
+            masking.register_round("round-1", self.peers)
+
+        models = self._masked_models(self.learners)
+        self.assertEqual(models[0].masking.round_id, "round-1")
+        self.assertEqual(models[0].masking.fraction_bits, 20)
+        self.assertEqual(
+            sorted(share.learner_id for share in models[0].masking.encrypted_shares), ["b", "c"])
+
+        # The pairwise masks cancel out, the self masks do not.
+        total = sum((_values(model) for model in models[1:]), _values(models[0]))
+        self.assertGreater(np.abs(total.view(np.int64)[1:]).min(), 2 ** 40)
+        # A single masked model reveals nothing about its values.
+        masked = np.frombuffer(models[0].tensors[0].value, dtype="<i8")
+        self.assertGreater(np.abs(masked).min(), 2 ** 40)
+
+        np.testing.assert_allclose(
+            _average(self._recover(models, ["a", "b", "c"], [])),
+            self._expected(self.learners), atol=1e-5)
+
+    def test_unpacked_masks_cancel_out(self):
+        for masking in self.learners.values():
+            masking.register_round("round-1", self.peers)
+        models = self._masked_models(self.learners, pack_tensors=False)
+        np.testing.assert_allclose(
+            _average(self._recover(models, ["a", "b", "c"], [])),
+            self._expected(self.learners), atol=1e-5)
+
+    def test_dropped_learners_are_recovered(self):
+        for masking in self.learners.values():
+            masking.register_round("round-1", self.peers)
+        models = self._masked_models(["a", "b"])
+
+        total = self._recover(models, ["a", "b"], ["c"])
+        self.assertEqual(total.dtype, np.uint64)
+        self.assertEqual(total.size, 1 + 12 + 5)
+        np.testing.assert_allclose(_average(total), self._expected(["a", "b"]), atol=1e-5)
+
+        # The same learners can be recovered again, but not others.
+        b_share = models[1].masking.encrypted_shares[0]
+        self.assertEqual(b_share.learner_id, "a")
+        self.learners["a"].recover("round-1", ["c"], {"b": b_share.share})
+        with self.assertRaises(ValueError):
+            self.learners["a"].recover("round-1", ["b", "c"])
+        # The masked model of a recovered round cannot be sent again.
+        with self.assertRaises(ValueError):
+            self._masked_models(["a"])
+
+    def test_late_learner_stays_masked(self):
+        for masking in self.learners.values():
+            masking.register_round("round-1", self.peers)
+        models = self._masked_models(["a", "b", "c"])
+        shares = {share.learner_id: share.share for share in models[2].masking.encrypted_shares}
+
+        # Learner c is late, yet the Controller claims that it dropped out.
+        corrections = [self.learners[name].recover("round-1", ["c"])[0] for name in ["a", "b"]]
+        # The pairwise masks of its model are removed, its self mask is not.
+        unmasked = sum(corrections, _values(models[2]))
+        self.assertGreater(np.abs(unmasked.view(np.int64)[1:]).min(), 2 ** 40)
+
+        # The learners that were told that c dropped out do not reveal its self mask.
+        for name in ["a", "b"]:
+            with self.assertRaises(ValueError):
+                self.learners[name].recover("round-1", [], {"c": shares[name]})
+        # A learner is never told that c both dropped out and survived.
+        self.learners["c"].register_round("round-2", self.peers)
+        self.learners["a"].register_round("round-2", self.peers)
+        self.learners["a"].set_active_round("round-2", 1.0)
+        self.learners["a"].encrypt(np.zeros(3))
+        with self.assertRaises(ValueError):
+            self.learners["a"].recover("round-2", ["c"], {"c": shares["a"]})
+
+    def test_shares_are_bound_to_their_round_and_sender(self):
+        for round_id in ["round-1", "round-2"]:
+            for masking in self.learners.values():
+                masking.register_round(round_id, self.peers)
+        models = self._masked_models(["a", "b", "c"])
+        to_a = {
+            name: {share.learner_id: share.share for share in model.masking.encrypted_shares}["a"]
+            for name, model in zip(["b", "c"], models[1:])
+        }
+
+        # Replayed in another round.
+        self.learners["a"].set_active_round("round-2", 1.0)
+        self.learners["a"].encrypt(np.zeros(3))
+        with self.assertRaises(ValueError):
+            self.learners["a"].recover("round-2", [], to_a)
+        # Presented as the share of another sender, or tampered with.
+        with self.assertRaises(ValueError):
+            self.learners["a"].recover("round-1", [], {"b": to_a["c"], "c": to_a["b"]})
+        tampered = bytearray(to_a["b"])
+        tampered[-1] ^= 1
+        with self.assertRaises(ValueError):
+            self.learners["a"].recover("round-1", [], {"b": bytes(tampered), "c": to_a["c"]})
+
+        _, revealed = self.learners["a"].recover("round-1", [], to_a)
+        self.assertEqual(sorted(revealed), ["a", "b", "c"])
+
+    def test_shares_reconstruct_the_seed(self):
+        seed = os.urandom(32)
+        shares = share_seed(seed, [1, 2, 3, 4, 5], threshold=3)
+        self.assertEqual(reconstruct_seed({index: shares[index] for index in [1, 3, 5]}), seed)
+        self.assertEqual(reconstruct_seed(shares), seed)
+        with self.assertRaises(ValueError):
+            reconstruct_seed({index: shares[index] for index in [2, 4]})
+
+    def test_chunks_round_trip(self):
+        masking = self.learners["a"]
+        masking.register_round("round-1", {"a": self.peers["a"]})
+        masking.set_active_round("round-1", 3.0)
+        helper = MessageHelper(scheme=masking)
+
+        chunks = list(helper.weights_to_model_chunks(self.weights["a"], chunk_size=16))
+        self.assertTrue(chunks[0].HasField("masking"))
+        self.assertFalse(chunks[-1].HasField("masking"))
+        model = chunks_to_model(chunks)
+        self.assertEqual(model, helper.weights_to_model_proto(self.weights["a"]))
+        self.assertTrue(model.encrypted)
+
+        # Without other learners, the values are only weighed, in fixed point, and self-masked.
+        _, revealed = masking.recover("round-1", [])
+        masks = expand_masks(reconstruct_seed({1: revealed["a"]}), 1 + 12 + 5)
+        self.assertEqual((model.masking.weight - int(masks[0])) % 2 ** 64, 3 * 2 ** 20)
+        offset = 1
+        for tensor in model.tensors:
+            values = np.frombuffer(tensor.value, dtype="<u8")
+            tensor.value = (values - masks[offset:offset + len(values)]).astype("<u8").tobytes()
+            offset += len(values)
+        for weight, expected in zip(helper.model_proto_to_weights(model), self.weights["a"]):
+            self.assertEqual(weight.dtype, expected.dtype)
+            np.testing.assert_allclose(weight, 3 * expected, atol=1e-5)
+
+    def test_invalid_rounds(self):
+        masking = self.learners["a"]
+        with self.assertRaises(ValueError):
+            masking.set_active_round("unknown", 1.0)
+        with self.assertRaises(ValueError):
+            masking.register_round("round-1", {"b": self.peers["b"]})
+        with self.assertRaises(ValueError):
+            masking.register_round("round-1", {"a": self.peers["a"], "b": b"\x01"})
+        with self.assertRaises(ValueError):
+            masking.register_round("round-1", self.peers, threshold=1)
+
+        masking.register_round("round-1", self.peers)
+        with self.assertRaises(ValueError):
+            masking.register_round("round-1", self.peers)
+        with self.assertRaises(ValueError):
+            masking.set_active_round("round-1", 0)
+        masking.set_active_round("round-1", 1.0)
+        with self.assertRaises(ValueError):
+            masking.encrypt(np.array([np.inf]))
+
+    def test_private_key_is_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "masking.key")
+            masking = PairwiseMasking(private_key_path=path)
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+            self.assertEqual(PairwiseMasking(private_key_path=path).public_key, masking.public_key)
+            self.assertNotEqual(PairwiseMasking().public_key, masking.public_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
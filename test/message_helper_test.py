@@ -0,0 +1,153 @@
+import unittest
+
+import numpy as np
+
+from metisfl.encryption.scheme import EncryptionScheme
+from metisfl.learner.message_helper import MessageHelper, bfloat16
+from metisfl.proto import model_pb2
+
+
+class PlaintextScheme(EncryptionScheme):
+
+    """Stands in for CKKS: "encrypts" the doubles as they are and counts the calls."""
+
+    def __init__(self):
+        self.num_encryptions = 0
+        self.num_calls = 0
+
+    def encrypt(self, data):
+        self.num_encryptions += 1
+        return np.asarray(data, dtype=np.float64).tobytes()
+
+    def decrypt(self, data, length):
+        return np.frombuffer(data, dtype=np.float64)[:length]
+
+    def encrypt_many(self, data):
+        self.num_calls += 1
+        return super().encrypt_many(data)
+
+    def decrypt_many(self, data, lengths):
+        self.num_calls += 1
+        return super().decrypt_many(data, lengths)
+
+
+class MessageHelperTest(unittest.TestCase):
+
+    def _round_trip(self, dtype):
+        weights = [
+            np.arange(12, dtype=dtype).reshape(3, 4),
+            np.array([1, 2, 3], dtype=dtype),
+        ]
+        helper = MessageHelper()
+        model = helper.weights_to_model_proto(weights)
+        converted = helper.model_proto_to_weights(model)
+
+        for original, restored in zip(weights, converted):
+            self.assertEqual(original.dtype, restored.dtype)
+            self.assertEqual(original.shape, restored.shape)
+            self.assertTrue(np.array_equal(original, restored))
+        return model
+
+    def test_float64(self):
+        model = self._round_trip(np.float64)
+        self.assertEqual(model.tensors[0].type.type,
+                         model_pb2.DType.Type.FLOAT64)
+
+    def test_float32(self):
+        model = self._round_trip(np.float32)
+        self.assertEqual(model.tensors[0].type.type,
+                         model_pb2.DType.Type.FLOAT32)
+        self.assertEqual(len(model.tensors[0].value), 12 * 4)
+
+    def test_float16(self):
+        model = self._round_trip(np.float16)
+        self.assertEqual(model.tensors[0].type.type,
+                         model_pb2.DType.Type.FLOAT16)
+        self.assertEqual(len(model.tensors[0].value), 12 * 2)
+
+    def test_int32(self):
+        self._round_trip(np.int32)
+
+    @unittest.skipIf(bfloat16 is None, "ml_dtypes is not installed")
+    def test_bfloat16(self):
+        model = self._round_trip(bfloat16)
+        self.assertEqual(model.tensors[0].type.type,
+                         model_pb2.DType.Type.BFLOAT16)
+
+    def test_big_endian_is_serialized_as_little_endian(self):
+        weights = [np.array([1.5, -2.0], dtype=">f4")]
+        helper = MessageHelper()
+        model = helper.weights_to_model_proto(weights)
+        converted = helper.model_proto_to_weights(model)
+        self.assertEqual(model.tensors[0].value,
+                         np.array([1.5, -2.0], dtype="<f4").tobytes())
+        self.assertTrue(np.array_equal(weights[0], converted[0]))
+
+    def test_weights_are_writable_views_of_one_buffer(self):
+        weights = [np.ones((3, 5), dtype=np.float32),
+                   np.ones((7,), dtype=np.float64),
+                   np.asfortranarray(np.arange(6, dtype=np.int16).reshape(2, 3))]
+        helper = MessageHelper()
+        converted = helper.model_proto_to_weights(
+            helper.weights_to_model_proto(weights))
+
+        for original, restored in zip(weights, converted):
+            self.assertTrue(restored.flags.writeable)
+            self.assertIs(restored.base.base.obj, converted[0].base.base.obj)
+            self.assertEqual(
+                (restored.ctypes.data - converted[0].ctypes.data) % 64, 0)
+            self.assertTrue(np.array_equal(original, restored))
+        converted[0] += 1
+        self.assertTrue(np.array_equal(converted[0], weights[0] + 1))
+
+    def test_unsupported_dtype(self):
+        with self.assertRaises(TypeError):
+            MessageHelper().weights_to_model_proto(
+                [np.array([1 + 2j], dtype=np.complex64)])
+
+    def test_packed_encryption(self):
+        weights = [
+            np.arange(12, dtype=np.float32).reshape(3, 4),
+            np.zeros(0, dtype=np.float32),
+            np.array([1, 2, 3], dtype=np.int64),
+        ]
+        for pack_tensors in [True, False]:
+            scheme = PlaintextScheme()
+            helper = MessageHelper(scheme=scheme, pack_tensors=pack_tensors)
+
+            model = helper.weights_to_model_proto(weights)
+            self.assertEqual(model.packed, pack_tensors)
+            self.assertEqual(scheme.num_encryptions, 1 if pack_tensors else 3)
+            if pack_tensors:
+                # The first tensor carries the ciphertexts of all the tensors.
+                self.assertEqual(len(model.tensors[0].value), 15 * 8)
+                self.assertEqual(model.tensors[2].value, b"")
+
+            chunks = list(helper.weights_to_model_chunks(weights, chunk_size=16))
+            self.assertEqual(chunks[0].packed, pack_tensors)
+            for converted in [helper.model_proto_to_weights(model),
+                              helper.model_chunks_to_weights(chunks)]:
+                for original, restored in zip(weights, converted):
+                    self.assertEqual(original.dtype, restored.dtype)
+                    self.assertEqual(original.shape, restored.shape)
+                    self.assertTrue(np.array_equal(original, restored))
+
+    def test_batched_encryption(self):
+        weights = [np.arange(10, dtype=np.float32), np.ones((2, 3), dtype=np.float64)]
+        scheme = PlaintextScheme()
+        helper = MessageHelper(scheme=scheme, pack_tensors=False)
+
+        # Every conversion encrypts or decrypts all the tensors in a single call.
+        model = helper.weights_to_model_proto(weights)
+        chunks = list(helper.weights_to_model_chunks(weights, chunk_size=16))
+        self.assertEqual(scheme.num_calls, 2)
+        for converted in [helper.model_proto_to_weights(model),
+                          helper.model_chunks_to_weights(chunks)]:
+            for original, restored in zip(weights, converted):
+                self.assertEqual(original.dtype, restored.dtype)
+                self.assertTrue(np.array_equal(original, restored))
+        self.assertEqual(scheme.num_calls, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from metisfl.common.types import GlobalTrainConfig
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.learner.model_delta import (ModelVersionCache, add_weights,
+                                         content_version, subtract_weights)
+
+
+class ModelDeltaTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.base = [
+            rng.normal(size=(8, 4)).astype(np.float32),
+            np.array([100, -128, 127], dtype=np.int8),
+            np.arange(5, dtype=np.uint64),
+        ]
+        self.weights = [
+            self.base[0] + 0.5,
+            np.array([-100, 127, -128], dtype=np.int8),
+            np.arange(5, dtype=np.uint64)[::-1].copy(),
+        ]
+
+    def test_round_trip(self):
+        delta = subtract_weights(self.weights, self.base)
+        for weight, delta_weight in zip(self.weights, delta):
+            self.assertEqual(weight.dtype, delta_weight.dtype)
+            self.assertEqual(weight.shape, delta_weight.shape)
+
+        weights = add_weights(delta, self.base)
+        # Integers wrap around, hence are restored exactly.
+        self.assertTrue(np.array_equal(weights[1], self.weights[1]))
+        self.assertTrue(np.array_equal(weights[2], self.weights[2]))
+        np.testing.assert_allclose(weights[0], self.weights[0], rtol=1e-6)
+
+    def test_mismatch(self):
+        with self.assertRaises(ValueError):
+            subtract_weights(self.weights[:2], self.base)
+        with self.assertRaises(ValueError):
+            subtract_weights([self.weights[0].astype(np.float64)] + self.weights[1:], self.base)
+
+    def test_version_cache(self):
+        cache = ModelVersionCache(capacity=2)
+        cache.put("a", self.base)
+        cache.put("b", self.weights)
+        cache.put("c", self.weights)
+        self.assertIsNone(cache.get("a"))
+        self.assertIs(cache.get("b"), self.weights)
+
+    def test_acknowledged_version_is_not_evicted(self):
+        cache = ModelVersionCache(capacity=2)
+        cache.put("a", self.base, acknowledged=True)
+        for version in ["b", "c", "d"]:
+            cache.put(version, self.weights)
+        self.assertIs(cache.get("a"), self.base)
+        self.assertIsNone(cache.get("b"))
+
+        # The version acknowledged before is held as any other version.
+        cache.put("e", self.weights, acknowledged=True)
+        self.assertIs(cache.get("a"), self.base)
+        self.assertIsNone(cache.get("c"))
+        cache.put("f", self.weights)
+        cache.put("g", self.weights)
+        self.assertIsNone(cache.get("a"))
+        self.assertIs(cache.get("e"), self.weights)
+
+    def test_content_version(self):
+        version = content_version(self.base)
+        self.assertEqual(version, content_version([weight.copy() for weight in self.base]))
+        self.assertNotEqual(version, content_version(self.weights))
+        # The data type and the shape are part of the content.
+        self.assertNotEqual(version, content_version(
+            [self.base[0].reshape(4, 8)] + self.base[1:]))
+        self.assertNotEqual(version, content_version(
+            [self.base[0]] + [self.base[1].view(np.uint8)] + self.base[2:]))
+
+    def test_versions_round_trip(self):
+        helper = MessageHelper()
+        delta = subtract_weights(self.weights, self.base)
+
+        model = helper.weights_to_model_proto(delta, base_version="v1")
+        self.assertEqual(model.base_version, "v1")
+
+        chunks = list(helper.weights_to_model_chunks(delta, chunk_size=16, base_version="v1"))
+        self.assertEqual(chunks[0].base_version, "v1")
+        weights = add_weights(helper.model_chunks_to_weights(chunks), self.base)
+        self.assertTrue(np.array_equal(weights[1], self.weights[1]))
+
+    def test_global_train_config(self):
+        config = GlobalTrainConfig(
+            aggregation_rule="FedAvg",
+            communication_protocol="Synchronous",
+            scaling_factor="NumParticipants",
+            delta_updates=True,
+        )
+        self.assertTrue(config.delta_updates)
+
+
+if __name__ == "__main__":
+    unittest.main()
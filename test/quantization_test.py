@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.learner.quantization import QuantizedWeight, UpdateQuantizer
+from metisfl.proto import model_pb2
+
+
+class QuantizationTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.weights = [
+            rng.normal(scale=0.01, size=(64, 33)).astype(np.float32),
+            rng.normal(size=7).astype(np.float64),
+            np.arange(5, dtype=np.int32),
+            np.zeros(0, dtype=np.float32),
+        ]
+
+    def _round_trip(self, quantizer, chunked=False):
+        helper = MessageHelper()
+        quantized = quantizer.quantize(self.weights)
+        if chunked:
+            return helper.model_chunks_to_weights(
+                helper.weights_to_model_chunks(quantized, chunk_size=100))
+        return helper.model_proto_to_weights(helper.weights_to_model_proto(quantized))
+
+    def test_round_trip(self):
+        for bits, block_size in [(8, None), (8, 100), (4, None), (4, 33)]:
+            quantizer = UpdateQuantizer(bits=bits, block_size=block_size,
+                                        stochastic_rounding=False, error_feedback=False)
+            for chunked in [False, True]:
+                weights = self._round_trip(quantizer, chunked)
+                for original, restored in zip(self.weights, weights):
+                    self.assertEqual(original.dtype, restored.dtype)
+                    self.assertEqual(original.shape, restored.shape)
+                    if original.size:
+                        # Rounded to the nearest level, i.e., within half a step.
+                        step = np.abs(original).max() / (127 if bits == 8 else 7)
+                        self.assertLessEqual(np.abs(original - restored).max(), step / 2 + 1e-6)
+                # Integer weights are not quantized.
+                self.assertTrue(np.array_equal(weights[2], self.weights[2]))
+
+    def test_model_proto(self):
+        quantized = UpdateQuantizer(bits=4, block_size=1000).quantize(self.weights)
+        self.assertIsInstance(quantized[0], QuantizedWeight)
+        self.assertNotIsInstance(quantized[2], QuantizedWeight)
+
+        model = MessageHelper(codec=model_pb2.Codec.Type.NONE).weights_to_model_proto(quantized)
+        tensor = model.tensors[0]
+        self.assertEqual(tensor.type.type, model_pb2.DType.Type.FLOAT32)
+        self.assertEqual(tensor.quantization.type, model_pb2.Quantization.Type.INT4)
+        self.assertEqual(len(tensor.value), 64 * 33 // 2)
+        self.assertEqual(len(tensor.quantization.scales), 3)
+        self.assertEqual(len(model.tensors[3].quantization.scales), 0)
+
+    def test_error_feedback(self):
+        # A constant update below the quantization step is eventually sent in full.
+        weights = [np.array([1.0, 0.001], dtype=np.float32)]
+        quantizer = UpdateQuantizer(bits=4, stochastic_rounding=False)
+        helper = MessageHelper()
+        sent = np.zeros(2, dtype=np.float32)
+        for _ in range(100):
+            model = helper.weights_to_model_proto(quantizer.quantize(weights))
+            sent += helper.model_proto_to_weights(model)[0]
+        np.testing.assert_allclose(sent, [100.0, 0.1], atol=1 / 7)
+
+        quantizer.reset()
+        without_feedback = UpdateQuantizer(bits=4, stochastic_rounding=False, error_feedback=False)
+        model = helper.weights_to_model_proto(without_feedback.quantize(weights))
+        self.assertEqual(helper.model_proto_to_weights(model)[0][1], 0)
+
+    def test_stochastic_rounding_is_unbiased(self):
+        weights = [np.full(100_000, 0.3, dtype=np.float32), np.array([7.0], dtype=np.float32)]
+        quantizer = UpdateQuantizer(bits=4, block_size=None, error_feedback=False, seed=0)
+        helper = MessageHelper()
+        # The scale is 1 for the block [0.3, ..., 7.0]; 0.3 is rounded up 30% of the time.
+        restored = helper.model_proto_to_weights(helper.weights_to_model_proto(
+            quantizer.quantize([np.concatenate(weights)])))[0]
+        self.assertAlmostEqual(restored[:-1].mean(), 0.3, places=2)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            UpdateQuantizer(bits=2)
+        with self.assertRaises(ValueError):
+            UpdateQuantizer(block_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
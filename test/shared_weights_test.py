@@ -0,0 +1,96 @@
+import os
+import queue
+import unittest
+
+import numpy as np
+
+from metisfl.learner.learner import Learner
+from metisfl.learner.shared_weights import (SHARED_WEIGHT_ALIGNMENT,
+                                            load_shared_weights,
+                                            release_shared_weights,
+                                            share_weights,
+                                            try_call_train_shared)
+from metisfl.learner.task_manager import TaskManager
+
+
+class IncrementLearner(Learner):
+
+    def get_weights(self):
+        return []
+
+    def set_weights(self, weights):
+        return True
+
+    def train(self, weights, params):
+        for weight in weights:
+            weight += 1
+        return weights, {"pid": os.getpid()}, {}
+
+    def evaluate(self, weights, params):
+        return {}
+
+
+class SharedWeightsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.weights = [
+            np.arange(12, dtype=np.float32).reshape(3, 4),
+            np.arange(5, dtype=np.int64),
+            np.array([1.5], dtype=np.float16),
+        ]
+
+    def test_roundtrip(self):
+        shared = share_weights(self.weights)
+        restored = load_shared_weights(shared)
+        release_shared_weights(shared)
+
+        self.assertFalse(os.path.exists(shared.path))
+        for weight, restored_weight in zip(self.weights, restored):
+            self.assertEqual(weight.dtype, restored_weight.dtype)
+            np.testing.assert_array_equal(weight, restored_weight)
+        for offset in shared.offsets:
+            self.assertEqual(offset % SHARED_WEIGHT_ALIGNMENT, 0)
+
+    def test_loaded_weights_are_private(self):
+        shared = share_weights(self.weights)
+        first = load_shared_weights(shared)
+        second = load_shared_weights(shared)
+        release_shared_weights(shared)
+
+        first[0][:] = -1
+        np.testing.assert_array_equal(second[0], self.weights[0])
+
+    def test_empty_model(self):
+        shared = share_weights([])
+        self.assertEqual(load_shared_weights(shared), [])
+        release_shared_weights(shared)
+
+    def test_train_in_worker(self):
+        results = queue.Queue()
+        shared = share_weights(self.weights)
+
+        task_manager = TaskManager()
+        task_manager.run_task(
+            task_fn=try_call_train_shared,
+            task_kwargs={
+                "learner": IncrementLearner(),
+                "weights": shared,
+                "params": {},
+            },
+            callback=results.put,
+        )
+        task_manager.shutdown()
+
+        trained_shared, metrics, _ = results.get(block=False)
+        trained = load_shared_weights(trained_shared)
+        release_shared_weights(trained_shared)
+
+        # The worker releases the incoming weights once loaded.
+        self.assertFalse(os.path.exists(shared.path))
+        self.assertNotEqual(metrics["pid"], os.getpid())
+        for weight, trained_weight in zip(self.weights, trained):
+            np.testing.assert_array_equal(weight + 1, trained_weight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+import numpy as np
+
+from metisfl.learner.message_helper import MessageHelper
+from metisfl.learner.quantization import UpdateQuantizer
+from metisfl.learner.sparsification import (SparseWeight, UpdateSparsifier,
+                                            decode_indices, encode_indices)
+from metisfl.proto import model_pb2
+
+
+class SparsificationTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.weights = [
+            rng.normal(size=(64, 33)).astype(np.float32),
+            rng.normal(size=1000).astype(np.float64),
+            np.arange(5, dtype=np.int32),
+        ]
+
+    def test_indices_round_trip(self):
+        for indices, num_values in [
+            (np.array([0, 1, 127, 128, 20_000, 3_000_000]), 3_000_001),
+            (np.arange(0, 100, 2), 100),
+            (np.zeros(0, dtype=np.int64), 10),
+        ]:
+            encoding, encoded = encode_indices(indices, num_values)
+            sparsity = model_pb2.Sparsity(
+                encoding=encoding, num_values=len(indices), indices=encoded)
+            self.assertTrue(np.array_equal(decode_indices(sparsity, num_values), indices))
+
+        # Dense indices are encoded as a bitmap, scattered ones as deltas.
+        self.assertEqual(encode_indices(np.arange(0, 100, 2), 100)[0],
+                         model_pb2.Sparsity.Encoding.BITMAP)
+        self.assertEqual(encode_indices(np.array([5, 900]), 1000)[0],
+                         model_pb2.Sparsity.Encoding.DELTA)
+
+    def test_rejects_malformed_indices(self):
+        for sparsity, num_values in [
+            (model_pb2.Sparsity(encoding=model_pb2.Sparsity.Encoding.DELTA,
+                                num_values=1, indices=b"\x80"), 10),
+            (model_pb2.Sparsity(encoding=model_pb2.Sparsity.Encoding.DELTA,
+                                num_values=2, indices=b"\x01\x00"), 10),
+            (model_pb2.Sparsity(encoding=model_pb2.Sparsity.Encoding.DELTA,
+                                num_values=1, indices=b"\x0a"), 10),
+            (model_pb2.Sparsity(encoding=model_pb2.Sparsity.Encoding.BITMAP,
+                                num_values=1, indices=b"\x01"), 10),
+        ]:
+            with self.assertRaises(ValueError):
+                decode_indices(sparsity, num_values)
+
+    def test_top_k_round_trip(self):
+        helper = MessageHelper()
+        sparse = UpdateSparsifier(ratio=0.05, error_feedback=False).sparsify(self.weights)
+        self.assertIsInstance(sparse[0], SparseWeight)
+        self.assertNotIsInstance(sparse[2], SparseWeight)
+
+        for chunked in [False, True]:
+            if chunked:
+                weights = helper.model_chunks_to_weights(
+                    helper.weights_to_model_chunks(sparse, chunk_size=100))
+            else:
+                weights = helper.model_proto_to_weights(helper.weights_to_model_proto(sparse))
+            for original, restored in zip(self.weights, weights):
+                self.assertEqual(original.dtype, restored.dtype)
+                self.assertEqual(original.shape, restored.shape)
+            # The kept values are the largest ones and are sent exactly.
+            kept = weights[0] != 0
+            self.assertEqual(kept.sum(), int(np.ceil(0.05 * self.weights[0].size)))
+            self.assertTrue(np.array_equal(weights[0][kept], self.weights[0][kept]))
+            self.assertGreaterEqual(np.abs(self.weights[0][kept]).min(),
+                                    np.abs(self.weights[0][~kept]).max())
+            self.assertTrue(np.array_equal(weights[2], self.weights[2]))
+
+    def test_quantized_values(self):
+        helper = MessageHelper(codec=model_pb2.Codec.Type.NONE)
+        quantizer = UpdateQuantizer(bits=8, stochastic_rounding=False, error_feedback=False)
+        sparse = UpdateSparsifier(threshold=1.0).sparsify(self.weights, quantizer=quantizer)
+
+        model = helper.weights_to_model_proto(sparse)
+        tensor = model.tensors[0]
+        num_kept = int((np.abs(self.weights[0]) >= 1.0).sum())
+        self.assertEqual(tensor.sparsity.num_values, num_kept)
+        self.assertEqual(tensor.quantization.type, model_pb2.Quantization.Type.INT8)
+        self.assertEqual(len(tensor.value), num_kept)
+
+        restored = helper.model_proto_to_weights(model)[0]
+        kept = np.abs(self.weights[0]) >= 1.0
+        step = np.abs(self.weights[0]).max() / 127
+        self.assertLessEqual(np.abs(restored[kept] - self.weights[0][kept]).max(), step / 2 + 1e-6)
+        self.assertTrue(np.all(restored[~kept] == 0))
+
+    def test_dense_if_not_smaller(self):
+        sparse = UpdateSparsifier(ratio=1.0).sparsify(self.weights)
+        self.assertNotIsInstance(sparse[0], SparseWeight)
+        self.assertTrue(np.array_equal(sparse[0], self.weights[0]))
+
+    def test_error_feedback(self):
+        # The values that are not sent are eventually sent in full.
+        weights = [np.array([1.0, 0.01, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], dtype=np.float32)]
+        sparsifier = UpdateSparsifier(ratio=1 / 8)
+        helper = MessageHelper()
+        sent = np.zeros(8, dtype=np.float32)
+        for _ in range(200):
+            model = helper.weights_to_model_proto(sparsifier.sparsify(weights))
+            sent += helper.model_proto_to_weights(model)[0]
+        np.testing.assert_allclose(sent, 200 * weights[0], atol=1.01)
+        self.assertGreater(sent[1], 0)
+
+    def test_invalid_arguments(self):
+        for kwargs in [{}, {"ratio": 0.1, "threshold": 1.0}, {"ratio": 0}, {"threshold": -1}]:
+            with self.assertRaises(ValueError):
+                UpdateSparsifier(**kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
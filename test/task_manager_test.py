@@ -0,0 +1,96 @@
+import os
+import queue
+import unittest
+
+from metisfl.common.timing import PhaseTimer
+from metisfl.learner.task_manager import TaskManager
+
+
+class CountingLearner(object):
+
+    def __init__(self):
+        self.num_tasks = 0
+
+
+def count_task(learner, crash=False):
+    if crash:
+        os._exit(1)
+    learner.num_tasks += 1
+    return os.getpid(), learner.num_tasks
+
+
+class TaskManagerTest(unittest.TestCase):
+
+    def _run_tasks(self, task_manager, tasks):
+        results = queue.Queue()
+        for crash in tasks:
+            task_manager.run_task(
+                task_fn=count_task,
+                task_kwargs={"learner": CountingLearner(), "crash": crash},
+                callback=results.put,
+            )
+        task_manager.shutdown()
+
+        collected = []
+        while not results.empty():
+            collected.append(results.get())
+        return collected
+
+    def test_fresh_worker_per_task(self):
+        results = self._run_tasks(TaskManager(), [False, False])
+
+        self.assertEqual([count for _, count in results], [1, 1])
+        self.assertNotEqual(results[0][0], results[1][0])
+
+    def test_resident_worker(self):
+        task_manager = TaskManager(
+            resident_kwargs={"learner": CountingLearner()})
+        results = self._run_tasks(task_manager, [False, False, False])
+
+        # The same learner is used by all tasks in the same process.
+        self.assertEqual([count for _, count in results], [1, 2, 3])
+        self.assertEqual(len({pid for pid, _ in results}), 1)
+
+    def test_resident_worker_restarts_after_crash(self):
+        task_manager = TaskManager(
+            resident_kwargs={"learner": CountingLearner()})
+        results = self._run_tasks(task_manager, [False, True, False])
+
+        # The crashed task has no result and the worker is restarted
+        # with a fresh copy of the resident learner.
+        self.assertEqual([count for _, count in results], [1, 1])
+        self.assertNotEqual(results[0][0], results[1][0])
+
+    def test_times_the_task(self):
+        task_manager = TaskManager(
+            resident_kwargs={"learner": CountingLearner()})
+        timer = PhaseTimer()
+        results = queue.Queue()
+        task_manager.run_task(task_fn=count_task, callback=results.put,
+                              timer=timer, phase="train")
+        task_manager.shutdown()
+
+        # The callback gets the result of the task, not its duration.
+        self.assertEqual(results.get(timeout=5)[1], 1)
+        self.assertEqual(set(timer.durations_ns()), {"train", "queue"})
+        self.assertGreater(timer.durations_ns()["train"], 0)
+
+    def test_cleans_up_failed_and_cancelled_tasks(self):
+        task_manager = TaskManager(max_queue_size=2)
+        cleaned_up, results = queue.Queue(), queue.Queue()
+        for crash in [True, False]:
+            task_manager.run_task(
+                task_fn=count_task,
+                task_kwargs={"learner": CountingLearner(), "crash": crash},
+                callback=results.put,
+                cleanup=lambda crash=crash: cleaned_up.put(crash),
+            )
+        task_manager.shutdown(force=True)
+
+        # Neither task completes, yet both are cleaned up.
+        self.assertEqual(sorted(cleaned_up.get(timeout=5) for _ in range(2)), [False, True])
+        self.assertTrue(results.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
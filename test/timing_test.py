@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from metisfl.common.timing import PhaseTimer, optional_phase
+
+
+class PhaseTimerTest(unittest.TestCase):
+
+    def test_nested_phases_are_excluded(self):
+        timer = PhaseTimer()
+        with timer.phase("serialize"):
+            time.sleep(0.02)
+            with timer.phase("encrypt"):
+                time.sleep(0.05)
+        with timer.phase("serialize"):
+            pass
+
+        durations = timer.durations_ms()
+        self.assertEqual(set(durations), {"serialize", "encrypt"})
+        self.assertGreaterEqual(durations["encrypt"], 50)
+        self.assertGreaterEqual(durations["serialize"], 20)
+        self.assertLess(durations["serialize"], 50)
+
+    def test_add(self):
+        timer = PhaseTimer()
+        timer.add("train", 2_000_000)
+        timer.add("train", 1_000_000)
+        # Negative durations, e.g., clock skews, are clamped.
+        timer.add("queue", -5)
+        self.assertEqual(timer.durations_ns(), {"train": 3_000_000, "queue": 0})
+        self.assertEqual(timer.durations_ms(), {"train": 3.0, "queue": 0.0})
+
+    def test_failed_phases_are_timed(self):
+        timer = PhaseTimer()
+        with self.assertRaises(ValueError):
+            with timer.phase("outer"):
+                with timer.phase("inner"):
+                    raise ValueError()
+        self.assertEqual(set(timer.durations_ns()), {"outer", "inner"})
+
+    def test_optional_phase(self):
+        with optional_phase(None, "train"):
+            pass
+        timer = PhaseTimer()
+        with optional_phase(timer, "train"):
+            pass
+        self.assertEqual(set(timer.durations_ns()), {"train"})
+
+
+if __name__ == "__main__":
+    unittest.main()
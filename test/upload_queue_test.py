@@ -0,0 +1,163 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import grpc
+
+from metisfl.learner.upload_queue import UploadQueue
+from metisfl.proto import controller_pb2, model_pb2
+
+
+class FakeRpcError(grpc.RpcError):
+
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+def _request(task_id, version=""):
+    return controller_pb2.TrainDoneRequest(
+        task_id=task_id, model=model_pb2.Model(version=version))
+
+
+class FakeController(object):
+
+    """Records the delivered requests; fails the next requests with the given errors, if not None."""
+
+    def __init__(self, errors=None):
+        self.errors = list(errors or [])
+        self.delivered = []
+        self.timeouts = []
+        self.upload_waits = []
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def send(self, request, timeout):
+        self.unblocked.wait()
+        self.timeouts.append(timeout)
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise FakeRpcError(error)
+        self.delivered.append((request.task_id, request.model.version))
+        self.upload_waits.append(request.metadata.phase_duration_ms["upload_wait"])
+
+
+class UploadQueueTest(unittest.TestCase):
+
+    def _queue(self, controller, **kwargs):
+        kwargs.setdefault("initial_backoff", 0.001)
+        queue = UploadQueue(send_fn=controller.send, **kwargs)
+        self.addCleanup(queue.close, 0)
+        return queue
+
+    def test_delivers_in_order_once(self):
+        controller = FakeController()
+        queue = self._queue(controller, max_pending=8)
+        for task_id in ["a", "b", "c"]:
+            self.assertTrue(queue.put(_request(task_id)))
+        self.assertTrue(queue.join(5))
+        self.assertFalse(queue.put(_request("b")))
+        queue.join(5)
+        self.assertEqual([task_id for task_id, _ in controller.delivered], ["a", "b", "c"])
+
+    def test_retries_transient_errors(self):
+        controller = FakeController([grpc.StatusCode.UNAVAILABLE,
+                                     grpc.StatusCode.DEADLINE_EXCEEDED])
+        queue = self._queue(controller, request_timeout=2)
+        queue.put(_request("a"))
+        queue.put(_request("b"))
+        self.assertTrue(queue.join(5))
+        self.assertEqual([task_id for task_id, _ in controller.delivered], ["a", "b"])
+        # The wait of an upload includes its retries.
+        self.assertTrue(all(wait > 0 for wait in controller.upload_waits))
+        self.assertEqual(len(controller.timeouts), 4)
+        self.assertTrue(all(0 < timeout <= 2 for timeout in controller.timeouts))
+
+    def test_drops_uploads_after_the_deadline(self):
+        controller = FakeController([grpc.StatusCode.UNAVAILABLE] * 1000)
+        queue = self._queue(controller, deadline=0.2, initial_backoff=0.05)
+        queue.put(_request("a"))
+        self.assertTrue(queue.join(5))
+        self.assertEqual(controller.delivered, [])
+        self.assertLess(len(controller.timeouts), 1000)
+
+    def test_sends_the_fallback_of_refused_uploads(self):
+        controller = FakeController([grpc.StatusCode.INVALID_ARGUMENT, None,
+                                     grpc.StatusCode.INVALID_ARGUMENT])
+        queue = self._queue(controller)
+        fallbacks = []
+        queue.put(_request("a", "delta"),
+                  fallback=lambda: model_pb2.Model(version="full"),
+                  on_fallback=lambda: fallbacks.append("a"))
+        # Refused uploads without a fallback are dropped.
+        queue.put(_request("b", "delta"))
+        queue.put(_request("c"))
+        self.assertTrue(queue.join(5))
+        self.assertEqual(controller.delivered, [("a", "full"), ("c", "")])
+        self.assertEqual(fallbacks, ["a"])
+
+    def test_unexpected_errors_drop_the_upload(self):
+        controller = FakeController([None, grpc.StatusCode.INVALID_ARGUMENT])
+        send = controller.send
+        failures = [ValueError("Cannot invoke RPC on closed channel!")]
+
+        def _send(request, timeout):
+            if failures:
+                raise failures.pop()
+            send(request, timeout)
+
+        queue = UploadQueue(send_fn=_send, max_pending=1, initial_backoff=0.001)
+        self.addCleanup(queue.close, 0)
+        queue.put(_request("a"))
+        # The delivery thread survives, hence the queue has space again.
+        self.assertTrue(queue.put(_request("b"), timeout=5))
+        # The fallback of the refused upload fails.
+        queue.put(_request("c"), fallback=lambda: 1 / 0)
+        queue.put(_request("d"))
+        self.assertTrue(queue.join(5))
+        self.assertEqual([task_id for task_id, _ in controller.delivered], ["b", "d"])
+
+    def test_full_queue_applies_backpressure(self):
+        controller = FakeController()
+        controller.unblocked.clear()
+        queue = UploadQueue(send_fn=controller.send, max_pending=1)
+        self.assertTrue(queue.put(_request("a")))
+        self.assertFalse(queue.put(_request("b"), timeout=0.1))
+        controller.unblocked.set()
+        queue.close()
+        self.assertEqual(controller.delivered, [("a", "")])
+
+    def test_spills_and_reloads_uploads(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            controller = FakeController()
+            controller.unblocked.clear()
+            queue = UploadQueue(send_fn=controller.send, max_pending=1, spill_dir=spill_dir)
+            queue.put(_request("a"))
+            queue.put(_request("b", "delta"), fallback=lambda: model_pb2.Model(version="full"))
+            queue.put(_request("c"))
+            self.assertEqual(queue.pending(), 3)
+            # The request of b, its fallback and the request of c.
+            self.assertEqual(len(os.listdir(spill_dir)), 3)
+
+            # The queue stops while a is being sent; b and c stay on disk.
+            closer = threading.Thread(target=queue.close, args=(0.1,))
+            closer.start()
+            closer.join(0.5)
+            controller.unblocked.set()
+            closer.join()
+            self.assertEqual(controller.delivered, [("a", "")])
+            self.assertEqual(len(os.listdir(spill_dir)), 3)
+
+            controller = FakeController([grpc.StatusCode.NOT_FOUND])
+            queue = UploadQueue(send_fn=controller.send, spill_dir=spill_dir)
+            self.assertTrue(queue.join(5))
+            queue.close()
+            self.assertEqual(controller.delivered, [("b", "full"), ("c", "")])
+            self.assertEqual(os.listdir(spill_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()